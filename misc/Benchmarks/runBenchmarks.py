@@ -0,0 +1,584 @@
+#!/usr/bin/env python3
+##############################################################################
+# Description:
+#
+#   Script to time the main calculation paths of PriceChartingTool,
+#   record the timings as a baseline in a JSON file, and check later
+#   runs against that baseline.
+#
+#   Each benchmark is run several times, and the fastest run is used,
+#   as seconds per operation.  A benchmark has regressed if it is
+#   slower than the baseline by more than the allowed slowdown.
+#
+#   Every run of a benchmark starts with empty calculation caches
+#   (PlanetaryInfo cache, StationIndex, LongitudeTable) and, for the
+#   pool benchmark, new pool processes, so that it times the
+#   calculations and not the lookups of an earlier run.  The ".warm"
+#   benchmarks time the same calculations a second time, against the
+#   caches filled by a first, untimed, pass.
+#
+# Usage:
+#
+#     ./runBenchmarks.py --help
+#     ./runBenchmarks.py --version
+#
+#     # List the benchmarks available.
+#     ./runBenchmarks.py --list
+#
+#     # Run all the benchmarks, and record the results as the baseline.
+#     ./runBenchmarks.py --record-baseline
+#
+#     # Run all the benchmarks, and compare against the baseline.
+#     # The exit code is 1 if any benchmark regressed.
+#     ./runBenchmarks.py
+#
+#     # Run only some of the benchmarks, allowing them to be 10% slower.
+#     ./runBenchmarks.py --benchmarks=getPlanetaryInfo.swiss,datetimeToJulianDay --max-slowdown=0.10
+#
+##############################################################################
+
+# For obtaining current directory path information, and creating directories
+import os
+import sys
+
+# For dates.
+import datetime
+import pytz
+
+# For timing the benchmarks.
+import time
+
+# For the platform information stored with the baseline.
+import platform
+
+# For reading and writing the baseline file.
+import json
+
+# For parsing command-line options
+from optparse import OptionParser
+
+# For logging.
+import logging
+
+# Include some PriceChartingTool modules.
+# This assumes that the relative directory from this script is: ../../src
+thisScriptDir = os.path.dirname(os.path.abspath(__file__))
+srcDir = os.path.dirname(os.path.dirname(thisScriptDir)) + os.sep + "src"
+if srcDir not in sys.path:
+    sys.path.insert(0, srcDir)
+from ephemeris import Ephemeris
+from lookbackmultiple_calc import LookbackMultipleUtils
+from eventsolver import EventSolver
+from stationindex import StationIndex
+from longitudetable import LongitudeTable
+
+##############################################################################
+
+##############################################################################
+# Global variables
+
+# Version string.
+VERSION = "0.1"
+
+# Version of the format of the baseline file.
+BASELINE_FILE_FORMAT_VERSION = 1
+
+# Location information to use with the Ephemeris.
+locationName = "New York City"
+locationLongitude = -74.0064
+locationLatitude = 40.7142
+locationElevation = 0
+
+# Directory where the swiss ephemeris files are located.
+swissEphemerisDataDir = \
+    os.path.abspath(os.path.join(srcDir, os.pardir, "data", "ephe"))
+
+# Default file the baseline is recorded to and read from.
+defaultBaselineFile = thisScriptDir + os.sep + "benchmarkBaseline.json"
+
+# Default fraction a benchmark may be slower than the baseline before
+# it counts as a regression.  A benchmark entry in the baseline file
+# can override this with a "maxSlowdown" value.
+defaultMaxSlowdown = 0.25
+
+# Default number of times each benchmark is run.
+defaultNumRepeats = 3
+
+# Reference timestamp of the lookback benchmarks.
+lookbackReferenceDt = datetime.datetime(1994, 10, 20, tzinfo=pytz.utc)
+
+# Error threshold for the lookback benchmarks.
+lookbackMaxErrorTd = datetime.timedelta(seconds=2)
+
+# Lookback calculations timed by the lookback benchmarks.
+# Each tuple is: (planetName, centricityType, longitudeType, degrees)
+lookbackCases = [\
+    ("MoSu",    "geocentric",   "tropical", 360 * 12),
+    ("Mercury", "geocentric",   "tropical", 720),
+    ("Venus",   "heliocentric", "tropical", 1000),
+    ("Mars",    "geocentric",   "tropical", 500),
+    ("Sun",     "geocentric",   "sidereal", 360 * 3),
+    ("Jupiter", "geocentric",   "tropical", 35),
+    ("Saturn",  "geocentric",   "tropical", 12),
+    ("H1",      "geocentric",   "tropical", 725),
+    ]
+
+# For logging.
+logging.basicConfig(format='%(levelname)s: %(message)s')
+moduleName = globals()['__name__']
+log = logging.getLogger(moduleName)
+#log.setLevel(logging.DEBUG)
+log.setLevel(logging.INFO)
+
+##############################################################################
+
+def shutdown(rc):
+    """Exits the script, but first flushes all logging handles, etc."""
+
+    # Close the Ephemeris so it can do necessary cleanups.
+    Ephemeris.closeEphemeris()
+
+    logging.shutdown()
+
+    sys.exit(rc)
+
+##############################################################################
+
+def clearCalculationCaches():
+    """Empties the caches that the calculations fill as they go, so
+    that the next calculations start cold.
+    """
+
+    Ephemeris.clearPlanetaryInfoCache()
+    EventSolver.setStationIndex(StationIndex())
+    LookbackMultipleUtils.setLongitudeTable(LongitudeTable())
+
+def timePlanetaryInfos(planetName, numOperations=2000):
+    """Times Ephemeris.getPlanetaryInfo() for the given planet, at
+    timestamps that are all different, starting with an empty
+    PlanetaryInfo cache.
+
+    Returns:
+    Tuple (elapsedSeconds, numOperations).
+    """
+
+    dts = [datetime.datetime(1950, 1, 1, tzinfo=pytz.utc) + \
+           datetime.timedelta(hours=(i * 7.3)) for i in range(numOperations)]
+
+    Ephemeris.clearPlanetaryInfoCache()
+
+    startTime = time.perf_counter()
+    for dt in dts:
+        Ephemeris.getPlanetaryInfo(planetName, dt)
+    endTime = time.perf_counter()
+
+    return (endTime - startTime, numOperations)
+
+def benchmarkGetPlanetaryInfoSwiss():
+    """Planet calculated directly by the Swiss Ephemeris."""
+
+    return timePlanetaryInfos("Mars")
+
+def benchmarkGetPlanetaryInfoHouseCusp():
+    """House cusp, calculated from the houses of the location."""
+
+    return timePlanetaryInfos("H1")
+
+def benchmarkGetPlanetaryInfoCombination():
+    """Combination planet, calculated from two planets."""
+
+    return timePlanetaryInfos("MoSu")
+
+def benchmarkGetPlanetaryInfoAveraged():
+    """Averaged planet, calculated from eight planets."""
+
+    return timePlanetaryInfos("CycleOfEight", numOperations=500)
+
+def benchmarkDatetimeToJulianDay():
+    """Conversion of timezone-aware datetimes to Julian Day."""
+
+    numOperations = 50000
+
+    eastern = pytz.timezone("US/Eastern")
+    dts = [eastern.normalize(\
+               datetime.datetime(1950, 1, 1, tzinfo=pytz.utc) + \
+               datetime.timedelta(hours=(i * 5.1))) \
+           for i in range(numOperations)]
+
+    startTime = time.perf_counter()
+    for dt in dts:
+        Ephemeris.datetimeToJulianDay(dt)
+    endTime = time.perf_counter()
+
+    return (endTime - startTime, numOperations)
+
+def timeLookbacks(futureFlag, warmFlag):
+    """Times the lookback calculations of 'lookbackCases', starting
+    with empty caches.  If 'warmFlag' is True, the calculations are
+    first run once without timing them, so that the timed run uses
+    the caches filled by it.
+
+    Arguments:
+    futureFlag - bool value for whether the lookbacks are in the
+                 future (True) or in the past (False).
+    warmFlag   - bool value for whether the caches are filled first.
+
+    Returns:
+    Tuple (elapsedSeconds, numOperations).
+    """
+
+    def runLookbacks():
+        for (planetName, centricityType, longitudeType, degrees) \
+                in lookbackCases:
+            if futureFlag == True:
+                LookbackMultipleUtils.\
+                    getDatetimesOfLongitudeDeltaDegreesInFuture(\
+                        planetName, centricityType, longitudeType,
+                        lookbackReferenceDt, degrees, lookbackMaxErrorTd)
+            else:
+                LookbackMultipleUtils.\
+                    getDatetimesOfLongitudeDeltaDegreesInPast(\
+                        planetName, centricityType, longitudeType,
+                        lookbackReferenceDt, -degrees, lookbackMaxErrorTd)
+
+    clearCalculationCaches()
+
+    if warmFlag == True:
+        runLookbacks()
+
+    startTime = time.perf_counter()
+    runLookbacks()
+    endTime = time.perf_counter()
+
+    return (endTime - startTime, len(lookbackCases))
+
+def benchmarkLookbackFuture():
+    """LookbackMultipleUtils.getDatetimesOfLongitudeDeltaDegreesInFuture()."""
+
+    return timeLookbacks(True, False)
+
+def benchmarkLookbackPast():
+    """LookbackMultipleUtils.getDatetimesOfLongitudeDeltaDegreesInPast()."""
+
+    return timeLookbacks(False, False)
+
+def benchmarkLookbackFutureWarm():
+    """lookback.future, again after filling the caches."""
+
+    return timeLookbacks(True, True)
+
+def benchmarkLookbackPastWarm():
+    """lookback.past, again after filling the caches."""
+
+    return timeLookbacks(False, True)
+
+def benchmarkParallelPool():
+    """Lookback calculations run through the LookbackMultipleParallel pool."""
+
+    # The pool of processes is created on first use.
+    from lookbackmultiple_parallel import LookbackMultipleParallel
+
+    argsTupleList = []
+    for i in range(4):
+        for (planetName, centricityType, longitudeType, degrees) \
+                in lookbackCases:
+            argsTupleList.append(\
+                (planetName, centricityType, longitudeType,
+                 lookbackReferenceDt + datetime.timedelta(days=(i * 91)),
+                 degrees, lookbackMaxErrorTd,
+                 locationLongitude, locationLatitude, locationElevation))
+
+    # New pool processes, so that none of them has tables left from
+    # an earlier run.  Starting them is not timed.
+    oldPool = LookbackMultipleParallel.getPool()
+    LookbackMultipleParallel.shutdown()
+    oldPool.join()
+    LookbackMultipleParallel.getPool()
+
+    startTime = time.perf_counter()
+    LookbackMultipleParallel.\
+        getDatetimesOfLongitudeDeltaDegreesInFutureParallel(argsTupleList)
+    endTime = time.perf_counter()
+
+    return (endTime - startTime, len(argsTupleList))
+
+# Benchmarks available, as tuples (name, function).
+# Each function returns a tuple (elapsedSeconds, numOperations).
+benchmarks = [\
+    ("getPlanetaryInfo.swiss",       benchmarkGetPlanetaryInfoSwiss),
+    ("getPlanetaryInfo.houseCusp",   benchmarkGetPlanetaryInfoHouseCusp),
+    ("getPlanetaryInfo.combination", benchmarkGetPlanetaryInfoCombination),
+    ("getPlanetaryInfo.averaged",    benchmarkGetPlanetaryInfoAveraged),
+    ("datetimeToJulianDay",          benchmarkDatetimeToJulianDay),
+    ("lookback.future",              benchmarkLookbackFuture),
+    ("lookback.past",                benchmarkLookbackPast),
+    ("lookback.future.warm",         benchmarkLookbackFutureWarm),
+    ("lookback.past.warm",           benchmarkLookbackPastWarm),
+    ("parallelPool",                 benchmarkParallelPool),
+    ]
+
+def runBenchmark(benchmarkFunction, numRepeats):
+    """Runs a benchmark function 'numRepeats' times.
+
+    Returns:
+    Tuple (secondsPerOperation, numOperations) of the fastest run.
+    """
+
+    bestSecondsPerOperation = None
+    numOperations = 0
+
+    for i in range(numRepeats):
+        (elapsedSeconds, numOperations) = benchmarkFunction()
+        secondsPerOperation = elapsedSeconds / numOperations
+
+        if bestSecondsPerOperation == None or \
+               secondsPerOperation < bestSecondsPerOperation:
+            bestSecondsPerOperation = secondsPerOperation
+
+    return (bestSecondsPerOperation, numOperations)
+
+def readBaseline(filename):
+    """Reads the baseline file.
+
+    Returns:
+    dict mapping benchmark name to the dict for that benchmark, or
+    None if the file could not be read.
+    """
+
+    try:
+        with open(filename, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (IOError, OSError, ValueError) as e:
+        log.error("Failed to read the baseline file '{}': {}".\
+                  format(filename, e))
+        return None
+
+    if not isinstance(data, dict) or \
+       data.get("version") != BASELINE_FILE_FORMAT_VERSION:
+
+        log.error("Baseline file '{}' has an unsupported format version.".\
+                  format(filename))
+        return None
+
+    return data["benchmarks"]
+
+def writeBaseline(filename, results):
+    """Writes the results as the baseline file.
+
+    Arguments:
+    filename - str holding the path of the file to write.
+    results  - dict mapping benchmark name to a tuple
+               (secondsPerOperation, numOperations).
+
+    Returns:
+    True if the write succeeded, False otherwise.
+    """
+
+    data = {"version"  : BASELINE_FILE_FORMAT_VERSION,
+            "created"  : datetime.datetime.now(pytz.utc).isoformat(),
+            "platform" : platform.platform(),
+            "python"   : platform.python_version(),
+            "cpuCount" : os.cpu_count(),
+            "benchmarks" : {}}
+
+    for (name, (secondsPerOperation, numOperations)) in results.items():
+        data["benchmarks"][name] = \
+            {"secondsPerOperation" : secondsPerOperation,
+             "numOperations"       : numOperations}
+
+    try:
+        with open(filename, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=4, sort_keys=True)
+            f.write("\n")
+    except (IOError, OSError) as e:
+        log.error("Failed to write the baseline file '{}': {}".\
+                  format(filename, e))
+        return False
+
+    return True
+
+##############################################################################
+
+# Create the parser
+parser = OptionParser()
+
+# Specify all valid options.
+parser.add_option("-v", "--version",
+                  action="store_true",
+                  dest="version",
+                  default=False,
+                  help="Display script version info and author contact.")
+
+parser.add_option("--list",
+                  action="store_true",
+                  dest="listBenchmarks",
+                  default=False,
+                  help="List the names of the benchmarks available.")
+
+parser.add_option("--benchmarks",
+                  action="store",
+                  type="str",
+                  dest="benchmarkNamesStr",
+                  default=None,
+                  help=\
+                  "Specify a comma-separated list of the benchmarks " + \
+                  "to run.  By default all benchmarks are run.",
+                  metavar="<NAMES>")
+
+parser.add_option("--baseline-file",
+                  action="store",
+                  type="str",
+                  dest="baselineFile",
+                  default=defaultBaselineFile,
+                  help=\
+                  "Specify the JSON file the baseline is recorded to " + \
+                  "and read from.  Default is: " + defaultBaselineFile,
+                  metavar="<FILE>")
+
+parser.add_option("--record-baseline",
+                  action="store_true",
+                  dest="recordBaseline",
+                  default=False,
+                  help=\
+                  "Record the results as the baseline, instead of " + \
+                  "comparing them against the baseline.")
+
+parser.add_option("--max-slowdown",
+                  action="store",
+                  type="float",
+                  dest="maxSlowdown",
+                  default=defaultMaxSlowdown,
+                  help=\
+                  "Specify the fraction a benchmark may be slower " + \
+                  "than the baseline before it counts as a " + \
+                  "regression.  Default is: {}".format(defaultMaxSlowdown),
+                  metavar="<FRACTION>")
+
+parser.add_option("--repeat",
+                  action="store",
+                  type="int",
+                  dest="numRepeats",
+                  default=defaultNumRepeats,
+                  help=\
+                  "Specify the number of times each benchmark is run.  " + \
+                  "Default is: {}".format(defaultNumRepeats),
+                  metavar="<NUM>")
+
+# Parse the arguments into options.
+(options, args) = parser.parse_args()
+
+# Print version information if the flag was used.
+if options.version == True:
+    print(os.path.basename(sys.argv[0]) + " (Version " + VERSION + ")")
+    print("By Ryan Luu, ryanluu@gmail.com")
+    sys.exit(0)
+
+if options.listBenchmarks == True:
+    for (name, benchmarkFunction) in benchmarks:
+        print("{:32} {}".format(name, benchmarkFunction.__doc__))
+    sys.exit(0)
+
+# Benchmarks selected to run.
+selectedBenchmarks = benchmarks
+if options.benchmarkNamesStr != None:
+    benchmarkNames = [name.strip() for name in \
+                      options.benchmarkNamesStr.split(",")]
+
+    knownNames = [name for (name, benchmarkFunction) in benchmarks]
+    for name in benchmarkNames:
+        if name not in knownNames:
+            log.error("Unknown benchmark name: {}".format(name))
+            sys.exit(1)
+
+    selectedBenchmarks = [(name, benchmarkFunction) \
+                          for (name, benchmarkFunction) in benchmarks \
+                          if name in benchmarkNames]
+
+if options.maxSlowdown < 0:
+    log.error("The --max-slowdown value must not be negative.")
+    sys.exit(1)
+
+if options.numRepeats < 1:
+    log.error("The --repeat value must be at least 1.")
+    sys.exit(1)
+
+##############################################################################
+
+if __name__ == "__main__":
+    # Initialize Ephemeris (required).
+    Ephemeris.SWISS_EPHEMERIS_DATA_DIR = swissEphemerisDataDir
+    LookbackMultipleUtils.initializeEphemeris(locationLongitude,
+                                              locationLatitude,
+                                              locationElevation)
+
+    # Dictionary of results computed.
+    results = {}
+
+    for (name, benchmarkFunction) in selectedBenchmarks:
+        log.info("Running benchmark '{}' ...".format(name))
+        results[name] = runBenchmark(benchmarkFunction, options.numRepeats)
+
+    if options.recordBaseline == True:
+        for (name, (secondsPerOperation, numOperations)) in results.items():
+            print("{:32} {:12.6f} ms/op".\
+                  format(name, secondsPerOperation * 1000.0))
+
+        # Keep the entries for the benchmarks that were not run.
+        baseline = {}
+        if os.path.exists(options.baselineFile):
+            baseline = readBaseline(options.baselineFile) or {}
+        for (name, entry) in baseline.items():
+            if name not in results:
+                results[name] = (entry["secondsPerOperation"],
+                                 entry["numOperations"])
+
+        if not writeBaseline(options.baselineFile, results):
+            shutdown(1)
+
+        log.info("Wrote baseline file '{}'.".format(options.baselineFile))
+        shutdown(0)
+
+    baseline = None
+    if os.path.exists(options.baselineFile):
+        baseline = readBaseline(options.baselineFile)
+        if baseline == None:
+            shutdown(1)
+    else:
+        log.warning("Baseline file '{}' does not exist.  ".\
+                    format(options.baselineFile) + \
+                    "Run with --record-baseline to create it.")
+        baseline = {}
+
+    numRegressions = 0
+
+    for (name, (secondsPerOperation, numOperations)) in results.items():
+        line = "{:32} {:12.6f} ms/op".\
+               format(name, secondsPerOperation * 1000.0)
+
+        entry = baseline.get(name)
+        if entry != None:
+            baselineSecondsPerOperation = entry["secondsPerOperation"]
+            maxSlowdown = entry.get("maxSlowdown", options.maxSlowdown)
+            ratio = secondsPerOperation / baselineSecondsPerOperation
+
+            line += "  baseline {:12.6f} ms/op  ({:+.1f}%)".\
+                    format(baselineSecondsPerOperation * 1000.0,
+                           (ratio - 1.0) * 100.0)
+
+            if ratio > 1.0 + maxSlowdown:
+                line += "  REGRESSION (allowed {:+.1f}%)".\
+                        format(maxSlowdown * 100.0)
+                numRegressions += 1
+        else:
+            line += "  no baseline"
+
+        print(line)
+
+    if numRegressions > 0:
+        log.error("{} benchmark(s) regressed.".format(numRegressions))
+        shutdown(1)
+
+    log.info("Done.")
+    shutdown(0)
+
+##############################################################################
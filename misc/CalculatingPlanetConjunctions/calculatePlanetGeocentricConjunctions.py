@@ -26,9 +26,6 @@ import os
 import sys 
 import errno
 
-# For copy.deepcopy()
-import copy
-
 # For dates.
 import datetime
 
@@ -46,6 +43,7 @@ if srcDir not in sys.path:
     sys.path.insert(0, srcDir)
 from astrologychart import AstrologyUtils
 from ephemeris import Ephemeris
+from eventsolver import EventSolver
 from data_objects import *
 
 ##############################################################################
@@ -78,10 +76,6 @@ endDt   = datetime.datetime(year=1940, month=12, day=31,
                             hour=hourOfDay, minute=minuteOfHour,
                             tzinfo=timezone)
 
-# Step size used when incrementing through all the timestamps between
-# startDt and endDt.
-stepSizeTd = datetime.timedelta(days=1)
-
 # Error threshold for calculating timestamps.
 maxErrorTd = datetime.timedelta(minutes=1)
 
@@ -302,7 +296,6 @@ def getLongitudeAspectTimestamps(\
                       "Not enough values given in planet tuple.")
             return None
 
-        planetName = planetTuple[0]
         centricityType = planetTuple[1]
         longitudeType = planetTuple[2]
             
@@ -324,43 +317,21 @@ def getLongitudeAspectTimestamps(\
                   "Value given was: {}".format(longitudeType))
             return None
             
-    # Field name we are getting.
-    fieldName = "longitude"
-        
     # Initialize the Ephemeris with the birth location.
     log.debug("Setting ephemeris location ...")
     Ephemeris.setGeographicPosition(locationLongitude,
                                     locationLatitude,
                                     locationElevation)
 
-    # Set the step size.
-    stepSizeTd = datetime.timedelta(days=1)
-    for planetTuple in planet1ParamsList + planet2ParamsList:
-        planetName = planetTuple[0]
-            
-        if Ephemeris.isHouseCuspPlanetName(planetName) or \
-           Ephemeris.isAscmcPlanetName(planetName):
-                
-            # House cusps and ascmc planets need a smaller step size.
-            stepSizeTd = datetime.timedelta(hours=1)
-        elif planetName == "Moon":
-            # Use a smaller step size for the moon so we can catch
-            # smaller aspect sizes.
-            stepSizeTd = datetime.timedelta(hours=3)
-        
-    log.debug("Step size is: {}".format(stepSizeTd))
-        
     # Desired angles.  We need to check for planets at these angles.
     desiredAngleDegList = []
 
     desiredAngleDeg1 = Util.toNormalizedAngle(degreeDifference)
     desiredAngleDegList.append(desiredAngleDeg1)
-    if Util.fuzzyIsEqual(desiredAngleDeg1, 0):
-        desiredAngleDegList.append(360)
-        
+    
     if uniDirectionalAspectsFlag == False:
         desiredAngleDeg2 = \
-            360 - Util.toNormalizedAngle(degreeDifference)
+            Util.toNormalizedAngle(360 - desiredAngleDeg1)
         if desiredAngleDeg2 not in desiredAngleDegList:
             desiredAngleDegList.append(desiredAngleDeg2)
 
@@ -370,310 +341,36 @@ def getLongitudeAspectTimestamps(\
         anglesStr += "{} ".format(angle)
     log.debug("Angles in desiredAngleDegList: " + anglesStr)
 
-    # Iterate through, appending to aspectTimestamps list as we go.
-    steps = []
-    steps.append(copy.deepcopy(startDt))
-    steps.append(copy.deepcopy(startDt))
-
-    longitudesP1 = []
-    longitudesP1.append(None)
-    longitudesP1.append(None)
-        
-    longitudesP2 = []
-    longitudesP2.append(None)
-    longitudesP2.append(None)
-
-    def getFieldValue(dt, planetParamsList, fieldName):
-        """Creates the PlanetaryInfo object for the given
-        planetParamsList and returns the value of the field
-        desired.
-        """
-        
-        log.debug("planetParamsList passed in is: {}".\
-                  format(planetParamsList))
-        
-        unAveragedFieldValues = []
-            
-        for t in planetParamsList:
-            planetName = t[0]
-            centricityType = t[1]
-            longitudeType = t[2]
-                
-            pi = Ephemeris.getPlanetaryInfo(planetName, dt)
-
-            fieldValue = None
-                
-            if centricityType.lower() == "geocentric":
-                fieldValue = pi.geocentric[longitudeType][fieldName]
-            elif centricityType.lower() == "topocentric":
-                fieldValue = pi.topocentric[longitudeType][fieldName]
-            elif centricityType.lower() == "heliocentric":
-                fieldValue = pi.heliocentric[longitudeType][fieldName]
-            else:
-                log.error("Unknown centricity type: {}".\
-                          format(centricityType))
-                fieldValue = None
-
-            unAveragedFieldValues.append(fieldValue)
-
-        log.debug("unAveragedFieldValues is: {}".\
-                  format(unAveragedFieldValues))
-        
-        # Average the field values.
-        total = 0.0
-        for v in unAveragedFieldValues:
-            total += v
-        averagedFieldValue = total / len(unAveragedFieldValues)
-        
-        log.debug("averagedFieldValue is: {}".\
-                  format(averagedFieldValue))
+    # Function for the angle of planet1 minus planet2.  The
+    # EventSolver chooses the step sizes from the planet speeds,
+    # and refines each crossing of a desired angle.
+    longitudeDifferenceFunction = \
+        EventSolver.createLongitudeDifferenceFunction(planet1ParamsList,
+                                                      planet2ParamsList)
     
-        return averagedFieldValue
-            
     log.debug("Stepping through timestamps from {} to {} ...".\
               format(Ephemeris.datetimeToStr(startDt),
                      Ephemeris.datetimeToStr(endDt)))
 
-    currDiff = None
-    prevDiff = None
-        
+    for segment in EventSolver.iterateLongitudeSegments(\
+        longitudeDifferenceFunction, startDt, endDt,
+        maxErrorTd=maxErrorTd):
 
-    while steps[-1] < endDt:
-        currDt = steps[-1]
-        prevDt = steps[-2]
-            
-        log.debug("Looking at currDt == {} ...".\
-                  format(Ephemeris.datetimeToStr(currDt)))
-            
-        longitudesP1[-1] = \
-            Util.toNormalizedAngle(\
-            getFieldValue(currDt, planet1ParamsList, fieldName))
-        longitudesP2[-1] = \
-            Util.toNormalizedAngle(\
-            getFieldValue(currDt, planet2ParamsList, fieldName))
-
-        log.debug("{} {} is: {}".\
-                  format(planet1ParamsList, fieldName,
-                         longitudesP1[-1]))
-        log.debug("{} {} is: {}".\
-                  format(planet2ParamsList, fieldName,
-                         longitudesP2[-1]))
-        
-        currDiff = Util.toNormalizedAngle(\
-            longitudesP1[-1] - longitudesP2[-1])
-        
-        log.debug("prevDiff == {}".format(prevDiff))
-        log.debug("currDiff == {}".format(currDiff))
-        
-        if prevDiff != None and \
-               longitudesP1[-2] != None and \
-               longitudesP2[-2] != None:
-            
-            if abs(prevDiff - currDiff) > 180:
-                # Probably crossed over 0.  Adjust the prevDiff so
-                # that the rest of the algorithm can continue to
-                # work.
-                if prevDiff > currDiff:
-                    prevDiff -= 360
-                else:
-                    prevDiff += 360
-                    
-                log.debug("After adjustment: prevDiff == {}".\
-                          format(prevDiff))
-                log.debug("After adjustment: currDiff == {}".\
-                          format(currDiff))
-
-            for desiredAngleDeg in desiredAngleDegList:
-                log.debug("Looking at desiredAngleDeg: {}".\
-                          format(desiredAngleDeg))
-                    
-                desiredDegree = desiredAngleDeg
-                    
-                if prevDiff < desiredDegree and currDiff >= desiredDegree:
-                    log.debug("Crossed over {} from below to above!".\
-                              format(desiredDegree))
-
-                    # This is the upper-bound of the error timedelta.
-                    t1 = prevDt
-                    t2 = currDt
-                    currErrorTd = t2 - t1
-
-                    # Refine the timestamp until it is less than
-                    # the threshold.
-                    while currErrorTd > maxErrorTd:
-                        log.debug("Refining between {} and {}".\
-                                  format(Ephemeris.datetimeToStr(t1),
-                                         Ephemeris.datetimeToStr(t2)))
-
-                        # Check the timestamp between.
-                        timeWindowTd = t2 - t1
-                        halfTimeWindowTd = \
-                            datetime.\
-                            timedelta(days=(timeWindowTd.days / 2.0),
-                                seconds=(timeWindowTd.seconds / 2.0),
-                                microseconds=\
-                                      (timeWindowTd.microseconds / 2.0))
-                        testDt = t1 + halfTimeWindowTd
-
-                        testValueP1 = \
-                            Util.toNormalizedAngle(getFieldValue(\
-                            testDt, planet1ParamsList, fieldName))
-                        testValueP2 = \
-                            Util.toNormalizedAngle(getFieldValue(\
-                            testDt, planet2ParamsList, fieldName))
-
-                        log.debug("testValueP1 == {}".format(testValueP1))
-                        log.debug("testValueP2 == {}".format(testValueP2))
-                        
-                        if longitudesP1[-2] > 240 and testValueP1 < 120:
-                            # Planet 1 hopped over 0 degrees.
-                            testValueP1 += 360
-                        elif longitudesP1[-2] < 120 and testValueP1 > 240:
-                            # Planet 1 hopped over 0 degrees.
-                            testValueP1 -= 360
-                            
-                        if longitudesP2[-2] > 240 and testValueP2 < 120:
-                            # Planet 2 hopped over 0 degrees.
-                            testValueP2 += 360
-                        elif longitudesP2[-2] < 120 and testValueP2 > 240:
-                            # Planet 2 hopped over 0 degrees.
-                            testValueP2 -= 360
-                        
-                        testDiff = Util.toNormalizedAngle(\
-                            testValueP1 - testValueP2)
-
-                        # Handle special cases of degrees 0 and 360.
-                        # Here we adjust testDiff so that it is in the
-                        # expected ranges.
-                        if Util.fuzzyIsEqual(desiredDegree, 0):
-                            if testDiff > 240:
-                                testDiff -= 360
-                        elif Util.fuzzyIsEqual(desiredDegree, 360):
-                            if testDiff < 120:
-                                testDiff += 360
-                        
-                        log.debug("testDiff == {}".format(testDiff))
-                        
-                        if testDiff < desiredDegree:
-                            t1 = testDt
-                        else:
-                            t2 = testDt
-
-                            # Update the curr values.
-                            currDt = t2
-                            currDiff = testDiff
-
-                            longitudesP1[-1] = testValueP1
-                            longitudesP2[-1] = testValueP2
-            
-                        currErrorTd = t2 - t1
-                            
-                    # Update our lists.
-                    steps[-1] = currDt
-
-                    # Store the aspect timestamp.
-                    aspectTimestamps.append(currDt)
-                 
-                elif prevDiff > desiredDegree and currDiff <= desiredDegree:
-                    log.debug("Crossed over {} from above to below!".\
-                              format(desiredDegree))
-
-                    # This is the upper-bound of the error timedelta.
-                    t1 = prevDt
-                    t2 = currDt
-                    currErrorTd = t2 - t1
-
-                    # Refine the timestamp until it is less than
-                    # the threshold.
-                    while currErrorTd > maxErrorTd:
-                        log.debug("Refining between {} and {}".\
-                                  format(Ephemeris.datetimeToStr(t1),
-                                         Ephemeris.datetimeToStr(t2)))
-
-                        # Check the timestamp between.
-                        timeWindowTd = t2 - t1
-                        halfTimeWindowTd = \
-                            datetime.\
-                            timedelta(days=(timeWindowTd.days / 2.0),
-                                seconds=(timeWindowTd.seconds / 2.0),
-                                microseconds=\
-                                      (timeWindowTd.microseconds / 2.0))
-                        testDt = t1 + halfTimeWindowTd
-
-                        testValueP1 = \
-                            Util.toNormalizedAngle(getFieldValue(\
-                            testDt, planet1ParamsList, fieldName))
-                        testValueP2 = \
-                            Util.toNormalizedAngle(getFieldValue(\
-                            testDt, planet2ParamsList, fieldName))
-
-                        log.debug("testValueP1 == {}".format(testValueP1))
-                        log.debug("testValueP2 == {}".format(testValueP2))
-                        
-                        if longitudesP1[-2] > 240 and testValueP1 < 120:
-                            # Planet 1 hopped over 0 degrees.
-                            testValueP1 += 360
-                        elif longitudesP1[-2] < 120 and testValueP1 > 240:
-                            # Planet 1 hopped over 0 degrees.
-                            testValueP1 -= 360
-                            
-                        if longitudesP2[-2] > 240 and testValueP2 < 120:
-                            # Planet 2 hopped over 0 degrees.
-                            testValueP2 += 360
-                        elif longitudesP2[-2] < 120 and testValueP2 > 240:
-                            # Planet 2 hopped over 0 degrees.
-                            testValueP2 -= 360
-
-                        testDiff = Util.toNormalizedAngle(\
-                            testValueP1 - testValueP2)
-
-                        # Handle special cases of degrees 0 and 360.
-                        # Here we adjust testDiff so that it is in the
-                        # expected ranges.
-                        if Util.fuzzyIsEqual(desiredDegree, 0):
-                            if testDiff > 240:
-                                testDiff -= 360
-                        elif Util.fuzzyIsEqual(desiredDegree, 360):
-                            if testDiff < 120:
-                                testDiff += 360
-                        
-                        log.debug("testDiff == {}".format(testDiff))
-                        
-                        if testDiff > desiredDegree:
-                            t1 = testDt
-                        else:
-                            t2 = testDt
-
-                            # Update the curr values.
-                            currDt = t2
-                            currDiff = testDiff
-
-                            longitudesP1[-1] = testValueP1
-                            longitudesP2[-1] = testValueP2
-                            
-                        currErrorTd = t2 - t1
-
-                    # Update our lists.
-                    steps[-1] = currDt
-
-                    # Store the aspect timestamp.
-                    aspectTimestamps.append(currDt)
-                 
-        # Prepare for the next iteration.
-        log.debug("steps[-1] is: {}".\
-                  format(Ephemeris.datetimeToStr(steps[-1])))
-        log.debug("stepSizeTd is: {}".format(stepSizeTd))
-        
-        steps.append(copy.deepcopy(steps[-1]) + stepSizeTd)
-        del steps[0]
-        longitudesP1.append(None)
-        del longitudesP1[0]
-        longitudesP2.append(None)
-        del longitudesP2[0]
-        
-        # Update prevDiff as the currDiff.
-        prevDiff = Util.toNormalizedAngle(currDiff)
+        crossedAngles = \
+            EventSolver.getCrossingValues(segment,
+                                          desiredAngleDegList,
+                                          modulus=360.0)
         
+        for crossedAngle in crossedAngles:
+            log.debug("Crossed over {}".format(crossedAngle))
+
+            dt = EventSolver.findCrossingDatetime(\
+                longitudeDifferenceFunction, startDt, segment,
+                crossedAngle, maxErrorTd)
+
+            # Store the aspect timestamp.
+            aspectTimestamps.append(dt)
+
     log.info("Number of timestamps obtained: {}".\
              format(len(aspectTimestamps)))
     
@@ -26,9 +26,6 @@ import os
 import sys 
 import errno
 
-# For copy.deepcopy()
-import copy
-
 # For dates.
 import datetime
 
@@ -46,6 +43,7 @@ if srcDir not in sys.path:
     sys.path.insert(0, srcDir)
 from astrologychart import AstrologyUtils
 from ephemeris import Ephemeris
+from stationindex import StationIndex
 from data_objects import *
 
 ##############################################################################
@@ -84,10 +82,6 @@ endDt   = datetime.datetime(year=1940, month=12, day=31,
 #                            hour=hourOfDay, minute=minuteOfHour,
 #                            tzinfo=timezone)
 
-# Step size used when incrementing through all the timestamps between
-# startDt and endDt.
-stepSizeTd = datetime.timedelta(days=5)
-
 # Error threshold for calculating timestamps of retrograde and direct planets.
 maxErrorTd = datetime.timedelta(minutes=1)
 
@@ -98,6 +92,13 @@ directStr = "D"
 # Destination output CSV file.
 outputFilename = thisScriptDir + os.sep + "planetDirectAndRetrograde.csv"
 
+# File the station index is loaded from, and saved to after the run,
+# so that later runs only calculate stations not already found.
+stationIndexFilename = thisScriptDir + os.sep + "planetStations.index"
+
+# Index of the planet stations.  This is set in main.
+stationIndex = None
+
 # Planet names to do calculations for.
 geocentricPlanetNames = [\
     #"Sun",
@@ -195,172 +196,33 @@ def getGeocentricPlanetDirectRetrogradeInfo(planetName):
     # Return value.
     rv = []
 
-    prevDt = None
-    currDt = copy.deepcopy(startDt)
+    stations = stationIndex.getStations(planetName, "geocentric", "tropical",
+                                        startDt, endDt)
 
-    prevTropLongitudeSpeed = None
-    currTropLongitudeSpeed = None
-
-    currTropLongitude = None
-    currSidLongitude = None
-    
-    while currDt <= endDt:
-        dt = currDt
+    for (dt, stationType) in stations:
+        # Keep the timezone of the timestamps in the output.
+        dt = dt.astimezone(timezone)
 
         pi = Ephemeris.getPlanetaryInfo(planetName, dt)
-        
+
         log.debug("Just obtained planetaryInfo for planet '{}', timestamp: {}".\
                   format(planetName, Ephemeris.datetimeToStr(dt)))
 
-        # Get the geocentric longitude and geocentric longitude speed.
-        tropLongitudeSpeed = pi.geocentric['tropical']['longitude_speed']
-        tropLongitude = pi.geocentric['tropical']['longitude']
-        sidLongitude = pi.geocentric['sidereal']['longitude']
-
-        # Store new current planet values.
-        currTropLongitudeSpeed = tropLongitudeSpeed
-        currTropLongitude = tropLongitude
-        currSidLongitude = sidLongitude
-
-        log.debug("prevTropLongitudeSpeed={}, currTropLongitudeSpeed={}".\
-                  format(prevTropLongitudeSpeed, currTropLongitudeSpeed))
-        
-        # We need two data points to proceed.
-        if prevTropLongitudeSpeed != None and \
-               currTropLongitudeSpeed != None and \
-               prevDt != None:
-            
-            # Check to see if we passed over 0 degrees.
-            
-            if prevTropLongitudeSpeed < 0.0 and currTropLongitudeSpeed >= 0.0:
-                # Crossed over from negative to positive!
-                log.debug("Crossed over from negative to positive!")
-
-                # This is the upper-bound of the error timedelta.
-                t1 = prevDt
-                t2 = currDt
-                currErrorTd = t2 - t1
-                
-                # Refine the timestamp until it is less than the
-                # desired threshold.
-                while currErrorTd > maxErrorTd:
-                    log.debug("Refining between {} and {}".\
-                              format(Ephemeris.datetimeToStr(t1),
-                                     Ephemeris.datetimeToStr(t2)))
-                    
-                    # Check the timestamp between.
-                    diffTd = t2 - t1
-                    halfDiffTd = \
-                        datetime.\
-                        timedelta(days=(diffTd.days / 2.0),
-                                  seconds=(diffTd.seconds / 2.0),
-                                  microseconds=(diffTd.microseconds / 2.0))
-                    testDt = t1 + halfDiffTd
-                    
-                    pi = Ephemeris.getPlanetaryInfo(planetName, testDt)
-                    
-                    testTropLongitudeSpeed = \
-                        pi.geocentric['tropical']['longitude_speed']
-                    testTropLongitude = pi.geocentric['tropical']['longitude']
-                    testSidLongitude = pi.geocentric['sidereal']['longitude']
-
-                    if testTropLongitudeSpeed >= 0.0:
-                        t2 = testDt
-                        
-                        # Update the curr values as the later boundary.
-                        currDt = t2
-                        currTropLongitudeSpeed = testTropLongitudeSpeed
-                        currTropLongitude = testTropLongitude
-                        currSidLongitude = testSidLongitude
-                    else:
-                        t1 = testDt
-
-                    currErrorTd = t2 - t1
-                        
-                # Broke out of while loop, meaning we have a timestamp
-                # within our threshold.
-                # Create a tuple to add to our list.
-                tup = (planetName,
-                       Ephemeris.datetimeToJulianDay(currDt),
-                       currDt,
-                       directStr,
-                       currTropLongitude,
-                       currSidLongitude)
-
-                # Append to the list.
-                rv.append(tup)
-                
-            elif prevTropLongitudeSpeed > 0.0 and currTropLongitudeSpeed <= 0.0:
-                # Crossed over from positive to negative!
-                log.debug("Crossed over from positive to negative!")
-                
-                # This is the upper-bound of the error timedelta.
-                t1 = prevDt
-                t2 = currDt
-                currErrorTd = t2 - t1
-                
-                # Refine the timestamp until it is less than the
-                # desired threshold.
-                while currErrorTd > maxErrorTd:
-                    log.debug("Refining between {} and {}".\
-                              format(Ephemeris.datetimeToStr(t1),
-                                     Ephemeris.datetimeToStr(t2)))
-                    
-                    # Check the timestamp between.
-                    diffTd = t2 - t1
-                    halfDiffTd = \
-                        datetime.\
-                        timedelta(days=(diffTd.days / 2.0),
-                                  seconds=(diffTd.seconds / 2.0),
-                                  microseconds=(diffTd.microseconds / 2.0))
-                    testDt = t1 + halfDiffTd
-                    
-                    pi = Ephemeris.getPlanetaryInfo(planetName, testDt)
-                    
-                    testTropLongitudeSpeed = \
-                        pi.geocentric['tropical']['longitude_speed']
-                    testTropLongitude = pi.geocentric['tropical']['longitude']
-                    testSidLongitude = pi.geocentric['sidereal']['longitude']
-
-                    if testTropLongitudeSpeed <= 0.0:
-                        t2 = testDt
-                        
-                        # Update the curr values as the later boundary.
-                        currDt = t2
-                        currTropLongitudeSpeed = testTropLongitudeSpeed
-                        currTropLongitude = testTropLongitude
-                        currSidLongitude = testSidLongitude
-                    else:
-                        t1 = testDt
-
-                    currErrorTd = t2 - t1
-                    
-                # Broke out of while loop, meaning we have a timestamp
-                # within our threshold.
-                # Create a tuple to add to our list.
-                tup = (planetName,
-                       Ephemeris.datetimeToJulianDay(currDt),
-                       currDt,
-                       retrogradeStr,
-                       currTropLongitude,
-                       currSidLongitude)
-
-                # Append to the list.
-                rv.append(tup)
-                
-            
-        # Increment currDt timestamp.
-        prevDt = currDt
-        currDt = currDt + stepSizeTd
-        
-        # Move the previous currTropLongitudeSpeed to prevTropLongitudeSpeed.
-        prevTropLongitudeSpeed = currTropLongitudeSpeed
-        currTropLongitudeSpeed = None
-        currTropLongitude = None
-        currSidLongitude = None
-
-        log.debug("prevTropLongitudeSpeed={}, currTropLongitudeSpeed={}".\
-                  format(prevTropLongitudeSpeed, currTropLongitudeSpeed))
+        if stationType == "direct":
+            retroOrDirect = directStr
+        else:
+            retroOrDirect = retrogradeStr
+
+        # Create a tuple to add to our list.
+        tup = (planetName,
+               Ephemeris.datetimeToJulianDay(dt),
+               dt,
+               retroOrDirect,
+               pi.geocentric['tropical']['longitude'],
+               pi.geocentric['sidereal']['longitude'])
+
+        # Append to the list.
+        rv.append(tup)
         
     return rv
 
@@ -376,6 +238,12 @@ if __name__ == "__main__":
                                     locationLatitude,
                                     locationElevation)
 
+    # Load the station index saved from an earlier run, if any.
+    if os.path.exists(stationIndexFilename):
+        stationIndex = StationIndex.load(stationIndexFilename)
+    if stationIndex == None or stationIndex.maxErrorTd > maxErrorTd:
+        stationIndex = StationIndex(maxErrorTd)
+
     # Dictionary of results computed.
     results = {}
     
@@ -437,6 +305,9 @@ if __name__ == "__main__":
         for line in outputLines:
             f.write(line + endl)
     
+    # Save the station index for the next run.
+    stationIndex.save(stationIndexFilename)
+
     log.info("Done.")
     shutdown(0)
 
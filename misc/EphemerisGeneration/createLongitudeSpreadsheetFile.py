@@ -744,7 +744,11 @@ while currDt < endDt:
     currPlanetaryInfosDict = {}
     
     for planetName in planetNames:
-        pi = Ephemeris.getPlanetaryInfo(planetName, currDt)
+        # Only calculate the fields for the centricity and zodiac used.
+        pi = Ephemeris.getPlanetaryInfoFields(planetName, currDt,
+                                              [centricityType],
+                                              [zodiacType],
+                                              ["ecliptical"])
         currPlanetaryInfosDict[planetName] = pi
     
     # Add text for a row in the table.
@@ -3,14 +3,10 @@
 # 
 # Description:
 # 
-#   Runs a server that is a Python multiprocessing Manager for managing task
-#   queues and result queues.  Accepts connections on a certain port from other
-#   multiprocessing clients that are either workers or taskers.  Work tasks
-#   submitted to the task queue by the tasker is pulled out and consumed by the
-#   workers.  When the worker completes the task, the worker puts the result
-#   that is computed for the task onto the result queue.  The tasker can then
-#   pull results from the result queue.  There can be many workers in this
-#   model.
+#   Runs a client tasker that connects to a remote LookbackMultipleJobServer,
+#   submits a job of LookbackMultiple calculations, and waits for the results
+#   computed by the workers.  This is an example test implementation that
+#   times how long the distributed calculations take.
 #   
 # Usage:
 #   
@@ -42,10 +38,6 @@ from optparse import OptionParser
 # For timing the calculations.
 import time
 
-# For multiprocessing features.
-from multiprocessing.managers import BaseManager
-from multiprocessing import JoinableQueue
-
 # Include some PriceChartingTool modules.
 # This assumes that the relative directory from this script is: ../../src
 thisScriptDir = os.path.dirname(os.path.abspath(__file__))
@@ -53,7 +45,8 @@ srcDir = os.path.dirname(os.path.dirname(thisScriptDir)) + os.sep + "src"
 if srcDir not in sys.path:
     sys.path.insert(0, srcDir)
 
-#from lookbackmultiple_parallel import LookbackMultipleParallel
+# For submitting distributed LookbackMultiple calculations.
+from lookbackmultiple_distributed import LookbackMultipleJobClient
 
 ##############################################################################
 
@@ -107,37 +100,29 @@ signal.signal(signal.SIGINT, signal_SIGINT_handler)
 
 ##############################################################################
 
-class QueueManager(BaseManager):
-    pass
-
 def runClientTasker():
     global serverAddress
     global serverPort
     global serverAuthKey
 
-    # Connect to a manager server and access its queues.
-
-    QueueManager.register("getTaskQueue", callable=lambda: taskQueue)
-    QueueManager.register("getResultQueue", callable=lambda: resultQueue)
-    
-    manager = QueueManager(address=(serverAddress, serverPort), 
-                           authkey=serverAuthKey)
-    manager.connect()
+    # Connect to the job server.
+    client = LookbackMultipleJobClient((serverAddress, serverPort), 
+                                       serverAuthKey)
     
     log.info("LookbackMultiple client tasker connected to {}:{}".\
              format(serverAddress, serverPort))
     
-    taskQueue = manager.getTaskQueue()
-    resultQueue = manager.getResultQueue()
-    
     log.info("LookbackMultiple client tasker now creating tasks ...")
     
-    speedTestDistributedParallel(taskQueue, resultQueue)
+    try:
+        speedTestDistributedParallel(client)
+    finally:
+        client.close()
     
     log.info("LookbackMultiple client tasker is done.")
 
 
-def speedTestDistributedParallel(taskQueue, resultQueue):
+def speedTestDistributedParallel(client):
     """Tests to see how long it takes to do some distributed
     computations in parallel.
     """
@@ -174,13 +159,7 @@ def speedTestDistributedParallel(taskQueue, resultQueue):
             #desiredDeltaDegrees = 360 * 360
             desiredDeltaDegrees = 360 * ((i+1) * 37)
 
-            methodToRun = "getDatetimesOfLongitudeDeltaDegreesInFuture"
-            #methodToRun = "getDatetimesOfLongitudeDeltaDegreesInPast"
-            taskId = i
-
-            args = (methodToRun,
-                    taskId,
-                    planetName, 
+            args = (planetName, 
                     centricityType, 
                     longitudeType, 
                     referenceDt, 
@@ -192,91 +171,35 @@ def speedTestDistributedParallel(taskQueue, resultQueue):
             
             argsTupleList.append(args)
 
-        # Submit tasks.
-        log.info("Submitting {} tasks ...".format(len(argsTupleList)))
-        for argsTuple in argsTupleList:
-            
-            log.debug("About to submit argsTuple: {}".\
-                      format(argsTuple))
-            taskQueue.put(argsTuple)
+        methodToRun = "getDatetimesOfLongitudeDeltaDegreesInFuture"
+        #methodToRun = "getDatetimesOfLongitudeDeltaDegreesInPast"
 
-        log.info("Submitting {} tasks completed.".\
-                  format(len(argsTupleList)))
-            
-        # Block, waiting for all the tasks to complete.
-        log.info("Waiting for all tasks to complete ...")
+        # Submit the tasks and block, waiting for all of them to complete.
+        log.info("Submitting {} tasks and waiting for them to complete ...".\
+                 format(len(argsTupleList)))
+
+        resultsList = client.getDatetimes(methodToRun, argsTupleList)
 
-        taskQueue.join()
+        if len(resultsList) != len(argsTupleList):
+            log.error("The distributed job did not complete.")
+            return
 
-        #log.debug("Tasks completed.  Now analyzing results ...")
         log.info("Now analyzing results ...")
         
-        resultCount = 0
-        while resultCount < len(argsTupleList):
-
-            # Get a result.
-            (argsTuple, resultDts) = resultQueue.get()
-
-            argIndex = 0
-            methodToRun = argsTuple[argIndex]
-            argIndex += 1
-            taskId = argsTuple[argIndex]
-            argIndex += 1
-            planetName = argsTuple[argIndex]
-            argIndex += 1
-            centricityType = argsTuple[argIndex]
-            argIndex += 1
-            longitudeType = argsTuple[argIndex]
-            argIndex += 1
-            referenceDt = argsTuple[argIndex]
-            argIndex += 1
-            desiredDeltaDegrees = argsTuple[argIndex]
-            argIndex += 1
-            maxErrorTd = argsTuple[argIndex]
-            argIndex += 1
-            locationLongitudeDegrees = argsTuple[argIndex]
-            argIndex += 1
-            locationLatitudeDegrees = argsTuple[argIndex]
-            argIndex += 1
-            locationElevationMeters = argsTuple[argIndex]
-            argIndex += 1
-            
-            endl = os.linesep
-
-            argsTupleStr = \
-                "methodToRun == {}".format(methodToRun) + endl + \
-                "taskId == {}".format(taskId) + endl + \
-                "planetName == {}".format(planetName) + endl + \
-                "centricityType == {}".format(centricityType) + endl + \
-                "longitudeType == {}".format(longitudeType) + endl + \
-                "referenceDt == {}".format(referenceDt) + endl + \
-                "desiredDeltaDegrees == {}".\
-                format(desiredDeltaDegrees) + endl + \
-                "maxErrorTd == {}".format(maxErrorTd) + endl + \
-                "locationLongitudeDegrees == {}".\
-                format(locationLongitudeDegrees) + endl + \
-                "locationLatitudeDegrees == {}".\
-                format(locationLatitudeDegrees) + endl + \
-                "locationElevationMeters == {}".\
-                format(locationElevationMeters)
-
-
+        for taskId in range(len(argsTupleList)):
+            argsTuple = argsTupleList[taskId]
+            resultDts = resultsList[taskId]
 
             log.debug("Obtained result: " + \
+                      "taskId == {}, ".format(taskId) + 
                       "argsTuple == {}, ".format(argsTuple) + 
                       "len(resultDts) == {}".format(len(resultDts)))
             for i in range(len(resultDts)):
                 dt = resultDts[i]
                 log.debug("  resultDts[{}] == {}".format(i, dt))
 
-            # Notify that the consumption of this result is complete.
-            resultQueue.task_done()
-
-            resultCount += 1
-            log.info("We have consumed {} total results now.".\
-                      format(resultCount))
-     
-        log.info("Done consuming all tasks submitted.") 
+        log.info("Done consuming all {} tasks submitted.".\
+                 format(len(resultsList))) 
         endTime = time.time()
 
         log.info("  Calculations in distributed parallel took: {} sec".\
@@ -3,12 +3,12 @@
 # 
 # Description:
 # 
-#   Runs a client worker that connects to a remote Python multiprocessing
-#   Manager server for getting tasks and generating results.  
+#   Runs a client worker that connects to a remote LookbackMultipleJobServer
+#   for getting tasks and generating results.  
 # 
-#   Work tasks are obtained from the task queue on the Manager server.  When
-#   the worker completes a task, the worker puts the result that is computed
-#   for the task onto the result queue on the Manager server.  
+#   Batches of tasks are leased from the server a few at a time, and
+#   heartbeats are sent to the server while they are calculated.  When the
+#   worker completes the batches, the worker sends the results to the server.
 # 
 #   This worker client runs forever, until the user either does Ctrl-C or sends
 #   a SIGINT signal to the process.
@@ -40,10 +40,6 @@ import signal
 # For parsing command-line options.
 from optparse import OptionParser  
 
-# For multiprocessing features.
-from multiprocessing.managers import BaseManager
-from multiprocessing import JoinableQueue
-
 # Include some PriceChartingTool modules.
 # This assumes that the relative directory from this script is: ../../src
 thisScriptDir = os.path.dirname(os.path.abspath(__file__))
@@ -52,7 +48,10 @@ if srcDir not in sys.path:
     sys.path.insert(0, srcDir)
 
 # For doing LookbackMultiple calculations.
-from lookbackmultiple_calc import LookbackMultipleUtils
+from lookbackmultiple_distributed import LookbackMultipleJobWorker
+
+# For the location of the ephemeris data files.
+from ephemeris import Ephemeris
 
 ##############################################################################
 
@@ -106,119 +105,30 @@ signal.signal(signal.SIGINT, signal_SIGINT_handler)
 
 ##############################################################################
 
-class QueueManager(BaseManager):
-    pass
-
-
 def runClientWorker():
     """Runs the client that does work, processing tasks.
-    Tasks are obtained from task queue on the Manager server.
-    Completed results are placed on the result queue on the Manager server.
+    Batches of tasks are leased from the LookbackMultipleJobServer.
+    Completed results are sent back to the server.
 
-    This method should run forever until the user presses Ctrl-C or
-    SIGINT is sent to the process.
+    This method should run until the user presses Ctrl-C or SIGINT is
+    sent to the process, or until the connection to the server is lost.
     """
     global serverAddress
     global serverPort
     global serverAuthKey
 
-    # Connect to a manager server and access its queues.
-
-    QueueManager.register("getTaskQueue", callable=lambda: taskQueue)
-    QueueManager.register("getResultQueue", callable=lambda: resultQueue)
+    # The ephemeris data files are relative to the src directory, not
+    # to this script.
+    Ephemeris.SWISS_EPHEMERIS_DATA_DIR = \
+        os.path.abspath(os.path.join(srcDir, "../data/ephe"))
     
-    manager = QueueManager(address=(serverAddress, serverPort), 
-                           authkey=serverAuthKey)
-    manager.connect()
+    worker = LookbackMultipleJobWorker((serverAddress, serverPort),
+                                       serverAuthKey)
     
     log.info("LookbackMultiple client worker connected to {}:{}".\
              format(serverAddress, serverPort))
     
-    taskQueue = manager.getTaskQueue()
-    resultQueue = manager.getResultQueue()
-    
-    log.info("LookbackMultiple client worker now processing taskQueue ...")
-    
-    # Process the queues.
-    while True:
-        argsTuple = taskQueue.get() # If queue is empty, then this will block.
-        
-        log.debug("Obtained a task.  argsTuple == {}".format(argsTuple))
-
-        # Do computation.
-        argIndex = 0
-        methodToRun = argsTuple[argIndex]
-        argIndex += 1
-        taskId = argsTuple[argIndex]
-        argIndex += 1
-        planetName = argsTuple[argIndex]
-        argIndex += 1
-        centricityType = argsTuple[argIndex]
-        argIndex += 1
-        longitudeType = argsTuple[argIndex]
-        argIndex += 1
-        referenceDt = argsTuple[argIndex]
-        argIndex += 1
-        desiredDeltaDegrees = argsTuple[argIndex]
-        argIndex += 1
-        maxErrorTd = argsTuple[argIndex]
-        argIndex += 1
-        locationLongitudeDegrees = argsTuple[argIndex]
-        argIndex += 1
-        locationLatitudeDegrees = argsTuple[argIndex]
-        argIndex += 1
-        locationElevationMeters = argsTuple[argIndex]
-        argIndex += 1
-            
-
-        LookbackMultipleUtils.\
-            initializeEphemeris(locationLongitudeDegrees, 
-                                locationLatitudeDegrees,
-                                locationElevationMeters)
-    
-        if methodToRun == "getDatetimesOfLongitudeDeltaDegreesInFuture":
-
-            resultDts = \
-                LookbackMultipleUtils.\
-                getDatetimesOfLongitudeDeltaDegreesInFuture(\
-                    planetName, 
-                    centricityType,
-                    longitudeType,
-                    referenceDt,
-                    desiredDeltaDegrees,
-                    maxErrorTd)
-                
-            log.debug("len(resultDts) == {}".format(len(resultDts)))
-
-            result = (argsTuple, resultDts)
-                
-            resultQueue.put(result)
-                
-            taskQueue.task_done()
-
-            log.debug("Task done.")
-
-        elif methodToRun == "getDatetimesOfLongitudeDeltaDegreesInPast":
-
-            resultDts = \
-                LookbackMultipleUtils.\
-                getDatetimesOfLongitudeDeltaDegreesInPast(\
-                    planetName, 
-                    centricityType,
-                    longitudeType,
-                    referenceDt,
-                    desiredDeltaDegrees,
-                    maxErrorTd)
-
-            log.debug("len(resultDts) == {}".format(len(resultDts)))
-
-            result = (argsTuple, resultDts)
-                
-            resultQueue.put(result)
-            
-            taskQueue.task_done()
-
-            log.debug("Task done.")
+    worker.run()
 
 ##############################################################################
 
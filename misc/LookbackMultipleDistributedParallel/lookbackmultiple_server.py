@@ -3,14 +3,13 @@
 # 
 # Description:
 # 
-#   Runs a server that is a Python multiprocessing Manager for managing task
-#   queues and result queues.  Accepts connections on a certain port from other
-#   multiprocessing clients that are either workers or taskers.  Work tasks
-#   submitted to the task queue by the tasker is pulled out and consumed by the
-#   workers.  When the worker completes the task, the worker puts the result
-#   that is computed for the task onto the result queue.  The tasker can then
-#   pull results from the result queue.  There can be many workers in this
-#   model.
+#   Runs a LookbackMultipleJobServer.  Accepts connections on a certain port
+#   from clients that are either workers or taskers.  Taskers submit jobs made
+#   of batches of LookbackMultiple calculations.  Workers lease a few batches
+#   at a time, keep their leases alive with heartbeats, and send back the
+#   results, which the tasker then collects.  Batches of workers that are lost
+#   or stop sending heartbeats are re-queued for other workers.  There can be
+#   many workers in this model.
 #   
 #   This server runs forever, until the user either does Ctrl-C or sends a
 #   SIGINT signal to the process.
@@ -42,10 +41,6 @@ import signal
 # For parsing command-line options.
 from optparse import OptionParser  
 
-# For multiprocessing features.
-from multiprocessing.managers import BaseManager
-from multiprocessing import JoinableQueue
-
 # Include some PriceChartingTool modules.
 # This assumes that the relative directory from this script is: ../../src
 thisScriptDir = os.path.dirname(os.path.abspath(__file__))
@@ -53,7 +48,8 @@ srcDir = os.path.dirname(os.path.dirname(thisScriptDir)) + os.sep + "src"
 if srcDir not in sys.path:
     sys.path.insert(0, srcDir)
 
-#from lookbackmultiple_parallel import LookbackMultipleParallel
+# For the server of the distributed LookbackMultiple calculations.
+from lookbackmultiple_distributed import LookbackMultipleJobServer
 
 ##############################################################################
 
@@ -77,6 +73,10 @@ serverPort = None
 # by converting from str to bytes.
 serverAuthKey = b""
 
+# Number of seconds a lease of batches stays valid without a heartbeat
+# from the worker (float).
+# This value is obtained via command-line parameter.
+leaseTimeoutSeconds = 30.0
 
 # For logging.
 #logLevel = logging.DEBUG
@@ -107,13 +107,8 @@ signal.signal(signal.SIGINT, signal_SIGINT_handler)
 
 ##############################################################################
 
-class QueueManager(BaseManager):
-    pass
-
-
 def runServer():
-    """Runs the server that is a multiprocessing Manager.
-    This server manages task and result queues.
+    """Runs the LookbackMultipleJobServer.
 
     This method should run forever until the user presses Ctrl-C or
     SIGINT is sent to the process.
@@ -121,24 +116,16 @@ def runServer():
     global serverAddress
     global serverPort
     global serverAuthKey
+    global leaseTimeoutSeconds
 
-    # Start a shared manager server and access its queues.
-
-    taskQueue = JoinableQueue()
-    resultQueue = JoinableQueue()
-
-    QueueManager.register("getTaskQueue", callable=lambda: taskQueue)
-    QueueManager.register("getResultQueue", callable=lambda: resultQueue)
-    
-    manager = QueueManager(address=(serverAddress, serverPort), 
-                              authkey=serverAuthKey)
-    
-    server = manager.get_server()
+    server = LookbackMultipleJobServer((serverAddress, serverPort),
+                                       serverAuthKey,
+                                       leaseTimeoutSeconds)
 
     log.info("LookbackMultiple server starting on address {} and port {}".\
              format(serverAddress, serverPort))
 
-    server.serve_forever()
+    server.serveForever()
     
 ##############################################################################
 
@@ -183,6 +170,16 @@ if __name__=="__main__":
                        "Example: 'passphrase'.  ",
                   metavar="<PASSWORD>")
 
+    parser.add_option("--lease-timeout",
+                  action="store",
+                  type="float",
+                  dest="leaseTimeoutSeconds",
+                  default=30.0,
+                  help="Specify the number of seconds a lease of " + \
+                       "batches stays valid without a heartbeat from " + \
+                       "the worker.  Default: 30.",
+                  metavar="<SECONDS>")
+
     # Parse the arguments into options.
     (options, args) = parser.parse_args()
      
@@ -219,6 +216,9 @@ if __name__=="__main__":
         serverAuthKey = options.serverAuthKey.encode("utf-8")
         log.debug("serverAuthKey == {}".format(serverAuthKey))
 
+    leaseTimeoutSeconds = options.leaseTimeoutSeconds
+    log.debug("leaseTimeoutSeconds == {}".format(leaseTimeoutSeconds))
+
     # Run the server.  
     #
     # This method should run forever until the user presses Ctrl-C or SIGINT is
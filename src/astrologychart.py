@@ -7178,6 +7178,10 @@ class AstrologyChartWidget(QWidget):
         # Astrological house system for getting the house cusps.
         houseSystem = Ephemeris.HouseSys['Porphyry']
 
+        # House cusps and ascmc planets are all calculated together.
+        housePlanetaryInfos = \
+            Ephemeris.getAllHousePlanetaryInfos(dt, houseSystem)
+
         settings = QSettings()
         
         if settings.value(\
@@ -7186,126 +7190,126 @@ class AstrologyChartWidget(QWidget):
             type=bool):
 
             self.log.debug("Getting house 1 values...")
-            planets.append(Ephemeris.getH1PlanetaryInfo(dt, houseSystem))
+            planets.append(housePlanetaryInfos["H1"])
         
         if settings.value(\
             SettingsKeys.planetH2CalculationsEnabledKey, \
             SettingsKeys.planetH2CalculationsEnabledDefValue,
             type=bool):
 
-            planets.append(Ephemeris.getH2PlanetaryInfo(dt, houseSystem))
+            planets.append(housePlanetaryInfos["H2"])
         
         if settings.value(\
             SettingsKeys.planetH3CalculationsEnabledKey, \
             SettingsKeys.planetH3CalculationsEnabledDefValue,
             type=bool):
 
-            planets.append(Ephemeris.getH3PlanetaryInfo(dt, houseSystem))
+            planets.append(housePlanetaryInfos["H3"])
 
         if settings.value(\
             SettingsKeys.planetH4CalculationsEnabledKey, \
             SettingsKeys.planetH4CalculationsEnabledDefValue,
             type=bool):
 
-            planets.append(Ephemeris.getH4PlanetaryInfo(dt, houseSystem))
+            planets.append(housePlanetaryInfos["H4"])
         
         if settings.value(\
             SettingsKeys.planetH5CalculationsEnabledKey, \
             SettingsKeys.planetH5CalculationsEnabledDefValue,
             type=bool):
 
-            planets.append(Ephemeris.getH5PlanetaryInfo(dt, houseSystem))
+            planets.append(housePlanetaryInfos["H5"])
         
         if settings.value(\
             SettingsKeys.planetH6CalculationsEnabledKey, \
             SettingsKeys.planetH6CalculationsEnabledDefValue,
             type=bool):
 
-            planets.append(Ephemeris.getH6PlanetaryInfo(dt, houseSystem))
+            planets.append(housePlanetaryInfos["H6"])
         
         if settings.value(\
             SettingsKeys.planetH7CalculationsEnabledKey, \
             SettingsKeys.planetH7CalculationsEnabledDefValue,
             type=bool):
 
-            planets.append(Ephemeris.getH7PlanetaryInfo(dt, houseSystem))
+            planets.append(housePlanetaryInfos["H7"])
         
         if settings.value(\
             SettingsKeys.planetH8CalculationsEnabledKey, \
             SettingsKeys.planetH8CalculationsEnabledDefValue,
             type=bool):
 
-            planets.append(Ephemeris.getH8PlanetaryInfo(dt, houseSystem))
+            planets.append(housePlanetaryInfos["H8"])
         
         if settings.value(\
             SettingsKeys.planetH9CalculationsEnabledKey, \
             SettingsKeys.planetH9CalculationsEnabledDefValue,
             type=bool):
 
-            planets.append(Ephemeris.getH9PlanetaryInfo(dt, houseSystem))
+            planets.append(housePlanetaryInfos["H9"])
         
         if settings.value(\
             SettingsKeys.planetH10CalculationsEnabledKey, \
             SettingsKeys.planetH10CalculationsEnabledDefValue,
             type=bool):
 
-            planets.append(Ephemeris.getH10PlanetaryInfo(dt, houseSystem))
+            planets.append(housePlanetaryInfos["H10"])
         
         if settings.value(\
             SettingsKeys.planetH11CalculationsEnabledKey, \
             SettingsKeys.planetH11CalculationsEnabledDefValue,
             type=bool):
 
-            planets.append(Ephemeris.getH11PlanetaryInfo(dt, houseSystem))
+            planets.append(housePlanetaryInfos["H11"])
         
         if settings.value(\
             SettingsKeys.planetH12CalculationsEnabledKey, \
             SettingsKeys.planetH12CalculationsEnabledDefValue,
             type=bool):
 
-            planets.append(Ephemeris.getH12PlanetaryInfo(dt, houseSystem))
+            planets.append(housePlanetaryInfos["H12"])
         
         if settings.value(\
             SettingsKeys.planetARMCCalculationsEnabledKey, \
             SettingsKeys.planetARMCCalculationsEnabledDefValue,
             type=bool):
 
-            planets.append(Ephemeris.getARMCPlanetaryInfo(dt, houseSystem))
+            planets.append(housePlanetaryInfos["ARMC"])
         
         if settings.value(\
             SettingsKeys.planetVertexCalculationsEnabledKey, \
             SettingsKeys.planetVertexCalculationsEnabledDefValue,
             type=bool):
 
-            planets.append(Ephemeris.getVertexPlanetaryInfo(dt, houseSystem))
+            planets.append(housePlanetaryInfos["Vertex"])
         
         if settings.value(\
             SettingsKeys.planetEquatorialAscendantCalculationsEnabledKey, \
             SettingsKeys.planetEquatorialAscendantCalculationsEnabledDefValue,
             type=bool):
 
-            planets.append(Ephemeris.getEquatorialAscendantPlanetaryInfo(dt, houseSystem))
+            planets.append(housePlanetaryInfos["EquatorialAscendant"])
         
         if settings.value(\
             SettingsKeys.planetCoAscendant1CalculationsEnabledKey, \
             SettingsKeys.planetCoAscendant1CalculationsEnabledDefValue,
             type=bool):
 
-            planets.append(Ephemeris.getCoAscendant1PlanetaryInfo(dt, houseSystem))
+            planets.append(housePlanetaryInfos["CoAscendant1"])
         
         if settings.value(\
             SettingsKeys.planetCoAscendant2CalculationsEnabledKey, \
             SettingsKeys.planetCoAscendant2CalculationsEnabledDefValue,
             type=bool):
 
-            planets.append(Ephemeris.getCoAscendant2PlanetaryInfo(dt, houseSystem))
+            planets.append(housePlanetaryInfos["CoAscendant2"])
         
         if settings.value(\
             SettingsKeys.planetPolarAscendantCalculationsEnabledKey, \
             SettingsKeys.planetPolarAscendantCalculationsEnabledDefValue,
             type=bool):
 
-            planets.append(Ephemeris.getPolarAscendantPlanetaryInfo(dt, houseSystem))
+            planets.append(housePlanetaryInfos["PolarAscendant"])
         
         if settings.value(\
             SettingsKeys.planetHoraLagnaCalculationsEnabledKey, \
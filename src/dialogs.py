@@ -1485,6 +1485,10 @@ class AppPreferencesEditWidget(QWidget):
             connect(self._handleBarCountGraphicsItemColorResetButtonClicked)
         self.barCountGraphicsItemTextColorResetButton.clicked.\
             connect(self._handleBarCountGraphicsItemTextColorResetButtonClicked)
+        self.priceBarChartItemIndexingEnabledResetButton.clicked.\
+            connect(self._handlePriceBarChartItemIndexingEnabledResetButtonClicked)
+        self.priceBarChartPriceSeriesItemEnabledResetButton.clicked.\
+            connect(self._handlePriceBarChartPriceSeriesItemEnabledResetButtonClicked)
 
         # Button at bottom to reset to defaults.
         self.priceBarResetAllToDefaultButton.clicked.\
@@ -1561,6 +1565,20 @@ class AppPreferencesEditWidget(QWidget):
         self.barCountGraphicsItemTextColorEditButton = ColorEditPushButton()
         self.barCountGraphicsItemTextColorResetButton = \
             QPushButton("Reset to default")
+
+        # PriceBarChart item indexing enabled (bool).
+        self.priceBarChartItemIndexingEnabledLabel = \
+            QLabel("Index items for faster painting and hovering:")
+        self.priceBarChartItemIndexingEnabledCheckBox = QCheckBox()
+        self.priceBarChartItemIndexingEnabledResetButton = \
+            QPushButton("Reset to default")
+
+        # PriceBarChart price series item enabled (bool).
+        self.priceBarChartPriceSeriesItemEnabledLabel = \
+            QLabel("Draw all PriceBars as one item for faster loading:")
+        self.priceBarChartPriceSeriesItemEnabledCheckBox = QCheckBox()
+        self.priceBarChartPriceSeriesItemEnabledResetButton = \
+            QPushButton("Reset to default")
         
         # Button for resetting all the above edit widgets.
         self.priceBarResetAllToDefaultButton = \
@@ -1612,6 +1630,21 @@ class AppPreferencesEditWidget(QWidget):
         gridLayout.\
             addWidget(self.barCountGraphicsItemTextColorResetButton, r, 2, ar)
         r += 1
+        gridLayout.\
+            addWidget(self.priceBarChartItemIndexingEnabledLabel, r, 0, al)
+        gridLayout.\
+            addWidget(self.priceBarChartItemIndexingEnabledCheckBox, r, 1, ar)
+        gridLayout.\
+            addWidget(self.priceBarChartItemIndexingEnabledResetButton, r, 2, ar)
+        r += 1
+        gridLayout.\
+            addWidget(self.priceBarChartPriceSeriesItemEnabledLabel, r, 0, al)
+        gridLayout.\
+            addWidget(self.priceBarChartPriceSeriesItemEnabledCheckBox, r, 1, ar)
+        gridLayout.\
+            addWidget(self.priceBarChartPriceSeriesItemEnabledResetButton,
+                      r, 2, ar)
+        r += 1
 
         # Label to tell the user that not all settings will be applied
         # on existing windows when the 'Okay' button is pressed.
@@ -10851,6 +10884,30 @@ class AppPreferencesEditWidget(QWidget):
             type=QColor)
         self.barCountGraphicsItemTextColorEditButton.setColor(value)
 
+        # PriceBarChart item indexing enabled (bool).
+        key = SettingsKeys.priceBarChartItemIndexingEnabledSettingsKey
+        value = settings.value(key, \
+            SettingsKeys.priceBarChartItemIndexingEnabledSettingsDefValue,
+            type=bool)
+        if value == True:
+            self.priceBarChartItemIndexingEnabledCheckBox.\
+                setCheckState(Qt.Checked)
+        else:
+            self.priceBarChartItemIndexingEnabledCheckBox.\
+                setCheckState(Qt.Unchecked)
+
+        # PriceBarChart price series item enabled (bool).
+        key = SettingsKeys.priceBarChartPriceSeriesItemEnabledSettingsKey
+        value = settings.value(key, \
+            SettingsKeys.priceBarChartPriceSeriesItemEnabledSettingsDefValue,
+            type=bool)
+        if value == True:
+            self.priceBarChartPriceSeriesItemEnabledCheckBox.\
+                setCheckState(Qt.Checked)
+        else:
+            self.priceBarChartPriceSeriesItemEnabledCheckBox.\
+                setCheckState(Qt.Unchecked)
+
 
     def _lookbackMultipleLoadValuesFromSettings(self):
         """Loads the widgets with values from the QSettings object.
@@ -19534,6 +19591,30 @@ class AppPreferencesEditWidget(QWidget):
         else:
             settings.setValue(key, newValue)
 
+        # PriceBarChart item indexing enabled (bool).
+        key = SettingsKeys.priceBarChartItemIndexingEnabledSettingsKey
+        newValue = \
+            self.priceBarChartItemIndexingEnabledCheckBox.\
+            checkState() == Qt.Checked
+        if settings.contains(key):
+            oldValue = settings.value(key, type=bool)
+            if oldValue != newValue:
+                settings.setValue(key, newValue)
+        else:
+            settings.setValue(key, newValue)
+
+        # PriceBarChart price series item enabled (bool).
+        key = SettingsKeys.priceBarChartPriceSeriesItemEnabledSettingsKey
+        newValue = \
+            self.priceBarChartPriceSeriesItemEnabledCheckBox.\
+            checkState() == Qt.Checked
+        if settings.contains(key):
+            oldValue = settings.value(key, type=bool)
+            if oldValue != newValue:
+                settings.setValue(key, newValue)
+        else:
+            settings.setValue(key, newValue)
+
 
         # Explicitly sync.
         settings.sync()
@@ -31892,6 +31973,34 @@ class AppPreferencesEditWidget(QWidget):
         value = SettingsKeys.barCountGraphicsItemTextColorSettingsDefValue
         self.barCountGraphicsItemTextColorEditButton.setColor(value)
 
+    def _handlePriceBarChartItemIndexingEnabledResetButtonClicked(self):
+        """Called when the priceBarChartItemIndexingEnabledResetButton
+        is clicked.  Resets the widget value to the default value.
+        """
+
+        value = \
+            bool(SettingsKeys.priceBarChartItemIndexingEnabledSettingsDefValue)
+        if value == True:
+            self.priceBarChartItemIndexingEnabledCheckBox.\
+                setCheckState(Qt.Checked)
+        else:
+            self.priceBarChartItemIndexingEnabledCheckBox.\
+                setCheckState(Qt.Unchecked)
+
+    def _handlePriceBarChartPriceSeriesItemEnabledResetButtonClicked(self):
+        """Called when the priceBarChartPriceSeriesItemEnabledResetButton
+        is clicked.  Resets the widget value to the default value.
+        """
+
+        value = \
+            bool(SettingsKeys.priceBarChartPriceSeriesItemEnabledSettingsDefValue)
+        if value == True:
+            self.priceBarChartPriceSeriesItemEnabledCheckBox.\
+                setCheckState(Qt.Checked)
+        else:
+            self.priceBarChartPriceSeriesItemEnabledCheckBox.\
+                setCheckState(Qt.Unchecked)
+
     def _handlePriceBarResetAllToDefaultButtonClicked(self):
         """Called when the priceBarResetAllToDefaultButton is clicked for
         the PriceBar settings.  Resets the all the widget values in this
@@ -31903,6 +32012,8 @@ class AppPreferencesEditWidget(QWidget):
         self._handleLowerPriceBarColorResetButtonClicked()
         self._handleBarCountGraphicsItemColorResetButtonClicked()
         self._handleBarCountGraphicsItemTextColorResetButtonClicked()
+        self._handlePriceBarChartItemIndexingEnabledResetButtonClicked()
+        self._handlePriceBarChartPriceSeriesItemEnabledResetButtonClicked()
 
 
     def _handleLookbackMultipleResetAllToDefaultButtonClicked(self):
@@ -7,6 +7,20 @@ import inspect
 # For copy.deepcopy()
 import copy
 
+# For compact arrays of floats.
+import array
+
+# For the PlanetaryInfo LRU cache.
+import collections
+
+# For binary searches in sorted lists.
+import bisect
+import pickle
+
+# For per-thread calculation state.
+import threading
+import contextlib
+
 # For datetimes
 import datetime
 
@@ -210,6 +224,537 @@ class PlanetaryInfo:
         return returnStr
 
 
+class EphemerisInterpolationCache:
+    """Class that holds precomputed Chebyshev approximations of the
+    values returned by the Swiss Ephemeris calc_ut() call, so that
+    positions at nearby timestamps can be obtained by evaluating a
+    small polynomial instead of calling the Swiss Ephemeris.
+
+    The approximations are stored per (planet id, calculation flag)
+    pair, as a list of contiguous time segments.  Each segment holds
+    one polynomial for each of the 6 values returned by calc_ut().
+    Segments are split in half until every value matches the Swiss
+    Ephemeris to within 'maxError' (in the units of the value, i.e.
+    degrees, degrees/day, AU, AU/day) at the checked points.
+
+    Instances are normally created and installed via
+    Ephemeris.createInterpolationCache() and
+    Ephemeris.setInterpolationCache().  Once installed, Ephemeris.calc_ut()
+    will use the cache for any timestamp and flag it covers, and fall
+    back to the Swiss Ephemeris otherwise.
+
+    Example:
+
+    startDt = datetime.datetime(1950, 1, 1, tzinfo=pytz.utc)
+    endDt = datetime.datetime(2050, 1, 1, tzinfo=pytz.utc)
+    cache = Ephemeris.createInterpolationCache(["Sun", "Moon"],
+                                               startDt, endDt)
+    cache.save("/tmp/ephemeris.cache")
+    ...
+    cache = EphemerisInterpolationCache.load("/tmp/ephemeris.cache")
+    Ephemeris.setInterpolationCache(cache)
+    """
+
+    # Version of the file format written by save().
+    # This should be incremented whenever the layout of the pickled
+    # data changes.
+    FILE_FORMAT_VERSION = 1
+
+    # Logger object for this class.
+    log = logging.getLogger("ephemeris.EphemerisInterpolationCache")
+
+    def __init__(self,
+                 maxError=0.00001,
+                 degree=7,
+                 segmentDays=4.0,
+                 minSegmentDays=(1.0 / 1440.0)):
+        """Initializes an empty cache.
+
+        Parameters:
+        maxError       - float value for the maximum allowed error of
+                         each interpolated value, in the units of
+                         that value.
+        degree         - int degree of the polynomials used.
+        segmentDays    - float value for the initial segment length,
+                         in days.  Segments are split in half until
+                         'maxError' is satisfied.
+        minSegmentDays - float value for the smallest segment length
+                         allowed, in days.  Segments of this length
+                         are kept even if 'maxError' is not satisfied.
+        """
+
+        self.maxError = maxError
+        self.degree = degree
+        self.segmentDays = segmentDays
+        self.minSegmentDays = minSegmentDays
+
+        # Dictionary mapping (planetId, flag) to a tuple:
+        # (startJds, segments, angleIndex)
+        #
+        # startJds is a sorted list of the start Julian Days of the
+        # segments, and segments is the list of segment tuples:
+        # (startJd, endJd, midJd, halfWidth, polynomials)
+        #
+        # 'polynomials' is a tuple of 6 tuples of polynomial
+        # coefficients in x = (jd - midJd) / halfWidth, with the
+        # highest power first.
+        #
+        # angleIndex is the index of the value that is an angle in
+        # [0, 360) and must be normalized after evaluation, or None.
+        self.tables = {}
+
+    def isEmpty(self):
+        """Returns True if the cache holds no segments."""
+
+        return len(self.tables) == 0
+
+    def contains(self, planetId, flag, jd):
+        """Returns True if the cache has a segment covering the given
+        planet id, calculation flag and Julian Day.
+        """
+
+        return self.__findSegment(planetId, flag, jd) != None
+
+    def evaluate(self, planetId, flag, jd):
+        """Returns the interpolated values for the given planet id,
+        calculation flag and Julian Day (UT).
+
+        Returns:
+        tuple of 6 floats in the same format as returned by
+        swe.calc_ut(), or None if the cache does not cover the
+        requested values.
+        """
+
+        key = (planetId, flag)
+        table = self.tables.get(key)
+        if table == None:
+            return None
+
+        (startJds, segments, angleIndex) = table
+        
+        i = bisect.bisect_right(startJds, jd) - 1
+        if i < 0:
+            return None
+
+        (startJd, endJd, midJd, halfWidth, polynomials) = segments[i]
+        if jd > endJd:
+            return None
+
+        x = (jd - midJd) / halfWidth
+
+        values = []
+        for coefficients in polynomials:
+            value = 0.0
+            for c in coefficients:
+                value = value * x + c
+            values.append(value)
+
+        if angleIndex != None:
+            values[angleIndex] %= 360.0
+            
+        return tuple(values)
+
+    def addRange(self, planetId, flag, startJd, endJd):
+        """Builds segments for the given planet id and calculation flag,
+        covering the Julian Days from 'startJd' to 'endJd', and adds
+        them to the cache.  The Swiss Ephemeris calculations are done
+        with swe.calc_ut(), so any global Swiss Ephemeris settings
+        (e.g. the sidereal mode) must already be set up.
+
+        Parameters:
+        planetId - int Swiss Ephemeris planet id.
+        flag     - int calculation flag, as passed to swe.calc_ut().
+        startJd  - float Julian Day (UT) of the start of the range.
+        endJd    - float Julian Day (UT) of the end of the range.
+        """
+
+        if endJd <= startJd:
+            self.log.error("addRange(): endJd must be after startJd.")
+            return
+
+        # Longitude and rectascension are angles that wrap around
+        # at 360 degrees.  Rectangular coordinates have no angles.
+        if flag & swe.FLG_XYZ:
+            angleIndex = None
+        else:
+            angleIndex = 0
+
+        newSegments = []
+        
+        segmentStartJd = startJd
+        while segmentStartJd < endJd:
+            segmentEndJd = min(segmentStartJd + self.segmentDays, endJd)
+            self.__buildSegments(planetId, flag, angleIndex,
+                                 segmentStartJd, segmentEndJd,
+                                 newSegments)
+            segmentStartJd = segmentEndJd
+
+        key = (planetId, flag)
+        if key in self.tables:
+            newSegments.extend(self.tables[key][1])
+            
+        newSegments.sort(key=lambda s: s[0])
+        startJds = [s[0] for s in newSegments]
+
+        self.tables[key] = (startJds, newSegments, angleIndex)
+
+    def save(self, filename):
+        """Writes this cache to the given file.
+
+        Returns:
+        True if the write succeeded, False otherwise.
+        """
+
+        data = {"version"     : EphemerisInterpolationCache.FILE_FORMAT_VERSION,
+                "sweVersion"  : swe.version,
+                "maxError"    : self.maxError,
+                "degree"      : self.degree,
+                "segmentDays" : self.segmentDays,
+                "minSegmentDays" : self.minSegmentDays,
+                "tables"      : self.tables}
+
+        try:
+            with open(filename, "wb") as f:
+                pickle.dump(data, f, pickle.HIGHEST_PROTOCOL)
+        except (IOError, OSError, pickle.PicklingError) as e:
+            self.log.error("Failed to write the ephemeris " + \
+                           "interpolation cache to file '{}': {}".\
+                           format(filename, e))
+            return False
+
+        return True
+
+    @staticmethod
+    def load(filename):
+        """Reads a cache previously written with save().
+
+        Returns:
+        EphemerisInterpolationCache object, or None if the file could
+        not be read or was written in an incompatible format.
+        """
+
+        log = EphemerisInterpolationCache.log
+        
+        try:
+            with open(filename, "rb") as f:
+                data = pickle.load(f)
+        except (IOError, OSError, EOFError, pickle.UnpicklingError) as e:
+            log.error("Failed to read the ephemeris interpolation " + \
+                      "cache from file '{}': {}".format(filename, e))
+            return None
+
+        if not isinstance(data, dict) or \
+           data.get("version") != EphemerisInterpolationCache.FILE_FORMAT_VERSION:
+            
+            log.error("Ephemeris interpolation cache file '{}' ".\
+                      format(filename) + \
+                      "has an unsupported format version.")
+            return None
+
+        if data["sweVersion"] != swe.version:
+            log.warning("Ephemeris interpolation cache file '{}' ".\
+                        format(filename) + \
+                        "was created with Swiss Ephemeris version {}, ".\
+                        format(data["sweVersion"]) + \
+                        "but version {} is in use.".format(swe.version))
+            
+        cache = EphemerisInterpolationCache(data["maxError"],
+                                            data["degree"],
+                                            data["segmentDays"],
+                                            data["minSegmentDays"])
+        cache.tables = data["tables"]
+
+        return cache
+
+    def __findSegment(self, planetId, flag, jd):
+        """Returns the segment tuple covering the given values, or None."""
+
+        table = self.tables.get((planetId, flag))
+        if table == None:
+            return None
+
+        (startJds, segments, angleIndex) = table
+        
+        i = bisect.bisect_right(startJds, jd) - 1
+        if i < 0 or jd > segments[i][1]:
+            return None
+        
+        return segments[i]
+
+    def __buildSegments(self, planetId, flag, angleIndex,
+                        startJd, endJd, segments):
+        """Fits a segment for the range from 'startJd' to 'endJd',
+        splitting it in half recursively until the error is within
+        'maxError'.  The resulting segments are appended to 'segments'.
+        """
+
+        n = self.degree + 1
+        midJd = (startJd + endJd) / 2.0
+        halfWidth = (endJd - startJd) / 2.0
+
+        # Chebyshev nodes, in order of increasing time.
+        nodes = [-math.cos(math.pi * (k + 0.5) / n) for k in range(n)]
+        
+        nodeValues = [swe.calc_ut(midJd + halfWidth * x, planetId, flag)
+                      for x in nodes]
+        
+        polynomials = []
+        for valueIndex in range(6):
+            ys = [values[valueIndex] for values in nodeValues]
+            
+            # Unwrap angles so that the fitted function is continuous.
+            if valueIndex == angleIndex:
+                for k in range(1, n):
+                    while ys[k] - ys[k-1] > 180.0:
+                        ys[k] -= 360.0
+                    while ys[k] - ys[k-1] < -180.0:
+                        ys[k] += 360.0
+            
+            polynomials.append(\
+                EphemerisInterpolationCache.__chebyshevFit(nodes, ys))
+        
+        segment = (startJd, endJd, midJd, halfWidth, tuple(polynomials))
+
+        # Check the error between the nodes and at the end points.
+        checkPoints = [-1.0, 1.0]
+        for k in range(n - 1):
+            checkPoints.append((nodes[k] + nodes[k+1]) / 2.0)
+
+        withinError = True
+        for x in checkPoints:
+            jd = midJd + halfWidth * x
+            expected = swe.calc_ut(jd, planetId, flag)
+            
+            for valueIndex in range(6):
+                value = 0.0
+                for c in polynomials[valueIndex]:
+                    value = value * x + c
+                diff = value - expected[valueIndex]
+                if valueIndex == angleIndex:
+                    diff = (diff + 180.0) % 360.0 - 180.0
+                if abs(diff) > self.maxError:
+                    withinError = False
+                    break
+
+            if not withinError:
+                break
+
+        if withinError or (endJd - startJd) / 2.0 < self.minSegmentDays:
+            if not withinError:
+                self.log.debug("Segment for planetId={}, flag={} ".\
+                               format(planetId, flag) + \
+                               "from jd {} to {} ".format(startJd, endJd) + \
+                               "exceeds the maximum error.")
+            segments.append(segment)
+        else:
+            self.__buildSegments(planetId, flag, angleIndex,
+                                 startJd, midJd, segments)
+            self.__buildSegments(planetId, flag, angleIndex,
+                                 midJd, endJd, segments)
+
+    @staticmethod
+    def __chebyshevFit(nodes, ys):
+        """Returns the coefficients (highest power first) of the
+        polynomial in x that interpolates the values 'ys' at the
+        Chebyshev nodes 'nodes'.  The fit is done in the Chebyshev
+        basis and then converted to the power basis so that the
+        polynomial can be evaluated with Horner's method.
+        """
+
+        n = len(nodes)
+
+        # Chebyshev coefficients.  The nodes are in order of
+        # increasing x, which is the reverse of the usual order.
+        chebyshevCoefficients = []
+        for j in range(n):
+            total = 0.0
+            for k in range(n):
+                total += ys[n - 1 - k] * math.cos(math.pi * j * (k + 0.5) / n)
+            chebyshevCoefficients.append(2.0 * total / n)
+        chebyshevCoefficients[0] /= 2.0
+
+        # Convert to the power basis, using the recurrence
+        # T(j+1) = 2x * T(j) - T(j-1).
+        powerCoefficients = [0.0] * n
+        tPrev = [1.0] + [0.0] * (n - 1)
+        tCurr = [0.0, 1.0] + [0.0] * (n - 2)
+        for j in range(n):
+            if j == 0:
+                t = tPrev
+            elif j == 1:
+                t = tCurr
+            else:
+                tNext = [0.0] * n
+                for i in range(n):
+                    if i > 0:
+                        tNext[i] += 2.0 * tCurr[i-1]
+                    tNext[i] -= tPrev[i]
+                tPrev = tCurr
+                tCurr = tNext
+                t = tCurr
+            for i in range(n):
+                powerCoefficients[i] += chebyshevCoefficients[j] * t[i]
+
+        powerCoefficients.reverse()
+        
+        return tuple(powerCoefficients)
+
+
+class EphemerisContext:
+    """Immutable class that holds the settings that Ephemeris
+    calculations depend on:
+
+    flags             - int holding the Swiss Ephemeris flags that are
+                        used for all calculations (e.g. swe.FLG_SWIEPH,
+                        swe.FLG_SPEED, swe.FLG_TRUEPOS).  The centricity,
+                        zodiac and coordinate system flags are not
+                        included, since those are set for each
+                        calculation.
+    geoLongitudeDeg   - Longitude in degrees of the geographic position 
+                        used for calculations of houses (and for 
+                        topocentric calculations).  Positive values
+                        refer to East, and negative values to West.
+    geoLatitudeDeg    - Latitude in degrees of the geographic position.
+                        North latitudes are positive, South latitudes
+                        are negative.
+    geoAltitudeMeters - Altitude in meters of the geographic position.
+
+    Each thread calculates with its own EphemerisContext if it set one
+    with Ephemeris.setContext() or Ephemeris.calculationContext(), and
+    with Ephemeris.defaultContext otherwise.  This allows
+    calculations with different settings to be done from multiple
+    threads at the same time.
+
+    Example:
+
+    context = Ephemeris.getContext().\
+        withGeographicPosition(-87.6278, 41.8819)
+
+    # In a worker thread:
+    with Ephemeris.calculationContext(context):
+        p = Ephemeris.getPlanetaryInfo("H1", dt)
+    """
+
+    __slots__ = ("flags",
+                 "geoLongitudeDeg",
+                 "geoLatitudeDeg",
+                 "geoAltitudeMeters")
+    
+    def __init__(self,
+                 flags=0,
+                 geoLongitudeDeg=0,
+                 geoLatitudeDeg=0,
+                 geoAltitudeMeters=0):
+        """Initializes the EphemerisContext with the given values."""
+
+        object.__setattr__(self, "flags", flags)
+        object.__setattr__(self, "geoLongitudeDeg", geoLongitudeDeg)
+        object.__setattr__(self, "geoLatitudeDeg", geoLatitudeDeg)
+        object.__setattr__(self, "geoAltitudeMeters", geoAltitudeMeters)
+
+    def __setattr__(self, name, value):
+        """Raises AttributeError, since EphemerisContext is immutable."""
+
+        raise AttributeError("EphemerisContext objects are immutable.")
+
+    def __eq__(self, other):
+        """Returns True if 'other' is an EphemerisContext with the
+        same values.
+        """
+
+        if not isinstance(other, EphemerisContext):
+            return NotImplemented
+        
+        return self.toTuple() == other.toTuple()
+
+    def __hash__(self):
+        """Returns a hash of the values of this object."""
+
+        return hash(self.toTuple())
+
+    def __str__(self):
+        """Returns a string representation of this object."""
+
+        return self.toString()
+
+    def toString(self):
+        """Returns a string representation of this object."""
+
+        formatStr = "[flags={}, geoLongitudeDeg={}, geoLatitudeDeg={}, " + \
+                    "geoAltitudeMeters={}]"
+
+        return formatStr.format(self.flags,
+                                self.geoLongitudeDeg,
+                                self.geoLatitudeDeg,
+                                self.geoAltitudeMeters)
+
+    def toTuple(self):
+        """Returns the values of this object as a tuple:
+        (flags, geoLongitudeDeg, geoLatitudeDeg, geoAltitudeMeters)
+        """
+
+        return (self.flags,
+                self.geoLongitudeDeg,
+                self.geoLatitudeDeg,
+                self.geoAltitudeMeters)
+
+    def withFlags(self, flags):
+        """Returns a new EphemerisContext that is the same as this
+        one, but with the given flags.
+        """
+
+        return EphemerisContext(flags,
+                                self.geoLongitudeDeg,
+                                self.geoLatitudeDeg,
+                                self.geoAltitudeMeters)
+
+    def withGeographicPosition(self,
+                               geoLongitudeDeg,
+                               geoLatitudeDeg,
+                               geoAltitudeMeters=0.0):
+        """Returns a new EphemerisContext that is the same as this
+        one, but with the given geographic position.
+        """
+
+        return EphemerisContext(self.flags,
+                                geoLongitudeDeg,
+                                geoLatitudeDeg,
+                                geoAltitudeMeters)
+
+
+class EphemerisThreadState(threading.local):
+    """Class that holds the Ephemeris calculation state of a thread.
+
+    context             - EphemerisContext set for the thread, or None
+                          if the thread uses Ephemeris.defaultContext.
+    iflag               - int holding the flags used in the Swiss
+                          Ephemeris calculations of the thread.  This
+                          is the context flags plus the centricity,
+                          zodiac and coordinate system flags, which
+                          are modified by the Ephemeris set*()
+                          functions.
+    topocentricPosition - Tuple (geoLongitudeDeg, geoLatitudeDeg,
+                          geoAltitudeMeters) that the thread last gave
+                          to swe.set_topo(), or None.
+
+    The Swiss Ephemeris keeps its settings (ephemeris path, sidereal
+    mode, topocentric position) in thread-local storage, so each
+    thread has to give them to the Swiss Ephemeris itself.
+    """
+
+    def __init__(self):
+        """Initializes the state of a thread from the
+        Ephemeris.defaultContext.  This is called once per thread,
+        the first time the thread accesses the state.
+        """
+
+        self.context = None
+        self.iflag = Ephemeris.defaultContext.flags
+        self.topocentricPosition = None
+
+        swe.set_ephe_path(Ephemeris.SWISS_EPHEMERIS_DATA_DIR)
+
+
 class Ephemeris:
     """Provides access to ephemeris data.  Please exercise caution when 
     using this class in multithreaded environments because the underlying
@@ -255,20 +800,47 @@ class Ephemeris:
     SWISS_EPHEMERIS_DATA_DIR = \
         os.path.abspath(os.path.join(sys.path[0], "../data/ephe"))
 
-    # Flag that is used in Swiss Ephemeris calculations.  
-    # We make mods to this variable to add options.
-    iflag = 0
-
-    # Holds the longitude, latitude, and altitude representing the 
-    # geographic positions to use in calculations of houses 
-    # (and in topocentric calculations).
-    #
-    # Note: 
-    # Positive longitude degrees refer to East, and 
-    # negative longitude degrees refer to West.
-    geoLongitudeDeg = 0
-    geoLatitudeDeg = 0
-    geoAltitudeMeters = 0
+    # EphemerisContext holding the flags and the geographic position
+    # used by all threads that have not set their own context with
+    # setContext() or calculationContext().
+    defaultContext = EphemerisContext()
+
+    # EphemerisThreadState holding the calculation state of each thread.
+    # This includes the flag that is used in Swiss Ephemeris
+    # calculations ('iflag'), which we make mods to in order to add
+    # options.  It is created below the class definition.
+    threadState = None
+
+    # Optional EphemerisInterpolationCache used by calc_ut() to avoid
+    # calling the Swiss Ephemeris for timestamps it covers.
+    # If None, then no interpolation is done.
+    interpolationCache = None
+
+    # LRU cache of PlanetaryInfo objects returned by getPlanetaryInfo().
+    # Maps (planetName, julianDay, flags, geoLongitudeDeg,
+    # geoLatitudeDeg, geoAltitudeMeters) to PlanetaryInfo, ordered
+    # from least recently used to most recently used.
+    planetaryInfoCache = collections.OrderedDict()
+
+    # Lock that is held while accessing Ephemeris.planetaryInfoCache
+    # and its statistics, since the cache is shared by all threads.
+    planetaryInfoCacheLock = threading.RLock()
+
+    # Maximum number of entries in Ephemeris.planetaryInfoCache.
+    # A value of 0 disables the cache.
+    planetaryInfoCacheMaxSize = 2048
+
+    # Hit and miss counts for Ephemeris.planetaryInfoCache.
+    planetaryInfoCacheHits = 0
+    planetaryInfoCacheMisses = 0
+
+    # Flags that getPlanetaryInfo() sets itself for each calculation.
+    # These are masked out of Ephemeris.threadState.iflag when creating a
+    # Ephemeris.planetaryInfoCache key, so that the key only depends on
+    # the flags that actually change the results (e.g. true positions).
+    PlanetaryInfoCacheIgnoredFlags = \
+        swe.FLG_HELCTR | swe.FLG_TOPOCTR | swe.FLG_SIDEREAL | \
+        swe.FLG_EQUATORIAL | swe.FLG_XYZ | swe.FLG_RADIANS
     
     # Dictionary for referencing various House Cusp Systems.
     HouseSys = { 'Placidus'      : b'P',
@@ -291,6 +863,80 @@ class Ephemeris:
                  'KrusinskiPisa' : b'U',
                  'GauquelinSectors' : b'G'}
 
+    # Centricity types, zodiac types and coordinate systems that can be
+    # requested from Ephemeris.getPlanetaryInfoFields().
+    CentricityTypes = ["geocentric", "topocentric", "heliocentric"]
+    ZodiacTypes = ["tropical", "sidereal"]
+    CoordinateSystems = ["ecliptical", "equatorial", "rectangular"]
+
+    # Dictionary mapping a coordinate system to the PlanetaryInfo
+    # field names that are populated by a single calc_ut() call in
+    # that coordinate system.  The order of the field names matches
+    # the order of the values returned by calc_ut().
+    CoordinateSystemFieldNames = \
+        {'ecliptical'  : ['longitude',
+                          'latitude',
+                          'distance',
+                          'longitude_speed',
+                          'latitude_speed',
+                          'distance_speed'],
+         'equatorial'  : ['rectascension',
+                          'declination',
+                          'distance',
+                          'rectascension_speed',
+                          'declination_speed',
+                          'distance_speed'],
+         'rectangular' : ['X',
+                          'Y',
+                          'Z',
+                          'dX',
+                          'dY',
+                          'dZ']}
+
+    # Dictionary mapping the name of an averaged planet to the names
+    # of the planets that are averaged to create it.
+    # This must be kept in sync with the get*PlanetaryInfo() methods
+    # of the averaged planets.
+    AveragedPlanetComponents = \
+        {'MeanOfFive'      : ['Jupiter', 'Saturn', 'Uranus', 'Neptune',
+                              'Pluto'],
+         'CycleOfEight'    : ['Mercury', 'Venus', 'Mars', 'Jupiter',
+                              'Saturn', 'Uranus', 'Neptune', 'Pluto'],
+         'AvgMaJuSaUrNePl' : ['Mars', 'Jupiter', 'Saturn', 'Uranus',
+                              'Neptune', 'Pluto'],
+         'AvgJuSaUrNe'     : ['Jupiter', 'Saturn', 'Uranus', 'Neptune'],
+         'AvgJuSa'         : ['Jupiter', 'Saturn']}
+
+    # Dictionary mapping the name of a combination planet to the names
+    # of the planets that are combined (subtracted) to create it.
+    # This must be kept in sync with the get*PlanetaryInfo() methods
+    # of the combination planets.
+    CombinationPlanetComponents = \
+        {'AsSu' : ['Ascendant', 'Sun'],
+         'AsMo' : ['Ascendant', 'Moon'],
+         'MoSu' : ['Moon', 'Sun'],
+         'MeVe' : ['Mercury', 'Venus'],
+         'MeEa' : ['Mercury', 'Earth'],
+         'MeMa' : ['Mercury', 'Mars'],
+         'MeJu' : ['Mercury', 'Jupiter'],
+         'MeSa' : ['Mercury', 'Saturn'],
+         'MeUr' : ['Mercury', 'Uranus'],
+         'VeEa' : ['Venus', 'Earth'],
+         'VeMa' : ['Venus', 'Mars'],
+         'VeJu' : ['Venus', 'Jupiter'],
+         'VeSa' : ['Venus', 'Saturn'],
+         'VeUr' : ['Venus', 'Uranus'],
+         'EaMa' : ['Earth', 'Mars'],
+         'EaJu' : ['Earth', 'Jupiter'],
+         'EaSa' : ['Earth', 'Saturn'],
+         'EaUr' : ['Earth', 'Uranus'],
+         'MaJu' : ['Mars', 'Jupiter'],
+         'MaSa' : ['Mars', 'Saturn'],
+         'MaUr' : ['Mars', 'Uranus'],
+         'JuSa' : ['Jupiter', 'Saturn'],
+         'JuUr' : ['Jupiter', 'Uranus'],
+         'SaUr' : ['Saturn', 'Uranus']}
+
     @staticmethod
     def getSupportedPlanetNamesList():
         """Returns a list of str objects that is the list of planet
@@ -408,17 +1054,23 @@ class Ephemeris:
         swe.set_ephe_path(Ephemeris.SWISS_EPHEMERIS_DATA_DIR)
 
         # Reset the iflag used.
-        Ephemeris.iflag = 0
+        iflag = 0
 
         # Use Swiss Ephemeris (and not JPL or Moshier)
         if Ephemeris.log.isEnabledFor(logging.INFO) == True:
             Ephemeris.log.info("Setting flag to use Swiss Ephemeris")
-        Ephemeris.iflag |= swe.FLG_SWIEPH
+        iflag |= swe.FLG_SWIEPH
 
         # Calculate speeds when doing calculations.
         if Ephemeris.log.isEnabledFor(logging.INFO) == True:
             Ephemeris.log.info("Setting flag to calculate speeds")
-        Ephemeris.iflag |= swe.FLG_SPEED
+        iflag |= swe.FLG_SPEED
+
+        # These flags are the default for all threads.  The current
+        # thread goes back to using the default context.
+        Ephemeris.defaultContext = Ephemeris.defaultContext.withFlags(iflag)
+        Ephemeris.threadState.context = None
+        Ephemeris.threadState.iflag = iflag
 
         # Use true positions of the planets by default.
         if Ephemeris.log.isEnabledFor(logging.INFO) == True:
@@ -447,6 +1099,11 @@ class Ephemeris:
                               altitudeMeters=0.0):
         """Sets the position for planetary calculations.
 
+        If the current thread has set its own EphemerisContext, the
+        position is set in a new context for the current thread only.
+        Otherwise the position is set in Ephemeris.defaultContext, and
+        applies to all threads that use the default context.
+
         Parameters:
         geoLongitudeDeg - Longitude in degrees.  
                           West longitudes are negative,
@@ -471,24 +1128,331 @@ class Ephemeris:
             Ephemeris.log.warn("Latitude specified was not between " + \
                                "-90 and 90.")
 
-        # Set the topo values for use in topo calculations.
-        swe.set_topo(geoLatitudeDeg, geoLatitudeDeg, altitudeMeters)
-
-        # Save off the values for future use (when getting house positions).
-        Ephemeris.geoLongitudeDeg = geoLongitudeDeg
-        Ephemeris.geoLatitudeDeg = geoLatitudeDeg
-        Ephemeris.geoAltitudeMeters = altitudeMeters
+        # Save off the values for future use (when getting house
+        # positions and in topocentric calculations).  The topo values
+        # are given to the Swiss Ephemeris right before a topocentric
+        # calculation, in calc_ut().
+        context = Ephemeris.getContext().\
+            withGeographicPosition(geoLongitudeDeg,
+                                   geoLatitudeDeg,
+                                   altitudeMeters)
+
+        if Ephemeris.threadState.context == None:
+            Ephemeris.defaultContext = context
+        else:
+            Ephemeris.threadState.context = context
 
         if Ephemeris.log.isEnabledFor(logging.DEBUG) == True:
             infoStr = "Setting geographic location to: " + \
                       "(lon={}, lat={}, alt={})".\
-                      format(Ephemeris.geoLongitudeDeg,
-                             Ephemeris.geoLatitudeDeg,
-                             Ephemeris.geoAltitudeMeters)
+                      format(context.geoLongitudeDeg,
+                             context.geoLatitudeDeg,
+                             context.geoAltitudeMeters)
             Ephemeris.log.debug(infoStr)
 
             Ephemeris.log.debug("Exiting setGeographicPosition()")
 
+    @staticmethod
+    def getContext():
+        """Returns the EphemerisContext used for calculations in the
+        current thread.  This is the context the thread set with
+        setContext() or calculationContext(), or
+        Ephemeris.defaultContext if it did not set one.
+        """
+
+        context = Ephemeris.threadState.context
+        
+        if context == None:
+            context = Ephemeris.defaultContext
+
+        return context
+
+    @staticmethod
+    def setContext(context):
+        """Sets the EphemerisContext used for calculations in the
+        current thread.  Other threads are not affected.  The
+        centricity, zodiac and coordinate system flags of the current
+        thread are reset to the flags of the context.
+
+        Parameters:
+        context - EphemerisContext to use, or None to go back to using
+                  Ephemeris.defaultContext.
+        """
+
+        if Ephemeris.log.isEnabledFor(logging.DEBUG) == True:
+            Ephemeris.log.debug("Entering setContext({})".format(context))
+
+        Ephemeris.threadState.context = context
+        Ephemeris.threadState.iflag = Ephemeris.getContext().flags
+
+        if Ephemeris.log.isEnabledFor(logging.DEBUG) == True:
+            Ephemeris.log.debug("Exiting setContext()")
+
+    @staticmethod
+    @contextlib.contextmanager
+    def calculationContext(context):
+        """Context manager that uses the given EphemerisContext for
+        calculations in the current thread within the 'with' block.
+        The previous context and flags of the thread are restored at
+        the end of the block.
+
+        Example:
+        
+        with Ephemeris.calculationContext(context):
+            p = Ephemeris.getPlanetaryInfo("Sun", dt)
+
+        Parameters:
+        context - EphemerisContext to use within the 'with' block.
+        """
+
+        previousContext = Ephemeris.threadState.context
+        previousIflag = Ephemeris.threadState.iflag
+
+        Ephemeris.setContext(context)
+        try:
+            yield context
+        finally:
+            Ephemeris.threadState.context = previousContext
+            Ephemeris.threadState.iflag = previousIflag
+
+    @staticmethod
+    def __setContextFlags(flags):
+        """Sets the flags of the EphemerisContext used by the current
+        thread.  If the thread uses Ephemeris.defaultContext, the
+        flags are set in the default context.
+
+        Parameters:
+        flags - int holding the new flags of the context.
+        """
+
+        if Ephemeris.threadState.context == None:
+            Ephemeris.defaultContext = \
+                Ephemeris.defaultContext.withFlags(flags)
+        else:
+            Ephemeris.threadState.context = \
+                Ephemeris.threadState.context.withFlags(flags)
+
+    @staticmethod
+    def __setTopocentricPosition():
+        """Gives the geographic position of the EphemerisContext of
+        the current thread to the Swiss Ephemeris, for use in
+        topocentric calculations of the current thread.
+        """
+
+        context = Ephemeris.getContext()
+        position = (context.geoLongitudeDeg,
+                    context.geoLatitudeDeg,
+                    context.geoAltitudeMeters)
+
+        if position != Ephemeris.threadState.topocentricPosition:
+            swe.set_topo(context.geoLatitudeDeg,
+                         context.geoLatitudeDeg,
+                         context.geoAltitudeMeters)
+            Ephemeris.threadState.topocentricPosition = position
+
+    @staticmethod
+    def setInterpolationCache(cache):
+        """Sets the EphemerisInterpolationCache that calc_ut() uses
+        for the planets, flags and timestamps the cache covers.  
+        Topocentric calculations are never taken from the cache, since
+        they depend on the geographic position.
+
+        Parameters:
+        cache - EphemerisInterpolationCache object, or None to
+                disable interpolation and always use the Swiss Ephemeris.
+        """
+
+        if Ephemeris.log.isEnabledFor(logging.DEBUG) == True:
+            Ephemeris.log.debug("setInterpolationCache(cache={})".\
+                                format(cache))
+            
+        Ephemeris.interpolationCache = cache
+
+        # Cached PlanetaryInfos may have been calculated with
+        # different values.
+        Ephemeris.clearPlanetaryInfoCache()
+
+    @staticmethod
+    def setPlanetaryInfoCacheMaxSize(maxSize):
+        """Sets the maximum number of PlanetaryInfo objects kept in the
+        LRU cache used by getPlanetaryInfo().  Least recently used
+        entries are evicted if the cache is currently larger.
+
+        Parameters:
+        maxSize - int value for the maximum number of entries.  
+                  A value of 0 disables the cache.
+        """
+
+        if Ephemeris.log.isEnabledFor(logging.DEBUG) == True:
+            Ephemeris.log.debug("setPlanetaryInfoCacheMaxSize(maxSize={})".\
+                                format(maxSize))
+
+        if maxSize < 0:
+            Ephemeris.log.error("setPlanetaryInfoCacheMaxSize(): " + \
+                                "Invalid maxSize: {}".format(maxSize))
+            return
+        
+        with Ephemeris.planetaryInfoCacheLock:
+            Ephemeris.planetaryInfoCacheMaxSize = maxSize
+        
+            while len(Ephemeris.planetaryInfoCache) > maxSize:
+                Ephemeris.planetaryInfoCache.popitem(last=False)
+
+    @staticmethod
+    def clearPlanetaryInfoCache():
+        """Removes all entries from the LRU cache used by
+        getPlanetaryInfo().  The hit and miss statistics are kept.
+        """
+
+        if Ephemeris.log.isEnabledFor(logging.DEBUG) == True:
+            Ephemeris.log.debug("clearPlanetaryInfoCache()")
+
+        with Ephemeris.planetaryInfoCacheLock:
+            Ephemeris.planetaryInfoCache.clear()
+
+    @staticmethod
+    def getPlanetaryInfoCacheStats():
+        """Returns the statistics of the LRU cache used by
+        getPlanetaryInfo().
+
+        Returns:
+        dict with the following keys:
+        'hits'    - int number of lookups found in the cache.
+        'misses'  - int number of lookups not found in the cache.
+        'size'    - int number of entries currently in the cache.
+        'maxSize' - int maximum number of entries in the cache.
+        """
+
+        with Ephemeris.planetaryInfoCacheLock:
+            return {'hits'    : Ephemeris.planetaryInfoCacheHits,
+                    'misses'  : Ephemeris.planetaryInfoCacheMisses,
+                    'size'    : len(Ephemeris.planetaryInfoCache),
+                    'maxSize' : Ephemeris.planetaryInfoCacheMaxSize}
+
+    @staticmethod
+    def resetPlanetaryInfoCacheStats():
+        """Resets the hit and miss counts of the LRU cache used by
+        getPlanetaryInfo() to zero.
+        """
+
+        with Ephemeris.planetaryInfoCacheLock:
+            Ephemeris.planetaryInfoCacheHits = 0
+            Ephemeris.planetaryInfoCacheMisses = 0
+
+    @staticmethod
+    def getInterpolationCache():
+        """Returns the EphemerisInterpolationCache currently used by
+        calc_ut(), or None if one is not set.
+        """
+
+        return Ephemeris.interpolationCache
+
+    @staticmethod
+    def createInterpolationCache(planetNames, startDt, endDt,
+                                 centricityTypes=None,
+                                 zodiacTypes=None,
+                                 coordinateSystems=None,
+                                 maxError=0.00001,
+                                 cache=None):
+        """Creates an EphemerisInterpolationCache holding the
+        approximations of the calc_ut() values for the given planets
+        over the given date range.  The returned cache is not
+        installed; call setInterpolationCache() to use it.
+
+        Note: This function modifies Ephemeris.threadState.iflag.
+
+        Parameters:
+        planetNames - list of str holding the names of the planets.
+                      Only planets supported directly by the Swiss
+                      Ephemeris can be cached.  Combination and averaged
+                      planets benefit automatically if their component
+                      planets are cached.
+        startDt     - datetime.datetime for the start of the range.
+        endDt       - datetime.datetime for the end of the range.
+        centricityTypes - list of str values, where each str is one of:
+                          "geocentric", "heliocentric".
+                          If None, then both are used.
+        zodiacTypes - list of str values, where each str is one of:
+                      "tropical", "sidereal".
+                      If None, then both are used.
+        coordinateSystems - list of str values, where each str is one of:
+                            "ecliptical", "equatorial", "rectangular".
+                            If None, then "ecliptical" and "equatorial"
+                            are used.
+        maxError    - float value for the maximum allowed error of
+                      each interpolated value, in the units of that
+                      value (degrees, degrees/day, AU, AU/day).
+        cache       - EphemerisInterpolationCache object to add to.
+                      If None, then a new cache is created.
+
+        Returns:
+        EphemerisInterpolationCache object, or None if the input
+        is invalid.
+        """
+
+        if Ephemeris.log.isEnabledFor(logging.DEBUG) == True:
+            debugStr = "Entered createInterpolationCache(planetNames={}, " + \
+                       "startDt={}, endDt={})"
+            Ephemeris.log.debug(debugStr.format(planetNames, startDt, endDt))
+
+        if centricityTypes == None:
+            centricityTypes = ["geocentric", "heliocentric"]
+        if zodiacTypes == None:
+            zodiacTypes = Ephemeris.ZodiacTypes
+        if coordinateSystems == None:
+            coordinateSystems = ["ecliptical", "equatorial"]
+
+        # Validate input.
+        for centricityType in centricityTypes:
+            if centricityType not in ("geocentric", "heliocentric"):
+                Ephemeris.log.error("createInterpolationCache(): " + \
+                    "Unsupported centricity type: {}".format(centricityType))
+                return None
+        for zodiacType in zodiacTypes:
+            if zodiacType not in Ephemeris.ZodiacTypes:
+                Ephemeris.log.error("createInterpolationCache(): " + \
+                    "Invalid zodiac type: {}".format(zodiacType))
+                return None
+        for coordinateSystem in coordinateSystems:
+            if coordinateSystem not in Ephemeris.CoordinateSystems:
+                Ephemeris.log.error("createInterpolationCache(): " + \
+                    "Invalid coordinate system: {}".format(coordinateSystem))
+                return None
+            
+        planetIds = []
+        for planetName in planetNames:
+            planetId = Ephemeris.getPlanetIdForName(planetName)
+            if planetId == None:
+                Ephemeris.log.error("createInterpolationCache(): " + \
+                    "Unsupported planet: {}".format(planetName))
+                return None
+            planetIds.append(planetId)
+
+        startJd = Ephemeris.datetimeToJulianDay(startDt)
+        endJd = Ephemeris.datetimeToJulianDay(endDt)
+        if endJd <= startJd:
+            Ephemeris.log.error("createInterpolationCache(): " + \
+                "endDt must be after startDt.")
+            return None
+
+        if cache == None:
+            cache = EphemerisInterpolationCache(maxError)
+
+        for planetId in planetIds:
+            for centricityType in centricityTypes:
+                for zodiacType in zodiacTypes:
+                    for coordinateSystem in coordinateSystems:
+                        Ephemeris.__setCalculationFlags(centricityType,
+                                                        zodiacType,
+                                                        coordinateSystem)
+                        cache.addRange(planetId, Ephemeris.threadState.iflag,
+                                       startJd, endJd)
+
+        if Ephemeris.log.isEnabledFor(logging.DEBUG) == True:
+            Ephemeris.log.debug("Exiting createInterpolationCache()")
+
+        return cache
+
     @staticmethod
     def getUtcOffsetForStandardTime(timezoneObj):
         """Utility function for getting the utcoffset of the standard
@@ -543,43 +1507,119 @@ class Ephemeris:
                 "in the datetime.datetime cannot be None"
             raise ValueError(errStr)
 
-        # Convert to UTC.
-        dtUtc = pytz.utc.normalize(dt.astimezone(pytz.utc))
+        # Convert to UTC.  This is done by subtracting the offset
+        # rather than with astimezone() and pytz.utc.normalize(), which
+        # give the same result but are much slower.  Only the date and
+        # time fields of 'dtUtc' are used, so its tzinfo is left as is.
+        offset = dt.utcoffset()
+        if offset:
+            dtUtc = dt - offset
+        else:
+            dtUtc = dt
 
         if Ephemeris.log.isEnabledFor(logging.DEBUG) == True:
             Ephemeris.log.debug("datetime converted to UTC is: {}".format(dtUtc))
 
-        # Get the Julian Day as calculated by Swiss Ephemeris.
-        cal = swe.GREG_CAL
-        (jd_et, jd_ut) = \
-                swe.utc_to_jd(dtUtc.year, dtUtc.month, dtUtc.day, 
-                              dtUtc.hour, dtUtc.minute, dtUtc.second,
-                              cal)
-
-        # We use the Julian Day for Universal Time (UT).
-        jd = jd_ut
+        jd = Ephemeris.__utcFieldsToJulianDay(dtUtc.year, dtUtc.month,
+                                              dtUtc.day, dtUtc.hour,
+                                              dtUtc.minute, dtUtc.second)
         
         if Ephemeris.log.isEnabledFor(logging.DEBUG) == True:
-            debugStr = "Swiss Ephemeris converted UTC datetime({}) to " + \
-                       "jd_et={}, jd_ut={}.  Using jd_ut as julian day."
-            Ephemeris.log.debug(debugStr.format(dtUtc, jd_et, jd_ut))
-
             Ephemeris.log.debug("Exiting datetimeToJulianDay() and " + \
                                 "returning {}".format(jd))
         return jd
 
-
     @staticmethod
-    def julianDayToDatetime(jd, tzInfo=pytz.utc):
-        """Utility function for converting a Julian Day number to 
-        a datetime.datetime object.  The returned datetime object is created 
-        with the timestamp in the timezone specified (or UTC by default if the
-        argument is not specified).
-        
-        This conversion process utilizes the Swiss Ephemeris to 
-        do the conversion and calculation.
-        """
-        
+    def datetimesToJulianDays(dts):
+        """Utility function for converting many datetime.datetime
+        objects to Julian Days.  The values are the same as the ones
+        returned by datetimeToJulianDay(), but this avoids the per-call
+        overhead.
+
+        Parameters:
+        dts - list (or other iterable) of datetime.datetime objects, 
+              each with the 'tzinfo' attribute set.
+
+        Returns:
+        array.array('d') holding the Julian Day for each datetime.
+        """
+
+        rv = array.array('d')
+        
+        for dt in dts:
+            offset = dt.utcoffset()
+            if offset == None:
+                errStr = "Ephemeris.datetimesToJulianDays(): " + \
+                    "tzinfo attribute in the datetime.datetime " + \
+                    "cannot be None"
+                raise ValueError(errStr)
+                
+            if offset:
+                dtUtc = dt - offset
+            else:
+                dtUtc = dt
+                
+            rv.append(Ephemeris.__utcFieldsToJulianDay(dtUtc.year,
+                                                       dtUtc.month,
+                                                       dtUtc.day,
+                                                       dtUtc.hour,
+                                                       dtUtc.minute,
+                                                       dtUtc.second))
+
+        return rv
+
+    # Cache of the Julian Days returned by swe.utc_to_jd(), keyed on
+    # the tuple (year, month, day, hour, minute, second) in UTC.
+    # The cache is emptied when it reaches the maximum size.
+    utcToJulianDayCache = {}
+    utcToJulianDayCacheMaxSize = 100000
+    
+    @staticmethod
+    def __utcFieldsToJulianDay(year, month, day, hour, minute, second):
+        """Private function that returns the Julian Day (UT) for the
+        given UTC date and time, as swe.utc_to_jd() does.
+
+        Before 1972, swe.utc_to_jd() treats UTC as UT and just calls
+        swe.julday(), so that is called directly.  From 1972 onwards,
+        UTC is corrected with leap seconds and Delta T, which is left
+        to the Swiss Ephemeris.
+        """
+
+        if year < 1972:
+            return swe.julday(year, month, day,
+                              hour + minute / 60.0 + second / 3600.0,
+                              swe.GREG_CAL)
+
+        key = (year, month, day, hour, minute, second)
+        jd = Ephemeris.utcToJulianDayCache.get(key)
+        
+        if jd == None:
+            (jd_et, jd_ut) = \
+                swe.utc_to_jd(year, month, day, hour, minute, second,
+                              swe.GREG_CAL)
+
+            # We use the Julian Day for Universal Time (UT).
+            jd = jd_ut
+
+            if len(Ephemeris.utcToJulianDayCache) >= \
+                   Ephemeris.utcToJulianDayCacheMaxSize:
+                Ephemeris.utcToJulianDayCache.clear()
+            Ephemeris.utcToJulianDayCache[key] = jd
+            
+        return jd
+
+
+    @staticmethod
+    def julianDayToDatetime(jd, tzInfo=pytz.utc):
+        """Utility function for converting a Julian Day number to 
+        a datetime.datetime object.  The returned datetime object is created 
+        with the timestamp in the timezone specified (or UTC by default if the
+        argument is not specified).
+        
+        This conversion process utilizes the Swiss Ephemeris to 
+        do the conversion and calculation.
+        """
+        
         if Ephemeris.log.isEnabledFor(logging.DEBUG) == True:
             Ephemeris.log.debug("Entering julianDayToDatetime({}, {})".\
                                 format(jd, tzInfo))
@@ -620,12 +1660,16 @@ class Ephemeris:
                              "is greater than datetime.MAXYEAR value " +
                              "{}.".format(datetime.MAXYEAR))
 
-        # Create a datetime.datetime in UTC.
-        dtUtc = datetime.datetime(year, month, day, hour, mins, 
-                                      secsTruncated, usecs, pytz.utc)
-
-        # Convert to the timezone specified.
-        dt = tzInfo.normalize(dtUtc.astimezone(tzInfo))
+        # Create a datetime.datetime in UTC, and convert to the
+        # timezone specified.
+        if tzInfo is pytz.utc:
+            dt = datetime.datetime(year, month, day, hour, mins, 
+                                   secsTruncated, usecs, pytz.utc)
+        else:
+            dt = Ephemeris.__utcToTimezone(\
+                datetime.datetime(year, month, day, hour, mins, 
+                                  secsTruncated, usecs),
+                tzInfo)
 
         if Ephemeris.log.isEnabledFor(logging.DEBUG) == True:
             Ephemeris.log.debug("Returning julian day converted from " + \
@@ -633,6 +1677,81 @@ class Ephemeris:
 
         return dt
 
+    @staticmethod
+    def julianDaysToDatetimes(jds, tzInfo=pytz.utc):
+        """Utility function for converting many Julian Day numbers to
+        datetime.datetime objects in the timezone specified (or UTC
+        by default if the argument is not specified).  The values are
+        the same as the ones returned by julianDayToDatetime().
+
+        Parameters:
+        jds    - list (or other iterable) of float Julian Days.
+        tzInfo - pytz-created datetime.tzinfo for the returned datetimes.
+
+        Returns:
+        list of datetime.datetime objects.
+        """
+
+        return [Ephemeris.julianDayToDatetime(jd, tzInfo) for jd in jds]
+
+    # Cache of the UTC offset transition tables of the timezones
+    # used in __utcToTimezone().  Maps the timezone name to a tuple:
+    # (utcTransitionTimes, tzinfos)
+    #
+    # utcTransitionTimes is the sorted list of naive UTC datetimes at
+    # which the UTC offset changes, and tzinfos is the list of
+    # pytz-created datetime.tzinfo objects in effect starting at those
+    # datetimes.
+    timezoneTransitionTables = {}
+    
+    @staticmethod
+    def __utcToTimezone(dtUtc, tzInfo):
+        """Private function that converts the naive datetime.datetime
+        'dtUtc', which is in UTC, to the timezone 'tzInfo'.  
+
+        This returns the same datetime as:
+            tzInfo.normalize(dtUtc.replace(tzinfo=pytz.utc).astimezone(tzInfo))
+        but for pytz timezones with daylight savings transitions, the
+        offset is looked up directly in a cached transition table.
+        """
+
+        if tzInfo is pytz.utc:
+            return pytz.utc.localize(dtUtc)
+
+        zone = getattr(tzInfo, "zone", None)
+        table = Ephemeris.timezoneTransitionTables.get(zone)
+        
+        if table == None:
+            if zone == None or \
+               not hasattr(tzInfo, "_utc_transition_times") or \
+               not hasattr(tzInfo, "_transition_info") or \
+               not hasattr(tzInfo, "_tzinfos"):
+                
+                # Not a pytz timezone with transitions.  Do the
+                # conversion the generic way.
+                dt = dtUtc.replace(tzinfo=pytz.utc).astimezone(tzInfo)
+                if hasattr(tzInfo, "normalize"):
+                    dt = tzInfo.normalize(dt)
+                return dt
+
+            tzinfos = [tzInfo._tzinfos[info] \
+                       for info in tzInfo._transition_info]
+            table = (tzInfo._utc_transition_times, tzinfos)
+            Ephemeris.timezoneTransitionTables[zone] = table
+
+        (utcTransitionTimes, tzinfos) = table
+        
+        i = bisect.bisect_right(utcTransitionTimes, dtUtc) - 1
+        if i < 0:
+            i = 0
+        tz = tzinfos[i]
+
+        # Note: datetime.replace() is avoided here because it is
+        # slow relative to the other operations.
+        return datetime.datetime(dtUtc.year, dtUtc.month, dtUtc.day,
+                                 dtUtc.hour, dtUtc.minute, dtUtc.second,
+                                 dtUtc.microsecond, tz) + tz._utcoffset
+
     @staticmethod
     def datetimeToStr(datetimeObj):
         """Returns a string representation of a datetime.datetime object.
@@ -1004,14 +2123,14 @@ class Ephemeris:
         if Ephemeris.log.isEnabledFor(logging.DEBUG) == True:
             Ephemeris.log.debug("Entering setSiderealZodiac()")
             Ephemeris.log.debug("swe.FLG_SIDEREAL == {}".format(swe.FLG_SIDEREAL))
-            Ephemeris.log.debug("iflag before: {}".format(Ephemeris.iflag))
+            Ephemeris.log.debug("iflag before: {}".format(Ephemeris.threadState.iflag))
 
-        Ephemeris.iflag |= swe.FLG_SIDEREAL
+        Ephemeris.threadState.iflag |= swe.FLG_SIDEREAL
 
         swe.set_sid_mode(swe.SIDM_LAHIRI)
 
         if Ephemeris.log.isEnabledFor(logging.DEBUG) == True:
-            Ephemeris.log.debug("iflag after: {}".format(Ephemeris.iflag))
+            Ephemeris.log.debug("iflag after: {}".format(Ephemeris.threadState.iflag))
             Ephemeris.log.debug("Exiting setSiderealZodiac()")
 
     @staticmethod
@@ -1023,12 +2142,12 @@ class Ephemeris:
         if Ephemeris.log.isEnabledFor(logging.DEBUG) == True:
             Ephemeris.log.debug("Entering setTropicalZodiac()")
             Ephemeris.log.debug("swe.FLG_SIDEREAL == {}".format(swe.FLG_SIDEREAL))
-            Ephemeris.log.debug("iflag before: {}".format(Ephemeris.iflag))
+            Ephemeris.log.debug("iflag before: {}".format(Ephemeris.threadState.iflag))
             
-        Ephemeris.iflag &= (~swe.FLG_SIDEREAL)
+        Ephemeris.threadState.iflag &= (~swe.FLG_SIDEREAL)
 
         if Ephemeris.log.isEnabledFor(logging.DEBUG) == True:
-            Ephemeris.log.debug("iflag after: {}".format(Ephemeris.iflag))
+            Ephemeris.log.debug("iflag after: {}".format(Ephemeris.threadState.iflag))
             Ephemeris.log.debug("Exiting setTropicalZodiac()")
         
 
@@ -1039,13 +2158,15 @@ class Ephemeris:
         if Ephemeris.log.isEnabledFor(logging.DEBUG) == True:
             Ephemeris.log.debug("Entering setTruePlanetaryPositions()")
             Ephemeris.log.debug("swe.FLG_TRUEPOS == {}".format(swe.FLG_TRUEPOS))
-            Ephemeris.log.debug("iflag before: {}".format(Ephemeris.iflag))
+            Ephemeris.log.debug("iflag before: {}".format(Ephemeris.threadState.iflag))
 
             
-        Ephemeris.iflag |= swe.FLG_TRUEPOS
+        Ephemeris.threadState.iflag |= swe.FLG_TRUEPOS
+        Ephemeris.__setContextFlags(
+            Ephemeris.getContext().flags | swe.FLG_TRUEPOS)
 
         if Ephemeris.log.isEnabledFor(logging.DEBUG) == True:
-            Ephemeris.log.debug("iflag after: {}".format(Ephemeris.iflag))
+            Ephemeris.log.debug("iflag after: {}".format(Ephemeris.threadState.iflag))
             Ephemeris.log.debug("Exiting setTruePlanetaryPositions()")
 
     @staticmethod
@@ -1055,12 +2176,14 @@ class Ephemeris:
         if Ephemeris.log.isEnabledFor(logging.DEBUG) == True:
             Ephemeris.log.debug("Entering setApparentPlanetaryPositions()")
             Ephemeris.log.debug("swe.FLG_TRUEPOS == {}".format(swe.FLG_TRUEPOS))
-            Ephemeris.log.debug("iflag before: {}".format(Ephemeris.iflag))
+            Ephemeris.log.debug("iflag before: {}".format(Ephemeris.threadState.iflag))
             
-        Ephemeris.iflag &= (~swe.FLG_TRUEPOS)
+        Ephemeris.threadState.iflag &= (~swe.FLG_TRUEPOS)
+        Ephemeris.__setContextFlags(
+            Ephemeris.getContext().flags & (~swe.FLG_TRUEPOS))
 
         if Ephemeris.log.isEnabledFor(logging.DEBUG) == True:
-            Ephemeris.log.debug("iflag after: {}".format(Ephemeris.iflag))
+            Ephemeris.log.debug("iflag after: {}".format(Ephemeris.threadState.iflag))
             Ephemeris.log.debug("Exiting setApparentPlanetaryPositions()")
 
 
@@ -1956,9 +3079,9 @@ class Ephemeris:
             debugStr ="Clearing flags for different coordinate systems." 
             Ephemeris.log.debug(debugStr)
 
-        Ephemeris.iflag &= (~swe.FLG_EQUATORIAL)
-        Ephemeris.iflag &= (~swe.FLG_XYZ)
-        Ephemeris.iflag &= (~swe.FLG_RADIANS)
+        Ephemeris.threadState.iflag &= (~swe.FLG_EQUATORIAL)
+        Ephemeris.threadState.iflag &= (~swe.FLG_XYZ)
+        Ephemeris.threadState.iflag &= (~swe.FLG_RADIANS)
 
     @staticmethod
     def setEclipticalCoordinateSystemFlag():
@@ -2004,7 +3127,7 @@ class Ephemeris:
             Ephemeris.log.debug("setEquatorialCoordinateSystemFlag()")
             
         Ephemeris.__clearCoordinateSystemFlags()
-        Ephemeris.iflag |= swe.FLG_EQUATORIAL
+        Ephemeris.threadState.iflag |= swe.FLG_EQUATORIAL
 
     @staticmethod
     def setRectangularCoordinateSystemFlag():
@@ -2025,7 +3148,7 @@ class Ephemeris:
             Ephemeris.log.debug("setRectangularCoordinateSystemFlag()")
             
         Ephemeris.__clearCoordinateSystemFlags()
-        Ephemeris.iflag |= swe.FLG_XYZ
+        Ephemeris.threadState.iflag |= swe.FLG_XYZ
 
     @staticmethod
     def setRadiansCoordinateSystemFlag():
@@ -2035,7 +3158,7 @@ class Ephemeris:
             Ephemeris.log.debug("setRadiansCoordinateSystemFlag()")
             
         Ephemeris.__clearCoordinateSystemFlags()
-        Ephemeris.iflag |= swe.FLG_RADIANS
+        Ephemeris.threadState.iflag |= swe.FLG_RADIANS
 
     @staticmethod
     def unsetRadiansCoordinateSystemFlag():
@@ -2047,7 +3170,7 @@ class Ephemeris:
         if Ephemeris.log.isEnabledFor(logging.DEBUG) == True:
             Ephemeris.log.debug("unsetRadiansCoordinateSystemFlag()")
             
-        Ephemeris.iflag &= (~swe.FLG_RADIANS)
+        Ephemeris.threadState.iflag &= (~swe.FLG_RADIANS)
 
     @staticmethod
     def setHeliocentricCalculations():
@@ -2056,8 +3179,8 @@ class Ephemeris:
         if Ephemeris.log.isEnabledFor(logging.DEBUG) == True:
             Ephemeris.log.debug("setHeliocentricCalculations()")
             
-        Ephemeris.iflag &= (~swe.FLG_TOPOCTR)
-        Ephemeris.iflag |= swe.FLG_HELCTR
+        Ephemeris.threadState.iflag &= (~swe.FLG_TOPOCTR)
+        Ephemeris.threadState.iflag |= swe.FLG_HELCTR
         
     @staticmethod
     def setGeocentricCalculations():
@@ -2066,8 +3189,8 @@ class Ephemeris:
         if Ephemeris.log.isEnabledFor(logging.DEBUG) == True:
             Ephemeris.log.debug("setGeocentricCalculations()")
             
-        Ephemeris.iflag &= (~swe.FLG_HELCTR)
-        Ephemeris.iflag &= (~swe.FLG_TOPOCTR)
+        Ephemeris.threadState.iflag &= (~swe.FLG_HELCTR)
+        Ephemeris.threadState.iflag &= (~swe.FLG_TOPOCTR)
         
     @staticmethod
     def setTopocentricCalculations():
@@ -2076,8 +3199,8 @@ class Ephemeris:
         if Ephemeris.log.isEnabledFor(logging.DEBUG) == True:
             Ephemeris.log.debug("setTopocentricCalculations()")
             
-        Ephemeris.iflag &= (~swe.FLG_HELCTR)
-        Ephemeris.iflag |= swe.FLG_TOPOCTR
+        Ephemeris.threadState.iflag &= (~swe.FLG_HELCTR)
+        Ephemeris.threadState.iflag |= swe.FLG_TOPOCTR
 
     @staticmethod
     def calc_ut(jd, planet, flag=swe.FLG_SWIEPH+swe.FLG_SPEED):
@@ -2098,6 +3221,19 @@ class Ephemeris:
             Ephemeris.log.debug("Entering calc_ut(jd={}, planet={}, flag={})".\
                                 format(jd, planet, flag))
 
+        # Use the interpolation cache if it covers this calculation.
+        if Ephemeris.interpolationCache != None and \
+               not (flag & swe.FLG_TOPOCTR):
+            
+            values = Ephemeris.interpolationCache.evaluate(planet, flag, jd)
+            if values != None:
+                return values
+
+        # Topocentric calculations use the geographic position of the
+        # current thread's context.
+        if flag & swe.FLG_TOPOCTR:
+            Ephemeris.__setTopocentricPosition()
+            
         # Do the calculation.
         (arg1, arg2, arg3, arg4, arg5, arg6) = swe.calc_ut(jd, planet, flag)
 
@@ -2239,31 +3375,31 @@ class Ephemeris:
 
         Ephemeris.log.debug("calc_ut(): Flags that set are: ")
         
-        if (Ephemeris.iflag & swe.FLG_JPLEPH):
+        if (Ephemeris.threadState.iflag & swe.FLG_JPLEPH):
             Ephemeris.log.debug("calc_ut():  - FLG_JPLEPH")
-        if (Ephemeris.iflag & swe.FLG_SWIEPH):
+        if (Ephemeris.threadState.iflag & swe.FLG_SWIEPH):
             Ephemeris.log.debug("calc_ut():  - FLG_SWIEPH")
-        if (Ephemeris.iflag & swe.FLG_MOSEPH):
+        if (Ephemeris.threadState.iflag & swe.FLG_MOSEPH):
             Ephemeris.log.debug("calc_ut():  - FLG_MOSEPH")
-        if (Ephemeris.iflag & swe.FLG_HELCTR):
+        if (Ephemeris.threadState.iflag & swe.FLG_HELCTR):
             Ephemeris.log.debug("calc_ut():  - FLG_HELCTR")
-        if (Ephemeris.iflag & swe.FLG_TRUEPOS):
+        if (Ephemeris.threadState.iflag & swe.FLG_TRUEPOS):
             Ephemeris.log.debug("calc_ut():  - FLG_TRUEPOS")
-        if (Ephemeris.iflag & swe.FLG_SPEED):
+        if (Ephemeris.threadState.iflag & swe.FLG_SPEED):
             Ephemeris.log.debug("calc_ut():  - FLG_SPEED")
-        if (Ephemeris.iflag & swe.FLG_EQUATORIAL):
+        if (Ephemeris.threadState.iflag & swe.FLG_EQUATORIAL):
             Ephemeris.log.debug("calc_ut():  - FLG_EQUATORIAL")
-        if (Ephemeris.iflag & swe.FLG_XYZ):
+        if (Ephemeris.threadState.iflag & swe.FLG_XYZ):
             Ephemeris.log.debug("calc_ut():  - FLG_XYZ")
-        if (Ephemeris.iflag & swe.FLG_RADIANS):
+        if (Ephemeris.threadState.iflag & swe.FLG_RADIANS):
             Ephemeris.log.debug("calc_ut():  - FLG_RADIANS")
-        if (Ephemeris.iflag & swe.FLG_TOPOCTR):
+        if (Ephemeris.threadState.iflag & swe.FLG_TOPOCTR):
             Ephemeris.log.debug("calc_ut():  - FLG_TOPOCTR")
-        if (Ephemeris.iflag & swe.FLG_SIDEREAL):
+        if (Ephemeris.threadState.iflag & swe.FLG_SIDEREAL):
             Ephemeris.log.debug("calc_ut():  - FLG_SIDEREAL")
 
         Ephemeris.log.debug("calc_ut(): Calculated values:")
-        if (Ephemeris.iflag & swe.FLG_EQUATORIAL):
+        if (Ephemeris.threadState.iflag & swe.FLG_EQUATORIAL):
             # Equatorial position calculated.
             # output here:
             debugStr = "calc_ut():  {:<36}{}"
@@ -2279,7 +3415,7 @@ class Ephemeris:
                     format("Speed in declination (deg/day):", arg5))
             Ephemeris.log.debug(debugStr.\
                     format("Speed in distance (AU/day)", arg6))
-        elif (Ephemeris.iflag & swe.FLG_XYZ): 
+        elif (Ephemeris.threadState.iflag & swe.FLG_XYZ): 
             # XYZ position calculated.
             debugStr = "calc_ut():  {:<15}{}"
             Ephemeris.log.debug(debugStr.\
@@ -2477,10 +3613,10 @@ class Ephemeris:
         # Obtain the house cusps.
         (tropicalCusps, tropicalAscmc) = \
             Ephemeris.swe_houses_ex(jd, 
-                                    Ephemeris.geoLatitudeDeg, 
-                                    Ephemeris.geoLongitudeDeg,
+                                    Ephemeris.getContext().geoLatitudeDeg, 
+                                    Ephemeris.getContext().geoLongitudeDeg,
                                     houseSystem,
-                                    Ephemeris.iflag)
+                                    Ephemeris.threadState.iflag)
 
         # Get the house cusps in the sidereal zodiac coordinates.
         Ephemeris.setSiderealZodiac()
@@ -2489,10 +3625,10 @@ class Ephemeris:
         # Obtain the house cusps.
         (siderealCusps, siderealAscmc) = \
             Ephemeris.swe_houses_ex(jd, 
-                                    Ephemeris.geoLatitudeDeg, 
-                                    Ephemeris.geoLongitudeDeg,
+                                    Ephemeris.getContext().geoLatitudeDeg, 
+                                    Ephemeris.getContext().geoLongitudeDeg,
                                     houseSystem,
-                                    Ephemeris.iflag)
+                                    Ephemeris.threadState.iflag)
 
         cusps = {'tropical' : tropicalCusps,
                  'sidereal' : siderealCusps}
@@ -2553,24 +3689,9 @@ class Ephemeris:
                                 format(houseNumber))
             return None
 
-        # Store some str in variables so they don't get instantiated a
-        # bunch of times.
-        tropicalStr = "tropical"
-        siderealStr = "sidereal"
-        
         # Planet name.
         planetName = "H{}".format(houseNumber)
 
-        # Planet ID.
-        # Here we will use an invalid planet ID.
-        #
-        # (Note: The number chosen has no meaning.
-        # I couldn't use -1, because -1 stands for SE_ECL_NUT.
-        # See documentation of the Swiss Ephemeris, in
-        # file: pyswisseph-1.77.00-0/doc/swephprg.htm)
-        #
-        planetId = -9999
-
         # julian day for the timestamp.
         jd = Ephemeris.datetimeToJulianDay(dt)
         
@@ -2580,262 +3701,12 @@ class Ephemeris:
         # Get the tuple holding values for the house cusps.
         cusps = Ephemeris.getHouseCusps(dt, houseSystem)
 
-        # Now fill out the dictionaries that go into a PlanetaryInfo object.
-        
-        # Geocentric, Tropical.
-        longitude = cusps[tropicalStr][houseCuspIndex]
-        latitude = 0.0
-        distance = 0.0
-        longitude_speed = 360.0
-        latitude_speed = 0.0
-        distance_speed = 0.0
-        rectascension = 0.0
-        declination = 0.0
-        rectascension_speed = 0.0
-        declination_speed = 0.0
-        distance_speed = 0.0
-        x = 0.0
-        y = 0.0
-        z = 0.0
-        dx = 0.0
-        dy = 0.0
-        dz = 0.0
-        
-        geocentricTropicalDict = \
-                {'longitude': longitude, 
-                 'latitude': latitude,
-                 'distance': distance,
-                 'longitude_speed': longitude_speed,
-                 'latitude_speed': latitude_speed,
-                 'distance_speed': distance_speed,
-                 'rectascension': rectascension, 
-                 'declination': declination,
-                 'distance': distance,
-                 'rectascension_speed': rectascension_speed,
-                 'declination_speed': declination_speed,
-                 'distance_speed': distance_speed,
-                 'X': x,
-                 'Y': y,
-                 'Z': z,
-                 'dX': dx,
-                 'dY': dy,
-                 'dZ': dz}
-
-        # Geocentric, Sidereal.
-        longitude = cusps[siderealStr][houseCuspIndex]
-        latitude = 0.0
-        distance = 0.0
-        longitude_speed = 360.0
-        latitude_speed = 0.0
-        distance_speed = 0.0
-        rectascension = 0.0
-        declination = 0.0
-        rectascension_speed = 0.0
-        declination_speed = 0.0
-        distance_speed = 0.0
-        x = 0.0
-        y = 0.0
-        z = 0.0
-        dx = 0.0
-        dy = 0.0
-        dz = 0.0
-        
-        geocentricSiderealDict = \
-                {'longitude': longitude, 
-                 'latitude': latitude,
-                 'distance': distance,
-                 'longitude_speed': longitude_speed,
-                 'latitude_speed': latitude_speed,
-                 'distance_speed': distance_speed,
-                 'rectascension': rectascension, 
-                 'declination': declination,
-                 'distance': distance,
-                 'rectascension_speed': rectascension_speed,
-                 'declination_speed': declination_speed,
-                 'distance_speed': distance_speed,
-                 'X': x,
-                 'Y': y,
-                 'Z': z,
-                 'dX': dx,
-                 'dY': dy,
-                 'dZ': dz}
-
-        # Topocentric, Tropical.  Not supported, so all values set to 0.0
-        longitude = 0.0
-        latitude = 0.0
-        distance = 0.0
-        longitude_speed = 0.0
-        latitude_speed = 0.0
-        distance_speed = 0.0
-        rectascension = 0.0
-        declination = 0.0
-        rectascension_speed = 0.0
-        declination_speed = 0.0
-        distance_speed = 0.0
-        x = 0.0
-        y = 0.0
-        z = 0.0
-        dx = 0.0
-        dy = 0.0
-        dz = 0.0
-        
-        topocentricTropicalDict = \
-                {'longitude': longitude, 
-                 'latitude': latitude,
-                 'distance': distance,
-                 'longitude_speed': longitude_speed,
-                 'latitude_speed': latitude_speed,
-                 'distance_speed': distance_speed,
-                 'rectascension': rectascension, 
-                 'declination': declination,
-                 'distance': distance,
-                 'rectascension_speed': rectascension_speed,
-                 'declination_speed': declination_speed,
-                 'distance_speed': distance_speed,
-                 'X': x,
-                 'Y': y,
-                 'Z': z,
-                 'dX': dx,
-                 'dY': dy,
-                 'dZ': dz}
-
-        # Topocentric, Sidereal.  Not supported, so all values set to 0.0
-        longitude = 0.0
-        latitude = 0.0
-        distance = 0.0
-        longitude_speed = 0.0
-        latitude_speed = 0.0
-        distance_speed = 0.0
-        rectascension = 0.0
-        declination = 0.0
-        rectascension_speed = 0.0
-        declination_speed = 0.0
-        distance_speed = 0.0
-        x = 0.0
-        y = 0.0
-        z = 0.0
-        dx = 0.0
-        dy = 0.0
-        dz = 0.0
-        
-        topocentricSiderealDict = \
-                {'longitude': longitude, 
-                 'latitude': latitude,
-                 'distance': distance,
-                 'longitude_speed': longitude_speed,
-                 'latitude_speed': latitude_speed,
-                 'distance_speed': distance_speed,
-                 'rectascension': rectascension, 
-                 'declination': declination,
-                 'distance': distance,
-                 'rectascension_speed': rectascension_speed,
-                 'declination_speed': declination_speed,
-                 'distance_speed': distance_speed,
-                 'X': x,
-                 'Y': y,
-                 'Z': z,
-                 'dX': dx,
-                 'dY': dy,
-                 'dZ': dz}
-
-        # Heliocentric, Tropical.  Not supported, so all values set to 0.0
-        longitude = 0.0
-        latitude = 0.0
-        distance = 0.0
-        longitude_speed = 0.0
-        latitude_speed = 0.0
-        distance_speed = 0.0
-        rectascension = 0.0
-        declination = 0.0
-        rectascension_speed = 0.0
-        declination_speed = 0.0
-        distance_speed = 0.0
-        x = 0.0
-        y = 0.0
-        z = 0.0
-        dx = 0.0
-        dy = 0.0
-        dz = 0.0
-        
-        heliocentricTropicalDict = \
-                {'longitude': longitude, 
-                 'latitude': latitude,
-                 'distance': distance,
-                 'longitude_speed': longitude_speed,
-                 'latitude_speed': latitude_speed,
-                 'distance_speed': distance_speed,
-                 'rectascension': rectascension, 
-                 'declination': declination,
-                 'distance': distance,
-                 'rectascension_speed': rectascension_speed,
-                 'declination_speed': declination_speed,
-                 'distance_speed': distance_speed,
-                 'X': x,
-                 'Y': y,
-                 'Z': z,
-                 'dX': dx,
-                 'dY': dy,
-                 'dZ': dz}
-
-        # Heliocentric, Sidereal.  Not supported, so all values set to 0.0
-        longitude = 0.0
-        latitude = 0.0
-        distance = 0.0
-        longitude_speed = 0.0
-        latitude_speed = 0.0
-        distance_speed = 0.0
-        rectascension = 0.0
-        declination = 0.0
-        rectascension_speed = 0.0
-        declination_speed = 0.0
-        distance_speed = 0.0
-        x = 0.0
-        y = 0.0
-        z = 0.0
-        dx = 0.0
-        dy = 0.0
-        dz = 0.0
-        
-        heliocentricSiderealDict = \
-                {'longitude': longitude, 
-                 'latitude': latitude,
-                 'distance': distance,
-                 'longitude_speed': longitude_speed,
-                 'latitude_speed': latitude_speed,
-                 'distance_speed': distance_speed,
-                 'rectascension': rectascension, 
-                 'declination': declination,
-                 'distance': distance,
-                 'rectascension_speed': rectascension_speed,
-                 'declination_speed': declination_speed,
-                 'distance_speed': distance_speed,
-                 'X': x,
-                 'Y': y,
-                 'Z': z,
-                 'dX': dx,
-                 'dY': dy,
-                 'dZ': dz}
-
-        # Dictionary holding all the geocentric information.
-        geocentricDict = {'tropical': geocentricTropicalDict,
-                          'sidereal': geocentricSiderealDict}
-
-        # Dictionary holding all the topocentric information.
-        topocentricDict = {'tropical': topocentricTropicalDict,
-                           'sidereal': topocentricSiderealDict}
-
-        # Dictionary holding all the heliocentric information.
-        heliocentricDict = {'tropical': heliocentricTropicalDict,
-                            'sidereal': heliocentricSiderealDict}
-
         # Create the PlanetaryInfo object.
-        planetaryInfo = PlanetaryInfo(planetName,
-                                      planetId,
-                                      dt,
-                                      jd,
-                                      geocentricDict,
-                                      topocentricDict,
-                                      heliocentricDict)
+        planetaryInfo = \
+            Ephemeris.__createHousePlanetaryInfo(\
+            planetName, dt, jd,
+            cusps['tropical'][houseCuspIndex],
+            cusps['sidereal'][houseCuspIndex])
 
         if Ephemeris.log.isEnabledFor(logging.DEBUG) == True:
             functName = inspect.stack()[0][3]
@@ -2935,10 +3806,10 @@ class Ephemeris:
         # Obtain the house cusps.
         (tropicalCusps, tropicalAscmc) = \
             Ephemeris.swe_houses_ex(jd, 
-                                    Ephemeris.geoLatitudeDeg, 
-                                    Ephemeris.geoLongitudeDeg,
+                                    Ephemeris.getContext().geoLatitudeDeg, 
+                                    Ephemeris.getContext().geoLongitudeDeg,
                                     houseSystem,
-                                    Ephemeris.iflag)
+                                    Ephemeris.threadState.iflag)
         
         # Get the house cusps in the sidereal zodiac coordinates.
         Ephemeris.setSiderealZodiac()
@@ -2947,10 +3818,10 @@ class Ephemeris:
         # Obtain the house cusps.
         (siderealCusps, siderealAscmc) = \
             Ephemeris.swe_houses_ex(jd, 
-                                    Ephemeris.geoLatitudeDeg, 
-                                    Ephemeris.geoLongitudeDeg,
+                                    Ephemeris.getContext().geoLatitudeDeg, 
+                                    Ephemeris.getContext().geoLongitudeDeg,
                                     houseSystem,
-                                    Ephemeris.iflag)
+                                    Ephemeris.threadState.iflag)
 
         # Put the values into dictionaries.
         tropicalAscmcDict = \
@@ -3056,294 +3927,199 @@ class Ephemeris:
                                 "(): Unsupported planet name specified.")
             return None
 
-        # Store some str in variables so they don't get instantiated a
-        # bunch of times.
-        tropicalStr = "tropical"
-        siderealStr = "sidereal"
-        
-        # Planet ID.
-        # Here we will use an invalid planet ID.
-        #
-        # (Note: The number chosen has no meaning.
-        # I couldn't use -1, because -1 stands for SE_ECL_NUT.
-        # See documentation of the Swiss Ephemeris, in
-        # file: pyswisseph-1.77.00-0/doc/swephprg.htm)
-        #
-        planetId = -9999
-        
         # julian day for the timestamp.
         jd = Ephemeris.datetimeToJulianDay(dt)
         
         # Get the tuple holding values for the ascmc locations.
         ascmc = Ephemeris.getAscmc(dt, houseSystem)
         
-        # Now fill out the dictionaries that go into a PlanetaryInfo object.
-        
-        # Geocentric, Tropical.
-        longitude = ascmc[tropicalStr][planetName]
-        latitude = 0.0
-        distance = 0.0
-        longitude_speed = 360.0
-        latitude_speed = 0.0
-        distance_speed = 0.0
-        rectascension = 0.0
-        declination = 0.0
-        rectascension_speed = 0.0
-        declination_speed = 0.0
-        distance_speed = 0.0
-        x = 0.0
-        y = 0.0
-        z = 0.0
-        dx = 0.0
-        dy = 0.0
-        dz = 0.0
+        # Create the PlanetaryInfo object.
+        planetaryInfo = \
+            Ephemeris.__createHousePlanetaryInfo(\
+            planetName, dt, jd,
+            ascmc['tropical'][planetName],
+            ascmc['sidereal'][planetName])
         
-        geocentricTropicalDict = \
-                {'longitude': longitude, 
-                 'latitude': latitude,
-                 'distance': distance,
-                 'longitude_speed': longitude_speed,
-                 'latitude_speed': latitude_speed,
-                 'distance_speed': distance_speed,
-                 'rectascension': rectascension, 
-                 'declination': declination,
-                 'distance': distance,
-                 'rectascension_speed': rectascension_speed,
-                 'declination_speed': declination_speed,
-                 'distance_speed': distance_speed,
-                 'X': x,
-                 'Y': y,
-                 'Z': z,
-                 'dX': dx,
-                 'dY': dy,
-                 'dZ': dz}
+        if Ephemeris.log.isEnabledFor(logging.DEBUG) == True:
+            functName = inspect.stack()[0][3]
+            Ephemeris.log.debug("Exiting " + functName + \
+                                "({}, {}, {})".\
+                                format(planetName,
+                                       Ephemeris.datetimeToStr(dt),
+                                       houseSystem))
         
-        # Geocentric, Sidereal.
-        longitude = ascmc[siderealStr][planetName]
-        latitude = 0.0
-        distance = 0.0
-        longitude_speed = 360.0
-        latitude_speed = 0.0
-        distance_speed = 0.0
-        rectascension = 0.0
-        declination = 0.0
-        rectascension_speed = 0.0
-        declination_speed = 0.0
-        distance_speed = 0.0
-        x = 0.0
-        y = 0.0
-        z = 0.0
-        dx = 0.0
-        dy = 0.0
-        dz = 0.0
+        return planetaryInfo
         
-        geocentricSiderealDict = \
-                {'longitude': longitude, 
-                 'latitude': latitude,
-                 'distance': distance,
-                 'longitude_speed': longitude_speed,
-                 'latitude_speed': latitude_speed,
-                 'distance_speed': distance_speed,
-                 'rectascension': rectascension, 
-                 'declination': declination,
-                 'distance': distance,
-                 'rectascension_speed': rectascension_speed,
-                 'declination_speed': declination_speed,
-                 'distance_speed': distance_speed,
-                 'X': x,
-                 'Y': y,
-                 'Z': z,
-                 'dX': dx,
-                 'dY': dy,
-                 'dZ': dz}
+    @staticmethod
+    def getAllHousePlanetaryInfos(dt, houseSystem=HouseSys['Porphyry']):
+        """Returns the PlanetaryInfos of all the house cusp planets
+        (H1 through H12) and all the ascmc planets (Ascendant, MC,
+        ARMC, Vertex, EquatorialAscendant, CoAscendant1, CoAscendant2,
+        PolarAscendant) at the given timestamp.
 
-        # Topocentric, Tropical.  Not supported, so all values set to 0.0
-        longitude = 0.0
-        latitude = 0.0
-        distance = 0.0
-        longitude_speed = 0.0
-        latitude_speed = 0.0
-        distance_speed = 0.0
-        rectascension = 0.0
-        declination = 0.0
-        rectascension_speed = 0.0
-        declination_speed = 0.0
-        distance_speed = 0.0
-        x = 0.0
-        y = 0.0
-        z = 0.0
-        dx = 0.0
-        dy = 0.0
-        dz = 0.0
-        
-        topocentricTropicalDict = \
-                {'longitude': longitude, 
-                 'latitude': latitude,
-                 'distance': distance,
-                 'longitude_speed': longitude_speed,
-                 'latitude_speed': latitude_speed,
-                 'distance_speed': distance_speed,
-                 'rectascension': rectascension, 
-                 'declination': declination,
-                 'distance': distance,
-                 'rectascension_speed': rectascension_speed,
-                 'declination_speed': declination_speed,
-                 'distance_speed': distance_speed,
-                 'X': x,
-                 'Y': y,
-                 'Z': z,
-                 'dX': dx,
-                 'dY': dy,
-                 'dZ': dz}
+        This is equivalent to calling getHouseCuspPlanetaryInfo() and
+        getAscmcPlanetaryInfo() for each of those planets, but
+        swe_houses_ex() is only called once for each zodiac type
+        instead of twice per planet.
 
-        # Topocentric, Sidereal.  Not supported, so all values set to 0.0
-        longitude = 0.0
-        latitude = 0.0
-        distance = 0.0
-        longitude_speed = 0.0
-        latitude_speed = 0.0
-        distance_speed = 0.0
-        rectascension = 0.0
-        declination = 0.0
-        rectascension_speed = 0.0
-        declination_speed = 0.0
-        distance_speed = 0.0
-        x = 0.0
-        y = 0.0
-        z = 0.0
-        dx = 0.0
-        dy = 0.0
-        dz = 0.0
-        
-        topocentricSiderealDict = \
-                {'longitude': longitude, 
-                 'latitude': latitude,
-                 'distance': distance,
-                 'longitude_speed': longitude_speed,
-                 'latitude_speed': latitude_speed,
-                 'distance_speed': distance_speed,
-                 'rectascension': rectascension, 
-                 'declination': declination,
-                 'distance': distance,
-                 'rectascension_speed': rectascension_speed,
-                 'declination_speed': declination_speed,
-                 'distance_speed': distance_speed,
-                 'X': x,
-                 'Y': y,
-                 'Z': z,
-                 'dX': dx,
-                 'dY': dy,
-                 'dZ': dz}
+        Preconditions: 
 
-        # Heliocentric, Tropical.  Not supported, so all values set to 0.0
-        longitude = 0.0
-        latitude = 0.0
-        distance = 0.0
-        longitude_speed = 0.0
-        latitude_speed = 0.0
-        distance_speed = 0.0
-        rectascension = 0.0
-        declination = 0.0
-        rectascension_speed = 0.0
-        declination_speed = 0.0
-        distance_speed = 0.0
-        x = 0.0
-        y = 0.0
-        z = 0.0
-        dx = 0.0
-        dy = 0.0
-        dz = 0.0
-        
-        heliocentricTropicalDict = \
-                {'longitude': longitude, 
-                 'latitude': latitude,
-                 'distance': distance,
-                 'longitude_speed': longitude_speed,
-                 'latitude_speed': latitude_speed,
-                 'distance_speed': distance_speed,
-                 'rectascension': rectascension, 
-                 'declination': declination,
-                 'distance': distance,
-                 'rectascension_speed': rectascension_speed,
-                 'declination_speed': declination_speed,
-                 'distance_speed': distance_speed,
-                 'X': x,
-                 'Y': y,
-                 'Z': z,
-                 'dX': dx,
-                 'dY': dy,
-                 'dZ': dz}
+            Ephemeris.setGeographicPosition() has been called previously.
 
-        # Heliocentric, Sidereal.  Not supported, so all values set to 0.0
-        longitude = 0.0
-        latitude = 0.0
-        distance = 0.0
-        longitude_speed = 0.0
-        latitude_speed = 0.0
-        distance_speed = 0.0
-        rectascension = 0.0
-        declination = 0.0
-        rectascension_speed = 0.0
-        declination_speed = 0.0
-        distance_speed = 0.0
-        x = 0.0
-        y = 0.0
-        z = 0.0
-        dx = 0.0
-        dy = 0.0
-        dz = 0.0
-        
-        heliocentricSiderealDict = \
-                {'longitude': longitude, 
-                 'latitude': latitude,
-                 'distance': distance,
-                 'longitude_speed': longitude_speed,
-                 'latitude_speed': latitude_speed,
-                 'distance_speed': distance_speed,
-                 'rectascension': rectascension, 
-                 'declination': declination,
-                 'distance': distance,
-                 'rectascension_speed': rectascension_speed,
-                 'declination_speed': declination_speed,
-                 'distance_speed': distance_speed,
-                 'X': x,
-                 'Y': y,
-                 'Z': z,
-                 'dX': dx,
-                 'dY': dy,
-                 'dZ': dz}
+        Parameters:
+        dt          - datetime.datetime object holding the timestamp at which 
+                      to do the lookup.  Timezone information is automatically
+                      converted to UTC for getting the planetary info.
+        houseSystem - byte string of length 1 for the house system to
+                      use.  See getHouseCuspPlanetaryInfo() for the
+                      supported values, or use the dict at
+                      Ephemeris.HouseSys.
 
-        # Dictionary holding all the geocentric information.
-        geocentricDict = {'tropical': geocentricTropicalDict,
-                          'sidereal': geocentricSiderealDict}
+        Returns:
+        dict mapping the planet name (e.g. "H1", "Ascendant") to the
+        PlanetaryInfo object for that planet.
+        If there is an error or invalid input, None is returned.
+        """
 
-        # Dictionary holding all the topocentric information.
-        topocentricDict = {'tropical': topocentricTropicalDict,
-                           'sidereal': topocentricSiderealDict}
+        if Ephemeris.log.isEnabledFor(logging.DEBUG) == True:
+            functName = inspect.stack()[0][3]
+            Ephemeris.log.debug("Entered " + functName + \
+                                "({}, {})".\
+                                format(Ephemeris.datetimeToStr(dt),
+                                       houseSystem))
 
-        # Dictionary holding all the heliocentric information.
-        heliocentricDict = {'tropical': heliocentricTropicalDict,
-                            'sidereal': heliocentricSiderealDict}
+        # Validate input.
+        validHouseSystems = list(Ephemeris.HouseSys.values())
+        if houseSystem not in validHouseSystems:
+            Ephemeris.log.error("getAllHousePlanetaryInfos(): " + \
+                "Invalid house system specified: {}".format(houseSystem))
+            return None
 
-        # Create the PlanetaryInfo object.
-        planetaryInfo = PlanetaryInfo(planetName,
-                                      planetId,
-                                      dt,
-                                      jd,
-                                      geocentricDict,
-                                      topocentricDict,
-                                      heliocentricDict)
+        # julian day for the timestamp.
+        jd = Ephemeris.datetimeToJulianDay(dt)
+
+        # Obtain the house cusps and ascmc for each zodiac type.
+        cusps = {}
+        ascmc = {}
         
+        Ephemeris.setTropicalZodiac()
+        Ephemeris.unsetRadiansCoordinateSystemFlag()
+        (cusps['tropical'], ascmc['tropical']) = \
+            Ephemeris.swe_houses_ex(jd, 
+                                    Ephemeris.getContext().geoLatitudeDeg, 
+                                    Ephemeris.getContext().geoLongitudeDeg,
+                                    houseSystem,
+                                    Ephemeris.threadState.iflag)
+
+        Ephemeris.setSiderealZodiac()
+        Ephemeris.unsetRadiansCoordinateSystemFlag()
+        (cusps['sidereal'], ascmc['sidereal']) = \
+            Ephemeris.swe_houses_ex(jd, 
+                                    Ephemeris.getContext().geoLatitudeDeg, 
+                                    Ephemeris.getContext().geoLongitudeDeg,
+                                    houseSystem,
+                                    Ephemeris.threadState.iflag)
+
+        # Return value.
+        rv = {}
+        
+        for houseCuspIndex in range(12):
+            planetName = "H{}".format(houseCuspIndex + 1)
+            rv[planetName] = \
+                Ephemeris.__createHousePlanetaryInfo(\
+                planetName, dt, jd,
+                cusps['tropical'][houseCuspIndex],
+                cusps['sidereal'][houseCuspIndex])
+
+        ascmcPlanetNames = [\
+            "Ascendant",
+            "MC",
+            "ARMC",
+            "Vertex",
+            "EquatorialAscendant",
+            "CoAscendant1",
+            "CoAscendant2",
+            "PolarAscendant"]
+        
+        for ascmcIndex in range(len(ascmcPlanetNames)):
+            planetName = ascmcPlanetNames[ascmcIndex]
+            rv[planetName] = \
+                Ephemeris.__createHousePlanetaryInfo(\
+                planetName, dt, jd,
+                ascmc['tropical'][ascmcIndex],
+                ascmc['sidereal'][ascmcIndex])
+
         if Ephemeris.log.isEnabledFor(logging.DEBUG) == True:
             functName = inspect.stack()[0][3]
             Ephemeris.log.debug("Exiting " + functName + \
-                                "({}, {}, {})".\
-                                format(planetName,
-                                       Ephemeris.datetimeToStr(dt),
+                                "({}, {})".\
+                                format(Ephemeris.datetimeToStr(dt),
                                        houseSystem))
+
+        return rv
         
-        return planetaryInfo
-        
+    @staticmethod
+    def __createHousePlanetaryInfo(planetName, dt, jd,
+                                   tropicalLongitude,
+                                   siderealLongitude):
+        """Private function that creates the PlanetaryInfo for a house
+        cusp or ascmc planet.  Only the geocentric longitude and
+        longitude speed are supported for these planets.  The
+        longitude speed is set to 360.0 degrees per day, and all
+        other fields are set to 0.0.
+
+        Arguments:
+        planetName        - str holding the name of the planet.
+        dt                - datetime.datetime of the timestamp.
+        jd                - float julian day of the timestamp.
+        tropicalLongitude - float geocentric tropical longitude.
+        siderealLongitude - float geocentric sidereal longitude.
+
+        Returns:
+        PlanetaryInfo object for the planet.
+        """
+
+        # Planet ID.
+        # Here we will use an invalid planet ID.
+        #
+        # (Note: The number chosen has no meaning.
+        # I couldn't use -1, because -1 stands for SE_ECL_NUT.
+        # See documentation of the Swiss Ephemeris, in
+        # file: pyswisseph-1.77.00-0/doc/swephprg.htm)
+        #
+        planetId = -9999
+
+        zeroFields = {}
+        for fieldNames in Ephemeris.CoordinateSystemFieldNames.values():
+            for fieldName in fieldNames:
+                zeroFields[fieldName] = 0.0
+
+        def createFieldsDict(longitude, longitude_speed):
+            fields = zeroFields.copy()
+            fields['longitude'] = longitude
+            fields['longitude_speed'] = longitude_speed
+            return fields
+        
+        # Geocentric values.  Topocentric and heliocentric are not
+        # supported, so all values set to 0.0.
+        geocentricDict = \
+            {'tropical': createFieldsDict(tropicalLongitude, 360.0),
+             'sidereal': createFieldsDict(siderealLongitude, 360.0)}
+        topocentricDict = \
+            {'tropical': createFieldsDict(0.0, 0.0),
+             'sidereal': createFieldsDict(0.0, 0.0)}
+        heliocentricDict = \
+            {'tropical': createFieldsDict(0.0, 0.0),
+             'sidereal': createFieldsDict(0.0, 0.0)}
+
+        return PlanetaryInfo(planetName,
+                             planetId,
+                             dt,
+                             jd,
+                             geocentricDict,
+                             topocentricDict,
+                             heliocentricDict)
+
     @staticmethod
     def getPlanetaryInfo(planetName, dt):
         """Returns a PlanetaryInfo object with a bunch of information about a
@@ -3362,6 +4138,84 @@ class Ephemeris:
         object returned is the same timestamp passed into this function.
         See the class description for PlanetaryInfo for details on 
         all the fields available.
+
+        Results are kept in an LRU cache keyed on the planet name, the
+        Julian Day, the calculation flags that affect the results, and
+        the geographic position of the current EphemerisContext.  The
+        cache is shared by all threads.  See
+        setPlanetaryInfoCacheMaxSize() and getPlanetaryInfoCacheStats().
+        A new PlanetaryInfo object is returned on every call, so callers
+        may modify it freely.
+        """
+
+        if Ephemeris.planetaryInfoCacheMaxSize == 0:
+            return Ephemeris.__getPlanetaryInfoUncached(planetName, dt)
+
+        jd = Ephemeris.datetimeToJulianDay(dt)
+        flags = Ephemeris.threadState.iflag & \
+                ~Ephemeris.PlanetaryInfoCacheIgnoredFlags
+        context = Ephemeris.getContext()
+        key = (planetName, jd, flags,
+               context.geoLongitudeDeg,
+               context.geoLatitudeDeg,
+               context.geoAltitudeMeters)
+
+        cache = Ephemeris.planetaryInfoCache
+
+        with Ephemeris.planetaryInfoCacheLock:
+            pi = cache.get(key)
+            if pi != None:
+                Ephemeris.planetaryInfoCacheHits += 1
+                cache.move_to_end(key)
+            else:
+                Ephemeris.planetaryInfoCacheMisses += 1
+            
+        if pi == None:
+            # Calculate outside of the lock, so that other threads can
+            # use the cache in the meantime.
+            pi = Ephemeris.__getPlanetaryInfoUncached(planetName, dt)
+            if pi == None:
+                return None
+
+            with Ephemeris.planetaryInfoCacheLock:
+                cache[key] = pi
+                cache.move_to_end(key)
+                while len(cache) > Ephemeris.planetaryInfoCacheMaxSize:
+                    cache.popitem(last=False)
+
+        return Ephemeris.__copyPlanetaryInfo(pi, dt)
+
+    @staticmethod
+    def __copyPlanetaryInfo(planetaryInfo, dt):
+        """Private function that returns a copy of the given
+        PlanetaryInfo, with the field dicts copied so that changes to
+        the copy do not affect the original.  The 'dt' field of the
+        copy is set to the given datetime.
+        """
+
+        centricityDicts = []
+        for centricityDict in (planetaryInfo.geocentric,
+                               planetaryInfo.topocentric,
+                               planetaryInfo.heliocentric):
+            if centricityDict == None:
+                centricityDicts.append(None)
+            else:
+                centricityDicts.append(\
+                    {zodiacType : dict(fields) for (zodiacType, fields) \
+                     in centricityDict.items()})
+
+        return PlanetaryInfo(planetaryInfo.name,
+                             planetaryInfo.id,
+                             dt,
+                             planetaryInfo.julianDay,
+                             centricityDicts[0],
+                             centricityDicts[1],
+                             centricityDicts[2])
+
+    @staticmethod
+    def __getPlanetaryInfoUncached(planetName, dt):
+        """Private function that does the work of getPlanetaryInfo(),
+        without using the cache.
         """
 
         if Ephemeris.log.isEnabledFor(logging.DEBUG) == True:
@@ -3510,7 +4364,7 @@ class Ephemeris:
         Ephemeris.setTropicalZodiac()
         Ephemeris.setEclipticalCoordinateSystemFlag()
         (arg1, arg2, arg3, arg4, arg5, arg6) = \
-                Ephemeris.calc_ut(jd, planetId, Ephemeris.iflag)
+                Ephemeris.calc_ut(jd, planetId, Ephemeris.threadState.iflag)
         longitude = arg1
         latitude = arg2
         distance = arg3
@@ -3523,7 +4377,7 @@ class Ephemeris:
         Ephemeris.setTropicalZodiac()
         Ephemeris.setEquatorialCoordinateSystemFlag()
         (arg1, arg2, arg3, arg4, arg5, arg6) = \
-                Ephemeris.calc_ut(jd, planetId, Ephemeris.iflag)
+                Ephemeris.calc_ut(jd, planetId, Ephemeris.threadState.iflag)
         rectascension = arg1
         declination = arg2
         distance = arg3
@@ -3536,7 +4390,7 @@ class Ephemeris:
         Ephemeris.setTropicalZodiac()
         Ephemeris.setRectangularCoordinateSystemFlag()
         (arg1, arg2, arg3, arg4, arg5, arg6) = \
-                Ephemeris.calc_ut(jd, planetId, Ephemeris.iflag)
+                Ephemeris.calc_ut(jd, planetId, Ephemeris.threadState.iflag)
         x = arg1
         y = arg2
         z = arg3
@@ -3569,7 +4423,7 @@ class Ephemeris:
         Ephemeris.setSiderealZodiac()
         Ephemeris.setEclipticalCoordinateSystemFlag()
         (arg1, arg2, arg3, arg4, arg5, arg6) = \
-                Ephemeris.calc_ut(jd, planetId, Ephemeris.iflag)
+                Ephemeris.calc_ut(jd, planetId, Ephemeris.threadState.iflag)
         longitude = arg1
         latitude = arg2
         distance = arg3
@@ -3582,7 +4436,7 @@ class Ephemeris:
         Ephemeris.setSiderealZodiac()
         Ephemeris.setEquatorialCoordinateSystemFlag()
         (arg1, arg2, arg3, arg4, arg5, arg6) = \
-                Ephemeris.calc_ut(jd, planetId, Ephemeris.iflag)
+                Ephemeris.calc_ut(jd, planetId, Ephemeris.threadState.iflag)
         rectascension = arg1
         declination = arg2
         distance = arg3
@@ -3595,7 +4449,7 @@ class Ephemeris:
         Ephemeris.setSiderealZodiac()
         Ephemeris.setRectangularCoordinateSystemFlag()
         (arg1, arg2, arg3, arg4, arg5, arg6) = \
-                Ephemeris.calc_ut(jd, planetId, Ephemeris.iflag)
+                Ephemeris.calc_ut(jd, planetId, Ephemeris.threadState.iflag)
         x = arg1
         y = arg2
         z = arg3
@@ -3629,7 +4483,7 @@ class Ephemeris:
         Ephemeris.setTropicalZodiac()
         Ephemeris.setEclipticalCoordinateSystemFlag()
         (arg1, arg2, arg3, arg4, arg5, arg6) = \
-                Ephemeris.calc_ut(jd, planetId, Ephemeris.iflag)
+                Ephemeris.calc_ut(jd, planetId, Ephemeris.threadState.iflag)
         longitude = arg1
         latitude = arg2
         distance = arg3
@@ -3642,7 +4496,7 @@ class Ephemeris:
         Ephemeris.setTropicalZodiac()
         Ephemeris.setEquatorialCoordinateSystemFlag()
         (arg1, arg2, arg3, arg4, arg5, arg6) = \
-                Ephemeris.calc_ut(jd, planetId, Ephemeris.iflag)
+                Ephemeris.calc_ut(jd, planetId, Ephemeris.threadState.iflag)
         rectascension = arg1
         declination = arg2
         distance = arg3
@@ -3655,7 +4509,7 @@ class Ephemeris:
         Ephemeris.setTropicalZodiac()
         Ephemeris.setRectangularCoordinateSystemFlag()
         (arg1, arg2, arg3, arg4, arg5, arg6) = \
-                Ephemeris.calc_ut(jd, planetId, Ephemeris.iflag)
+                Ephemeris.calc_ut(jd, planetId, Ephemeris.threadState.iflag)
         x = arg1
         y = arg2
         z = arg3
@@ -3688,7 +4542,7 @@ class Ephemeris:
         Ephemeris.setSiderealZodiac()
         Ephemeris.setEclipticalCoordinateSystemFlag()
         (arg1, arg2, arg3, arg4, arg5, arg6) = \
-                Ephemeris.calc_ut(jd, planetId, Ephemeris.iflag)
+                Ephemeris.calc_ut(jd, planetId, Ephemeris.threadState.iflag)
         longitude = arg1
         latitude = arg2
         distance = arg3
@@ -3701,7 +4555,7 @@ class Ephemeris:
         Ephemeris.setSiderealZodiac()
         Ephemeris.setEquatorialCoordinateSystemFlag()
         (arg1, arg2, arg3, arg4, arg5, arg6) = \
-                Ephemeris.calc_ut(jd, planetId, Ephemeris.iflag)
+                Ephemeris.calc_ut(jd, planetId, Ephemeris.threadState.iflag)
         rectascension = arg1
         declination = arg2
         distance = arg3
@@ -3714,7 +4568,7 @@ class Ephemeris:
         Ephemeris.setSiderealZodiac()
         Ephemeris.setRectangularCoordinateSystemFlag()
         (arg1, arg2, arg3, arg4, arg5, arg6) = \
-                Ephemeris.calc_ut(jd, planetId, Ephemeris.iflag)
+                Ephemeris.calc_ut(jd, planetId, Ephemeris.threadState.iflag)
         x = arg1
         y = arg2
         z = arg3
@@ -3747,7 +4601,7 @@ class Ephemeris:
         Ephemeris.setTropicalZodiac()
         Ephemeris.setEclipticalCoordinateSystemFlag()
         (arg1, arg2, arg3, arg4, arg5, arg6) = \
-                Ephemeris.calc_ut(jd, planetId, Ephemeris.iflag)
+                Ephemeris.calc_ut(jd, planetId, Ephemeris.threadState.iflag)
         longitude = arg1
         latitude = arg2
         distance = arg3
@@ -3760,7 +4614,7 @@ class Ephemeris:
         Ephemeris.setTropicalZodiac()
         Ephemeris.setEquatorialCoordinateSystemFlag()
         (arg1, arg2, arg3, arg4, arg5, arg6) = \
-                Ephemeris.calc_ut(jd, planetId, Ephemeris.iflag)
+                Ephemeris.calc_ut(jd, planetId, Ephemeris.threadState.iflag)
         rectascension = arg1
         declination = arg2
         distance = arg3
@@ -3773,7 +4627,7 @@ class Ephemeris:
         Ephemeris.setTropicalZodiac()
         Ephemeris.setRectangularCoordinateSystemFlag()
         (arg1, arg2, arg3, arg4, arg5, arg6) = \
-                Ephemeris.calc_ut(jd, planetId, Ephemeris.iflag)
+                Ephemeris.calc_ut(jd, planetId, Ephemeris.threadState.iflag)
         x = arg1
         y = arg2
         z = arg3
@@ -3806,7 +4660,7 @@ class Ephemeris:
         Ephemeris.setSiderealZodiac()
         Ephemeris.setEclipticalCoordinateSystemFlag()
         (arg1, arg2, arg3, arg4, arg5, arg6) = \
-                Ephemeris.calc_ut(jd, planetId, Ephemeris.iflag)
+                Ephemeris.calc_ut(jd, planetId, Ephemeris.threadState.iflag)
         longitude = arg1
         latitude = arg2
         distance = arg3
@@ -3819,7 +4673,7 @@ class Ephemeris:
         Ephemeris.setSiderealZodiac()
         Ephemeris.setEquatorialCoordinateSystemFlag()
         (arg1, arg2, arg3, arg4, arg5, arg6) = \
-                Ephemeris.calc_ut(jd, planetId, Ephemeris.iflag)
+                Ephemeris.calc_ut(jd, planetId, Ephemeris.threadState.iflag)
         rectascension = arg1
         declination = arg2
         distance = arg3
@@ -3832,7 +4686,7 @@ class Ephemeris:
         Ephemeris.setSiderealZodiac()
         Ephemeris.setRectangularCoordinateSystemFlag()
         (arg1, arg2, arg3, arg4, arg5, arg6) = \
-                Ephemeris.calc_ut(jd, planetId, Ephemeris.iflag)
+                Ephemeris.calc_ut(jd, planetId, Ephemeris.threadState.iflag)
         x = arg1
         y = arg2
         z = arg3
@@ -3887,6 +4741,720 @@ class Ephemeris:
 
         return planetaryInfo
 
+    @staticmethod
+    def getPlanetaryInfoFields(planetName, dt,
+                               centricityTypes=None,
+                               zodiacTypes=None,
+                               coordinateSystems=None):
+        """Returns a PlanetaryInfo object for a planet at a given
+        date/time, but with only the requested subset of fields
+        calculated and populated.  This is much cheaper than
+        getPlanetaryInfo() when the caller only needs a few fields,
+        because each (centricity, zodiac, coordinate system)
+        combination that is not requested saves one call to the
+        Swiss Ephemeris.
+
+        Example:
+
+        # Only calculate the geocentric tropical longitude (and the other
+        # ecliptical fields returned in the same Swiss Ephemeris call).
+        p = Ephemeris.getPlanetaryInfoFields("Mars", dt,
+                                             ["geocentric"],
+                                             ["tropical"],
+                                             ["ecliptical"])
+        longitude = p.geocentric['tropical']['longitude']
+
+        Parameters:
+        planetName  - str that holds the name of the planet.
+        dt          - datetime.datetime object that represents the date 
+                      and time for which the info is requested.  This 
+                      object must have the tzinfo attribute defined 
+                      and it must created from pytz.
+        centricityTypes - list of str values, where each str is one of:
+                          "geocentric", "topocentric", "heliocentric".
+                          If None, then all centricity types are used.
+        zodiacTypes - list of str values, where each str is one of:
+                      "tropical", "sidereal".
+                      If None, then all zodiac types are used.
+        coordinateSystems - list of str values, where each str is one of:
+                            "ecliptical", "equatorial", "rectangular".
+                            If None, then all coordinate systems are used.
+                            Fields populated for each coordinate system
+                            are listed in 
+                            Ephemeris.CoordinateSystemFieldNames.
+        
+        Returns:
+        A PlanetaryInfo object for the given timestamp.  Only the
+        requested centricity dicts are set (the others are None), and
+        those dicts only hold the requested zodiac types, which in turn
+        only hold the fields of the requested coordinate systems.  
+        Field values are identical to the ones that would be
+        returned by getPlanetaryInfo(), with one exception: for
+        averaged and combination planets, the 'distance' and
+        'distance_speed' fields are combined only once here, whereas
+        createAveragedPlanetaryInfo() and
+        createCombinationPlanetaryInfo() combine them once for each
+        coordinate system that returns them.
+
+        If the planet name is unknown or if an invalid centricity
+        type, zodiac type or coordinate system is given, then None is
+        returned.
+        """
+
+        if Ephemeris.log.isEnabledFor(logging.DEBUG) == True:
+            debugStr = "Entered getPlanetaryInfoFields(planetName={}, " + \
+                       "datetime={}, centricityTypes={}, zodiacTypes={}, " + \
+                       "coordinateSystems={})"
+            Ephemeris.log.debug(debugStr.format(planetName, dt,
+                                                centricityTypes,
+                                                zodiacTypes,
+                                                coordinateSystems))
+
+        if centricityTypes == None:
+            centricityTypes = Ephemeris.CentricityTypes
+        if zodiacTypes == None:
+            zodiacTypes = Ephemeris.ZodiacTypes
+        if coordinateSystems == None:
+            coordinateSystems = Ephemeris.CoordinateSystems
+
+        # Validate input.
+        for centricityType in centricityTypes:
+            if centricityType not in Ephemeris.CentricityTypes:
+                Ephemeris.log.error("getPlanetaryInfoFields(): " + \
+                    "Invalid centricity type: {}".format(centricityType))
+                return None
+        for zodiacType in zodiacTypes:
+            if zodiacType not in Ephemeris.ZodiacTypes:
+                Ephemeris.log.error("getPlanetaryInfoFields(): " + \
+                    "Invalid zodiac type: {}".format(zodiacType))
+                return None
+        for coordinateSystem in coordinateSystems:
+            if coordinateSystem not in Ephemeris.CoordinateSystems:
+                Ephemeris.log.error("getPlanetaryInfoFields(): " + \
+                    "Invalid coordinate system: {}".format(coordinateSystem))
+                return None
+
+        # Get the planet id.
+        planetId = Ephemeris.getPlanetIdForName(planetName)
+
+        rv = None
+        
+        if planetId != None:
+            # Standard planet supported by the Swiss Ephemeris.
+            # Only do the calc_ut() calls that are needed.
+            jd = Ephemeris.datetimeToJulianDay(dt)
+
+            centricityDicts = {}
+            
+            for centricityType in centricityTypes:
+                centricityDict = {}
+                
+                for zodiacType in zodiacTypes:
+                    zodiacDict = {}
+
+                    # Iterate in the canonical coordinate system order
+                    # so that the shared 'distance' fields end up with
+                    # the same values as in getPlanetaryInfo().
+                    for coordinateSystem in Ephemeris.CoordinateSystems:
+                        if coordinateSystem not in coordinateSystems:
+                            continue
+                        
+                        Ephemeris.__setCalculationFlags(centricityType,
+                                                        zodiacType,
+                                                        coordinateSystem)
+                        values = \
+                            Ephemeris.calc_ut(jd, planetId, Ephemeris.threadState.iflag)
+                        
+                        fieldNames = \
+                            Ephemeris.CoordinateSystemFieldNames[coordinateSystem]
+                        for i in range(len(fieldNames)):
+                            zodiacDict[fieldNames[i]] = values[i]
+
+                    centricityDict[zodiacType] = zodiacDict
+                    
+                centricityDicts[centricityType] = centricityDict
+
+            rv = PlanetaryInfo(planetName,
+                               planetId,
+                               dt,
+                               jd,
+                               centricityDicts.get("geocentric"),
+                               centricityDicts.get("topocentric"),
+                               centricityDicts.get("heliocentric"))
+            
+        elif planetName in Ephemeris.AveragedPlanetComponents or \
+             planetName in Ephemeris.CombinationPlanetComponents:
+            
+            # Obtain the component planets with only the requested
+            # fields, and then combine them.
+            if planetName in Ephemeris.AveragedPlanetComponents:
+                componentPlanetNames = \
+                    Ephemeris.AveragedPlanetComponents[planetName]
+            else:
+                componentPlanetNames = \
+                    Ephemeris.CombinationPlanetComponents[planetName]
+
+            planetaryInfos = []
+            for componentPlanetName in componentPlanetNames:
+                pi = Ephemeris.getPlanetaryInfoFields(componentPlanetName,
+                                                      dt,
+                                                      centricityTypes,
+                                                      zodiacTypes,
+                                                      coordinateSystems)
+                if pi == None:
+                    return None
+                planetaryInfos.append(pi)
+
+            if planetName in Ephemeris.AveragedPlanetComponents:
+                rv = Ephemeris.__createAveragedPlanetaryInfoFields(\
+                    planetName, planetaryInfos)
+            else:
+                rv = Ephemeris.__createCombinationPlanetaryInfoFields(\
+                    planetName, planetaryInfos)
+            
+        else:
+            # House cusps and ascmc planets.  These are calculated
+            # together from swe_houses_ex(), so there is nothing to
+            # save by calculating field-by-field.  Get the full
+            # PlanetaryInfo and then trim it down.
+            pi = Ephemeris.getPlanetaryInfo(planetName, dt)
+            if pi == None:
+                return None
+
+            rv = Ephemeris.__trimPlanetaryInfoFields(pi,
+                                                     centricityTypes,
+                                                     zodiacTypes,
+                                                     coordinateSystems)
+
+        if Ephemeris.log.isEnabledFor(logging.DEBUG) == True:
+            debugStr = "Exiting getPlanetaryInfoFields(planetName={}, " + \
+                       "datetime={})"
+            Ephemeris.log.debug(debugStr.format(planetName, dt))
+
+        return rv
+
+    @staticmethod
+    def __setCalculationFlags(centricityType, zodiacType, coordinateSystem):
+        """Private function that sets the flags for the given centricity
+        type, zodiac type and coordinate system, in preparation for a
+        call to calc_ut().
+        
+        Arguments:
+        centricityType   - str that is one of Ephemeris.CentricityTypes.
+        zodiacType       - str that is one of Ephemeris.ZodiacTypes.
+        coordinateSystem - str that is one of Ephemeris.CoordinateSystems.
+        """
+
+        if centricityType == "geocentric":
+            Ephemeris.setGeocentricCalculations()
+        elif centricityType == "topocentric":
+            Ephemeris.setTopocentricCalculations()
+        elif centricityType == "heliocentric":
+            Ephemeris.setHeliocentricCalculations()
+
+        if zodiacType == "tropical":
+            Ephemeris.setTropicalZodiac()
+        elif zodiacType == "sidereal":
+            Ephemeris.setSiderealZodiac()
+
+        if coordinateSystem == "ecliptical":
+            Ephemeris.setEclipticalCoordinateSystemFlag()
+        elif coordinateSystem == "equatorial":
+            Ephemeris.setEquatorialCoordinateSystemFlag()
+        elif coordinateSystem == "rectangular":
+            Ephemeris.setRectangularCoordinateSystemFlag()
+
+    @staticmethod
+    def __getPlanetaryInfoCentricityDict(planetaryInfo, centricityType):
+        """Private function that returns the dict of the given
+        PlanetaryInfo for the centricity type specified.
+        """
+
+        if centricityType == "geocentric":
+            return planetaryInfo.geocentric
+        elif centricityType == "topocentric":
+            return planetaryInfo.topocentric
+        elif centricityType == "heliocentric":
+            return planetaryInfo.heliocentric
+        else:
+            return None
+
+    @staticmethod
+    def __trimPlanetaryInfoFields(planetaryInfo,
+                                  centricityTypes,
+                                  zodiacTypes,
+                                  coordinateSystems):
+        """Private function that returns a new PlanetaryInfo with only
+        the centricity types, zodiac types and coordinate system fields
+        specified copied over from the given fully populated
+        PlanetaryInfo.
+        """
+
+        fieldNames = []
+        for coordinateSystem in coordinateSystems:
+            fieldNames.extend(\
+                Ephemeris.CoordinateSystemFieldNames[coordinateSystem])
+
+        centricityDicts = {}
+        
+        for centricityType in centricityTypes:
+            srcCentricityDict = \
+                Ephemeris.__getPlanetaryInfoCentricityDict(planetaryInfo,
+                                                           centricityType)
+            centricityDict = {}
+            for zodiacType in zodiacTypes:
+                zodiacDict = {}
+                for fieldName in fieldNames:
+                    zodiacDict[fieldName] = \
+                        srcCentricityDict[zodiacType][fieldName]
+                centricityDict[zodiacType] = zodiacDict
+            centricityDicts[centricityType] = centricityDict
+
+        rv = PlanetaryInfo(planetaryInfo.name,
+                           planetaryInfo.id,
+                           planetaryInfo.dt,
+                           planetaryInfo.julianDay,
+                           centricityDicts.get("geocentric"),
+                           centricityDicts.get("topocentric"),
+                           centricityDicts.get("heliocentric"))
+        
+        return rv
+        
+    @staticmethod
+    def __createAveragedPlanetaryInfoFields(planetName, planetaryInfos):
+        """Private function that does the same thing as
+        createAveragedPlanetaryInfo(), but it works on PlanetaryInfo
+        objects that are only partially populated (as returned by
+        getPlanetaryInfoFields()).  Only the fields that are present
+        in the PlanetaryInfo objects are averaged.
+
+        Arguments:
+        planetName     - Name of the new PlanetaryInfo to create.
+        planetaryInfos - list of PlanetaryInfo objects that all have the
+                         same fields populated.
+
+        Returns:
+        PlanetaryInfo object that represents the average of the given planets.
+        """
+
+        numPIs = len(planetaryInfos)
+        if numPIs == 0:
+            functName = inspect.stack()[0][3]
+            Ephemeris.log.warn("Passed an empty list of PlanetaryInfos to " + \
+                               functName + "()")
+            return None
+
+        # Start off with a copy of the first PlanetaryInfo.
+        rv = copy.deepcopy(planetaryInfos[0])
+        rv.name = planetName
+
+        # Use an invalid planet ID.
+        #
+        # (Note: The number chosen has no meaning.
+        # I couldn't use -1, because -1 stands for SE_ECL_NUT.
+        # See documentation of the Swiss Ephemeris, in
+        # file: pyswisseph-1.77.00-0/doc/swephprg.htm)
+        #
+        rv.id = -9999
+
+        for centricityType in Ephemeris.CentricityTypes:
+            rvCentricityDict = \
+                Ephemeris.__getPlanetaryInfoCentricityDict(rv, centricityType)
+            if rvCentricityDict == None:
+                continue
+            
+            for zodiacType, zodiacDict in rvCentricityDict.items():
+                for fieldName in zodiacDict.keys():
+                    # Sum the field values.
+                    for p in planetaryInfos[1:]:
+                        zodiacDict[fieldName] += \
+                            Ephemeris.__getPlanetaryInfoCentricityDict(\
+                            p, centricityType)[zodiacType][fieldName]
+
+                    zodiacDict[fieldName] /= numPIs
+                    
+        return rv
+        
+    @staticmethod
+    def __createCombinationPlanetaryInfoFields(planetName, planetaryInfos):
+        """Private function that does the same thing as
+        createCombinationPlanetaryInfo(), but it works on PlanetaryInfo
+        objects that are only partially populated (as returned by
+        getPlanetaryInfoFields()).  Only the fields that are present
+        in the PlanetaryInfo objects are combined.
+
+        Arguments:
+        planetName     - Name of the new PlanetaryInfo to create.
+        planetaryInfos - list of PlanetaryInfo objects that all have the
+                         same fields populated.
+
+        Returns:
+        PlanetaryInfo object that represents the combination of the
+        given planets.
+        """
+
+        numPIs = len(planetaryInfos)
+        if numPIs == 0:
+            functName = inspect.stack()[0][3]
+            Ephemeris.log.warn("Passed an empty list of PlanetaryInfos to " + \
+                               functName + "()")
+            return None
+        
+        # Start off with a copy of the last PlanetaryInfo in the list,
+        # and combine moving towards the front of the list.
+        rv = copy.deepcopy(planetaryInfos[-1])
+        rv.name = planetName
+        
+        # Use an invalid planet ID.
+        #
+        # (Note: The number chosen has no meaning.
+        # I couldn't use -1, because -1 stands for SE_ECL_NUT.
+        # See documentation of the Swiss Ephemeris, in
+        # file: pyswisseph-1.77.00-0/doc/swephprg.htm)
+        #
+        rv.id = -9999
+
+        i = numPIs - 2
+        while i >= 0:
+            p = planetaryInfos[i]
+            
+            for centricityType in Ephemeris.CentricityTypes:
+                rvCentricityDict = \
+                    Ephemeris.__getPlanetaryInfoCentricityDict(rv,
+                                                               centricityType)
+                if rvCentricityDict == None:
+                    continue
+                pCentricityDict = \
+                    Ephemeris.__getPlanetaryInfoCentricityDict(p,
+                                                               centricityType)
+                
+                for zodiacType, zodiacDict in rvCentricityDict.items():
+                    for fieldName in zodiacDict.keys():
+                        zodiacDict[fieldName] = \
+                            pCentricityDict[zodiacType][fieldName] - \
+                            zodiacDict[fieldName]
+
+                    # Normalize the longitude value that resulted
+                    # from the combining.  Longitude values will
+                    # always be in the range [0, 360).
+                    if 'longitude' in zodiacDict:
+                        zodiacDict['longitude'] = \
+                            Ephemeris.__toNormalizedAngle(\
+                            zodiacDict['longitude'])
+
+            i = i - 1
+
+        return rv
+
+    @staticmethod
+    def getPlanetaryInfoBatch(planetNames, julianDays, fields,
+                              houseSystem=HouseSys['Porphyry']):
+        """Returns the values of the requested PlanetaryInfo fields
+        for many planets over many timestamps, in a single pass.  
+
+        This avoids creating a datetime.datetime, the nested dicts
+        and a PlanetaryInfo object for every timestamp, and it only
+        sets the calculation flags once per (centricity, zodiac,
+        coordinate system) combination, which makes it suitable for
+        generating long daily or hourly ephemerides.
+
+        Example:
+
+        # Daily geocentric tropical longitudes of the Sun and Moon
+        # for 50 years.
+        startJd = Ephemeris.datetimeToJulianDay(startDt)
+        julianDays = [startJd + i for i in range(50 * 366)]
+        fields = [("geocentric", "tropical", "longitude")]
+        columns = Ephemeris.getPlanetaryInfoBatch(["Sun", "Moon"],
+                                                  julianDays,
+                                                  fields)
+        moonLongitudes = \\
+            columns["Moon"][("geocentric", "tropical", "longitude")]
+
+        Parameters:
+        planetNames - list of str holding the names of the planets.
+        julianDays  - list (or other sequence) of float values that are
+                      the Julian Days (UT) to do the calculations for.
+        fields      - list of tuples, where each tuple is:
+                      (centricityType, zodiacType, fieldName)
+
+                      centricityType is one of Ephemeris.CentricityTypes,
+                      zodiacType is one of Ephemeris.ZodiacTypes, and
+                      fieldName is any field name from 
+                      Ephemeris.CoordinateSystemFieldNames
+                      (e.g. 'longitude', 'declination', 'X').
+        houseSystem - byte string of length 1 for the house system to use
+                      for house cusp and ascmc planets.  See 
+                      Ephemeris.HouseSys.
+
+        Returns:
+        dict mapping each planet name to a dict that maps each tuple in
+        'fields' to an array.array('d') holding the field values, with
+        one value per Julian Day in 'julianDays'.  The arrays support
+        the buffer protocol, so they can be wrapped without copying
+        (e.g. numpy.frombuffer(column)).  Values are the same values
+        that getPlanetaryInfoFields() would return.
+
+        If a planet name is unknown or if an invalid field is given,
+        then None is returned.
+        """
+
+        if Ephemeris.log.isEnabledFor(logging.DEBUG) == True:
+            debugStr = "Entered getPlanetaryInfoBatch(planetNames={}, " + \
+                       "len(julianDays)={}, fields={})"
+            Ephemeris.log.debug(debugStr.format(planetNames,
+                                                len(julianDays),
+                                                fields))
+
+        # Validate input.
+        validFieldNames = []
+        for fieldNames in Ephemeris.CoordinateSystemFieldNames.values():
+            validFieldNames.extend(fieldNames)
+            
+        for field in fields:
+            if len(field) != 3 or \
+               field[0] not in Ephemeris.CentricityTypes or \
+               field[1] not in Ephemeris.ZodiacTypes or \
+               field[2] not in validFieldNames:
+                
+                Ephemeris.log.error("getPlanetaryInfoBatch(): " + \
+                    "Invalid field specified: {}".format(field))
+                return None
+
+        rv = {}
+
+        for planetName in planetNames:
+            columns = \
+                Ephemeris.__getPlanetaryInfoBatchColumns(planetName,
+                                                         julianDays,
+                                                         fields,
+                                                         houseSystem)
+            if columns == None:
+                return None
+            
+            rv[planetName] = columns
+
+        if Ephemeris.log.isEnabledFor(logging.DEBUG) == True:
+            Ephemeris.log.debug("Exiting getPlanetaryInfoBatch()")
+
+        return rv
+
+    @staticmethod
+    def __getPlanetaryInfoBatchColumns(planetName, julianDays, fields,
+                                       houseSystem):
+        """Private function that does the work of getPlanetaryInfoBatch()
+        for a single planet.
+
+        Returns:
+        dict mapping each tuple in 'fields' to an array.array('d')
+        of values, or None if the planet name is unknown.
+        """
+
+        numValues = len(julianDays)
+        
+        # Return value.
+        columns = {}
+        for field in fields:
+            columns[field] = array.array('d', [0.0]) * numValues
+
+        planetId = Ephemeris.getPlanetIdForName(planetName)
+        
+        if planetId != None:
+            # Standard planet supported by the Swiss Ephemeris.
+            # Group the fields by the calc_ut() call that produces
+            # them, so that the flags are set only once per group.
+            groups = {}
+            for field in fields:
+                (centricityType, zodiacType, fieldName) = field
+
+                coordinateSystem = \
+                    Ephemeris.__getCoordinateSystemForFieldName(\
+                    fieldName, centricityType, zodiacType, fields)
+                fieldIndex = \
+                    Ephemeris.CoordinateSystemFieldNames[coordinateSystem].\
+                    index(fieldName)
+                
+                key = (centricityType, zodiacType, coordinateSystem)
+                groups.setdefault(key, []).append((fieldIndex, 
+                                                   columns[field]))
+
+            for key, columnsToFill in groups.items():
+                (centricityType, zodiacType, coordinateSystem) = key
+                
+                Ephemeris.__setCalculationFlags(centricityType,
+                                                zodiacType,
+                                                coordinateSystem)
+                flag = Ephemeris.threadState.iflag
+
+                # Call swe.calc_ut() directly rather than the
+                # Ephemeris.calc_ut() wrapper, to keep the per-value
+                # overhead down in this loop.
+                if flag & swe.FLG_TOPOCTR:
+                    Ephemeris.__setTopocentricPosition()
+                    
+                for i in range(numValues):
+                    values = swe.calc_ut(julianDays[i], planetId, flag)
+                    for (fieldIndex, column) in columnsToFill:
+                        column[i] = values[fieldIndex]
+            
+        elif planetName in Ephemeris.AveragedPlanetComponents:
+            
+            componentPlanetNames = \
+                Ephemeris.AveragedPlanetComponents[planetName]
+            numComponents = len(componentPlanetNames)
+            
+            for componentPlanetName in componentPlanetNames:
+                componentColumns = \
+                    Ephemeris.__getPlanetaryInfoBatchColumns(\
+                    componentPlanetName, julianDays, fields, houseSystem)
+
+                for field in fields:
+                    column = columns[field]
+                    componentColumn = componentColumns[field]
+                    for i in range(numValues):
+                        column[i] += componentColumn[i]
+                        
+            for field in fields:
+                column = columns[field]
+                for i in range(numValues):
+                    column[i] /= numComponents
+            
+        elif planetName in Ephemeris.CombinationPlanetComponents:
+            
+            componentPlanetNames = \
+                Ephemeris.CombinationPlanetComponents[planetName]
+            
+            # Start off with the last planet in the list, and combine
+            # moving towards the front of the list.  This follows
+            # what is done in createCombinationPlanetaryInfo().
+            componentColumns = \
+                Ephemeris.__getPlanetaryInfoBatchColumns(\
+                componentPlanetNames[-1], julianDays, fields, houseSystem)
+            for field in fields:
+                columns[field] = componentColumns[field]
+
+            for componentPlanetName in reversed(componentPlanetNames[:-1]):
+                componentColumns = \
+                    Ephemeris.__getPlanetaryInfoBatchColumns(\
+                    componentPlanetName, julianDays, fields, houseSystem)
+
+                for field in fields:
+                    column = columns[field]
+                    componentColumn = componentColumns[field]
+                    for i in range(numValues):
+                        column[i] = componentColumn[i] - column[i]
+
+                    # Normalize the longitude values that resulted
+                    # from the combining.
+                    if field[2] == 'longitude':
+                        for i in range(numValues):
+                            column[i] = \
+                                Ephemeris.__toNormalizedAngle(column[i])
+            
+        elif Ephemeris.isHouseCuspPlanetName(planetName) or \
+             Ephemeris.isAscmcPlanetName(planetName):
+
+            # House cusps and ascmc planets only have geocentric
+            # longitude and longitude speed values.  All other fields
+            # are 0.0.
+            if Ephemeris.isHouseCuspPlanetName(planetName):
+                houseCuspIndex = int(planetName[1:]) - 1
+                if houseCuspIndex < 0 or houseCuspIndex > 11:
+                    Ephemeris.log.error("getPlanetaryInfoBatch(): " + \
+                        "Invalid house cusp planet: {}".format(planetName))
+                    return None
+            else:
+                ascmcIndex = Ephemeris.__getAscmcIndexForPlanetName(planetName)
+            
+            for zodiacType in Ephemeris.ZodiacTypes:
+                longitudeField = ("geocentric", zodiacType, "longitude")
+                speedField = ("geocentric", zodiacType, "longitude_speed")
+
+                if speedField in columns:
+                    column = columns[speedField]
+                    for i in range(numValues):
+                        column[i] = 360.0
+                        
+                if longitudeField not in columns:
+                    continue
+                
+                if zodiacType == "tropical":
+                    Ephemeris.setTropicalZodiac()
+                else:
+                    Ephemeris.setSiderealZodiac()
+                Ephemeris.unsetRadiansCoordinateSystemFlag()
+                flag = Ephemeris.threadState.iflag
+
+                column = columns[longitudeField]
+                for i in range(numValues):
+                    (cusps, ascmc) = \
+                        swe.houses_ex(julianDays[i],
+                                      Ephemeris.getContext().geoLatitudeDeg,
+                                      Ephemeris.getContext().geoLongitudeDeg,
+                                      houseSystem,
+                                      flag)
+                    if Ephemeris.isHouseCuspPlanetName(planetName):
+                        column[i] = cusps[houseCuspIndex]
+                    else:
+                        column[i] = ascmc[ascmcIndex]
+                
+        else:
+            Ephemeris.log.error("Unknown planetName given to " + \
+                                "getPlanetaryInfoBatch(): {}".\
+                                format(planetName))
+            return None
+
+        return columns
+
+    @staticmethod
+    def __getCoordinateSystemForFieldName(fieldName,
+                                          centricityType,
+                                          zodiacType,
+                                          fields):
+        """Private function that returns the coordinate system whose
+        calc_ut() call should be used to obtain the given field.
+        The 'distance' and 'distance_speed' fields are returned in
+        both the ecliptical and equatorial coordinate systems, so for
+        those fields the equatorial coordinate system is chosen if
+        it is already needed for another field (matching
+        getPlanetaryInfo()), otherwise ecliptical is chosen.
+        """
+
+        if fieldName in Ephemeris.CoordinateSystemFieldNames['rectangular']:
+            return 'rectangular'
+        elif fieldName not in ('distance', 'distance_speed'):
+            if fieldName in \
+                   Ephemeris.CoordinateSystemFieldNames['ecliptical']:
+                return 'ecliptical'
+            else:
+                return 'equatorial'
+
+        for (c, z, f) in fields:
+            if c == centricityType and z == zodiacType and \
+               f not in ('distance', 'distance_speed') and \
+               f in Ephemeris.CoordinateSystemFieldNames['equatorial']:
+                return 'equatorial'
+
+        return 'ecliptical'
+
+    @staticmethod
+    def __getAscmcIndexForPlanetName(planetName):
+        """Private function that returns the index into the ascmc
+        tuple returned by swe_houses_ex() for the given ascmc planet name.
+        """
+
+        ascmcPlanetNames = [\
+            "Ascendant",
+            "MC",
+            "ARMC",
+            "Vertex",
+            "EquatorialAscendant",
+            "CoAscendant1",
+            "CoAscendant2",
+            "PolarAscendant"]
+
+        return ascmcPlanetNames.index(planetName)
+
 
     ######################################################################
 
@@ -6058,6 +7626,11 @@ class Ephemeris:
 
 ##############################################################################
 
+
+# Per-thread calculation state of the Ephemeris.
+Ephemeris.threadState = EphemerisThreadState()
+
+
 def testTimezoneSpeed():
     """This test will test the speed of creating a timezone via pytz.timezone().
     If it is slow, that means pytz needs to be decompressed (see more info
@@ -6326,6 +7899,256 @@ def testPlanetTopicalLongitude():
     print("    At {}, the Geocentric Tropical Longitude of {} is: {}".\
             format(now, p.name, longitude))
 
+def testGetPlanetaryInfoBatch():
+    print("Running " + inspect.stack()[0][3] + "()")
+
+    # Daily timestamps for a year, starting now.
+    eastern = pytz.timezone('US/Eastern')
+    now = datetime.datetime.now(eastern)
+    print("    now is: {}".format(now))
+
+    datetimes = [now + datetime.timedelta(days=i) for i in range(366)]
+    julianDays = [Ephemeris.datetimeToJulianDay(dt) for dt in datetimes]
+
+    planetNames = ["Sun", "Moon", "H1", "MoSu", "MeanOfFive"]
+    fields = [("geocentric", "tropical", "longitude"),
+              ("geocentric", "tropical", "declination"),
+              ("heliocentric", "sidereal", "longitude")]
+    
+    columns = Ephemeris.getPlanetaryInfoBatch(planetNames, julianDays, fields)
+
+    # Compare against the values from the non-batched calls.
+    numMismatches = 0
+    for planetName in planetNames:
+        for i in range(0, len(julianDays), 30):
+            dt = datetimes[i]
+            p = Ephemeris.getPlanetaryInfoFields(planetName, dt)
+            
+            for field in fields:
+                (centricityType, zodiacType, fieldName) = field
+                if centricityType == "geocentric":
+                    expected = p.geocentric[zodiacType][fieldName]
+                elif centricityType == "topocentric":
+                    expected = p.topocentric[zodiacType][fieldName]
+                else:
+                    expected = p.heliocentric[zodiacType][fieldName]
+                actual = columns[planetName][field][i]
+
+                if abs(expected - actual) > 0.0000001:
+                    numMismatches += 1
+                    print("    Mismatch for {} {} on {}: {} != {}".\
+                          format(planetName, field, dt, actual, expected))
+
+    print("    Number of mismatches: {}".format(numMismatches))
+
+def testEphemerisInterpolationCache():
+    print("Running " + inspect.stack()[0][3] + "()")
+
+    import time
+
+    startDt = datetime.datetime(2000, 1, 1, tzinfo=pytz.utc)
+    endDt = datetime.datetime(2001, 1, 1, tzinfo=pytz.utc)
+    
+    cache = Ephemeris.createInterpolationCache(["Sun", "Moon"],
+                                               startDt, endDt,
+                                               ["geocentric"],
+                                               ["tropical"],
+                                               ["ecliptical"])
+    
+    filename = "/tmp/testEphemerisInterpolationCache.cache"
+    cache.save(filename)
+    cache = EphemerisInterpolationCache.load(filename)
+    os.remove(filename)
+
+    # Compare the non-cached and cached values at hourly timestamps.
+    dts = [startDt + datetime.timedelta(hours=i) for i in range(24 * 365)]
+    
+    Ephemeris.setInterpolationCache(None)
+    start = time.time()
+    expectedValues = [Ephemeris.getPlanetaryInfoFields("Moon", dt,
+                                                       ["geocentric"],
+                                                       ["tropical"],
+                                                       ["ecliptical"])
+                      for dt in dts]
+    end = time.time()
+    print("    Without cache: {} sec".format(end - start))
+
+    Ephemeris.setInterpolationCache(cache)
+    start = time.time()
+    actualValues = [Ephemeris.getPlanetaryInfoFields("Moon", dt,
+                                                     ["geocentric"],
+                                                     ["tropical"],
+                                                     ["ecliptical"])
+                    for dt in dts]
+    end = time.time()
+    print("    With cache:    {} sec".format(end - start))
+    Ephemeris.setInterpolationCache(None)
+
+    maxError = 0.0
+    for i in range(len(dts)):
+        expected = expectedValues[i].geocentric['tropical']
+        actual = actualValues[i].geocentric['tropical']
+        for fieldName in expected.keys():
+            diff = actual[fieldName] - expected[fieldName]
+            if fieldName == 'longitude':
+                diff = (diff + 180.0) % 360.0 - 180.0
+            maxError = max(maxError, abs(diff))
+    
+    print("    Maximum error: {} (allowed: {})".format(maxError, 
+                                                        cache.maxError))
+
+def testPlanetaryInfoCache():
+    print("Running " + inspect.stack()[0][3] + "()")
+
+    import time
+
+    eastern = pytz.timezone('US/Eastern')
+    startDt = datetime.datetime(2010, 1, 1, tzinfo=pytz.utc)
+    dts = [startDt + datetime.timedelta(hours=i) for i in range(150)]
+    planetNames = ["Sun", "Moon", "MoSu", "MeanOfFive", "H1"]
+
+    Ephemeris.clearPlanetaryInfoCache()
+    Ephemeris.resetPlanetaryInfoCacheStats()
+
+    for i in range(2):
+        start = time.time()
+        for dt in dts:
+            for planetName in planetNames:
+                Ephemeris.getPlanetaryInfo(planetName, dt)
+        end = time.time()
+        print("    Pass {}: {} sec, stats: {}".\
+              format(i, end - start, Ephemeris.getPlanetaryInfoCacheStats()))
+
+    # Modifying a returned PlanetaryInfo must not affect later results.
+    p = Ephemeris.getPlanetaryInfo("Sun", dts[0])
+    p.geocentric['tropical']['longitude'] = None
+    p = Ephemeris.getPlanetaryInfo("Sun", dts[0].astimezone(eastern))
+    print("    Sun longitude after modification: {}, dt: {}".\
+          format(p.geocentric['tropical']['longitude'], p.dt))
+
+def testDatetimeJulianDayConversions():
+    """Regression test that checks that datetimeToJulianDay() and
+    julianDayToDatetime() return exactly the same values as converting
+    with pytz normalize() and swe.utc_to_jd() / swe.jdut1_to_utc().
+    """
+    
+    print("Running " + inspect.stack()[0][3] + "()")
+
+    import random
+    import time
+    
+    def referenceDatetimeToJulianDay(dt):
+        dtUtc = pytz.utc.normalize(dt.astimezone(pytz.utc))
+        (jd_et, jd_ut) = \
+                swe.utc_to_jd(dtUtc.year, dtUtc.month, dtUtc.day, 
+                              dtUtc.hour, dtUtc.minute, dtUtc.second,
+                              swe.GREG_CAL)
+        return jd_ut
+
+    def referenceJulianDayToDatetime(jd, tzInfo):
+        (year, month, day, hour, mins, secs) = swe.jdut1_to_utc(jd, 1)
+        if secs < 0:
+            secs = 0
+        elif secs >= 60:
+            secs = 59.999999
+        secsTruncated = int(math.floor(secs))
+        usecs = int(round((secs - secsTruncated) * 1000000))
+        if usecs > 999999:
+            usecs = 999999
+        dtUtc = datetime.datetime(year, month, day, hour, mins, 
+                                  secsTruncated, usecs, pytz.utc)
+        return tzInfo.normalize(dtUtc.astimezone(tzInfo))
+
+    timezones = [pytz.utc,
+                 pytz.timezone("US/Eastern"),
+                 pytz.timezone("Europe/London"),
+                 pytz.timezone("Asia/Kolkata"),
+                 pytz.timezone("Australia/Lord_Howe"),
+                 pytz.timezone("EST"),
+                 pytz.FixedOffset(-330)]
+
+    # Julian Days of the US/Eastern daylight savings transitions, 
+    # to test the conversions around them.
+    transitionJds = \
+        [referenceDatetimeToJulianDay(pytz.utc.localize(dt)) for dt in \
+         pytz.timezone("US/Eastern")._utc_transition_times[1:200]]
+    
+    random.seed(0)
+    numTests = 100000
+    numMismatches = 0
+    
+    start = time.time()
+    for i in range(numTests):
+        tzInfo = timezones[i % len(timezones)]
+        if i % 2 == 0:
+            jd = random.uniform(1721426.0, 2524000.0)
+        else:
+            jd = random.choice(transitionJds) + random.uniform(-0.1, 0.1)
+        
+        expectedDt = referenceJulianDayToDatetime(jd, tzInfo)
+        actualDt = Ephemeris.julianDayToDatetime(jd, tzInfo)
+        
+        if expectedDt != actualDt or \
+           expectedDt.tzinfo is not actualDt.tzinfo:
+            numMismatches += 1
+            print("    Mismatch for jd {} in {}: {} != {}".\
+                  format(jd, tzInfo, actualDt, expectedDt))
+
+        expectedJd = referenceDatetimeToJulianDay(expectedDt)
+        actualJd = Ephemeris.datetimeToJulianDay(expectedDt)
+        
+        if expectedJd != actualJd:
+            numMismatches += 1
+            print("    Mismatch for datetime {}: {} != {}".\
+                  format(expectedDt, actualJd, expectedJd))
+    end = time.time()
+    
+    print("    Tested {} conversions in {} sec.  Number of mismatches: {}".\
+          format(numTests, end - start, numMismatches))
+
+def testEphemerisThreads():
+    """Checks that PlanetaryInfos calculated from a pool of threads,
+    each with its own EphemerisContext, are the same as the ones
+    calculated serially.
+    """
+    
+    print("Running " + inspect.stack()[0][3] + "()")
+
+    import concurrent.futures
+
+    startDt = datetime.datetime(2010, 1, 1, tzinfo=pytz.utc)
+    dts = [startDt + datetime.timedelta(hours=7 * i) for i in range(50)]
+    planetNames = ["Sun", "Moon", "MoSu", "H1", "MC"]
+
+    defaultContext = Ephemeris.getContext()
+    contexts = [defaultContext.withGeographicPosition(-87.6278, 41.8819),
+                defaultContext.withGeographicPosition(151.2093, -33.8688),
+                defaultContext.withGeographicPosition(0.0, 51.4779, 46),
+                defaultContext.withFlags(\
+                    defaultContext.flags & ~swe.FLG_TRUEPOS)]
+
+    def calculate(context):
+        with Ephemeris.calculationContext(context):
+            return [Ephemeris.getPlanetaryInfo(planetName, dt).toString() \
+                    for dt in dts for planetName in planetNames]
+
+    Ephemeris.clearPlanetaryInfoCache()
+    expected = [calculate(context) for context in contexts]
+    
+    Ephemeris.clearPlanetaryInfoCache()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+        actual = list(executor.map(calculate, contexts * 4))
+
+    numMismatches = 0
+    for i in range(len(actual)):
+        if actual[i] != expected[i % len(contexts)]:
+            numMismatches += 1
+
+    print("    Results: {}, mismatches: {}".format(len(actual), 
+                                                   numMismatches))
+    print("    Context restored: {}".\
+          format(Ephemeris.getContext() == defaultContext))
+
 def testDatetimeJulianPrecisionLoss():
     print("Running " + inspect.stack()[0][3] + "()")
 
@@ -9610,6 +11433,11 @@ if __name__=="__main__":
     #testHouseCusps()
     #testAscmc()
     #testPlanetTopicalLongitude()
+    #testGetPlanetaryInfoBatch()
+    #testEphemerisInterpolationCache()
+    #testPlanetaryInfoCache()
+    #testDatetimeJulianDayConversions()
+    #testEphemerisThreads()
     #testDatetimeJulianPrecisionLoss()
 
     # These tests will take a long time, so I've commented it out.
@@ -0,0 +1,822 @@
+# For logging.
+import logging
+
+# For collections.deque.
+import collections
+
+# For math.copysign().
+import math
+
+# For timestamps and timezone information.
+import datetime
+import pytz
+
+# For directory access.
+import inspect
+
+# Import the Ephemeris classes.
+from ephemeris import Ephemeris
+
+# For generic utility helper methods.
+from util import Util
+
+##############################################################################
+
+class EventSolver:
+    """Contains static methods for finding the moments in time when a
+    longitude (or a value derived from longitudes, like the
+    difference between the longitudes of two planets) crosses given
+    degree values.
+
+    The longitude is tracked as a continuous ('unwrapped') value, so
+    crossings of the 0/360 degree boundary need no special handling.
+    The step size adapts to the longitude speed returned by the
+    Ephemeris: steps grow while the motion is smooth, and shrink
+    where the speed changes quickly (e.g. near stations).  Steps are
+    split at stations, so each segment yielded is monotonic.
+    Crossings are then refined with Newton steps using the longitude
+    speed, falling back to the secant through the bracketing
+    timestamps, which needs far fewer Ephemeris evaluations than
+    bisection.
+
+    Note:
+    This class has the following methods for public use:
+      isLongitudeSpeedAvailable()
+      createLongitudeFunction()
+      createLongitudeDifferenceFunction()
+      setStationIndex()
+      getStationIndex()
+      createStationsFunction()
+      iterateLongitudeSegments()
+      getCrossingValues()
+      findCrossingDatetime()
+      getCounters()
+
+    A longitude function is a callable that takes a
+    datetime.datetime and returns a tuple (longitude, longitudeSpeed),
+    where longitude is a float in degrees and longitudeSpeed is a float
+    in degrees per day, or None if the speed is not known.
+
+    A segment is a tuple (t1, u1, v1, t2, u2, v2), where t1 and t2
+    are float values for the number of days relative to the starting
+    timestamp, u1 and u2 are the unwrapped longitudes at those
+    moments, and v1 and v2 are the longitude speeds (or None).
+    """
+
+    # Logger object for this class.
+    log = logging.getLogger("eventsolver.EventSolver")
+
+    # Maximum number of degrees the longitude may move in one step.
+    # This must stay well below 180 degrees, so that wrapping around
+    # 360 degrees can be told apart from movement.
+    maxDegreesPerStep = 60.0
+
+    # Maximum difference allowed between the movement over a step
+    # predicted from the speeds at both ends of the step, and the
+    # actual movement.  The difference allowed is this number of
+    # degrees, plus the fraction below of the actual movement.  Steps
+    # with a larger difference are retried with a smaller step size.
+    # This is what keeps retrograde loops from being stepped over.
+    maxStepErrorDegrees = 0.1
+    maxStepErrorFraction = 0.25
+
+    # Maximum step size in days.
+    maxStepDays = 4200.0
+
+    # Step size in days for the first step.  Later steps grow from this.
+    initialStepDays = 1.0
+
+    # Step size in days for the first step of a longitude function
+    # without a known speed (e.g. house cusps).
+    initialUnknownSpeedStepDays = 1.0 / 24.0
+
+    # Number of days of stations looked up at a time, when stepping
+    # with a stations function.
+    stationQueryDays = 366.0
+
+    # StationIndex used by createStationsFunction(), or None.
+    stationIndex = None
+
+    # Counters of the work done in this process, for profiling.  See
+    # getCounters().
+    numLongitudeEvaluations = 0
+    numCrossingIterations = 0
+    numSegments = 0
+
+    @staticmethod
+    def isLongitudeSpeedAvailable(planetName):
+        """Returns True if the longitude speed fields calculated by the
+        Ephemeris for the given planet are the real longitude speeds.
+        For house cusps and ascmc planets (and combinations involving
+        them), the Ephemeris sets the speed fields to constant values.
+
+        Arguments:
+        planetName - str holding the name of the planet.
+        """
+
+        if Ephemeris.isHouseCuspPlanetName(planetName) or \
+               Ephemeris.isAscmcPlanetName(planetName):
+            return False
+
+        componentPlanetNames = \
+            Ephemeris.AveragedPlanetComponents.get(planetName, []) + \
+            Ephemeris.CombinationPlanetComponents.get(planetName, [])
+
+        for componentPlanetName in componentPlanetNames:
+            if not EventSolver.isLongitudeSpeedAvailable(componentPlanetName):
+                return False
+
+        return True
+
+    @staticmethod
+    def createLongitudeFunction(planetParamsList):
+        """Returns a longitude function for the average longitude of
+        the planets given.  Like other averaging code in this
+        application, the longitudes in the range [0, 360) are averaged
+        directly, so the average jumps when one of the planets crosses
+        0 degrees.
+
+        Arguments:
+        planetParamsList - List of tuples, where each tuple is
+                      (planetName, centricityType, longitudeType).
+
+                      planetName - str holding the name of the planet.
+                      centricityType - str value holding either
+                                  "geocentric", "topocentric", or
+                                  "heliocentric".
+                      longitudeType - str value holding either
+                                  "tropical" or "sidereal".
+
+        Returns:
+        Callable that takes a datetime.datetime and returns a tuple
+        (longitude, longitudeSpeed).
+        """
+
+        planetParamsList = \
+            [(planetName, centricityType.lower(), longitudeType.lower()) \
+             for (planetName, centricityType, longitudeType) \
+             in planetParamsList]
+
+        speedAvailable = True
+        for (planetName, centricityType, longitudeType) in planetParamsList:
+            if not EventSolver.isLongitudeSpeedAvailable(planetName):
+                speedAvailable = False
+
+        numPlanets = len(planetParamsList)
+
+        def longitudeFunction(dt):
+            totalLongitude = 0.0
+            totalSpeed = 0.0
+
+            EventSolver.numLongitudeEvaluations += numPlanets
+
+            for (planetName, centricityType, longitudeType) \
+                    in planetParamsList:
+
+                # Only the ecliptical fields for the centricity type and
+                # longitude type we are interested in are calculated.
+                pi = Ephemeris.getPlanetaryInfoFields(planetName, dt,
+                                                      [centricityType],
+                                                      [longitudeType],
+                                                      ["ecliptical"])
+                fields = getattr(pi, centricityType)[longitudeType]
+
+                totalLongitude += fields['longitude']
+                totalSpeed += fields['longitude_speed']
+
+            longitude = Util.toNormalizedAngle(totalLongitude / numPlanets)
+
+            if speedAvailable:
+                return (longitude, totalSpeed / numPlanets)
+            else:
+                return (longitude, None)
+
+        return longitudeFunction
+
+    @staticmethod
+    def createLongitudeDifferenceFunction(planet1ParamsList,
+                                          planet2ParamsList):
+        """Returns a longitude function for the angle between two
+        (possibly averaged) planets, i.e. the longitude of planet1
+        minus the longitude of planet2.
+
+        Arguments:
+        planet1ParamsList - List of tuples for planet1.  See
+                            createLongitudeFunction() for the format.
+        planet2ParamsList - List of tuples for planet2.  See
+                            createLongitudeFunction() for the format.
+
+        Returns:
+        Callable that takes a datetime.datetime and returns a tuple
+        (longitudeDifference, longitudeDifferenceSpeed).
+        """
+
+        planet1Function = \
+            EventSolver.createLongitudeFunction(planet1ParamsList)
+        planet2Function = \
+            EventSolver.createLongitudeFunction(planet2ParamsList)
+
+        def longitudeDifferenceFunction(dt):
+            (longitude1, speed1) = planet1Function(dt)
+            (longitude2, speed2) = planet2Function(dt)
+
+            difference = Util.toNormalizedAngle(longitude1 - longitude2)
+
+            if speed1 == None or speed2 == None:
+                return (difference, None)
+            else:
+                return (difference, speed1 - speed2)
+
+        return longitudeDifferenceFunction
+
+    @staticmethod
+    def setStationIndex(stationIndex):
+        """Sets the StationIndex used by createStationsFunction().
+
+        Arguments:
+        stationIndex - StationIndex object, or None to step through
+                       longitudes without knowing where the stations are.
+        """
+
+        if EventSolver.log.isEnabledFor(logging.DEBUG) == True:
+            EventSolver.log.debug("setStationIndex(stationIndex={})".\
+                                  format(stationIndex))
+
+        EventSolver.stationIndex = stationIndex
+
+    @staticmethod
+    def getStationIndex():
+        """Returns the StationIndex set with setStationIndex(), or None."""
+
+        return EventSolver.stationIndex
+
+    @staticmethod
+    def createStationsFunction(planetParamsList):
+        """Returns a stations function for the longitude function
+        created by createLongitudeFunction() for the same planets.
+        The stations are looked up in the StationIndex set with
+        setStationIndex().
+
+        Arguments:
+        planetParamsList - List of tuples, where each tuple is
+                           (planetName, centricityType, longitudeType).
+
+        Returns:
+        Callable that takes two datetime.datetime objects, and returns
+        a list of datetime.datetime objects for the stations between
+        them, in increasing order.  None is returned if no StationIndex
+        is set, or if the stations cannot be looked up for the planets
+        given (an average of more than one planet, a planet without
+        a longitude speed, or a topocentric planet).
+        """
+
+        stationIndex = EventSolver.stationIndex
+
+        if stationIndex == None or len(planetParamsList) != 1:
+            return None
+
+        (planetName, centricityType, longitudeType) = planetParamsList[0]
+
+        if not EventSolver.isLongitudeSpeedAvailable(planetName) or \
+               centricityType.lower() == "topocentric":
+            return None
+
+        def stationsFunction(startDt, endDt):
+            stations = stationIndex.getStations(planetName,
+                                                centricityType,
+                                                longitudeType,
+                                                startDt, endDt)
+            if stations == None:
+                return []
+
+            return [dt for (dt, stationType) in stations]
+
+        return stationsFunction
+
+    @staticmethod
+    def iterateLongitudeSegments(longitudeFunction,
+                                 startDt,
+                                 endDt=None,
+                                 backwards=False,
+                                 maxErrorTd=datetime.timedelta(seconds=2),
+                                 stationsFunction=None):
+        """Generator that steps through time from 'startDt', and
+        yields the segments of the unwrapped longitude between the
+        steps.  Each segment is monotonic: if the longitude speed
+        changes sign within a step, the step is split at the station.
+
+        The unwrapped longitude at 'startDt' is the longitude returned
+        by the longitude function.  After that, it changes
+        continuously, so it may go below 0 or above 360 degrees.
+
+        Arguments:
+        longitudeFunction - Callable that takes a datetime.datetime and
+                            returns a tuple (longitude, longitudeSpeed).
+        startDt   - datetime.datetime object for the timestamp to
+                    start stepping from.
+        endDt     - datetime.datetime object for the timestamp to stop
+                    stepping at.  If None, the generator never stops,
+                    and the caller stops iterating when it is done.
+        backwards - bool value for whether to step into the past
+                    instead of into the future.
+        maxErrorTd - datetime.timedelta object for the accuracy of the
+                    calculations.  This is the smallest step size
+                    used, and the accuracy of the stations found.
+        stationsFunction - Callable that takes two datetime.datetime
+                    objects, and returns a list of datetime.datetime
+                    objects for the stations of the longitude between
+                    them, in increasing order (see
+                    createStationsFunction()).  If given, steps end at
+                    these stations, and since the longitude is known to
+                    be monotonic between them, steps are not checked
+                    for hidden retrograde loops and can be larger.
+
+        Yields:
+        Tuples (t1, u1, v1, t2, u2, v2).  See the class description
+        for details.  t1 and t2 are negative when stepping backwards.
+        """
+
+        if EventSolver.log.isEnabledFor(logging.DEBUG) == True:
+            EventSolver.log.debug("Entered " + inspect.stack()[0][3] + "()")
+
+        if backwards:
+            sign = -1.0
+        else:
+            sign = 1.0
+
+        minStepDays = maxErrorTd.total_seconds() / 86400.0
+
+        # Number of days to step through, or None to step forever.
+        endDays = None
+        if endDt != None:
+            endDays = max(0.0, sign * (endDt - startDt).total_seconds() / 86400.0)
+
+        (longitude, v) = longitudeFunction(startDt)
+        t = 0.0
+        u = longitude
+
+        if v == None:
+            stepDays = EventSolver.initialUnknownSpeedStepDays
+        else:
+            stepDays = EventSolver.__getMaxStepDays(v)
+            stepDays = min(stepDays, EventSolver.initialStepDays)
+
+        # Number of days up to which the stations are known, and the
+        # number of days of the stations not reached yet.
+        stationsKnownDays = 0.0
+        stationDays = collections.deque()
+
+        elapsedDays = 0.0
+        while endDays == None or elapsedDays < endDays:
+
+            if endDays != None:
+                stepDays = min(stepDays, endDays - elapsedDays)
+
+            # Step size to continue with after this step.
+            nextStepDays = stepDays
+
+            # Whether this step ends at a known station.
+            endsAtStation = False
+
+            if stationsFunction != None:
+                while stationsKnownDays < elapsedDays + stepDays:
+                    queryDays = max(EventSolver.stationQueryDays, stepDays)
+                    stationsKnownDays += queryDays
+                    dt1 = startDt + \
+                          datetime.timedelta(days=sign * (stationsKnownDays - queryDays))
+                    dt2 = startDt + \
+                          datetime.timedelta(days=sign * stationsKnownDays)
+
+                    stationDts = stationsFunction(min(dt1, dt2), max(dt1, dt2))
+                    if backwards:
+                        stationDts = reversed(stationDts)
+
+                    for stationDt in stationDts:
+                        days = sign * (stationDt - startDt).total_seconds() / 86400.0
+                        if stationsKnownDays - queryDays < days and \
+                               days <= stationsKnownDays and \
+                               days > elapsedDays:
+                            stationDays.append(days)
+
+                if len(stationDays) > 0 and \
+                       stationDays[0] <= elapsedDays + stepDays:
+                    stepDays = stationDays[0] - elapsedDays
+                    endsAtStation = True
+
+            t2 = sign * (elapsedDays + stepDays)
+            (longitude2, v2) = \
+                longitudeFunction(startDt + datetime.timedelta(days=t2))
+
+            # Movement over this step, assuming it is less than 180
+            # degrees, or less than 360 degrees if the direction of the
+            # movement is known from the stations.
+            du = (longitude2 - u + 180.0) % 360.0 - 180.0
+            if stationsFunction != None and v != None and v2 != None:
+                if endsAtStation:
+                    direction = sign * v
+                else:
+                    direction = sign * v2
+                if direction > 0.0:
+                    du = (longitude2 - u) % 360.0
+                elif direction < 0.0:
+                    du = -((u - longitude2) % 360.0)
+
+            # Check whether the step was small enough that no motion
+            # was missed.  If it was not, then retry with a smaller step.
+            rejected = abs(du) > EventSolver.maxDegreesPerStep * 1.5
+            
+            error = None
+            maxError = None
+            if v != None and v2 != None and stationsFunction == None:
+                error = abs(du - sign * stepDays * (v + v2) / 2.0)
+                maxError = EventSolver.maxStepErrorDegrees + \
+                           EventSolver.maxStepErrorFraction * abs(du)
+                if error > maxError:
+                    rejected = True
+
+            if rejected and stepDays > minStepDays:
+                if EventSolver.log.isEnabledFor(logging.DEBUG) == True:
+                    EventSolver.log.debug(\
+                        "Rejected step of {} days at t={}.".\
+                        format(stepDays, t))
+
+                stepDays = EventSolver.__getNextStepDays(stepDays, du,
+                                                         error, maxError)
+                stepDays = max(stepDays, minStepDays)
+                continue
+
+            u2 = u + du
+
+            if endsAtStation:
+                stationDays.popleft()
+                v2 = 0.0
+
+            if v != None and v2 != None and v * v2 < 0.0:
+                # The planet stations within this step.
+                (ts, us) = EventSolver.__findStation(longitudeFunction,
+                                                     startDt,
+                                                     t, u, v,
+                                                     t2, u2, v2,
+                                                     minStepDays)
+                EventSolver.numSegments += 2
+                yield (t, u, v, ts, us, 0.0)
+                yield (ts, us, 0.0, t2, u2, v2)
+            else:
+                EventSolver.numSegments += 1
+                yield (t, u, v, t2, u2, v2)
+
+            # Choose the size of the next step.  A step shortened to
+            # end at a station says little about the step size needed.
+            if endsAtStation:
+                stepDays = nextStepDays
+            else:
+                stepDays = EventSolver.__getNextStepDays(stepDays, du,
+                                                         error, maxError)
+            if v2 != None:
+                stepDays = min(stepDays, EventSolver.__getMaxStepDays(v2))
+            stepDays = max(stepDays, minStepDays)
+
+            elapsedDays += abs(t2 - t)
+            t = t2
+            u = u2
+            v = v2
+
+        if EventSolver.log.isEnabledFor(logging.DEBUG) == True:
+            EventSolver.log.debug("Exiting " + inspect.stack()[0][3] + "()")
+
+    @staticmethod
+    def getCrossingValues(segment, values, modulus=None):
+        """Returns the values crossed within a segment, ordered in
+        the order they are crossed.  A value is crossed if it lies
+        after the first longitude of the segment, up to and including
+        the last longitude of the segment.
+
+        Arguments:
+        segment - Tuple (t1, u1, v1, t2, u2, v2) as yielded by
+                  iterateLongitudeSegments().
+        values  - List of float values for the degrees to check.
+        modulus - float value.  If not None, then each value also
+                  stands for all values that differ from it by a
+                  multiple of 'modulus' (e.g. 360.0 for angles).
+
+        Returns:
+        List of float values that are crossed, in the unwrapped
+        longitude scale of the segment.
+        """
+
+        (t1, u1, v1, t2, u2, v2) = segment
+
+        lowValue = min(u1, u2)
+        highValue = max(u1, u2)
+
+        rv = []
+
+        for value in values:
+            if modulus == None:
+                candidates = [value]
+            else:
+                # All the values equivalent to 'value' within the range.
+                first = value + \
+                        math.floor((lowValue - value) / modulus) * modulus
+                candidates = []
+                while first <= highValue:
+                    candidates.append(first)
+                    first += modulus
+
+            for candidate in candidates:
+                if (u1 < candidate <= u2) or (u1 > candidate >= u2):
+                    rv.append(candidate)
+
+        rv.sort(reverse=(u2 < u1))
+
+        return rv
+
+    @staticmethod
+    def findCrossingDatetime(longitudeFunction,
+                             startDt,
+                             segment,
+                             value,
+                             maxErrorTd=datetime.timedelta(seconds=2)):
+        """Returns the timestamp at which the unwrapped longitude
+        crosses the given value within the given segment.
+
+        Arguments:
+        longitudeFunction - Callable that takes a datetime.datetime and
+                            returns a tuple (longitude, longitudeSpeed).
+        startDt - datetime.datetime object that was passed to
+                  iterateLongitudeSegments() as the starting timestamp.
+        segment - Tuple (t1, u1, v1, t2, u2, v2) as yielded by
+                  iterateLongitudeSegments().  The value must be
+                  crossed within this segment (see getCrossingValues()).
+        value   - float value for the unwrapped longitude crossed.
+        maxErrorTd - datetime.timedelta object holding the maximum
+                     time difference between the exact crossing
+                     timestamp, and the one calculated.
+
+        Returns:
+        datetime.datetime object within 'maxErrorTd' of the exact
+        crossing.  Like the bisection this replaces, the timestamp
+        returned is on the far side of the crossing, in the order of
+        the segment.
+        """
+
+        (t1, u1, v1, t2, u2, v2) = segment
+
+        toleranceDays = maxErrorTd.total_seconds() / 86400.0
+
+        # Bracket around the crossing.  The values 'gLo' and 'gHi' are
+        # the distances from the value, before and after the crossing.
+        (tLo, gLo) = (t1, u1 - value)
+        (tHi, gHi) = (t2, u2 - value)
+
+        # +1 if the longitude increases through the value, -1 otherwise.
+        if gLo < 0.0:
+            direction = 1.0
+        else:
+            direction = -1.0
+
+        # Start from the end of the segment closest to the value.
+        if abs(gLo) <= abs(gHi):
+            (t, g, v) = (tLo, gLo, v1)
+            (tPrev, gPrev) = (tHi, gHi)
+        else:
+            (t, g, v) = (tHi, gHi, v2)
+            (tPrev, gPrev) = (tLo, gLo)
+
+        while abs(tHi - tLo) > toleranceDays:
+
+            # Newton step using the speed, or a secant step through
+            # the last two timestamps if the speed is not known.  Fall
+            # back to the secant through the bracket.
+            nextT = None
+            if v != None and v != 0.0:
+                nextT = t - g / v
+            elif v == None and g != gPrev:
+                nextT = t - g * (t - tPrev) / (g - gPrev)
+            if nextT == None or \
+                   not (min(tLo, tHi) < nextT < max(tLo, tHi)):
+                nextT = tLo - gLo * (tHi - tLo) / (gHi - gLo)
+
+            # Step at least half of the tolerance, so that the bracket
+            # is closed from both sides once the steps get small.
+            if t == tLo:
+                towardsT = tHi
+            else:
+                towardsT = tLo
+            if abs(nextT - t) < toleranceDays / 2.0:
+                nextT = t + math.copysign(toleranceDays / 2.0, towardsT - t)
+
+            if not (min(tLo, tHi) < nextT < max(tLo, tHi)):
+                nextT = (tLo + tHi) / 2.0
+
+            EventSolver.numCrossingIterations += 1
+            
+            (longitude, v) = \
+                longitudeFunction(startDt + datetime.timedelta(days=nextT))
+            (tPrev, gPrev) = (t, g)
+            g = u1 + (longitude - u1 + 180.0) % 360.0 - 180.0 - value
+            t = nextT
+
+            if direction * g >= 0.0:
+                (tHi, gHi) = (t, g)
+            else:
+                (tLo, gLo) = (t, g)
+
+        return startDt + datetime.timedelta(days=tHi)
+
+    @staticmethod
+    def getCounters():
+        """Returns the counters of the work done by EventSolver in this
+        process, since it started.
+
+        Returns:
+        dict with the following keys:
+          longitudeEvaluations - int holding the number of planet
+                                 longitudes calculated by the Ephemeris
+                                 for the longitude functions.
+          crossingIterations   - int holding the number of iterations
+                                 of findCrossingDatetime().
+          segments             - int holding the number of segments
+                                 yielded by iterateLongitudeSegments().
+        """
+
+        return {"longitudeEvaluations" : EventSolver.numLongitudeEvaluations,
+                "crossingIterations" : EventSolver.numCrossingIterations,
+                "segments" : EventSolver.numSegments}
+
+    @staticmethod
+    def __getMaxStepDays(speed):
+        """Returns the largest step size in days for the given speed."""
+
+        if speed == 0.0:
+            return EventSolver.maxStepDays
+        else:
+            return min(EventSolver.maxStepDays,
+                       EventSolver.maxDegreesPerStep / abs(speed))
+
+    @staticmethod
+    def __getNextStepDays(stepDays, du, error, maxError):
+        """Returns the size of the step to take after a step of
+        'stepDays' days, over which the longitude moved 'du' degrees
+        and the movement predicted from the speeds was off by 'error'
+        degrees ('error' is None if the speed is not known).  This is
+        used both after accepting and after rejecting a step.
+        """
+
+        factor = 2.0
+
+        # Keep the movement of the next step within the limit.
+        if du != 0.0:
+            factor = min(factor,
+                         0.9 * EventSolver.maxDegreesPerStep / abs(du))
+
+        # The error of the predicted movement grows with the cube of
+        # the step size.
+        if error != None and error > 0.0:
+            factor = min(factor, 0.9 * (maxError / error) ** (1.0 / 3.0))
+
+        return stepDays * max(factor, 0.2)
+
+    @staticmethod
+    def __findStation(longitudeFunction, startDt,
+                      t1, u1, v1, t2, u2, v2,
+                      toleranceDays):
+        """Returns a tuple (t, u) for the moment of the station between
+        t1 and t2, and the unwrapped longitude at that moment.  The
+        speeds v1 and v2 must have opposite signs.  The station is
+        found with the Illinois variant of the secant method on the
+        speed.
+        """
+
+        (tLo, vLo) = (t1, v1)
+        (tHi, vHi) = (t2, v2)
+        (t, u) = (t1, u1)
+        side = 0
+
+        while abs(tHi - tLo) > toleranceDays:
+            t = tLo - vLo * (tHi - tLo) / (vHi - vLo)
+            if not (min(tLo, tHi) < t < max(tLo, tHi)):
+                t = (tLo + tHi) / 2.0
+
+            (longitude, v) = \
+                longitudeFunction(startDt + datetime.timedelta(days=t))
+            u = u1 + (longitude - u1 + 180.0) % 360.0 - 180.0
+
+            if v == 0.0:
+                break
+            elif (v < 0.0) == (vLo < 0.0):
+                (tLo, vLo) = (t, v)
+                if side == -1:
+                    vHi /= 2.0
+                side = -1
+            else:
+                (tHi, vHi) = (t, v)
+                if side == 1:
+                    vLo /= 2.0
+                side = 1
+
+        return (t, u)
+
+##############################################################################
+
+def testEventSolver():
+    """Compares the crossings found by the EventSolver with the ones
+    found by stepping with a fixed step size and bisecting, and
+    prints the number of Ephemeris evaluations for both.
+    """
+
+    print("Running " + inspect.stack()[0][3] + "()")
+
+    maxErrorTd = datetime.timedelta(seconds=2)
+    startDt = datetime.datetime(1994, 10, 20, tzinfo=pytz.utc)
+    endDt = datetime.datetime(1996, 10, 20, tzinfo=pytz.utc)
+
+    for planetName in ["Moon", "Mercury", "Venus", "Mars", "Jupiter"]:
+        longitudeFunction = EventSolver.createLongitudeFunction(\
+            [(planetName, "geocentric", "tropical")])
+
+        numEvaluations = [0]
+        def countingFunction(dt):
+            numEvaluations[0] += 1
+            return longitudeFunction(dt)
+
+        # Crossings of each multiple of 30 degrees.
+        values = [0.0]
+
+        solverDts = []
+        for segment in EventSolver.iterateLongitudeSegments(\
+            countingFunction, startDt, endDt, maxErrorTd=maxErrorTd):
+
+            for value in EventSolver.getCrossingValues(segment, values, 30.0):
+                solverDts.append(EventSolver.findCrossingDatetime(\
+                    countingFunction, startDt, segment, value, maxErrorTd))
+
+        solverEvaluations = numEvaluations[0]
+        numEvaluations[0] = 0
+
+        # Same crossings, with a fixed step size and bisection.
+        stepTd = datetime.timedelta(hours=6)
+        bisectionDts = []
+        prevDt = startDt
+        (prevLongitude, speed) = countingFunction(prevDt)
+        while prevDt < endDt:
+            currDt = prevDt + stepTd
+            (currLongitude, speed) = countingFunction(currDt)
+
+            if math.floor(prevLongitude / 30.0) != \
+                   math.floor(currLongitude / 30.0):
+                (t1, t2) = (prevDt, currDt)
+                while t2 - t1 > maxErrorTd:
+                    testDt = t1 + (t2 - t1) / 2
+                    (testLongitude, speed) = countingFunction(testDt)
+                    if math.floor(testLongitude / 30.0) == \
+                           math.floor(prevLongitude / 30.0):
+                        t1 = testDt
+                    else:
+                        t2 = testDt
+                bisectionDts.append(t2)
+
+            (prevDt, prevLongitude) = (currDt, currLongitude)
+
+        bisectionEvaluations = numEvaluations[0]
+
+        maxDiffTd = datetime.timedelta(0)
+        for (dt1, dt2) in zip(solverDts, bisectionDts):
+            maxDiffTd = max(maxDiffTd, Util.absTd(dt1 - dt2))
+
+        print("    {}: {} crossings ({} with bisection), ".\
+              format(planetName, len(solverDts), len(bisectionDts)) + \
+              "max difference {}, evaluations: {} vs. {}".\
+              format(maxDiffTd, solverEvaluations, bisectionEvaluations))
+
+##############################################################################
+
+# For debugging the module during development.  
+if __name__=="__main__":
+    # For logging and for exiting.
+    import logging.config
+    import os
+    import sys
+    
+    # Initialize logging.
+    LOG_CONFIG_FILE = os.path.join(sys.path[0], "../conf/logging.conf")
+    logging.config.fileConfig(LOG_CONFIG_FILE)
+
+    # Initialize the Ephemeris (required).
+    Ephemeris.initialize()
+
+    # New York City:
+    lon = -74.0064
+    lat = 40.7142
+
+    # Set a default location (required).
+    Ephemeris.setGeographicPosition(lon, lat)
+
+    # Various tests to run:
+    testEventSolver()
+
+    # Quit.
+    print("Exiting.")
+    sys.exit()
+
+##############################################################################
@@ -0,0 +1,551 @@
+# For logging.
+import logging
+
+# For bisect.bisect_left() and bisect.bisect_right().
+import bisect
+
+# For compact arrays of float values.
+import array
+
+# For math.inf.
+import math
+
+# For the lock that guards the tables.
+import threading
+
+# For timestamps and timezone information.
+import datetime
+import pytz
+
+# For directory access.
+import inspect
+
+# Import the Ephemeris classes.
+from ephemeris import Ephemeris
+
+# For stepping through the longitude of a planet.
+from eventsolver import EventSolver
+
+##############################################################################
+
+class LongitudeTable:
+    """Class that holds the unwrapped longitude of planets, sampled at
+    the ends of the monotonic segments found by
+    EventSolver.iterateLongitudeSegments(), so that the timestamps
+    when a planet has moved a number of degrees can be found without
+    stepping through time.
+
+    Tables are stored per (planetName, centricityType, longitudeType),
+    for the planets that StationIndex supports: geocentric and
+    heliocentric planets with a longitude speed.  House cusps and
+    ascmc move around the zodiac every day, and together with
+    topocentric planets depend on the geographic position, so a table
+    is no use for them (see isSupportedPlanet()).  Each table holds,
+    for a contiguous range of time, the float arrays of the days of
+    the samples relative to the first timestamp of the table, the
+    unwrapped longitudes, the longitude speeds, and the running
+    maximum and the running minimum of the unwrapped longitude.
+    Stations are at the ends of the segments, so the longitude is
+    monotonic between two samples.
+
+    The running maximum from the start of the table, and the running
+    minimum from the end of the table, are non-decreasing.  A search
+    for the first timestamp that a longitude is reached, when it is
+    not reached yet, is then a binary search in one of them.  Only the
+    segments near the longitude are looked at after that, and the
+    exact timestamp is refined in them with the longitude function.
+
+    If a lookup falls outside of the covered range, the table is
+    extended first, so a table can be used without any setup.
+
+    Example:
+
+    table = LongitudeTable()
+    dts = table.getDatetimesOfLongitudeDeltaDegrees(\\
+        "Venus", "geocentric", "tropical", referenceDt, 360 * 8,
+        backwards=False)
+    """
+
+    # Logger object for this class.
+    log = logging.getLogger("longitudetable.LongitudeTable")
+
+    def __init__(self,
+                 maxErrorTd=datetime.timedelta(seconds=2),
+                 chunkDays=365.25):
+        """Initializes an empty table.
+
+        Parameters:
+        maxErrorTd - datetime.timedelta object holding the accuracy
+                     of the stations between the samples.
+        chunkDays  - float value for the smallest number of days that
+                     the covered range is extended by when a lookup
+                     falls outside of it.
+        """
+
+        self.maxErrorTd = maxErrorTd
+        self.chunkDays = chunkDays
+
+        # Dictionary mapping the key to a list:
+        # [epochDt, days, longitudes, speeds, runningMaxs, runningMins]
+        #
+        # epochDt is the datetime.datetime of the first sample
+        # calculated, and the other values are array.array objects of
+        # floats, one entry per sample, ordered by time.  'days' holds
+        # the number of days of the samples relative to 'epochDt'.
+        self.tables = {}
+
+        # Lock that guards 'tables'.
+        self.lock = threading.RLock()
+
+    def isEmpty(self):
+        """Returns True if no tables were calculated yet."""
+
+        return len(self.tables) == 0
+
+    @staticmethod
+    def isSupportedPlanet(planetName, centricityType):
+        """Returns True if tables can be calculated for the given
+        planet and centricity type.
+        """
+
+        centricityType = centricityType.lower()
+
+        return (centricityType == "geocentric" or \
+                centricityType == "heliocentric") and \
+               EventSolver.isLongitudeSpeedAvailable(planetName)
+
+    def getNumSamples(self, planetName, centricityType, longitudeType):
+        """Returns the number of samples in the table of the given
+        planet.
+        """
+
+        key = (planetName, centricityType.lower(), longitudeType.lower())
+
+        with self.lock:
+            table = self.tables.get(key)
+            if table == None:
+                return 0
+
+            return len(table[1])
+
+    def getDatetimesOfLongitudeDeltaDegrees(self,
+                                            planetName,
+                                            centricityType,
+                                            longitudeType,
+                                            referenceDt,
+                                            desiredDeltaDegrees,
+                                            maxErrorTd=datetime.timedelta(seconds=2),
+                                            backwards=False):
+        """Returns a list of datetime.datetime objects that hold the
+        timestamps when the given planet is at 'desiredDeltaDegrees'
+        longitude degrees relative to the longitude degrees at
+        'referenceDt'.  The results are the same as the ones of
+        LookbackMultipleUtils.getDatetimesOfLongitudeDeltaDegreesInFuture()
+        and getDatetimesOfLongitudeDeltaDegreesInPast().
+
+        Arguments:
+        planetName - str holding the name of the planet to do the
+                     calculations for.
+        centricityType - str value holding either "geocentric",
+                         "topocentric", or "heliocentric".
+        longitudeType - str value holding either "tropical" or "sidereal".
+        referenceDt - datetime.datetime object for the reference time.
+        desiredDeltaDegrees - float value for the number of longitude degrees
+                        elapsed from the longitude at 'referenceDt'.
+        maxErrorTd - datetime.timedelta object holding the maximum
+                     time difference between the exact timestamps and
+                     the ones calculated.
+        backwards - bool value for whether to look into the past
+                    instead of into the future.
+
+        Returns:
+        List of datetime.datetime objects, in the order they are
+        reached from 'referenceDt'.  In the event of an error, the
+        reference None is returned.
+        """
+
+        if self.log.isEnabledFor(logging.DEBUG) == True:
+            self.log.debug("Entered " + inspect.stack()[0][3] + "()")
+
+        # Return value.
+        rv = []
+
+        centricityType = centricityType.lower()
+        longitudeType = longitudeType.lower()
+
+        if not LongitudeTable.isSupportedPlanet(planetName, centricityType):
+            self.log.error("Invalid input: A longitude table cannot be " + \
+                           "calculated for planet '{}' ".format(planetName) + \
+                           "with centricity type '{}'.".format(centricityType))
+            return None
+
+        if longitudeType != "tropical" and \
+           longitudeType != "sidereal":
+
+            self.log.error("Invalid input: Longitude type is invalid.  " + \
+                           "Value given was: {}".format(longitudeType))
+            return None
+
+        key = (planetName, centricityType, longitudeType)
+        planetParamsList = [(planetName, centricityType, longitudeType)]
+
+        longitudeFunction = \
+            EventSolver.createLongitudeFunction(planetParamsList)
+
+        isDirectOnlyPlanet = \
+            Ephemeris.isDirectOnlyPlanetName(centricityType, planetName)
+
+        # +1 when looking into the future, -1 when looking into the past.
+        if backwards:
+            directionSign = -1
+        else:
+            directionSign = 1
+
+        with self.lock:
+            table = self.tables.get(key)
+            if table == None:
+                table = self.__createTable(key, planetParamsList, referenceDt)
+
+            # Days of 'referenceDt' relative to the epoch of the table.
+            referenceDays = \
+                (referenceDt - table[0]).total_seconds() / 86400.0
+
+            # Make sure 'referenceDt' is covered, and that there is a
+            # sample after it, in the direction looked.
+            while table[1][0] > referenceDays or \
+                  (backwards and table[1][0] == referenceDays):
+                self.__extend(key, planetParamsList, True,
+                              table[1][0] - referenceDays + self.chunkDays)
+            while table[1][-1] < referenceDays or \
+                  (not backwards and table[1][-1] == referenceDays):
+                self.__extend(key, planetParamsList, False,
+                              referenceDays - table[1][-1] + self.chunkDays)
+
+            (epochDt, days, longitudes, speeds, runningMaxs, runningMins) = \
+                table
+
+            # Index of the first sample after 'referenceDt', in the
+            # direction looked.
+            if backwards:
+                i = bisect.bisect_left(days, referenceDays) - 1
+            else:
+                i = bisect.bisect_right(days, referenceDays)
+
+            # Unwrapped longitude at 'referenceDt'.  The sample before
+            # it is less than 180 degrees away.
+            (longitude, speed) = longitudeFunction(referenceDt)
+            previousLongitude = longitudes[i - directionSign]
+            referenceLongitude = previousLongitude + \
+                (longitude - previousLongitude + 180.0) % 360.0 - 180.0
+
+            desiredLongitude = referenceLongitude + desiredDeltaDegrees
+
+            if self.log.isEnabledFor(logging.DEBUG) == True:
+                self.log.debug("referenceLongitude == {}".\
+                               format(referenceLongitude))
+
+            # Segment from 'referenceDt' to the sample after it.  The
+            # segments are in the order they are reached, and 'i' is
+            # the index of the sample at the end of the segment.
+            segment = (0.0, referenceLongitude, speed,
+                       days[i] - referenceDays, longitudes[i], speeds[i])
+
+            while True:
+
+                if len(EventSolver.getCrossingValues(segment,
+                                                     [desiredLongitude])) > 0:
+                    dt = EventSolver.findCrossingDatetime(\
+                        longitudeFunction, referenceDt, segment,
+                        desiredLongitude, maxErrorTd)
+                    rv.append(dt)
+
+                    # Direct-only planets will yield only 1 timestamp.
+                    if isDirectOnlyPlanet:
+                        break
+
+                # Stop if the planet won't ever reach the desired
+                # longitude, as in
+                # LookbackMultipleUtils._getDatetimesOfLongitudeDeltaDegrees().
+                if directionSign * (longitudes[i] - desiredLongitude) > 120:
+                    break
+
+                # Skip the samples before the desired longitude is
+                # reached for the first time.  If it is not reached
+                # within the table, extend the table first.
+                while True:
+                    if not backwards and runningMaxs[i] < desiredLongitude:
+                        j = bisect.bisect_left(runningMaxs, desiredLongitude)
+                        if j < len(runningMaxs):
+                            i = j - 1
+                            break
+                    elif backwards and runningMins[i] > desiredLongitude:
+                        j = bisect.bisect_right(runningMins,
+                                                desiredLongitude) - 1
+                        if j >= 0:
+                            i = j + 1
+                            break
+                    else:
+                        break
+
+                    i += self.__extendToLongitude(key, planetParamsList,
+                                                  backwards,
+                                                  desiredLongitude)
+                    (epochDt, days, longitudes, speeds,
+                     runningMaxs, runningMins) = table
+
+                # Move to the next segment, extending the table if
+                # needed.
+                if i + directionSign < 0 or \
+                       i + directionSign >= len(days):
+                    i += self.__extend(key, planetParamsList, backwards,
+                                       self.chunkDays)
+                    (epochDt, days, longitudes, speeds,
+                     runningMaxs, runningMins) = table
+
+                j = i + directionSign
+                segment = (days[i] - referenceDays, longitudes[i], speeds[i],
+                           days[j] - referenceDays, longitudes[j], speeds[j])
+                i = j
+
+        if self.log.isEnabledFor(logging.DEBUG) == True:
+            self.log.debug("Exiting " + inspect.stack()[0][3] + "()")
+
+        return rv
+
+    def __createTable(self, key, planetParamsList, epochDt):
+        """Creates the table for the given key, with a single sample
+        at 'epochDt'.
+
+        Returns:
+        The table created.
+        """
+
+        longitudeFunction = \
+            EventSolver.createLongitudeFunction(planetParamsList)
+
+        (longitude, speed) = longitudeFunction(epochDt)
+
+        table = [epochDt,
+                 array.array('d', [0.0]),
+                 array.array('d', [longitude]),
+                 array.array('d', [speed]),
+                 array.array('d', [longitude]),
+                 array.array('d', [longitude])]
+
+        self.tables[key] = table
+
+        return table
+
+    def __extendToLongitude(self, key, planetParamsList, backwards,
+                            desiredLongitude):
+        """Extends the table for the given key in the given direction,
+        by the number of days estimated for the planet to reach
+        'desiredLongitude', or by 'chunkDays' if that is more.
+
+        Returns:
+        The number of samples added at the start of the table.
+        """
+
+        (epochDt, days, longitudes, speeds, runningMaxs, runningMins) = \
+            self.tables[key]
+
+        numDays = self.chunkDays
+
+        # Average speed over the covered range.
+        if days[-1] > days[0]:
+            averageSpeed = \
+                (longitudes[-1] - longitudes[0]) / (days[-1] - days[0])
+
+            if backwards:
+                remainingDegrees = runningMins[0] - desiredLongitude
+            else:
+                remainingDegrees = desiredLongitude - runningMaxs[-1]
+
+            if averageSpeed > 0.0:
+                numDays = max(numDays, 1.1 * remainingDegrees / averageSpeed)
+
+        return self.__extend(key, planetParamsList, backwards, numDays)
+
+    def __extend(self, key, planetParamsList, backwards, numDays):
+        """Extends the table for the given key by 'numDays' days,
+        after its end or before its start.
+
+        Returns:
+        The number of samples added at the start of the table, so
+        that the callers can shift the indexes they hold.
+        """
+
+        table = self.tables[key]
+        (epochDt, days, longitudes, speeds, runningMaxs, runningMins) = table
+
+        if self.log.isEnabledFor(logging.DEBUG) == True:
+            self.log.debug("Extending table {} by {} days.".\
+                           format(key, numDays))
+
+        longitudeFunction = \
+            EventSolver.createLongitudeFunction(planetParamsList)
+        stationsFunction = \
+            EventSolver.createStationsFunction(planetParamsList)
+
+        if backwards:
+            startDays = days[0]
+            startLongitude = longitudes[0]
+        else:
+            startDays = days[-1]
+            startLongitude = longitudes[-1]
+
+        startDt = epochDt + datetime.timedelta(days=startDays)
+        endDt = epochDt + datetime.timedelta(days=startDays + \
+                                             (-numDays if backwards else numDays))
+
+        newDays = array.array('d')
+        newLongitudes = array.array('d')
+        newSpeeds = array.array('d')
+
+        # Offset between the unwrapped longitudes of the segments and
+        # the ones of the table.
+        offset = None
+
+        for (t1, u1, v1, t2, u2, v2) in EventSolver.iterateLongitudeSegments(\
+            longitudeFunction, startDt, endDt=endDt, backwards=backwards,
+            maxErrorTd=self.maxErrorTd, stationsFunction=stationsFunction):
+
+            if offset == None:
+                offset = 360.0 * round((startLongitude - u1) / 360.0)
+
+            newDays.append(startDays + t2)
+            newLongitudes.append(u2 + offset)
+            newSpeeds.append(v2)
+
+        if backwards:
+            newDays.reverse()
+            newLongitudes.reverse()
+            newSpeeds.reverse()
+
+            days[0:0] = newDays
+            longitudes[0:0] = newLongitudes
+            speeds[0:0] = newSpeeds
+        else:
+            days.extend(newDays)
+            longitudes.extend(newLongitudes)
+            speeds.extend(newSpeeds)
+
+        # The running extremes are calculated again, since they change
+        # everywhere when samples are added before the start.
+        runningMax = -math.inf
+        runningMaxs = array.array('d', longitudes)
+        for i in range(len(longitudes)):
+            runningMax = max(runningMax, longitudes[i])
+            runningMaxs[i] = runningMax
+
+        runningMin = math.inf
+        runningMins = array.array('d', longitudes)
+        for i in range(len(longitudes) - 1, -1, -1):
+            runningMin = min(runningMin, longitudes[i])
+            runningMins[i] = runningMin
+
+        table[4] = runningMaxs
+        table[5] = runningMins
+
+        if backwards:
+            return len(newDays)
+        else:
+            return 0
+
+##############################################################################
+
+def testLongitudeTable():
+    print("Running " + inspect.stack()[0][3] + "()")
+
+    # For comparing with the results found by stepping.
+    from lookbackmultiple_calc import LookbackMultipleUtils
+
+    maxErrorTd = datetime.timedelta(minutes=1)
+
+    table = LongitudeTable()
+
+    testCases = [\
+        ("Sun", "geocentric", "tropical", 360 * 8),
+        ("Moon", "geocentric", "tropical", 360 * 37),
+        ("Mercury", "geocentric", "tropical", 20),
+        ("Mercury", "geocentric", "tropical", 360 * 3),
+        ("Venus", "geocentric", "sidereal", 720),
+        ("Saturn", "geocentric", "tropical", 10),
+        ("MoSu", "geocentric", "tropical", 360 * 12),
+        ("Mars", "heliocentric", "tropical", 360 * 2)]
+
+    referenceDts = []
+    for i in range(5):
+        referenceDts.append(datetime.datetime(1983, 10, 25, 19, 34,
+                                              tzinfo=pytz.utc) + \
+                            datetime.timedelta(days=97 * i))
+
+    for (planetName, centricityType, longitudeType, desiredDeltaDegrees) \
+        in testCases:
+
+        for backwards in [False, True]:
+            if backwards:
+                method = LookbackMultipleUtils.\
+                    getDatetimesOfLongitudeDeltaDegreesInPast
+                deltaDegrees = -desiredDeltaDegrees
+            else:
+                method = LookbackMultipleUtils.\
+                    getDatetimesOfLongitudeDeltaDegreesInFuture
+                deltaDegrees = desiredDeltaDegrees
+
+            print("  Testing {} {} {} moving {} degrees.".\
+                  format(centricityType, longitudeType, planetName,
+                         deltaDegrees))
+
+            numDifferent = 0
+            for referenceDt in referenceDts:
+                expectedDts = method(planetName, centricityType,
+                                     longitudeType, referenceDt,
+                                     deltaDegrees, maxErrorTd)
+                resultDts = table.getDatetimesOfLongitudeDeltaDegrees(\
+                    planetName, centricityType, longitudeType,
+                    referenceDt, deltaDegrees, maxErrorTd, backwards)
+
+                if len(expectedDts) != len(resultDts):
+                    numDifferent += 1
+                    continue
+
+                for j in range(len(expectedDts)):
+                    if abs(expectedDts[j] - resultDts[j]) > 2 * maxErrorTd:
+                        numDifferent += 1
+                        break
+
+            print("  Actual   num different == {}".format(numDifferent))
+            print("  Expected num different == 0")
+
+##############################################################################
+
+# For debugging the module during development.
+if __name__=="__main__":
+    # For logging and for exiting.
+    import logging.config
+    import os
+    import sys
+
+    # Initialize logging.
+    LOG_CONFIG_FILE = os.path.join(sys.path[0], "../conf/logging.conf")
+    logging.config.fileConfig(LOG_CONFIG_FILE)
+
+    # Initialize the Ephemeris (required).
+    Ephemeris.initialize()
+
+    # New York City:
+    lon = -74.0064
+    lat = 40.7142
+
+    # Set a default location (required).
+    Ephemeris.setGeographicPosition(lon, lat)
+
+    # Various tests to run:
+    testLongitudeTable()
+
+    # Quit.
+    print("Exiting.")
+    sys.exit()
+
+##############################################################################
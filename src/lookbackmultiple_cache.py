@@ -0,0 +1,493 @@
+# For logging.
+import logging
+
+# For the database that holds the cache.
+import sqlite3
+
+# For encoding the lists of result timestamps.
+import json
+
+# For the lock that guards the database connection.
+import threading
+
+# For the last-used times of the entries.
+import time
+
+# For timestamps and timezone information.
+import datetime
+import pytz
+
+# For directory access.
+import inspect
+
+##############################################################################
+
+class LookbackMultipleCache:
+    """Class that holds the results of LookbackMultiple calculations
+    in an SQLite database, so that they do not have to be calculated
+    again when a chart is redrawn, or when a document is opened again.
+
+    The results of a calculation only depend on its arguments, which
+    are given as the same argument tuples used by
+    PriceBarChartWidget, LookbackMultipleParallel and the remote
+    calculations:
+
+    (planetName, centricityType, longitudeType, referenceDt,
+     desiredDeltaDegrees, maxErrorTd, locationLongitudeDegrees,
+     locationLatitudeDegrees, locationElevationMeters)
+
+    together with the name of the method used:
+    "getDatetimesOfLongitudeDeltaDegreesInFuture" or
+    "getDatetimesOfLongitudeDeltaDegreesInPast".
+
+    An entry is stored per set of arguments without 'maxErrorTd',
+    together with the 'maxErrorTd' it was calculated with.  A lookup
+    is satisfied by an entry calculated with the same or a smaller
+    'maxErrorTd'.
+
+    The number of entries is bounded by 'maxNumEntries'.  When it is
+    exceeded, the entries least recently used are removed.
+
+    Example:
+
+    cache = LookbackMultipleCache("/tmp/chart.pcd.lmcache")
+    resultsList = cache.getResults(methodName, argsTupleList)
+    ...
+    cache.putResults(methodName, argsTupleList, resultsList)
+    cache.close()
+    """
+
+    # Version of the database layout.  This should be incremented
+    # whenever the tables or the encoding of the values change.  A
+    # database with a different version is emptied when it is opened.
+    FILE_FORMAT_VERSION = 1
+
+    # Default for the maximum number of entries.
+    DEFAULT_MAX_NUM_ENTRIES = 500000
+
+    # Fraction of 'maxNumEntries' that the number of entries is
+    # reduced to when entries are removed, so that removals are not
+    # needed on every store.
+    EVICTION_FRACTION = 0.9
+
+    # Logger object for this class.
+    log = logging.getLogger("lookbackmultiple_cache.LookbackMultipleCache")
+
+    def __init__(self, filename=None,
+                 maxNumEntries=DEFAULT_MAX_NUM_ENTRIES):
+        """Opens the cache, creating the database if it does not
+        exist yet.
+
+        Parameters:
+        filename      - str holding the path of the SQLite database
+                        file.  If None, the cache is only held in
+                        memory.
+        maxNumEntries - int value for the maximum number of entries
+                        kept.
+        """
+
+        self.filename = filename
+        self.maxNumEntries = maxNumEntries
+
+        # Lock that guards 'connection' and the counters of lookups.
+        self.lock = threading.RLock()
+
+        # Number of results looked up that were found, and that were
+        # not found, since the cache was opened.
+        self.numHits = 0
+        self.numMisses = 0
+
+        if filename == None:
+            database = ":memory:"
+        else:
+            database = filename
+
+        self.connection = \
+            sqlite3.connect(database, check_same_thread=False)
+
+        try:
+            self.__createTables()
+        except sqlite3.DatabaseError as e:
+            # The file is not a database we can use.  Start with an
+            # empty cache in memory instead, so that the calculations
+            # still work.
+            errMsg = "Could not use LookbackMultiple cache file " + \
+                     "'{}': {}".format(filename, e)
+            self.log.error(errMsg)
+
+            self.connection.close()
+            self.connection = \
+                sqlite3.connect(":memory:", check_same_thread=False)
+            self.__createTables()
+
+    def close(self):
+        """Closes the database.  The cache can not be used after this."""
+
+        with self.lock:
+            if self.connection != None:
+                self.connection.close()
+                self.connection = None
+
+    def getNumEntries(self):
+        """Returns the number of entries in the cache."""
+
+        with self.lock:
+            cursor = self.connection.execute("SELECT COUNT(*) FROM results")
+            return cursor.fetchone()[0]
+
+    def getHitCounts(self):
+        """Returns a tuple (numHits, numMisses) with the number of
+        results looked up with getResults() that were found, and that
+        were not found, since the cache was opened.
+        """
+
+        with self.lock:
+            return (self.numHits, self.numMisses)
+
+    def clear(self):
+        """Removes all the entries in the cache."""
+
+        with self.lock:
+            with self.connection:
+                self.connection.execute("DELETE FROM results")
+
+    def copyEntriesFrom(self, otherCache):
+        """Stores the entries of another LookbackMultipleCache in this
+        cache.  As with putResults(), entries already stored with a
+        smaller 'maxErrorTd' are kept instead.
+
+        Arguments:
+        otherCache - LookbackMultipleCache to copy the entries from.
+        """
+
+        if self.log.isEnabledFor(logging.DEBUG) == True:
+            self.log.debug("Entered " + inspect.stack()[0][3] + "()")
+
+        with otherCache.lock:
+            cursor = otherCache.connection.execute(\
+                "SELECT methodName, planetName, centricityType, " + \
+                "longitudeType, referenceTimestamp, desiredDeltaDegrees, " + \
+                "locationLongitudeDegrees, locationLatitudeDegrees, " + \
+                "locationElevationMeters, maxErrorSeconds, " + \
+                "resultTimestamps, lastUsed FROM results")
+            rows = cursor.fetchall()
+
+        with self.lock:
+            with self.connection:
+                self.connection.executemany(\
+                    "INSERT INTO results VALUES (?,?,?,?,?,?,?,?,?,?,?,?) " + \
+                    "ON CONFLICT (methodName, planetName, " + \
+                    "centricityType, longitudeType, referenceTimestamp, " + \
+                    "desiredDeltaDegrees, locationLongitudeDegrees, " + \
+                    "locationLatitudeDegrees, locationElevationMeters) " + \
+                    "DO UPDATE SET " + \
+                    "maxErrorSeconds=excluded.maxErrorSeconds, " + \
+                    "resultTimestamps=excluded.resultTimestamps, " + \
+                    "lastUsed=excluded.lastUsed " + \
+                    "WHERE excluded.maxErrorSeconds<=maxErrorSeconds",
+                    rows)
+
+            self.__evict()
+
+        if self.log.isEnabledFor(logging.DEBUG) == True:
+            self.log.debug("Copied {} entries into the cache.".\
+                           format(len(rows)))
+            self.log.debug("Exiting " + inspect.stack()[0][3] + "()")
+
+    def getResults(self, methodName, argsTupleList):
+        """Looks up the results of LookbackMultiple calculations.
+
+        Arguments:
+        methodName    - str holding the name of the LookbackMultipleUtils
+                        method of the calculations.
+        argsTupleList - List of argument tuples for the calculations.
+                        See the class description for the fields.
+
+        Returns:
+        List with an entry for each tuple in 'argsTupleList'.  The
+        entry is the list of datetime.datetime objects of the results
+        if they were found in the cache, or None otherwise.  The
+        datetime.datetime objects have the tzinfo of the referenceDt
+        in the tuple.
+        """
+
+        if self.log.isEnabledFor(logging.DEBUG) == True:
+            self.log.debug("Entered " + inspect.stack()[0][3] + "()")
+
+        rv = []
+
+        now = time.time()
+
+        with self.lock:
+            usedRowIds = []
+
+            for argsTuple in argsTupleList:
+                key = self.__getKey(methodName, argsTuple)
+                maxErrorSeconds = argsTuple[5].total_seconds()
+
+                cursor = self.connection.execute(\
+                    "SELECT rowid, resultTimestamps FROM results " + \
+                    "WHERE methodName=? AND planetName=? AND " + \
+                    "centricityType=? AND longitudeType=? AND " + \
+                    "referenceTimestamp=? AND desiredDeltaDegrees=? AND " + \
+                    "locationLongitudeDegrees=? AND " + \
+                    "locationLatitudeDegrees=? AND " + \
+                    "locationElevationMeters=? AND " + \
+                    "maxErrorSeconds<=?",
+                    key + (maxErrorSeconds,))
+                row = cursor.fetchone()
+
+                if row == None:
+                    rv.append(None)
+                else:
+                    usedRowIds.append((now, row[0]))
+
+                    tzinfo = argsTuple[3].tzinfo
+                    dts = []
+                    for timestamp in json.loads(row[1]):
+                        dt = datetime.datetime.fromtimestamp(timestamp,
+                                                             pytz.utc)
+                        dts.append(dt.astimezone(tzinfo))
+                    rv.append(dts)
+
+            self.numHits += len(usedRowIds)
+            self.numMisses += len(argsTupleList) - len(usedRowIds)
+            
+            if len(usedRowIds) > 0:
+                with self.connection:
+                    self.connection.executemany(\
+                        "UPDATE results SET lastUsed=? WHERE rowid=?",
+                        usedRowIds)
+
+        if self.log.isEnabledFor(logging.DEBUG) == True:
+            self.log.debug("Found {} of {} results in the cache.".\
+                           format(len(usedRowIds), len(argsTupleList)))
+            self.log.debug("Exiting " + inspect.stack()[0][3] + "()")
+
+        return rv
+
+    def putResults(self, methodName, argsTupleList, resultsList):
+        """Stores the results of LookbackMultiple calculations.  If
+        results for the same arguments are already stored with a
+        smaller 'maxErrorTd', those are kept instead.
+
+        Arguments:
+        methodName    - str holding the name of the LookbackMultipleUtils
+                        method of the calculations.
+        argsTupleList - List of argument tuples for the calculations.
+                        See the class description for the fields.
+        resultsList   - List of lists of datetime.datetime objects.
+                        Each list within the list holds the results
+                        for the respective tuple within argsTupleList.
+        """
+
+        if self.log.isEnabledFor(logging.DEBUG) == True:
+            self.log.debug("Entered " + inspect.stack()[0][3] + "()")
+
+        now = time.time()
+
+        rows = []
+        for i in range(len(argsTupleList)):
+            argsTuple = argsTupleList[i]
+            key = self.__getKey(methodName, argsTuple)
+            maxErrorSeconds = argsTuple[5].total_seconds()
+            resultTimestamps = \
+                json.dumps([dt.timestamp() for dt in resultsList[i]])
+
+            rows.append(key + (maxErrorSeconds, resultTimestamps, now))
+
+        with self.lock:
+            with self.connection:
+                self.connection.executemany(\
+                    "INSERT INTO results VALUES (?,?,?,?,?,?,?,?,?,?,?,?) " + \
+                    "ON CONFLICT (methodName, planetName, " + \
+                    "centricityType, longitudeType, referenceTimestamp, " + \
+                    "desiredDeltaDegrees, locationLongitudeDegrees, " + \
+                    "locationLatitudeDegrees, locationElevationMeters) " + \
+                    "DO UPDATE SET " + \
+                    "maxErrorSeconds=excluded.maxErrorSeconds, " + \
+                    "resultTimestamps=excluded.resultTimestamps, " + \
+                    "lastUsed=excluded.lastUsed " + \
+                    "WHERE excluded.maxErrorSeconds<=maxErrorSeconds",
+                    rows)
+
+            self.__evict()
+
+        if self.log.isEnabledFor(logging.DEBUG) == True:
+            self.log.debug("Exiting " + inspect.stack()[0][3] + "()")
+
+    def __createTables(self):
+        """Creates the tables of the database if they do not exist
+        yet, and empties them if they were written with a different
+        FILE_FORMAT_VERSION.
+        """
+
+        with self.connection:
+            self.connection.execute(\
+                "CREATE TABLE IF NOT EXISTS info " + \
+                "(name TEXT PRIMARY KEY, value TEXT)")
+
+            cursor = self.connection.execute(\
+                "SELECT value FROM info WHERE name='fileFormatVersion'")
+            row = cursor.fetchone()
+
+            if row != None and \
+                   row[0] != str(LookbackMultipleCache.FILE_FORMAT_VERSION):
+
+                self.log.info("LookbackMultiple cache file " + \
+                              "'{}' has an old format.  ".\
+                              format(self.filename) + \
+                              "Starting with an empty cache.")
+                self.connection.execute("DROP TABLE IF EXISTS results")
+
+            self.connection.execute(\
+                "INSERT OR REPLACE INTO info VALUES " + \
+                "('fileFormatVersion', ?)",
+                (str(LookbackMultipleCache.FILE_FORMAT_VERSION),))
+
+            self.connection.execute(\
+                "CREATE TABLE IF NOT EXISTS results (" + \
+                "methodName TEXT, " + \
+                "planetName TEXT, " + \
+                "centricityType TEXT, " + \
+                "longitudeType TEXT, " + \
+                "referenceTimestamp REAL, " + \
+                "desiredDeltaDegrees REAL, " + \
+                "locationLongitudeDegrees REAL, " + \
+                "locationLatitudeDegrees REAL, " + \
+                "locationElevationMeters REAL, " + \
+                "maxErrorSeconds REAL, " + \
+                "resultTimestamps TEXT, " + \
+                "lastUsed REAL, " + \
+                "PRIMARY KEY (methodName, planetName, centricityType, " + \
+                "longitudeType, referenceTimestamp, desiredDeltaDegrees, " + \
+                "locationLongitudeDegrees, locationLatitudeDegrees, " + \
+                "locationElevationMeters))")
+
+            self.connection.execute(\
+                "CREATE INDEX IF NOT EXISTS resultsLastUsed " + \
+                "ON results (lastUsed)")
+
+    def __evict(self):
+        """Removes the entries least recently used if there are more
+        than 'maxNumEntries' entries.
+        """
+
+        numEntries = self.getNumEntries()
+
+        if numEntries > self.maxNumEntries:
+            numToRemove = numEntries - \
+                int(self.maxNumEntries * LookbackMultipleCache.EVICTION_FRACTION)
+
+            self.log.debug("Removing {} entries from the cache.".\
+                           format(numToRemove))
+
+            with self.connection:
+                self.connection.execute(\
+                    "DELETE FROM results WHERE rowid IN " + \
+                    "(SELECT rowid FROM results ORDER BY lastUsed LIMIT ?)",
+                    (numToRemove,))
+
+    @staticmethod
+    def __getKey(methodName, argsTuple):
+        """Returns the tuple of the values of the key columns for the
+        given method name and argument tuple.
+        """
+
+        return (methodName,
+                argsTuple[0],
+                argsTuple[1].lower(),
+                argsTuple[2].lower(),
+                argsTuple[3].timestamp(),
+                float(argsTuple[4]),
+                float(argsTuple[6]),
+                float(argsTuple[7]),
+                float(argsTuple[8]))
+
+##############################################################################
+
+def testLookbackMultipleCache():
+    print("Running " + inspect.stack()[0][3] + "()")
+
+    methodName = "getDatetimesOfLongitudeDeltaDegreesInFuture"
+
+    def argsTuple(day, maxErrorTd):
+        referenceDt = datetime.datetime(2000, 1, day, 12, 0, tzinfo=pytz.utc)
+        return ("Sun", "geocentric", "tropical", referenceDt, 360.0,
+                maxErrorTd, -74.0064, 40.7142, 0)
+
+    minute = datetime.timedelta(minutes=1)
+    hour = datetime.timedelta(minutes=60)
+
+    cache = LookbackMultipleCache(maxNumEntries=10)
+
+    argsTupleList = [argsTuple(1, minute), argsTuple(2, minute)]
+    resultsList = \
+        [[argsTupleList[0][3] + datetime.timedelta(days=365.25)],
+         []]
+    cache.putResults(methodName, argsTupleList, resultsList)
+
+    print("  Testing lookups at the same maxErrorTd.")
+    print("  Actual   : {}".format(cache.getResults(methodName, argsTupleList)))
+    print("  Expected : {}".format(resultsList))
+
+    print("  Testing a lookup at a coarser and a finer maxErrorTd.")
+    print("  Actual   : {}".format(cache.getResults(methodName,
+              [argsTuple(1, hour), argsTuple(1, datetime.timedelta(0))])))
+    print("  Expected : [{}, None]".format(resultsList[0]))
+
+    print("  Testing a lookup for the other direction.")
+    print("  Actual   : {}".format(cache.getResults(\
+        "getDatetimesOfLongitudeDeltaDegreesInPast", argsTupleList)))
+    print("  Expected : [None, None]")
+
+    print("  Testing that coarser results do not replace finer ones.")
+    cache.putResults(methodName, [argsTuple(1, hour)], [[]])
+    print("  Actual   : {}".format(cache.getResults(methodName,
+                                                    [argsTuple(1, minute)])))
+    print("  Expected : [{}]".format(resultsList[0]))
+
+    print("  Testing eviction of the least recently used entries.")
+    for day in range(3, 20):
+        cache.putResults(methodName, [argsTuple(day, minute)], [[]])
+        cache.getResults(methodName, [argsTuple(1, minute)])
+    print("  Actual   num entries == {}".format(cache.getNumEntries()))
+    print("  Expected num entries <= 10")
+    print("  Actual   : {}".format(cache.getResults(methodName,
+              [argsTuple(1, minute), argsTuple(2, minute)])))
+    print("  Expected : [{}, None]".format(resultsList[0]))
+
+    print("  Testing copying the entries into another cache.")
+    otherCache = LookbackMultipleCache()
+    otherCache.putResults(methodName, [argsTuple(1, hour)], [[]])
+    otherCache.copyEntriesFrom(cache)
+    print("  Actual   num entries == {}".format(otherCache.getNumEntries()))
+    print("  Expected num entries == {}".format(cache.getNumEntries()))
+    print("  Actual   : {}".format(otherCache.getResults(methodName,
+              [argsTuple(1, minute)])))
+    print("  Expected : [{}]".format(resultsList[0]))
+    otherCache.close()
+
+    cache.close()
+
+##############################################################################
+
+# For debugging the module during development.
+if __name__=="__main__":
+    # For logging and for exiting.
+    import logging.config
+    import os
+    import sys
+
+    # Initialize logging.
+    LOG_CONFIG_FILE = os.path.join(sys.path[0], "../conf/logging.conf")
+    logging.config.fileConfig(LOG_CONFIG_FILE)
+
+    # Various tests to run:
+    testLookbackMultipleCache()
+
+    # Quit.
+    print("Exiting.")
+    sys.exit()
+
+##############################################################################
@@ -2,8 +2,8 @@
 # For directory access.
 import inspect
 
-# For collections.deque.
-import collections
+# For searching sorted lists.
+import bisect
 
 # For timestamps and timezone information.
 import datetime
@@ -17,8 +17,10 @@ import logging.config
 from ephemeris import PlanetaryInfo
 from ephemeris import Ephemeris
 
-# For generic utility helper methods.
-from util import Util
+# For finding the timestamps of longitude crossings.
+from eventsolver import EventSolver
+from stationindex import StationIndex
+from longitudetable import LongitudeTable
 
 ##############################################################################
 
@@ -31,6 +33,11 @@ class LookbackMultipleUtils:
       initializeEphemeris()
       getDatetimesOfLongitudeDeltaDegreesInFuture()
       getDatetimesOfLongitudeDeltaDegreesInPast()
+      getDatetimesOfLongitudeDeltaDegreesInFutureForReferences()
+      getDatetimesOfLongitudeDeltaDegreesInPastForReferences()
+      getDatetimesOfLongitudeDeltaDegreesInFutureForReferencesAndDeltas()
+      getDatetimesOfLongitudeDeltaDegreesInPastForReferencesAndDeltas()
+      getCounters()
 
     The reason why we don't have a generic method for this (without the
     words 'future' or 'past' in the method name) is because we need a
@@ -47,6 +54,15 @@ class LookbackMultipleUtils:
     # Logger object for this class.
     log = logging.getLogger("lookbackmultiple_calc.LookbackMultipleUtils")
 
+    # LongitudeTable used to look up the timestamps instead of
+    # stepping through time, or None.
+    longitudeTable = None
+
+    # Counters of the reference timestamps calculated in this process,
+    # and of the timestamps found for them.  See getCounters().
+    numReferences = 0
+    numResults = 0
+
     @staticmethod
     def initializeEphemeris(locationLongitudeDegrees=-74.0064,
                             locationLatitudeDegrees=40.7142,
@@ -75,7 +91,59 @@ class LookbackMultipleUtils:
         Ephemeris.setGeographicPosition(locationLongitudeDegrees, 
                                         locationLatitudeDegrees,
                                         locationElevationMeters)
+
+        # Index of the planet stations, which lets the steps through
+        # longitude be larger.  The stations are calculated as they are
+        # needed, and do not depend on the location, so an index
+        # already set is kept.
+        if EventSolver.getStationIndex() == None:
+            EventSolver.setStationIndex(StationIndex())
+
+        # Table of the unwrapped longitudes of the planets, for the
+        # same reasons.
+        if LookbackMultipleUtils.getLongitudeTable() == None:
+            LookbackMultipleUtils.setLongitudeTable(LongitudeTable())
+
+    @staticmethod
+    def setLongitudeTable(longitudeTable):
+        """Sets the LongitudeTable used by
+        getDatetimesOfLongitudeDeltaDegreesInFuture() and
+        getDatetimesOfLongitudeDeltaDegreesInPast() for the planets it
+        supports.
+
+        Arguments:
+        longitudeTable - LongitudeTable object, or None to always step
+                         through time.
+        """
+
+        LookbackMultipleUtils.longitudeTable = longitudeTable
+
+    @staticmethod
+    def getLongitudeTable():
+        """Returns the LongitudeTable set with setLongitudeTable(), or None."""
+
+        return LookbackMultipleUtils.longitudeTable
     
+    @staticmethod
+    def getCounters():
+        """Returns the counters of the work done calculating
+        LookbackMultiples in this process, since it started.  These
+        are also the counters of LookbackMultipleTelemetry.
+
+        Returns:
+        dict with the keys of EventSolver.getCounters(), and:
+          references - int holding the number of reference timestamps
+                       calculated.
+          results    - int holding the number of timestamps found for
+                       them.
+        """
+
+        counters = EventSolver.getCounters()
+        counters["references"] = LookbackMultipleUtils.numReferences
+        counters["results"] = LookbackMultipleUtils.numResults
+
+        return counters
+
     @staticmethod
     def getDatetimesOfLongitudeDeltaDegreesInFuture(\
         planetName, 
@@ -127,454 +195,10 @@ class LookbackMultipleUtils:
         'referenceDt'.
         """
         
-        if LookbackMultipleUtils.log.isEnabledFor(logging.DEBUG) == True:
-            LookbackMultipleUtils.log.debug("Entered " + inspect.stack()[0][3] + "()")
+        return LookbackMultipleUtils._getDatetimesOfLongitudeDeltaDegrees(\
+            planetName, centricityType, longitudeType, referenceDt,
+            desiredDeltaDegrees, maxErrorTd, backwards=False)
 
-        # Return value.
-        rv = []
-
-        # Verify inputs.
-        centricityTypeOrig = centricityType
-        centricityType = centricityType.lower()
-        if centricityType != "geocentric" and \
-           centricityType != "topocentric" and \
-           centricityType != "heliocentric":
-
-            errMsg = "Invalid input: centricityType is invalid.  " + \
-                      "Value given was: {}".format(centricityTypeOrig)
-            LookbackMultipleUtils.log.error(errMsg)
-            raise ValueError(errMsg)
-
-        longitudeTypeOrig = longitudeType
-        longitudeType = longitudeType.lower()
-        if longitudeType != "tropical" and \
-           longitudeType != "sidereal":
-
-            errMsg = "Invalid input: longitudeType is invalid.  " + \
-                      "Value given was: {}".format(longitudeTypeOrig)
-            LookbackMultipleUtils.log.error(errMsg)
-            raise ValueError(errMsg)
-
-        # Field name we are getting.
-        fieldName = "longitude"
-
-        # Step size timedelta.  
-        stepSizeTd = \
-            LookbackMultipleUtils._getOptimalStepSizeTd(centricityType, 
-                                                        planetName)
-        
-        # Running count of number of full 360-degree circles.
-        numFullCircles = 0
-        
-        # Desired degree.
-        desiredDegree = None
-        
-        # Longitude of the planet at datetime referenceDt.
-        planetReferenceLongitude = None
-
-        # Iterate through, creating artfacts and adding them as we go.
-        steps = collections.deque(maxlen=2)
-        steps.append(referenceDt)
-        steps.append(referenceDt)
-
-        longitudesP1 = collections.deque(maxlen=2)
-        longitudesP1.append(None)
-        longitudesP1.append(None)
-        
-        def getFieldValue(planetaryInfo, fieldName):
-            pi = planetaryInfo
-            fieldValue = None
-            
-            if centricityType == "geocentric":
-                fieldValue = pi.geocentric[longitudeType][fieldName]
-            elif centricityType.lower() == "topocentric":
-                fieldValue = pi.topocentric[longitudeType][fieldName]
-            elif centricityType.lower() == "heliocentric":
-                fieldValue = pi.heliocentric[longitudeType][fieldName]
-            else:
-                LookbackMultipleUtils.log.error("Unknown centricity type.")
-                fieldValue = None
-
-            return fieldValue
-            
-        if LookbackMultipleUtils.log.isEnabledFor(logging.DEBUG) == True:
-            LookbackMultipleUtils.log.debug("Stepping through timestamps from {} ...".\
-                  format(Ephemeris.datetimeToStr(referenceDt)))
-
-        currDiff = None
-        prevDiff = None
-
-        # Current and previous number of degrees distance relative that we are
-        # away from the longitude at referenceDt.
-        currDeltaDegrees = None
-        prevDeltaDegrees = None
-        
-        done = False
-        while not done:
-        
-            currDt = steps[-1]
-            prevDt = steps[-2]
-            
-            if LookbackMultipleUtils.log.isEnabledFor(logging.DEBUG) == True:
-                LookbackMultipleUtils.log.debug("Looking at currDt == {} ...".\
-                      format(Ephemeris.datetimeToStr(currDt)))
-
-            p1 = Ephemeris.getPlanetaryInfo(planetName, currDt)
-
-            if planetReferenceLongitude == None:
-                planetReferenceLongitude = getFieldValue(p1, fieldName)
-
-                if LookbackMultipleUtils.log.isEnabledFor(logging.DEBUG) == True:
-                    LookbackMultipleUtils.log.debug("planetReferenceLongitude == {}".\
-                                                format(planetReferenceLongitude))
-            
-            longitudesP1[-1] = getFieldValue(p1, fieldName)
-            
-            if LookbackMultipleUtils.log.isEnabledFor(logging.DEBUG) == True:
-                LookbackMultipleUtils.log.debug("{} {} {} {} is: {}".\
-                      format(p1.name, centricityType, longitudeType, fieldName,
-                             getFieldValue(p1, fieldName)))
-            
-            # Calculate the difference in planet longitudes between the current
-            # datetime and the referenceDt.  
-            # (This value will be in the range [0, 360) ).
-            #
-            currDiff = Util.toNormalizedAngle(\
-                longitudesP1[-1] - planetReferenceLongitude)
-            
-            if LookbackMultipleUtils.log.isEnabledFor(logging.DEBUG) == True:
-                LookbackMultipleUtils.log.debug("prevDiff == {}".\
-                                                format(prevDiff))
-                LookbackMultipleUtils.log.debug("currDiff == {}".\
-                                                format(currDiff))
-            
-            # If this is not the first iteration of the loop 
-            # (i.e. we have both a prevDiff and 
-            # a currDiff to compare).
-            if prevDiff != None and longitudesP1[-2] != None:
-                
-                if prevDiff > 240 and currDiff < 120:
-                    if LookbackMultipleUtils.log.isEnabledFor(logging.DEBUG) == True:
-                        LookbackMultipleUtils.log.debug("Crossed over planet reference longitude {} ".\
-                              format(planetReferenceLongitude) + \
-                              "from below to above!")
-
-                    # This is the upper-bound of the error timedelta.
-                    t1 = prevDt
-                    t2 = currDt
-                    currErrorTd = Util.absTd(t2 - t1)
-                    
-                    # Refine the timestamp until it is less than the threshold.
-                    while currErrorTd > maxErrorTd:
-                        if LookbackMultipleUtils.log.isEnabledFor(logging.DEBUG) == True:
-                            LookbackMultipleUtils.log.debug("Refining between {} and {}".\
-                                  format(Ephemeris.datetimeToStr(t1),
-                                         Ephemeris.datetimeToStr(t2)))
-
-                        # Check the timestamp between.
-                        timeWindowTd = t2 - t1
-                        halfTimeWindowTd = \
-                            datetime.\
-                            timedelta(days=(timeWindowTd.days / 2.0),
-                                seconds=(timeWindowTd.seconds / 2.0),
-                                microseconds=(timeWindowTd.microseconds / 2.0))
-                        testDt = t1 + halfTimeWindowTd
-
-                        p1 = Ephemeris.getPlanetaryInfo(planetName, testDt)
-
-                        testValueP1 = getFieldValue(p1, fieldName)
-
-                        testDiff = Util.toNormalizedAngle(\
-                            testValueP1 - planetReferenceLongitude)
-
-                        if testDiff < 120:
-                            t2 = testDt
-                            
-                            # Update the curr values.
-                            currDt = t2
-                            currDiff = testDiff
-                        else:
-                            t1 = testDt
-
-                            # Update the prev values.
-                            prevDt = t1
-
-                        currErrorTd = Util.absTd(t2 - t1)
-
-                    # Update our deque.
-                    steps[-1] = currDt
-                    steps[-2] = prevDt
-
-                    # Increment the number of 360-degree circles traversed.
-                    numFullCircles += 1
-
-                    # Calculate the total number of degrees of distance currently.
-                    currDeltaDegrees = (numFullCircles * 360.0) + currDiff
-                
-                elif prevDiff < 120 and currDiff > 240:
-                    if LookbackMultipleUtils.log.isEnabledFor(logging.DEBUG) == True:
-                        LookbackMultipleUtils.log.debug("Crossed over planet reference longitude {} ".\
-                              format(planetReferenceLongitude) + \
-                              "from above to below!")
-
-                    # This is the upper-bound of the error timedelta.
-                    t1 = prevDt
-                    t2 = currDt
-                    currErrorTd = Util.absTd(t2 - t1)
-
-                    # Refine the timestamp until it is less than the threshold.
-                    while currErrorTd > maxErrorTd:
-                        if LookbackMultipleUtils.log.isEnabledFor(logging.DEBUG) == True:
-                            LookbackMultipleUtils.log.debug("Refining between {} and {}".\
-                                  format(Ephemeris.datetimeToStr(t1),
-                                         Ephemeris.datetimeToStr(t2)))
-
-                        # Check the timestamp between.
-                        timeWindowTd = t2 - t1
-                        halfTimeWindowTd = \
-                            datetime.\
-                            timedelta(days=(timeWindowTd.days / 2.0),
-                                seconds=(timeWindowTd.seconds / 2.0),
-                                microseconds=(timeWindowTd.microseconds / 2.0))
-                        testDt = t1 + halfTimeWindowTd
-
-                        p1 = Ephemeris.getPlanetaryInfo(planetName, testDt)
-
-                        testValueP1 = getFieldValue(p1, fieldName)
-
-                        testDiff = Util.toNormalizedAngle(\
-                            testValueP1 - planetReferenceLongitude)
-
-                        if testDiff < 120:
-                            t1 = testDt
-
-                            # Update the prev values.
-                            prevDt = t1
-                        else:
-                            t2 = testDt
-                            
-                            # Update the curr values.
-                            currDt = t2
-                            currDiff = testDiff
-
-                        currErrorTd = Util.absTd(t2 - t1)
-
-                    # Update our deque.
-                    steps[-1] = currDt
-                    steps[-2] = prevDt
-
-                    # Decrement the number of 360-degree circles traversed.
-                    numFullCircles -= 1
-
-                    # Calculate the total number of degrees of distance currently.
-                    currDeltaDegrees = (numFullCircles * 360.0) + currDiff
-
-                else:
-                    # Planet reference longitude not crossed.
-                    
-                    # Calculate the total number of degrees of distance currently.
-                    currDeltaDegrees = (numFullCircles * 360.0) + currDiff
-                
-                # If prevDeltaDegrees is not set, then that means this is the first
-                # time in this section of code.  Initialize the prevDeltaDegrees.
-                if prevDeltaDegrees == None:
-                    # Two steps of stepSizeTd never goes more than 360 degrees,
-                    # so we can safely use the prevDiff as the
-                    # previous delta, without having to worry if we need to
-                    # account for multiple full circle revolutions in between.
-                    prevDeltaDegrees = prevDiff
-                
-                
-                if LookbackMultipleUtils.log.isEnabledFor(logging.DEBUG) == True:
-                    LookbackMultipleUtils.log.debug("prevDiff == {}".format(prevDiff))
-                    LookbackMultipleUtils.log.debug("currDiff == {}".format(currDiff))
-                    LookbackMultipleUtils.log.debug("currDeltaDegrees == {}".format(currDeltaDegrees))
-                    LookbackMultipleUtils.log.debug("prevDeltaDegrees == {}".format(prevDeltaDegrees))
-                    LookbackMultipleUtils.log.debug("desiredDeltaDegrees == {}".format(desiredDeltaDegrees))
-                
-                if prevDeltaDegrees < desiredDeltaDegrees and \
-                      currDeltaDegrees > desiredDeltaDegrees:
-                    # We pased the number of degrees past that we were
-                    # looking for.  Now we have to calculate the exact
-                    # timestamp and find out if there are other
-                    # moments in time where the planet is elapsed this
-                    # many degrees (in the event that the planet goes
-                    # retrograde).
-                    if LookbackMultipleUtils.log.isEnabledFor(logging.DEBUG) == True:
-                        LookbackMultipleUtils.log.debug("Passed the desired number of " + \
-                              "delta degrees from below to above.  " + \
-                              "Narrowing down to the exact moment in time ...")
-                    
-                    # Actual degree we are looking for.
-                    desiredDegree = \
-                        Util.toNormalizedAngle(\
-                        planetReferenceLongitude + 
-                        (desiredDeltaDegrees % 360.0))
-
-                    if LookbackMultipleUtils.log.isEnabledFor(logging.DEBUG) == True:
-                        LookbackMultipleUtils.log.debug("desiredDegree == {}".format(desiredDegree))
-                    
-                    # Check starting from steps[-2] to steps[-1] to
-                    # see exactly when it passes this desiredDegree.
-
-                    # This is the upper-bound of the error timedelta.
-                    t1 = steps[-2]
-                    t2 = steps[-1]
-                    currErrorTd = Util.absTd(t2 - t1)
-                    
-                    # Refine the timestamp until it is less than the threshold.
-                    while currErrorTd > maxErrorTd:
-                        if LookbackMultipleUtils.log.isEnabledFor(logging.DEBUG) == True:
-                            LookbackMultipleUtils.log.debug("Refining between {} and {}".\
-                                  format(Ephemeris.datetimeToStr(t1),
-                                         Ephemeris.datetimeToStr(t2)))
-
-                        # Check the timestamp between.
-                        timeWindowTd = t2 - t1
-                        halfTimeWindowTd = \
-                            datetime.\
-                            timedelta(days=(timeWindowTd.days / 2.0),
-                                seconds=(timeWindowTd.seconds / 2.0),
-                                microseconds=(timeWindowTd.microseconds / 2.0))
-                        testDt = t1 + halfTimeWindowTd
-
-                        p1 = Ephemeris.getPlanetaryInfo(planetName, testDt)
-                        
-                        testValueP1 = getFieldValue(p1, fieldName)
-
-                        testDiff = Util.toNormalizedAngle(\
-                            testValueP1 - desiredDegree)
-                        
-                        if testDiff < 120:
-                            t2 = testDt
-                        else:
-                            t1 = testDt
-
-                        currErrorTd = Util.absTd(t2 - t1)
-
-                    # t2 holds the moment in time.
-                    rv.append(t2)
-
-                    if LookbackMultipleUtils.log.isEnabledFor(logging.DEBUG) == True:
-                        p1 = Ephemeris.getPlanetaryInfo(planetName, t2)
-                        LookbackMultipleUtils.log.debug(\
-                            "Found moment time: {}, with longitudeDegree == {}".\
-                            format(Ephemeris.datetimeToStr(t2), 
-                                   getFieldValue(p1, fieldName)))
-
-                elif prevDeltaDegrees > desiredDeltaDegrees and \
-                      currDeltaDegrees < desiredDeltaDegrees:
-                    # We pased the number of degrees past that we were
-                    # looking for.  Now we have to calculate the exact
-                    # timestamp and find out if there are other
-                    # moments in time where the planet is elapsed this
-                    # many degrees (in the event that the planet goes
-                    # retrograde).
-                    if LookbackMultipleUtils.log.isEnabledFor(logging.DEBUG) == True:
-                        LookbackMultipleUtils.log.debug("Passed the desired number of " + \
-                              "delta degrees from above to below.  " + \
-                              "Narrowing down to the exact moment in time ...")
-                    
-                    # Actual degree we are looking for.
-                    desiredDegree = \
-                        Util.toNormalizedAngle(\
-                        planetReferenceLongitude + 
-                        (desiredDeltaDegrees % 360.0))
-
-                    if LookbackMultipleUtils.log.isEnabledFor(logging.DEBUG) == True:
-                        LookbackMultipleUtils.log.debug("desiredDegree == {}".format(desiredDegree))
-                    
-                    # Check starting from steps[-2] to steps[-1] to
-                    # see exactly when it passes this desiredDegree.
-
-                    # This is the upper-bound of the error timedelta.
-                    t1 = steps[-2]
-                    t2 = steps[-1]
-                    currErrorTd = Util.absTd(t2 - t1)
-                    
-                    # Refine the timestamp until it is less than the threshold.
-                    while currErrorTd > maxErrorTd:
-                        if LookbackMultipleUtils.log.isEnabledFor(logging.DEBUG) == True:
-                            LookbackMultipleUtils.log.debug("Refining between {} and {}".\
-                                  format(Ephemeris.datetimeToStr(t1),
-                                         Ephemeris.datetimeToStr(t2)))
-
-                        # Check the timestamp between.
-                        timeWindowTd = t2 - t1
-                        halfTimeWindowTd = \
-                            datetime.\
-                            timedelta(days=(timeWindowTd.days / 2.0),
-                                seconds=(timeWindowTd.seconds / 2.0),
-                                microseconds=(timeWindowTd.microseconds / 2.0))
-                        testDt = t1 + halfTimeWindowTd
-
-                        p1 = Ephemeris.getPlanetaryInfo(planetName, testDt)
-                        
-                        testValueP1 = getFieldValue(p1, fieldName)
-
-                        testDiff = Util.toNormalizedAngle(\
-                            testValueP1 - desiredDegree)
-                        
-                        if testDiff > 240:
-                            t2 = testDt
-                        else:
-                            t1 = testDt
-
-                        currErrorTd = Util.absTd(t2 - t1)
-
-                    # t2 holds the moment in time.
-                    rv.append(t2)
-
-                    if LookbackMultipleUtils.log.isEnabledFor(logging.DEBUG) == True:
-                        p1 = Ephemeris.getPlanetaryInfo(planetName, t2)
-                        LookbackMultipleUtils.log.debug(\
-                            "Found moment time: {}, with longitudeDegree == {}".\
-                            format(Ephemeris.datetimeToStr(t2), 
-                                   getFieldValue(p1, fieldName)))
-
-
-                # If we have at least one timestamp found, there is only need
-                # to continue looking for more potential timestamps if the
-                # planet can go retrograde.  Direct-only planets will yield
-                # only 1 timestamp, and we have found it already.
-                if len(rv) >= 1:    
-                    if Ephemeris.isDirectOnlyPlanetName(centricityType, planetName):
-                         
-                        if LookbackMultipleUtils.log.isEnabledFor(logging.DEBUG) == True:
-                            LookbackMultipleUtils.log.debug(\
-                            "No need to look for anymore timestamps " + \
-                            "because this planet doesn't go retrograde.")
-
-                        # Set the done flag, which will stop us from looking
-                        # for more timestamps.
-                        done = True
-
-                # Test base case to test if the planet will never reach the
-                # 'desiredDeltaDegrees' relative to the reference
-                # 'planetReferenceLongitude' longitude.
-                if currDeltaDegrees - desiredDeltaDegrees > 120:
-                        
-                    LookbackMultipleUtils.log.debug("Realizing we won't ever reach " + \
-                                                    "'desiredDeltaDegrees' if we continue, " + \
-                                                    "so setting done = True.")
-                    done = True
-
-            # Prepare for the next iteration.
-            steps.append(steps[-1] + stepSizeTd)
-            longitudesP1.append(None)
-
-            # Update prevDiff with the currDiff.
-            prevDiff = currDiff
-
-            # Update prevDeltaDegrees with the currDeltaDegrees.
-            prevDeltaDegrees = currDeltaDegrees
-
-        if LookbackMultipleUtils.log.isEnabledFor(logging.DEBUG) == True:
-            LookbackMultipleUtils.log.debug("Exiting " + inspect.stack()[0][3] + "()")
-
-        return rv
-
-        
     @staticmethod
     def getDatetimesOfLongitudeDeltaDegreesInPast(\
         planetName, 
@@ -626,6 +250,202 @@ class LookbackMultipleUtils:
         'referenceDt'.
         """
         
+        return LookbackMultipleUtils._getDatetimesOfLongitudeDeltaDegrees(\
+            planetName, centricityType, longitudeType, referenceDt,
+            desiredDeltaDegrees, maxErrorTd, backwards=True)
+
+    @staticmethod
+    def getDatetimesOfLongitudeDeltaDegreesInFutureForReferences(\
+        planetName, 
+        centricityType,
+        longitudeType,
+        referenceDts,
+        desiredDeltaDegrees,
+        maxErrorTd=datetime.timedelta(seconds=2)):
+        """Returns the same results as calling
+        getDatetimesOfLongitudeDeltaDegreesInFuture() once for each
+        timestamp in 'referenceDts', but the results are all obtained
+        in a single sweep through time, so this is a lot faster when
+        there are many reference timestamps (e.g. one for every
+        PriceBar on a chart).
+
+        Pre-requisites:
+        Same as for getDatetimesOfLongitudeDeltaDegreesInFuture().
+
+        Arguments:
+        planetName - str holding the name of the planet to do the
+                     calculations for.
+        centricityType - str value holding either "geocentric",
+                         "topocentric", or "heliocentric".
+        longitudeType - str value holding either "tropical" or "sidereal".
+        referenceDts - list of datetime.datetime objects for the
+                       reference times.  They do not need to be sorted.
+        desiredDeltaDegrees - float value for the number of longitude degrees
+                        elapsed from the longitude at each reference time.
+        maxErrorTd - datetime.timedelta object holding the maximum
+                     time difference between the exact planetary
+                     combination timestamp, and the one calculated.
+                     This would define the accuracy of the
+                     calculations.  
+
+        Returns:
+        List of lists of datetime.datetime objects.  Each list within
+        the list corresponds to the respective timestamp in
+        'referenceDts', and holds the same timestamps that
+        getDatetimesOfLongitudeDeltaDegreesInFuture() returns for it.
+        """
+        
+        return LookbackMultipleUtils.\
+            _getDatetimesOfLongitudeDeltaDegreesForReferences(\
+            planetName, centricityType, longitudeType, referenceDts,
+            [desiredDeltaDegrees] * len(referenceDts), maxErrorTd,
+            backwards=False)
+
+    @staticmethod
+    def getDatetimesOfLongitudeDeltaDegreesInPastForReferences(\
+        planetName, 
+        centricityType,
+        longitudeType,
+        referenceDts,
+        desiredDeltaDegrees,
+        maxErrorTd=datetime.timedelta(seconds=2)):
+        """Returns the same results as calling
+        getDatetimesOfLongitudeDeltaDegreesInPast() once for each
+        timestamp in 'referenceDts', but the results are all obtained
+        in a single sweep through time.
+
+        Pre-requisites:
+        Same as for getDatetimesOfLongitudeDeltaDegreesInPast().
+
+        Arguments:
+        planetName - str holding the name of the planet to do the
+                     calculations for.
+        centricityType - str value holding either "geocentric",
+                         "topocentric", or "heliocentric".
+        longitudeType - str value holding either "tropical" or "sidereal".
+        referenceDts - list of datetime.datetime objects for the
+                       reference times.  They do not need to be sorted.
+        desiredDeltaDegrees - float value for the number of longitude degrees
+                        elapsed from the longitude at each reference time.
+        maxErrorTd - datetime.timedelta object holding the maximum
+                     time difference between the exact planetary
+                     combination timestamp, and the one calculated.
+                     This would define the accuracy of the
+                     calculations.  
+
+        Returns:
+        List of lists of datetime.datetime objects.  Each list within
+        the list corresponds to the respective timestamp in
+        'referenceDts', and holds the same timestamps that
+        getDatetimesOfLongitudeDeltaDegreesInPast() returns for it.
+        """
+        
+        return LookbackMultipleUtils.\
+            _getDatetimesOfLongitudeDeltaDegreesForReferences(\
+            planetName, centricityType, longitudeType, referenceDts,
+            [desiredDeltaDegrees] * len(referenceDts), maxErrorTd,
+            backwards=True)
+
+    @staticmethod
+    def getDatetimesOfLongitudeDeltaDegreesInFutureForReferencesAndDeltas(\
+        planetName, 
+        centricityType,
+        longitudeType,
+        referenceDts,
+        desiredDeltaDegreesList,
+        maxErrorTd=datetime.timedelta(seconds=2)):
+        """Returns the same results as calling
+        getDatetimesOfLongitudeDeltaDegreesInFuture() once for each
+        pair of a timestamp in 'referenceDts' and the delta at the same
+        index in 'desiredDeltaDegreesList', but the results are all
+        obtained in a single sweep through time.  This is what makes
+        several LookbackMultiples of the same planet (that differ only
+        in their multiple) cost about as much as the largest of them.
+
+        Pre-requisites:
+        Same as for getDatetimesOfLongitudeDeltaDegreesInFuture().
+
+        Arguments:
+        planetName - str holding the name of the planet to do the
+                     calculations for.
+        centricityType - str value holding either "geocentric",
+                         "topocentric", or "heliocentric".
+        longitudeType - str value holding either "tropical" or "sidereal".
+        referenceDts - list of datetime.datetime objects for the
+                       reference times.  They do not need to be sorted,
+                       and the same timestamp may appear more than once.
+        desiredDeltaDegreesList - list of float values, of the same
+                        length as 'referenceDts', for the number of
+                        longitude degrees elapsed from the longitude at
+                        the respective reference time.
+        maxErrorTd - datetime.timedelta object holding the maximum
+                     time difference between the exact planetary
+                     combination timestamp, and the one calculated.
+                     This would define the accuracy of the
+                     calculations.  
+
+        Returns:
+        List of lists of datetime.datetime objects.  Each list within
+        the list corresponds to the respective pair of reference
+        timestamp and delta.
+        """
+        
+        return LookbackMultipleUtils.\
+            _getDatetimesOfLongitudeDeltaDegreesForReferences(\
+            planetName, centricityType, longitudeType, referenceDts,
+            desiredDeltaDegreesList, maxErrorTd, backwards=False)
+
+    @staticmethod
+    def getDatetimesOfLongitudeDeltaDegreesInPastForReferencesAndDeltas(\
+        planetName, 
+        centricityType,
+        longitudeType,
+        referenceDts,
+        desiredDeltaDegreesList,
+        maxErrorTd=datetime.timedelta(seconds=2)):
+        """Returns the same results as calling
+        getDatetimesOfLongitudeDeltaDegreesInPast() once for each
+        pair of a timestamp in 'referenceDts' and the delta at the same
+        index in 'desiredDeltaDegreesList', but the results are all
+        obtained in a single sweep through time.
+
+        Pre-requisites:
+        Same as for getDatetimesOfLongitudeDeltaDegreesInPast().
+
+        Arguments:
+        Same as for
+        getDatetimesOfLongitudeDeltaDegreesInFutureForReferencesAndDeltas().
+
+        Returns:
+        List of lists of datetime.datetime objects.  Each list within
+        the list corresponds to the respective pair of reference
+        timestamp and delta.
+        """
+        
+        return LookbackMultipleUtils.\
+            _getDatetimesOfLongitudeDeltaDegreesForReferences(\
+            planetName, centricityType, longitudeType, referenceDts,
+            desiredDeltaDegreesList, maxErrorTd, backwards=True)
+
+    @staticmethod
+    def _getDatetimesOfLongitudeDeltaDegrees(\
+        planetName, 
+        centricityType,
+        longitudeType,
+        referenceDt,
+        desiredDeltaDegrees,
+        maxErrorTd,
+        backwards):
+        """Helper function that does the work of
+        getDatetimesOfLongitudeDeltaDegreesInFuture() and
+        getDatetimesOfLongitudeDeltaDegreesInPast().  The arguments
+        and return value are the same as for those methods, with the
+        addition of:
+
+        backwards - bool value for whether to step into the past
+                    instead of into the future.
+        """
+        
         if LookbackMultipleUtils.log.isEnabledFor(logging.DEBUG) == True:
             LookbackMultipleUtils.log.debug("Entered " + inspect.stack()[0][3] + "()")
 
@@ -654,479 +474,326 @@ class LookbackMultipleUtils:
             LookbackMultipleUtils.log.error(errMsg)
             raise ValueError(errMsg)
 
-        # Field name we are getting.
-        fieldName = "longitude"
+        # Look up the timestamps in the LongitudeTable if it supports
+        # this planet, instead of stepping through time.
+        longitudeTable = LookbackMultipleUtils.longitudeTable
+        if longitudeTable != None and \
+               LongitudeTable.isSupportedPlanet(planetName, centricityType):
 
-        # Step size timedelta.  
-        stepSizeTd = \
-            LookbackMultipleUtils._getOptimalStepSizeTd(centricityType, 
-                                                        planetName)
-        stepSizeTd = stepSizeTd * -1
-        
-        # Running count of number of full 360-degree circles.
-        numFullCircles = 0
-        
-        # Desired degree.
-        desiredDegree = None
-        
-        # Longitude of the planet at datetime referenceDt.
-        planetReferenceLongitude = None
+            rv = longitudeTable.getDatetimesOfLongitudeDeltaDegrees(\
+                planetName, centricityType, longitudeType, referenceDt,
+                desiredDeltaDegrees, maxErrorTd, backwards)
+
+            if LookbackMultipleUtils.log.isEnabledFor(logging.DEBUG) == True:
+                LookbackMultipleUtils.log.debug("Exiting " + inspect.stack()[0][3] + "()")
 
-        # Iterate through, creating artfacts and adding them as we go.
-        steps = collections.deque(maxlen=2)
-        steps.append(referenceDt)
-        steps.append(referenceDt)
+            LookbackMultipleUtils.numReferences += 1
+            LookbackMultipleUtils.numResults += len(rv)
 
-        longitudesP1 = collections.deque(maxlen=2)
-        longitudesP1.append(None)
-        longitudesP1.append(None)
+            return rv
+
+        # +1 when stepping into the future, -1 when stepping into the past.
+        if backwards:
+            directionSign = -1
+        else:
+            directionSign = 1
         
-        def getFieldValue(planetaryInfo, fieldName):
-            pi = planetaryInfo
-            fieldValue = None
-            
-            if centricityType == "geocentric":
-                fieldValue = pi.geocentric[longitudeType][fieldName]
-            elif centricityType.lower() == "topocentric":
-                fieldValue = pi.topocentric[longitudeType][fieldName]
-            elif centricityType.lower() == "heliocentric":
-                fieldValue = pi.heliocentric[longitudeType][fieldName]
-            else:
-                LookbackMultipleUtils.log.error("Unknown centricity type.")
-                fieldValue = None
+        longitudeFunction = EventSolver.createLongitudeFunction(\
+            [(planetName, centricityType, longitudeType)])
 
-            return fieldValue
-            
+        # Stations from the StationIndex, if one is set.  This is None
+        # otherwise, and the stations are found while stepping.
+        stationsFunction = EventSolver.createStationsFunction(\
+            [(planetName, centricityType, longitudeType)])
+        
         if LookbackMultipleUtils.log.isEnabledFor(logging.DEBUG) == True:
             LookbackMultipleUtils.log.debug("Stepping through timestamps from {} ...".\
                   format(Ephemeris.datetimeToStr(referenceDt)))
 
-        currDiff = None
-        prevDiff = None
-
-        # Current and previous number of degrees distance relative that we are
-        # away from the longitude at referenceDt.
-        currDeltaDegrees = None
-        prevDeltaDegrees = None
-        
-        done = False
-        while not done:
+        # The unwrapped longitude of the planet starts at the longitude
+        # at datetime referenceDt, so the longitude we are looking for
+        # is simply 'desiredDeltaDegrees' further.
+        desiredLongitude = None
         
-            currDt = steps[-1]
-            prevDt = steps[-2]
-            
-            if LookbackMultipleUtils.log.isEnabledFor(logging.DEBUG) == True:
-                LookbackMultipleUtils.log.debug("Looking at currDt == {} ...".\
-                      format(Ephemeris.datetimeToStr(currDt)))
+        for segment in EventSolver.iterateLongitudeSegments(\
+            longitudeFunction, referenceDt, backwards=backwards,
+            maxErrorTd=maxErrorTd, stationsFunction=stationsFunction):
 
-            p1 = Ephemeris.getPlanetaryInfo(planetName, currDt)
+            (t1, u1, v1, t2, u2, v2) = segment
 
-            if planetReferenceLongitude == None:
-                planetReferenceLongitude = getFieldValue(p1, fieldName)
+            if desiredLongitude == None:
+                planetReferenceLongitude = u1
+                desiredLongitude = \
+                    planetReferenceLongitude + desiredDeltaDegrees
 
                 if LookbackMultipleUtils.log.isEnabledFor(logging.DEBUG) == True:
                     LookbackMultipleUtils.log.debug("planetReferenceLongitude == {}".\
                                                 format(planetReferenceLongitude))
-            
-            longitudesP1[-1] = getFieldValue(p1, fieldName)
-            
-            if LookbackMultipleUtils.log.isEnabledFor(logging.DEBUG) == True:
-                LookbackMultipleUtils.log.debug("{} {} {} {} is: {}".\
-                      format(p1.name, centricityType, longitudeType, fieldName,
-                             getFieldValue(p1, fieldName)))
-            
-            # Calculate the difference in planet longitudes between the current
-            # datetime and the referenceDt.  
-            # (This value will be in the range [0, 360) ).
-            #
-            currDiff = Util.toNormalizedAngle(\
-                longitudesP1[-1] - planetReferenceLongitude)
+
+            # Number of degrees of distance currently, relative to the
+            # longitude at referenceDt.
+            currDeltaDegrees = u2 - planetReferenceLongitude
             
             if LookbackMultipleUtils.log.isEnabledFor(logging.DEBUG) == True:
-                LookbackMultipleUtils.log.debug("prevDiff == {}".\
-                                                format(prevDiff))
-                LookbackMultipleUtils.log.debug("currDiff == {}".\
-                                                format(currDiff))
-            
-            # If this is not the first iteration of the loop 
-            # (i.e. we have both a prevDiff and 
-            # a currDiff to compare).
-            if prevDiff != None and longitudesP1[-2] != None:
-                
-                if prevDiff > 240 and currDiff < 120:
-                    if LookbackMultipleUtils.log.isEnabledFor(logging.DEBUG) == True:
-                        LookbackMultipleUtils.log.debug("Crossed over planet reference longitude {} ".\
-                              format(planetReferenceLongitude) + \
-                              "from below to above!")
-
-                    # This is the upper-bound of the error timedelta.
-                    t1 = prevDt
-                    t2 = currDt
-                    currErrorTd = Util.absTd(t2 - t1)
-                    
-                    # Refine the timestamp until it is less than the threshold.
-                    while currErrorTd > maxErrorTd:
-                        if LookbackMultipleUtils.log.isEnabledFor(logging.DEBUG) == True:
-                            LookbackMultipleUtils.log.debug("Refining between {} and {}".\
-                                  format(Ephemeris.datetimeToStr(t1),
-                                         Ephemeris.datetimeToStr(t2)))
-
-                        # Check the timestamp between.
-                        timeWindowTd = t2 - t1
-                        halfTimeWindowTd = \
-                            datetime.\
-                            timedelta(days=(timeWindowTd.days / 2.0),
-                                seconds=(timeWindowTd.seconds / 2.0),
-                                microseconds=(timeWindowTd.microseconds / 2.0))
-                        testDt = t1 + halfTimeWindowTd
-
-                        p1 = Ephemeris.getPlanetaryInfo(planetName, testDt)
-
-                        testValueP1 = getFieldValue(p1, fieldName)
-
-                        testDiff = Util.toNormalizedAngle(\
-                            testValueP1 - planetReferenceLongitude)
-
-                        if testDiff < 120:
-                            t2 = testDt
-                            
-                            # Update the curr values.
-                            currDt = t2
-                            currDiff = testDiff
-                        else:
-                            t1 = testDt
-
-                            # Update the prev values.
-                            prevDt = t1
-
-                        currErrorTd = Util.absTd(t2 - t1)
-
-                    # Update our deque.
-                    steps[-1] = currDt
-                    steps[-2] = prevDt
-
-                    # Increment the number of 360-degree circles traversed.
-                    numFullCircles += 1
-
-                    # Calculate the total number of degrees of distance currently.
-                    currDeltaDegrees = (numFullCircles * 360.0) + currDiff
-                
-                elif prevDiff < 120 and currDiff > 240:
-                    if LookbackMultipleUtils.log.isEnabledFor(logging.DEBUG) == True:
-                        LookbackMultipleUtils.log.debug("Crossed over planet reference longitude {} ".\
-                              format(planetReferenceLongitude) + \
-                              "from above to below!")
-
-                    # This is the upper-bound of the error timedelta.
-                    t1 = prevDt
-                    t2 = currDt
-                    currErrorTd = Util.absTd(t2 - t1)
-
-                    # Refine the timestamp until it is less than the threshold.
-                    while currErrorTd > maxErrorTd:
-                        if LookbackMultipleUtils.log.isEnabledFor(logging.DEBUG) == True:
-                            LookbackMultipleUtils.log.debug("Refining between {} and {}".\
-                                  format(Ephemeris.datetimeToStr(t1),
-                                         Ephemeris.datetimeToStr(t2)))
-
-                        # Check the timestamp between.
-                        timeWindowTd = t2 - t1
-                        halfTimeWindowTd = \
-                            datetime.\
-                            timedelta(days=(timeWindowTd.days / 2.0),
-                                seconds=(timeWindowTd.seconds / 2.0),
-                                microseconds=(timeWindowTd.microseconds / 2.0))
-                        testDt = t1 + halfTimeWindowTd
-
-                        p1 = Ephemeris.getPlanetaryInfo(planetName, testDt)
-
-                        testValueP1 = getFieldValue(p1, fieldName)
-
-                        testDiff = Util.toNormalizedAngle(\
-                            testValueP1 - planetReferenceLongitude)
-
-                        if testDiff < 120:
-                            t1 = testDt
-
-                            # Update the prev values.
-                            prevDt = t1
-                        else:
-                            t2 = testDt
-                            
-                            # Update the curr values.
-                            currDt = t2
-                            currDiff = testDiff
-
-                        currErrorTd = Util.absTd(t2 - t1)
-
-                    # Update our deque.
-                    steps[-1] = currDt
-                    steps[-2] = prevDt
-
-                    # Decrement the number of 360-degree circles traversed.
-                    numFullCircles -= 1
-
-                    # Calculate the total number of degrees of distance currently.
-                    currDeltaDegrees = (numFullCircles * 360.0) + currDiff
+                LookbackMultipleUtils.log.debug("currDeltaDegrees == {}".format(currDeltaDegrees))
+                LookbackMultipleUtils.log.debug("desiredDeltaDegrees == {}".format(desiredDeltaDegrees))
+
+            if len(EventSolver.getCrossingValues(segment,
+                                                 [desiredLongitude])) > 0:
+                # We passed the number of degrees that we were looking
+                # for.  Now we have to calculate the exact timestamp.
+                # There may be other moments in time where the planet
+                # is elapsed this many degrees (in the event that the
+                # planet goes retrograde).
+                if LookbackMultipleUtils.log.isEnabledFor(logging.DEBUG) == True:
+                    LookbackMultipleUtils.log.debug("Passed the desired number of " + \
+                          "delta degrees.  " + \
+                          "Narrowing down to the exact moment in time ...")
+
+                dt = EventSolver.findCrossingDatetime(\
+                    longitudeFunction, referenceDt, segment,
+                    desiredLongitude, maxErrorTd)
+                rv.append(dt)
 
-                else:
-                    # Planet reference longitude not crossed.
-                    
-                    # Calculate the total number of degrees of distance currently.
-                    currDeltaDegrees = (numFullCircles * 360.0) + currDiff
-                
-                # If prevDeltaDegrees is not set, then that means this is the first
-                # time in this section of code.  Initialize the prevDeltaDegrees.
-                if prevDeltaDegrees == None:
-                    # Two steps of stepSizeTd never goes more than 360 degrees,
-                    # so we can safely use the prevDiff as the
-                    # previous delta, without having to worry if we need to
-                    # account for multiple full circle revolutions in between.
-                    prevDeltaDegrees = prevDiff
-                
-                
                 if LookbackMultipleUtils.log.isEnabledFor(logging.DEBUG) == True:
-                    LookbackMultipleUtils.log.debug("prevDiff == {}".format(prevDiff))
-                    LookbackMultipleUtils.log.debug("currDiff == {}".format(currDiff))
-                    LookbackMultipleUtils.log.debug("currDeltaDegrees == {}".format(currDeltaDegrees))
-                    LookbackMultipleUtils.log.debug("prevDeltaDegrees == {}".format(prevDeltaDegrees))
-                    LookbackMultipleUtils.log.debug("desiredDeltaDegrees == {}".format(desiredDeltaDegrees))
-                
-                if prevDeltaDegrees < desiredDeltaDegrees and \
-                      currDeltaDegrees > desiredDeltaDegrees:
-                    # We pased the number of degrees past that we were
-                    # looking for.  Now we have to calculate the exact
-                    # timestamp and find out if there are other
-                    # moments in time where the planet is elapsed this
-                    # many degrees (in the event that the planet goes
-                    # retrograde).
+                    LookbackMultipleUtils.log.debug(\
+                        "Found moment time: {}".\
+                        format(Ephemeris.datetimeToStr(dt)))
+
+                # If we have at least one timestamp found, there is
+                # only need to continue looking for more potential
+                # timestamps if the planet can go retrograde.
+                # Direct-only planets will yield only 1 timestamp, and
+                # we have found it already.
+                if Ephemeris.isDirectOnlyPlanetName(centricityType, planetName):
+                         
                     if LookbackMultipleUtils.log.isEnabledFor(logging.DEBUG) == True:
-                        LookbackMultipleUtils.log.debug("Passed the desired number of " + \
-                              "delta degrees from below to above.  " + \
-                              "Narrowing down to the exact moment in time ...")
-                    
-                    # Actual degree we are looking for.
-                    desiredDegree = \
-                        Util.toNormalizedAngle(\
-                        planetReferenceLongitude + 
-                        (desiredDeltaDegrees % 360.0))
+                        LookbackMultipleUtils.log.debug(\
+                        "No need to look for anymore timestamps " + \
+                        "because this planet doesn't go retrograde.")
 
-                    if LookbackMultipleUtils.log.isEnabledFor(logging.DEBUG) == True:
-                        LookbackMultipleUtils.log.debug("desiredDegree == {}".format(desiredDegree))
-                    
-                    # Check starting from steps[-2] to steps[-1] to
-                    # see exactly when it passes this desiredDegree.
-
-                    # This is the upper-bound of the error timedelta.
-                    t1 = steps[-2]
-                    t2 = steps[-1]
-                    currErrorTd = Util.absTd(t2 - t1)
-                    
-                    # Refine the timestamp until it is less than the threshold.
-                    while currErrorTd > maxErrorTd:
-                        if LookbackMultipleUtils.log.isEnabledFor(logging.DEBUG) == True:
-                            LookbackMultipleUtils.log.debug("Refining between {} and {}".\
-                                  format(Ephemeris.datetimeToStr(t1),
-                                         Ephemeris.datetimeToStr(t2)))
-
-                        # Check the timestamp between.
-                        timeWindowTd = t2 - t1
-                        halfTimeWindowTd = \
-                            datetime.\
-                            timedelta(days=(timeWindowTd.days / 2.0),
-                                seconds=(timeWindowTd.seconds / 2.0),
-                                microseconds=(timeWindowTd.microseconds / 2.0))
-                        testDt = t1 + halfTimeWindowTd
-
-                        p1 = Ephemeris.getPlanetaryInfo(planetName, testDt)
-                        
-                        testValueP1 = getFieldValue(p1, fieldName)
+                    break
 
-                        testDiff = Util.toNormalizedAngle(\
-                            testValueP1 - desiredDegree)
+            # Test base case to test if the planet will never reach the
+            # 'desiredDeltaDegrees' relative to the reference
+            # 'planetReferenceLongitude' longitude.
+            if directionSign * (currDeltaDegrees - desiredDeltaDegrees) > 120:
                         
-                        if testDiff < 120:
-                            t2 = testDt
-                        else:
-                            t1 = testDt
+                LookbackMultipleUtils.log.debug("Realizing we won't ever reach " + \
+                                                "'desiredDeltaDegrees' if we continue, " + \
+                                                "so stopping.")
+                break
 
-                        currErrorTd = Util.absTd(t2 - t1)
+        if LookbackMultipleUtils.log.isEnabledFor(logging.DEBUG) == True:
+            LookbackMultipleUtils.log.debug("Exiting " + inspect.stack()[0][3] + "()")
 
-                    # t2 holds the moment in time.
-                    rv.append(t2)
+        LookbackMultipleUtils.numReferences += 1
+        LookbackMultipleUtils.numResults += len(rv)
 
-                    if LookbackMultipleUtils.log.isEnabledFor(logging.DEBUG) == True:
-                        p1 = Ephemeris.getPlanetaryInfo(planetName, t2)
-                        LookbackMultipleUtils.log.debug(\
-                            "Found moment time: {}, with longitudeDegree == {}".\
-                            format(Ephemeris.datetimeToStr(t2), 
-                                   getFieldValue(p1, fieldName)))
-
-                elif prevDeltaDegrees > desiredDeltaDegrees and \
-                      currDeltaDegrees < desiredDeltaDegrees:
-                    # We pased the number of degrees past that we were
-                    # looking for.  Now we have to calculate the exact
-                    # timestamp and find out if there are other
-                    # moments in time where the planet is elapsed this
-                    # many degrees (in the event that the planet goes
-                    # retrograde).
-                    if LookbackMultipleUtils.log.isEnabledFor(logging.DEBUG) == True:
-                        LookbackMultipleUtils.log.debug("Passed the desired number of " + \
-                              "delta degrees from above to below.  " + \
-                              "Narrowing down to the exact moment in time ...")
-                    
-                    # Actual degree we are looking for.
-                    desiredDegree = \
-                        Util.toNormalizedAngle(\
-                        planetReferenceLongitude + 
-                        (desiredDeltaDegrees % 360.0))
-
-                    if LookbackMultipleUtils.log.isEnabledFor(logging.DEBUG) == True:
-                        LookbackMultipleUtils.log.debug("desiredDegree == {}".format(desiredDegree))
-                    
-                    # Check starting from steps[-2] to steps[-1] to
-                    # see exactly when it passes this desiredDegree.
-
-                    # This is the upper-bound of the error timedelta.
-                    t1 = steps[-2]
-                    t2 = steps[-1]
-                    currErrorTd = Util.absTd(t2 - t1)
-                    
-                    # Refine the timestamp until it is less than the threshold.
-                    while currErrorTd > maxErrorTd:
-                        if LookbackMultipleUtils.log.isEnabledFor(logging.DEBUG) == True:
-                            LookbackMultipleUtils.log.debug("Refining between {} and {}".\
-                                  format(Ephemeris.datetimeToStr(t1),
-                                         Ephemeris.datetimeToStr(t2)))
-
-                        # Check the timestamp between.
-                        timeWindowTd = t2 - t1
-                        halfTimeWindowTd = \
-                            datetime.\
-                            timedelta(days=(timeWindowTd.days / 2.0),
-                                seconds=(timeWindowTd.seconds / 2.0),
-                                microseconds=(timeWindowTd.microseconds / 2.0))
-                        testDt = t1 + halfTimeWindowTd
-
-                        p1 = Ephemeris.getPlanetaryInfo(planetName, testDt)
-                        
-                        testValueP1 = getFieldValue(p1, fieldName)
+        return rv
 
-                        testDiff = Util.toNormalizedAngle(\
-                            testValueP1 - desiredDegree)
-                        
-                        if testDiff > 240:
-                            t2 = testDt
-                        else:
-                            t1 = testDt
+    @staticmethod
+    def _getDatetimesOfLongitudeDeltaDegreesForReferences(\
+        planetName, 
+        centricityType,
+        longitudeType,
+        referenceDts,
+        desiredDeltaDegreesList,
+        maxErrorTd,
+        backwards):
+        """Helper function that does the work of
+        getDatetimesOfLongitudeDeltaDegreesInFutureForReferencesAndDeltas()
+        and getDatetimesOfLongitudeDeltaDegreesInPastForReferencesAndDeltas().
+        The arguments and return value are the same as for those
+        methods, with the addition of:
+
+        backwards - bool value for whether to step into the past
+                    instead of into the future.
+
+        The reference timestamps are visited in the order of the
+        sweep.  The unwrapped longitude at each one, plus its delta,
+        gives the longitude looked for from it (its target).  The targets still
+        being looked for are kept sorted, so the ones crossed within
+        a segment are found by bisection.  A target stops being
+        looked for under the same conditions as in
+        _getDatetimesOfLongitudeDeltaDegrees().
+        """
+        
+        if LookbackMultipleUtils.log.isEnabledFor(logging.DEBUG) == True:
+            LookbackMultipleUtils.log.debug("Entered " + inspect.stack()[0][3] + "()")
 
-                        currErrorTd = Util.absTd(t2 - t1)
+        # Return value.
+        rv = [[] for referenceDt in referenceDts]
 
-                    # t2 holds the moment in time.
-                    rv.append(t2)
+        # Verify inputs.
+        if len(desiredDeltaDegreesList) != len(referenceDts):
+            errMsg = "Invalid input: desiredDeltaDegreesList has " + \
+                "{} values for {} reference timestamps.".\
+                format(len(desiredDeltaDegreesList), len(referenceDts))
+            LookbackMultipleUtils.log.error(errMsg)
+            raise ValueError(errMsg)
+            
+        centricityTypeOrig = centricityType
+        centricityType = centricityType.lower()
+        if centricityType != "geocentric" and \
+           centricityType != "topocentric" and \
+           centricityType != "heliocentric":
 
-                    if LookbackMultipleUtils.log.isEnabledFor(logging.DEBUG) == True:
-                        p1 = Ephemeris.getPlanetaryInfo(planetName, t2)
-                        LookbackMultipleUtils.log.debug(\
-                            "Found moment time: {}, with longitudeDegree == {}".\
-                            format(Ephemeris.datetimeToStr(t2), 
-                                   getFieldValue(p1, fieldName)))
+            errMsg = "Invalid input: centricityType is invalid.  " + \
+                      "Value given was: {}".format(centricityTypeOrig)
+            LookbackMultipleUtils.log.error(errMsg)
+            raise ValueError(errMsg)
 
+        longitudeTypeOrig = longitudeType
+        longitudeType = longitudeType.lower()
+        if longitudeType != "tropical" and \
+           longitudeType != "sidereal":
 
-                # If we have at least one timestamp found, there is only need
-                # to continue looking for more potential timestamps if the
-                # planet can go retrograde.  Direct-only planets will yield
-                # only 1 timestamp, and we have found it already.
-                if len(rv) >= 1:    
-                    if Ephemeris.isDirectOnlyPlanetName(centricityType, planetName):
-                        
-                        if LookbackMultipleUtils.log.isEnabledFor(logging.DEBUG) == True:
-                            LookbackMultipleUtils.log.debug(\
-                            "No need to look for anymore timestamps " + \
-                            "because this planet doesn't go retrograde.")
-
-                        # Set the done flag, which will stop us from looking
-                        # for more timestamps.
-                        done = True
-                    
-                # Test base case to test if the planet will never reach the
-                # 'desiredDeltaDegrees' relative to the reference
-                # 'planetReferenceLongitude' longitude.
-                if currDeltaDegrees - desiredDeltaDegrees < -120:
-                        
-                    LookbackMultipleUtils.log.debug("Realizing we won't ever reach " + \
-                                                    "'desiredDeltaDegrees' if we continue, " + \
-                                                    "so setting done = True.")
-                    done = True
-                
-            # Prepare for the next iteration.
-            steps.append(steps[-1] + stepSizeTd)
-            longitudesP1.append(None)
+            errMsg = "Invalid input: longitudeType is invalid.  " + \
+                      "Value given was: {}".format(longitudeTypeOrig)
+            LookbackMultipleUtils.log.error(errMsg)
+            raise ValueError(errMsg)
 
-            # Update prevDiff with the currDiff.
-            prevDiff = currDiff
+        if len(referenceDts) == 0:
+            return rv
+        
+        # +1 when stepping into the future, -1 when stepping into the past.
+        if backwards:
+            directionSign = -1
+        else:
+            directionSign = 1
+
+        isDirectOnlyPlanet = \
+            Ephemeris.isDirectOnlyPlanetName(centricityType, planetName)
+        
+        longitudeFunction = EventSolver.createLongitudeFunction(\
+            [(planetName, centricityType, longitudeType)])
+
+        # Stations from the StationIndex, if one is set.  This is None
+        # otherwise, and the stations are found while stepping.
+        stationsFunction = EventSolver.createStationsFunction(\
+            [(planetName, centricityType, longitudeType)])
+
+        # Indexes of the reference timestamps, in the order the sweep
+        # reaches them.
+        pendingIndexes = sorted(range(len(referenceDts)),
+                                key=lambda i: referenceDts[i],
+                                reverse=backwards)
+        nextPending = 0
+
+        # The rest of the segment after the last reference timestamp
+        # visited, as a tuple (referenceDt, referenceSegment).  The
+        # same timestamp is often given once for each delta.
+        lastReference = (None, None)
+
+        startDt = referenceDts[pendingIndexes[0]]
+        
+        # Targets still looked for, as sorted lists of the unwrapped
+        # longitudes and of the matching indexes into 'referenceDts'.
+        targetLongitudes = []
+        targetIndexes = []
+
+        def addResult(i, segment, desiredLongitude):
+            """Appends the timestamp of the crossing of
+            'desiredLongitude' in 'segment' to the results of
+            referenceDts[i].
+            """
+
+            dt = EventSolver.findCrossingDatetime(\
+                longitudeFunction, startDt, segment,
+                desiredLongitude, maxErrorTd)
+            rv[i].append(dt.astimezone(referenceDts[i].tzinfo))
+        
+        if LookbackMultipleUtils.log.isEnabledFor(logging.DEBUG) == True:
+            LookbackMultipleUtils.log.debug(\
+                "Stepping through timestamps from {} for {} references ...".\
+                format(Ephemeris.datetimeToStr(startDt), len(referenceDts)))
+
+        for segment in EventSolver.iterateLongitudeSegments(\
+            longitudeFunction, startDt, backwards=backwards,
+            maxErrorTd=maxErrorTd, stationsFunction=stationsFunction):
+
+            (t1, u1, v1, t2, u2, v2) = segment
+
+            # Targets of the reference timestamps reached before this
+            # segment, that are crossed within this segment.
+            low = bisect.bisect_left(targetLongitudes, min(u1, u2))
+            high = bisect.bisect_right(targetLongitudes, max(u1, u2))
+            crossedIndexes = []
+            for j in range(low, high):
+                if len(EventSolver.getCrossingValues(\
+                    segment, [targetLongitudes[j]])) > 0:
+
+                    addResult(targetIndexes[j], segment, targetLongitudes[j])
+                    crossedIndexes.append(j)
+
+            # Direct-only planets will yield only 1 timestamp per
+            # reference, and we have found it already.
+            if isDirectOnlyPlanet:
+                for j in reversed(crossedIndexes):
+                    del targetLongitudes[j]
+                    del targetIndexes[j]
+
+            # Reference timestamps reached within this segment.  One
+            # at the end of the segment is left for the next segment,
+            # so that its longitude is exactly the one of the sweep.
+            while nextPending < len(pendingIndexes):
+                i = pendingIndexes[nextPending]
+                t = (referenceDts[i] - startDt).total_seconds() / 86400.0
+                if directionSign * t >= directionSign * t2:
+                    break
+                nextPending += 1
+
+                # The rest of the segment, after the reference timestamp.
+                if t == t1:
+                    referenceSegment = segment
+                elif lastReference[0] == referenceDts[i] and \
+                     lastReference[1][3] == t2:
+                    referenceSegment = lastReference[1]
+                else:
+                    (longitude, v) = longitudeFunction(referenceDts[i])
+                    u = u1 + (longitude - u1 + 180.0) % 360.0 - 180.0
+                    referenceSegment = (t, u, v, t2, u2, v2)
+                lastReference = (referenceDts[i], referenceSegment)
+
+                desiredLongitude = \
+                    referenceSegment[1] + desiredDeltaDegreesList[i]
+
+                if len(EventSolver.getCrossingValues(\
+                    referenceSegment, [desiredLongitude])) > 0:
+
+                    addResult(i, referenceSegment, desiredLongitude)
+                    if isDirectOnlyPlanet:
+                        continue
+
+                j = bisect.bisect_right(targetLongitudes, desiredLongitude)
+                targetLongitudes.insert(j, desiredLongitude)
+                targetIndexes.insert(j, i)
+
+            # Stop looking for the targets that won't ever be reached.
+            if directionSign > 0:
+                while len(targetLongitudes) > 0 and \
+                      u2 - targetLongitudes[0] > 120:
+                    del targetLongitudes[0]
+                    del targetIndexes[0]
+            else:
+                while len(targetLongitudes) > 0 and \
+                      targetLongitudes[-1] - u2 > 120:
+                    del targetLongitudes[-1]
+                    del targetIndexes[-1]
 
-            # Update prevDeltaDegrees with the currDeltaDegrees.
-            prevDeltaDegrees = currDeltaDegrees
+            if nextPending == len(pendingIndexes) and \
+               len(targetLongitudes) == 0:
+                break
 
         if LookbackMultipleUtils.log.isEnabledFor(logging.DEBUG) == True:
             LookbackMultipleUtils.log.debug("Exiting " + inspect.stack()[0][3] + "()")
 
-        return rv
+        LookbackMultipleUtils.numReferences += len(referenceDts)
+        for resultDts in rv:
+            LookbackMultipleUtils.numResults += len(resultDts)
 
-        
-    @staticmethod
-    def _getOptimalStepSizeTd(centricityType, planetName):
-        """Helper function that will try to determine a better step size
-        for supporting other methods of LookbackMultipleUtils.
-        
-        The step size chosen here is dependent on centricityType and planetName.
-        """
-        
-        # This is the default step size.  
-        # Planet should not ever move more than 120 degrees per step size.
-        stepSizeTd = datetime.timedelta(days=1)
-
-        # Optimize the step size accord to the planet being used.
-        if Ephemeris.isHouseCuspPlanetName(planetName) or \
-               Ephemeris.isAscmcPlanetName(planetName):
-
-            # House cusps and ascmc planets need a smaller step size.
-            stepSizeTd = datetime.timedelta(hours=5)
-
-        # These planets don't go retrograde, so we don't have to worry about
-        # losing data points if our step size is too big.  We just have to keep
-        # the step size to lower than 120 degrees.  Here, I'll just
-        # use some overly safe values, because planets move a different speeds
-        # due to their elliptical orbits.
-        if centricityType == "geocentric":
-            if planetName == "Moon":
-                stepSizeTd = datetime.timedelta(days=5)
-            elif planetName == "MoSu":
-                stepSizeTd = datetime.timedelta(days=5)
-            elif planetName == "Sun":
-                stepSizeTd = datetime.timedelta(days=55)
-        elif centricityType == "heliocentric":
-            if planetName == "Mercury":
-                stepSizeTd = datetime.timedelta(days=12)
-            elif planetName == "Venus":
-                stepSizeTd = datetime.timedelta(days=30)
-            elif planetName == "Earth":
-                stepSizeTd = datetime.timedelta(days=55)
-            elif planetName == "Mars":
-                stepSizeTd = datetime.timedelta(days=90)
-            elif planetName == "Jupiter":
-                stepSizeTd = datetime.timedelta(days=360)
-            elif planetName == "Saturn":
-                stepSizeTd = datetime.timedelta(days=720)
-            elif planetName == "Uranus":
-                stepSizeTd = datetime.timedelta(days=2100)
-            elif planetName == "Neptune":
-                stepSizeTd = datetime.timedelta(days=4200)
-            elif planetName == "Pluto":
-                stepSizeTd = datetime.timedelta(days=4200)
-
-        return stepSizeTd
+        return rv
 
 ##############################################################################
 
@@ -2085,6 +1752,157 @@ def testLookbackMultipleUtils_getDatetimesOfLongitudeDeltaDegreesInPast():
     print("")
 
 
+def testLookbackMultipleUtils_getDatetimesOfLongitudeDeltaDegreesForReferences():
+    """Tests that the results for many reference timestamps at once
+    are the same as the results for each of them separately.
+    """
+
+    print("Running " + inspect.stack()[0][3] + "()")
+    
+    # Assumes that Ephemeris has been initialized by this point of execution.
+
+    maxErrorTd = datetime.timedelta(minutes=1)
+    
+    referenceDts = []
+    for i in range(40):
+        referenceDts.append(datetime.datetime(1983, 10, 25, 19, 34,
+                                              tzinfo=pytz.utc) + \
+                            datetime.timedelta(days=3 * i))
+
+    testCases = [\
+        ("Sun", "geocentric", "tropical", 150),
+        ("Moon", "geocentric", "sidereal", 720),
+        ("Mercury", "geocentric", "tropical", 20),
+        ("Venus", "heliocentric", "tropical", 400),
+        ("MoSu", "geocentric", "tropical", 90),
+        ("H1", "geocentric", "tropical", 360)]
+
+    for (planetName, centricityType, longitudeType, desiredDeltaDegrees) \
+        in testCases:
+
+        for backwards in [False, True]:
+            if backwards:
+                method = LookbackMultipleUtils.\
+                    getDatetimesOfLongitudeDeltaDegreesInPast
+                batchMethod = LookbackMultipleUtils.\
+                    getDatetimesOfLongitudeDeltaDegreesInPastForReferences
+                deltaDegrees = -desiredDeltaDegrees
+            else:
+                method = LookbackMultipleUtils.\
+                    getDatetimesOfLongitudeDeltaDegreesInFuture
+                batchMethod = LookbackMultipleUtils.\
+                    getDatetimesOfLongitudeDeltaDegreesInFutureForReferences
+                deltaDegrees = desiredDeltaDegrees
+
+            print("  Testing {} {} {} moving {} degrees for {} references.".\
+                  format(centricityType, longitudeType, planetName,
+                         deltaDegrees, len(referenceDts)))
+            
+            resultsList = batchMethod(planetName, centricityType,
+                                      longitudeType, referenceDts,
+                                      deltaDegrees, maxErrorTd)
+
+            numDifferent = 0
+            for i in range(len(referenceDts)):
+                expectedDts = method(planetName, centricityType,
+                                     longitudeType, referenceDts[i],
+                                     deltaDegrees, maxErrorTd)
+                resultDts = resultsList[i]
+
+                if len(expectedDts) != len(resultDts):
+                    numDifferent += 1
+                    continue
+
+                for j in range(len(expectedDts)):
+                    if abs(expectedDts[j] - resultDts[j]) > 2 * maxErrorTd:
+                        numDifferent += 1
+                        break
+
+            print("  Actual   num different == {}".format(numDifferent))
+            print("  Expected num different == 0")
+
+    print("")
+
+
+def testLookbackMultipleUtils_getDatetimesOfLongitudeDeltaDegreesForReferencesAndDeltas():
+    """Tests that the results for several deltas calculated in one
+    sweep are the same as the results for each delta separately.
+    """
+
+    print("Running " + inspect.stack()[0][3] + "()")
+    
+    # Assumes that Ephemeris has been initialized by this point of execution.
+
+    maxErrorTd = datetime.timedelta(minutes=1)
+    
+    referenceDts = []
+    for i in range(20):
+        referenceDts.append(datetime.datetime(1983, 10, 25, 19, 34,
+                                              tzinfo=pytz.utc) + \
+                            datetime.timedelta(days=5 * i))
+
+    testCases = [\
+        ("Sun", "geocentric", "tropical", [30, 90, 360]),
+        ("Venus", "geocentric", "tropical", [45, 360, 720]),
+        ("MoSu", "geocentric", "tropical", [360, 720, 1080, 1440])]
+
+    for (planetName, centricityType, longitudeType, desiredDeltaDegreesList) \
+        in testCases:
+
+        for backwards in [False, True]:
+            if backwards:
+                method = LookbackMultipleUtils.\
+                    getDatetimesOfLongitudeDeltaDegreesInPastForReferences
+                sharedMethod = LookbackMultipleUtils.\
+                    getDatetimesOfLongitudeDeltaDegreesInPastForReferencesAndDeltas
+                deltas = [-d for d in desiredDeltaDegreesList]
+            else:
+                method = LookbackMultipleUtils.\
+                    getDatetimesOfLongitudeDeltaDegreesInFutureForReferences
+                sharedMethod = LookbackMultipleUtils.\
+                    getDatetimesOfLongitudeDeltaDegreesInFutureForReferencesAndDeltas
+                deltas = desiredDeltaDegreesList
+
+            print("  Testing {} {} {} moving {} degrees for {} references.".\
+                  format(centricityType, longitudeType, planetName,
+                         deltas, len(referenceDts)))
+
+            # Every reference timestamp with every delta.
+            pairReferenceDts = []
+            pairDeltas = []
+            for deltaDegrees in deltas:
+                pairReferenceDts.extend(referenceDts)
+                pairDeltas.extend([deltaDegrees] * len(referenceDts))
+            
+            resultsList = sharedMethod(planetName, centricityType,
+                                       longitudeType, pairReferenceDts,
+                                       pairDeltas, maxErrorTd)
+
+            numDifferent = 0
+            for k in range(len(deltas)):
+                expectedResultsList = \
+                    method(planetName, centricityType, longitudeType,
+                           referenceDts, deltas[k], maxErrorTd)
+                
+                for i in range(len(referenceDts)):
+                    expectedDts = expectedResultsList[i]
+                    resultDts = resultsList[k * len(referenceDts) + i]
+
+                    if len(expectedDts) != len(resultDts):
+                        numDifferent += 1
+                        continue
+
+                    for j in range(len(expectedDts)):
+                        if abs(expectedDts[j] - resultDts[j]) > 2 * maxErrorTd:
+                            numDifferent += 1
+                            break
+
+            print("  Actual   num different == {}".format(numDifferent))
+            print("  Expected num different == 0")
+
+    print("")
+
+
 def testLookbackMultipleUtils_speedTest():
     """Tests to see how long it takes to do some computations."""
 
@@ -2205,6 +2023,8 @@ if __name__=="__main__":
     def runTests():
         testLookbackMultipleUtils_getDatetimesOfLongitudeDeltaDegreesInFuture()
         testLookbackMultipleUtils_getDatetimesOfLongitudeDeltaDegreesInPast()
+        testLookbackMultipleUtils_getDatetimesOfLongitudeDeltaDegreesForReferences()
+        testLookbackMultipleUtils_getDatetimesOfLongitudeDeltaDegreesForReferencesAndDeltas()
         testLookbackMultipleUtils_speedTest()
 
     startTime = time.time()
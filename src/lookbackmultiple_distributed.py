@@ -0,0 +1,1031 @@
+# For logging.
+import logging
+
+# For the connections between the server, workers and clients.
+from multiprocessing.connection import Listener
+from multiprocessing.connection import Client
+from multiprocessing import AuthenticationError
+
+# For the threads of the server and the heartbeats of the workers.
+import threading
+
+# For the queue of tasks waiting for a worker.
+import collections
+
+# For the lease expiry times.
+import time
+
+# For encoding timestamps.
+import struct
+
+# For identifying workers.
+import os
+import socket
+
+# For timestamps and timezone information.
+import datetime
+import pytz
+
+# For directory access.
+import inspect
+
+# For adding up the work done by the workers.
+from lookbackmultiple_telemetry import LookbackMultipleTelemetry
+
+# For grouping and calculating batches of LookbackMultiple tuples.
+from lookbackmultiple_parallel import groupArgsTuples
+from lookbackmultiple_parallel import sortIndexesByTarget
+from lookbackmultiple_parallel import getDatetimesForBatch
+
+##############################################################################
+
+class LookbackMultipleJobProtocol:
+    """Class holding the encoding used for the messages between
+    LookbackMultipleJobServer, LookbackMultipleJobWorker and
+    LookbackMultipleJobClient.
+
+    Messages are tuples sent over multiprocessing.connection
+    connections, with the message type as the first element:
+
+      Client to server:
+        ("submit", batches)              -> ("submitted", jobId)
+        ("wait", jobId, timeoutSeconds)  -> ("results", numDone, numTotal,
+                                              [(batchIndex, data,
+                                                busySeconds, queueSeconds,
+                                                counters), ...])
+        ("cancel", jobId)                -> ("ok",)
+
+      Worker to server:
+        ("lease", workerId, maxNumBatches, timeoutSeconds)
+                                         -> ("lease", leaseId,
+                                              [(taskId, batch), ...])
+        ("heartbeat", leaseId)           -> ("ok", leaseValidFlag)
+        ("complete", leaseId, [(taskId, data, busySeconds,
+                                counters), ...],
+                              [(taskId, errorStr), ...])
+                                         -> ("ok",)
+
+    Any request can also get ("error", errorStr) back.  A "wait" gets
+    it when a batch of the job failed on every attempt.
+
+    A worker completes a lease with the results of the batches it
+    calculated, and the errors of the batches whose calculation raised
+    an exception.  Once a heartbeat reports the lease is no longer
+    valid, the worker does not start any more of its batches.
+
+    Along with the results of each batch go the seconds the worker
+    spent calculating it, the seconds it waited on the server from the
+    submit until it was leased, and a dict of the work counters of the
+    worker for it (see LookbackMultipleTelemetry).
+
+    A batch is a tuple (methodName, key, encodedReferenceDts,
+    encodedDesiredDeltaDegrees), where 'key' holds the arguments
+    shared by all the pairs of reference timestamp and desired delta
+    degrees (see lookbackmultiple_parallel.groupArgsTuples()).
+    Timestamps are encoded as little-endian int64 microseconds since
+    the epoch (UTC), deltas as little-endian doubles, and the results
+    of a batch as the number of results of each pair followed by all
+    the result timestamps.
+    """
+
+    # Seconds since the epoch of a timestamp is relative to this.
+    epochDt = datetime.datetime(1970, 1, 1, tzinfo=pytz.utc)
+
+    @staticmethod
+    def encodeDatetimes(dts):
+        """Returns bytes holding the given list of timezone-aware
+        datetime.datetime objects.
+        """
+
+        epochDt = LookbackMultipleJobProtocol.epochDt
+
+        values = [(dt - epochDt) // datetime.timedelta(microseconds=1) \
+                  for dt in dts]
+
+        return struct.pack("<I{}q".format(len(values)), len(values), *values)
+
+    @staticmethod
+    def decodeDatetimes(data, offset=0):
+        """Returns a tuple (dts, offset) with the list of
+        datetime.datetime objects (in UTC) encoded by encodeDatetimes()
+        at 'offset' in 'data', and the offset just past them.
+        """
+
+        epochDt = LookbackMultipleJobProtocol.epochDt
+
+        (numValues,) = struct.unpack_from("<I", data, offset)
+        offset += 4
+        values = struct.unpack_from("<{}q".format(numValues), data, offset)
+        offset += 8 * numValues
+
+        dts = [epochDt + datetime.timedelta(microseconds=value) \
+               for value in values]
+
+        return (dts, offset)
+
+    @staticmethod
+    def encodeFloats(values):
+        """Returns bytes holding the given list of float values."""
+
+        return struct.pack("<I{}d".format(len(values)), len(values), *values)
+
+    @staticmethod
+    def decodeFloats(data, offset=0):
+        """Returns a tuple (values, offset) with the list of float
+        values encoded by encodeFloats() at 'offset' in 'data', and the
+        offset just past them.
+        """
+
+        (numValues,) = struct.unpack_from("<I", data, offset)
+        offset += 4
+        values = struct.unpack_from("<{}d".format(numValues), data, offset)
+        offset += 8 * numValues
+
+        return (list(values), offset)
+
+    @staticmethod
+    def encodeResults(resultsList):
+        """Returns bytes holding the given list of list of
+        datetime.datetime objects.
+        """
+
+        counts = [len(resultDts) for resultDts in resultsList]
+        flatDts = [dt for resultDts in resultsList for dt in resultDts]
+
+        return struct.pack("<I{}I".format(len(counts)), len(counts), *counts) + \
+            LookbackMultipleJobProtocol.encodeDatetimes(flatDts)
+
+    @staticmethod
+    def decodeResults(data):
+        """Returns the list of list of datetime.datetime objects (in
+        UTC) encoded by encodeResults().
+        """
+
+        (numCounts,) = struct.unpack_from("<I", data, 0)
+        counts = struct.unpack_from("<{}I".format(numCounts), data, 4)
+
+        (flatDts, offset) = \
+            LookbackMultipleJobProtocol.decodeDatetimes(data, 4 + 4 * numCounts)
+
+        resultsList = []
+        start = 0
+        for count in counts:
+            resultsList.append(flatDts[start:start + count])
+            start += count
+
+        return resultsList
+
+
+class LookbackMultipleJobServer:
+    """Server that hands out batches of LookbackMultiple calculations
+    submitted by LookbackMultipleJobClients to
+    LookbackMultipleJobWorkers, and passes the results back.
+
+    Workers lease a few batches at a time.  A lease is kept alive by
+    the worker's heartbeats.  When a worker's connection is lost, or
+    its lease expires without a heartbeat, the batches of the lease go
+    back to the front of the queue for another worker.  A batch
+    completed more than once only has its first result kept.
+
+    A batch whose calculation failed is also given to another worker.
+    A batch is leased at most 'maxNumAttemptsPerBatch' times; when
+    that is used up without a result, the job fails, and the client
+    gets an error back.
+    """
+
+    def __init__(self, address, authKey, leaseTimeoutSeconds=30.0,
+                 maxNumAttemptsPerBatch=3):
+        """Creates the server and starts listening.  Call
+        serveForever() or start() to begin accepting connections.
+
+        Arguments:
+        address - tuple of (hostname or IP address str, port int).
+                  Port 0 picks a free port; see self.address.
+        authKey - bytes holding the authentication key.
+        leaseTimeoutSeconds - float holding the number of seconds a
+                              lease stays valid without a heartbeat.
+        maxNumAttemptsPerBatch - int holding the number of times a
+                                 batch is leased before its job fails.
+        """
+
+        self.log = logging.getLogger(\
+            "lookbackmultiple_distributed.LookbackMultipleJobServer")
+
+        self.leaseTimeoutSeconds = leaseTimeoutSeconds
+        self.maxNumAttemptsPerBatch = maxNumAttemptsPerBatch
+
+        self.listener = Listener(address, authkey=authKey)
+
+        # Address actually listened on.
+        self.address = self.listener.address
+
+        # Guards all the state below, and is notified when it changes.
+        self.condition = threading.Condition()
+
+        self.runningFlag = False
+
+        self.nextJobId = 1
+        self.nextLeaseId = 1
+
+        # Dictionary mapping a job id to a dict with the keys:
+        #   "batches" - list of batches.
+        #   "submitTime" - float time.time() when the job was submitted.
+        #   "results" - dict mapping a batch index to a tuple of
+        #               (data, busySeconds, queueSeconds, counters),
+        #               for the results not yet delivered.
+        #   "doneIndexes" - set of the batch indexes completed.
+        #   "numDelivered" - int number of results delivered.
+        #   "numAttempts" - dict mapping a batch index to the number
+        #                   of times it was leased.
+        #   "errorStr" - str describing why the job failed, or None.
+        self.jobs = {}
+
+        # Tasks waiting for a worker, as tuples (jobId, batchIndex).
+        self.pendingTasks = collections.deque()
+
+        # Dictionary mapping a lease id to a dict with the keys:
+        #   "workerId" - str identifying the worker.
+        #   "taskIds" - list of (jobId, batchIndex).
+        #   "leaseTime" - float time.time() when the lease was made.
+        #   "expiryTime" - float time.time() when the lease expires.
+        self.leases = {}
+
+    def start(self):
+        """Runs serveForever() in a daemon thread."""
+
+        thread = threading.Thread(target=self.serveForever, daemon=True)
+        thread.start()
+
+    def serveForever(self):
+        """Accepts connections until shutdown() is called.  Each
+        connection is handled in its own thread.
+        """
+
+        self.log.info("LookbackMultiple server listening on {}".\
+                      format(self.address))
+
+        self.runningFlag = True
+
+        thread = threading.Thread(target=self.__expireLeases, daemon=True)
+        thread.start()
+
+        while self.runningFlag == True:
+            try:
+                conn = self.listener.accept()
+            except AuthenticationError as e:
+                self.log.warning("Rejected a connection: {}".format(e))
+                continue
+            except OSError:
+                # The listener was closed.
+                break
+
+            thread = threading.Thread(target=self.__handleConnection,
+                                      args=(conn,),
+                                      daemon=True)
+            thread.start()
+
+    def shutdown(self):
+        """Stops accepting connections."""
+
+        with self.condition:
+            self.runningFlag = False
+            self.condition.notify_all()
+
+        self.listener.close()
+
+    def getNumPendingTasks(self):
+        """Returns the number of batches waiting for a worker."""
+
+        with self.condition:
+            return len(self.pendingTasks)
+
+    def __handleConnection(self, conn):
+        """Handles the requests of one connection until it is closed.
+        The leases still held when a worker's connection is lost, and
+        the jobs of a client's connection, are given up.
+        """
+
+        leaseIds = set()
+        jobIds = set()
+
+        try:
+            while True:
+                message = conn.recv()
+                messageType = message[0]
+
+                if messageType == "submit":
+                    reply = self.__submit(message[1])
+                    jobIds.add(reply[1])
+                elif messageType == "wait":
+                    reply = self.__wait(message[1], message[2])
+                    if reply[0] == "results" and reply[1] == reply[2]:
+                        jobIds.discard(message[1])
+                elif messageType == "cancel":
+                    reply = self.__cancel(message[1])
+                    jobIds.discard(message[1])
+                elif messageType == "lease":
+                    reply = self.__lease(message[1], message[2], message[3])
+                    if reply[1] != None:
+                        leaseIds.add(reply[1])
+                elif messageType == "heartbeat":
+                    reply = self.__heartbeat(message[1])
+                elif messageType == "complete":
+                    reply = self.__complete(message[1], message[2],
+                                            message[3])
+                    leaseIds.discard(message[1])
+                else:
+                    reply = ("error",
+                             "Unknown message type: {}".format(messageType))
+
+                conn.send(reply)
+
+        except (EOFError, OSError):
+            pass
+        finally:
+            conn.close()
+
+            with self.condition:
+                for leaseId in leaseIds:
+                    self.__requeueLease(leaseId, "connection lost")
+                for jobId in jobIds:
+                    self.__cancel(jobId)
+
+    def __submit(self, batches):
+        with self.condition:
+            jobId = self.nextJobId
+            self.nextJobId += 1
+
+            self.jobs[jobId] = {
+                "batches" : batches,
+                "submitTime" : time.time(),
+                "results" : {},
+                "doneIndexes" : set(),
+                "numDelivered" : 0,
+                "numAttempts" : {},
+                "errorStr" : None,
+                }
+
+            for batchIndex in range(len(batches)):
+                self.pendingTasks.append((jobId, batchIndex))
+
+            self.log.info("Job {} submitted with {} batches.".\
+                          format(jobId, len(batches)))
+
+            self.condition.notify_all()
+
+            return ("submitted", jobId)
+
+    def __wait(self, jobId, timeoutSeconds):
+        endTime = time.time() + timeoutSeconds
+
+        with self.condition:
+            while jobId in self.jobs and \
+                  len(self.jobs[jobId]["results"]) == 0 and \
+                  self.jobs[jobId]["errorStr"] == None and \
+                  time.time() < endTime:
+                self.condition.wait(endTime - time.time())
+
+            if jobId not in self.jobs:
+                return ("error", "Unknown job: {}".format(jobId))
+
+            job = self.jobs[jobId]
+
+            if job["errorStr"] != None:
+                del self.jobs[jobId]
+                return ("error", job["errorStr"])
+            results = [(batchIndex,) + result \
+                       for (batchIndex, result) in job["results"].items()]
+            job["results"] = {}
+            job["numDelivered"] += len(results)
+
+            numTotal = len(job["batches"])
+            if job["numDelivered"] == numTotal:
+                del self.jobs[jobId]
+                self.log.info("Job {} completed.".format(jobId))
+
+            return ("results", job["numDelivered"], numTotal, results)
+
+    def __cancel(self, jobId):
+        with self.condition:
+            if jobId in self.jobs:
+                del self.jobs[jobId]
+                self.log.info("Job {} cancelled.".format(jobId))
+
+            # Tasks of the job still pending are skipped by __lease().
+            return ("ok",)
+
+    def __lease(self, workerId, maxNumBatches, timeoutSeconds):
+        endTime = time.time() + timeoutSeconds
+
+        with self.condition:
+            taskIds = []
+
+            while len(taskIds) == 0 and self.runningFlag == True:
+                while len(self.pendingTasks) > 0 and \
+                      len(taskIds) < maxNumBatches:
+                    taskId = self.pendingTasks.popleft()
+                    (jobId, batchIndex) = taskId
+                    if self.__isTaskPending(taskId) == True:
+                        numAttempts = self.jobs[jobId]["numAttempts"]
+                        numAttempts[batchIndex] = \
+                            numAttempts.get(batchIndex, 0) + 1
+                        taskIds.append(taskId)
+
+                if len(taskIds) > 0 or time.time() >= endTime:
+                    break
+
+                self.condition.wait(endTime - time.time())
+
+            if len(taskIds) == 0:
+                return ("lease", None, [])
+
+            leaseId = self.nextLeaseId
+            self.nextLeaseId += 1
+
+            leaseTime = time.time()
+            
+            self.leases[leaseId] = {
+                "workerId" : workerId,
+                "taskIds" : taskIds,
+                "leaseTime" : leaseTime,
+                "expiryTime" : leaseTime + self.leaseTimeoutSeconds,
+                }
+
+            tasks = [(taskId, self.jobs[taskId[0]]["batches"][taskId[1]]) \
+                     for taskId in taskIds]
+
+            return ("lease", leaseId, tasks)
+
+    def __heartbeat(self, leaseId):
+        with self.condition:
+            if leaseId in self.leases:
+                self.leases[leaseId]["expiryTime"] = \
+                    time.time() + self.leaseTimeoutSeconds
+                return ("ok", True)
+            else:
+                return ("ok", False)
+
+    def __complete(self, leaseId, taskResults, taskErrors):
+        with self.condition:
+            lease = self.leases.pop(leaseId, None)
+
+            # An expired lease may still complete.  Its queue wait is
+            # then not known.
+            leaseTime = None
+            if lease != None:
+                leaseTime = lease["leaseTime"]
+
+            for ((jobId, batchIndex), data, busySeconds, counters) in \
+                    taskResults:
+                if jobId in self.jobs:
+                    job = self.jobs[jobId]
+                    if batchIndex not in job["doneIndexes"]:
+                        queueSeconds = 0.0
+                        if leaseTime != None:
+                            queueSeconds = leaseTime - job["submitTime"]
+                        
+                        job["doneIndexes"].add(batchIndex)
+                        job["results"][batchIndex] = \
+                            (data, busySeconds, queueSeconds, counters)
+
+            # The batches of an expired lease were already re-queued.
+            if lease != None:
+                workerId = lease["workerId"]
+
+                for (taskId, errorStr) in taskErrors:
+                    reasonStr = "failed on worker {}: {}".\
+                                format(workerId, errorStr)
+                    self.log.warning("Batch {} of job {} {}".\
+                                     format(taskId[1], taskId[0], reasonStr))
+                    self.__requeueTask(taskId, reasonStr)
+
+                # Batches of the lease the worker did not get to.
+                reportedTaskIds = \
+                    set([taskResult[0] for taskResult in taskResults] + \
+                        [taskError[0] for taskError in taskErrors])
+                for taskId in lease["taskIds"]:
+                    if taskId not in reportedTaskIds:
+                        self.__requeueTask(taskId,
+                                           "not calculated by worker {}".\
+                                           format(workerId))
+
+            self.condition.notify_all()
+
+            return ("ok",)
+
+    def __isTaskPending(self, taskId):
+        """Returns True if the batch of the task still needs a result.
+        The condition must be held by the caller.
+        """
+
+        (jobId, batchIndex) = taskId
+
+        if jobId not in self.jobs:
+            return False
+
+        job = self.jobs[jobId]
+
+        return job["errorStr"] == None and \
+               batchIndex not in job["doneIndexes"]
+
+    def __requeueTask(self, taskId, reasonStr):
+        """Puts a task back at the front of the queue, or fails its
+        job if the batch was already leased 'maxNumAttemptsPerBatch'
+        times.  The condition must be held by the caller.
+        """
+
+        if self.__isTaskPending(taskId) == False:
+            return
+
+        (jobId, batchIndex) = taskId
+        job = self.jobs[jobId]
+
+        numAttempts = job["numAttempts"].get(batchIndex, 0)
+
+        if numAttempts >= self.maxNumAttemptsPerBatch:
+            job["errorStr"] = \
+                "Batch {} got no result in {} attempts.  ".\
+                format(batchIndex, numAttempts) + \
+                "Last attempt: {}".format(reasonStr)
+            self.log.error("Job {} failed: {}".format(jobId, job["errorStr"]))
+        else:
+            self.pendingTasks.appendleft(taskId)
+
+        self.condition.notify_all()
+
+    def __requeueLease(self, leaseId, reasonStr):
+        """Puts the tasks of a lease back at the front of the queue.
+        The condition must be held by the caller.
+        """
+
+        lease = self.leases.pop(leaseId, None)
+        if lease == None:
+            return
+
+        self.log.warning("Re-queueing {} batches of worker {}: {}".\
+                         format(len(lease["taskIds"]), lease["workerId"],
+                                reasonStr))
+
+        for taskId in reversed(lease["taskIds"]):
+            self.__requeueTask(taskId, reasonStr)
+
+        self.condition.notify_all()
+
+    def __expireLeases(self):
+        """Re-queues the tasks of expired leases, until shutdown()."""
+
+        with self.condition:
+            while self.runningFlag == True:
+                now = time.time()
+
+                for leaseId in list(self.leases.keys()):
+                    if self.leases[leaseId]["expiryTime"] < now:
+                        self.__requeueLease(leaseId, "lease expired")
+
+                self.condition.wait(self.leaseTimeoutSeconds / 4.0)
+
+
+class LookbackMultipleJobWorker:
+    """Worker that leases batches of LookbackMultiple calculations
+    from a LookbackMultipleJobServer, calculates them, and sends back
+    the results.  Heartbeats are sent from a separate thread while the
+    batches are calculated.
+    """
+
+    def __init__(self,
+                 address,
+                 authKey,
+                 maxNumBatchesPerLease=2,
+                 heartbeatIntervalSeconds=5.0):
+        """Connects to the server.
+
+        Arguments:
+        address - tuple of (hostname or IP address str, port int) of
+                  the server.
+        authKey - bytes holding the authentication key.
+        maxNumBatchesPerLease - int holding the number of batches
+                                asked for at a time.
+        heartbeatIntervalSeconds - float holding the number of seconds
+                                   between heartbeats.  This must be
+                                   well below the lease timeout of the
+                                   server.
+        """
+
+        self.log = logging.getLogger(\
+            "lookbackmultiple_distributed.LookbackMultipleJobWorker")
+
+        self.maxNumBatchesPerLease = maxNumBatchesPerLease
+        self.heartbeatIntervalSeconds = heartbeatIntervalSeconds
+
+        self.workerId = "{}:{}".format(socket.gethostname(), os.getpid())
+
+        self.conn = Client(address, authkey=authKey)
+
+        # Guards the use of the connection by the heartbeat thread.
+        self.connLock = threading.Lock()
+
+    def run(self):
+        """Processes batches until the connection to the server is
+        lost.
+        """
+
+        self.log.info("LookbackMultiple worker {} processing batches ...".\
+                      format(self.workerId))
+
+        try:
+            while True:
+                reply = self.__request(("lease",
+                                        self.workerId,
+                                        self.maxNumBatchesPerLease,
+                                        self.heartbeatIntervalSeconds))
+
+                (messageType, leaseId, tasks) = reply
+                if leaseId == None:
+                    continue
+
+                self.__runLease(leaseId, tasks)
+
+        except (EOFError, OSError):
+            self.log.info("Connection to the server was lost.")
+        finally:
+            self.conn.close()
+
+    def __runLease(self, leaseId, tasks):
+        """Calculates the batches of a lease, sending heartbeats from
+        another thread until done.  The batches not started yet are
+        skipped once a heartbeat reports that the lease is no longer
+        valid, since the server has given them to another worker.
+        """
+
+        stopEvent = threading.Event()
+        leaseLostEvent = threading.Event()
+
+        def sendHeartbeats():
+            while not stopEvent.wait(self.heartbeatIntervalSeconds):
+                try:
+                    (messageType, leaseValidFlag) = \
+                        self.__request(("heartbeat", leaseId))
+                except (EOFError, OSError):
+                    break
+
+                if leaseValidFlag == False:
+                    leaseLostEvent.set()
+                    break
+
+        thread = threading.Thread(target=sendHeartbeats, daemon=True)
+        thread.start()
+
+        taskResults = []
+        taskErrors = []
+        try:
+            for (taskId, batch) in tasks:
+                if leaseLostEvent.is_set():
+                    self.log.warning("Lease {} is no longer valid.  ".\
+                                     format(leaseId) + \
+                                     "Skipping its remaining batches.")
+                    break
+
+                startTime = time.time()
+                baseCounters = LookbackMultipleTelemetry.getProcessCounters()
+
+                try:
+                    (methodName, key, encodedReferenceDts,
+                     encodedDesiredDeltaDegrees) = batch
+                    (referenceDts, offset) = \
+                        LookbackMultipleJobProtocol.\
+                        decodeDatetimes(encodedReferenceDts)
+                    (desiredDeltaDegreesList, offset) = \
+                        LookbackMultipleJobProtocol.\
+                        decodeFloats(encodedDesiredDeltaDegrees)
+
+                    self.log.debug(\
+                        "Calculating batch {} with {} timestamps.".\
+                        format(taskId, len(referenceDts)))
+
+                    resultsList = \
+                        getDatetimesForBatch((methodName, key, referenceDts,
+                                              desiredDeltaDegreesList))
+
+                    data = LookbackMultipleJobProtocol.\
+                           encodeResults(resultsList)
+                except Exception as e:
+                    errorStr = "{}: {}".format(type(e).__name__, e)
+                    self.log.error("Calculating batch {} failed: {}".\
+                                   format(taskId, errorStr))
+                    taskErrors.append((taskId, errorStr))
+                    continue
+
+                busySeconds = time.time() - startTime
+                counters = LookbackMultipleTelemetry.subtractCounters(\
+                    LookbackMultipleTelemetry.getProcessCounters(),
+                    baseCounters)
+
+                taskResults.append((taskId, data, busySeconds, counters))
+        finally:
+            stopEvent.set()
+            thread.join()
+
+        self.__request(("complete", leaseId, taskResults, taskErrors))
+
+    def __request(self, message):
+        """Sends a message to the server and returns the reply."""
+
+        with self.connLock:
+            self.conn.send(message)
+            return self.conn.recv()
+
+
+class LookbackMultipleJobClient:
+    """Client that submits LookbackMultiple calculations to a
+    LookbackMultipleJobServer, and gets the results.
+    """
+
+    def __init__(self, address, authKey):
+        """Connects to the server.  This raises ConnectionRefusedError
+        or multiprocessing.AuthenticationError if that fails.
+
+        Arguments:
+        address - tuple of (hostname or IP address str, port int) of
+                  the server.
+        authKey - bytes holding the authentication key.
+        """
+
+        self.log = logging.getLogger(\
+            "lookbackmultiple_distributed.LookbackMultipleJobClient")
+
+        self.conn = Client(address, authkey=authKey)
+
+        # Work done by the workers for the last call to getDatetimes().
+        self.telemetry = LookbackMultipleTelemetry()
+
+    def close(self):
+        """Closes the connection.  A job not completed is cancelled by
+        the server.
+        """
+
+        self.conn.close()
+
+    def getDatetimes(self,
+                     methodName,
+                     argsTupleList,
+                     batchSize=25,
+                     pollSeconds=1.0):
+        """Runs LookbackMultiple calculations on the workers of the
+        server, and waits for all the results.  Tuples that differ only
+        by the reference timestamp and the desired delta degrees are
+        sent in batches of at most 'batchSize' reference timestamps for
+        each delta.
+
+        Arguments:
+        methodName   - str holding one of the following:
+                       getDatetimesOfLongitudeDeltaDegreesInFuture
+                       getDatetimesOfLongitudeDeltaDegreesInPast
+        argsTupleList - List of tuple objects, as for
+                        LookbackMultipleParallel.getDatetimesOfLongitudeDeltaDegreesInFutureParallel().
+        batchSize - int holding the maximum number of reference
+                    timestamps for each delta in a batch.
+        pollSeconds - float holding the number of seconds the server
+                      waits for results before replying.
+
+        Returns:
+        List of list of datetime.datetime objects.  Each list within
+        the list corresponds to the respective tuple within
+        argsTupleList.  If the job failed, an empty list is returned.
+        The work done by the workers is logged and kept for
+        getTelemetry().
+        """
+
+        # Return value.
+        rv = [None] * len(argsTupleList)
+
+        self.telemetry = LookbackMultipleTelemetry()
+        startTime = time.time()
+
+        batches = []
+        batchIndexes = []
+
+        for key, indexes in groupArgsTuples(argsTupleList).items():
+            # Tuples that differ only by the multiple of their
+            # LookbackMultiple end near each other after sorting, and
+            # share the sweep of a batch.  Batches get 'batchSize'
+            # tuples of each delta.
+            sortIndexesByTarget(argsTupleList, indexes)
+            numDeltas = len(set([argsTupleList[i][4] for i in indexes]))
+            groupBatchSize = batchSize * numDeltas
+
+            for start in range(0, len(indexes), groupBatchSize):
+                batchIndexList = indexes[start:start + groupBatchSize]
+                referenceDts = [argsTupleList[i][3] for i in batchIndexList]
+                desiredDeltaDegreesList = \
+                    [argsTupleList[i][4] for i in batchIndexList]
+
+                batches.append(\
+                    (methodName,
+                     key,
+                     LookbackMultipleJobProtocol.encodeDatetimes(referenceDts),
+                     LookbackMultipleJobProtocol.\
+                     encodeFloats(desiredDeltaDegreesList)))
+                batchIndexes.append(batchIndexList)
+
+        self.conn.send(("submit", batches))
+        (messageType, jobId) = self.conn.recv()
+
+        self.log.debug("Submitted job {} with {} batches.".\
+                       format(jobId, len(batches)))
+
+        numDone = 0
+        while numDone < len(batches):
+            self.conn.send(("wait", jobId, pollSeconds))
+            reply = self.conn.recv()
+
+            if reply[0] != "results":
+                self.log.error("LookbackMultiple job {} failed: {}".\
+                               format(jobId, reply[1]))
+                return []
+
+            (messageType, numDone, numTotal, results) = reply
+
+            for (batchIndex, data, busySeconds, queueSeconds, counters) in \
+                    results:
+                resultsList = LookbackMultipleJobProtocol.decodeResults(data)
+                for i, dts in zip(batchIndexes[batchIndex], resultsList):
+                    tzinfo = argsTupleList[i][3].tzinfo
+                    rv[i] = [dt.astimezone(tzinfo) for dt in dts]
+
+                self.telemetry.addBatch(busySeconds, queueSeconds, counters)
+
+            self.log.debug("Job {}: {} of {} batches done.".\
+                           format(jobId, numDone, numTotal))
+
+        if self.log.isEnabledFor(logging.INFO) == True:
+            self.log.info("Job {} calculated {} tuples in {} batches ".\
+                          format(jobId, len(argsTupleList), len(batches)) + \
+                          "in {:.3f} sec.".format(time.time() - startTime))
+            self.log.info("  Work: " + self.telemetry.toString())
+            
+        return rv
+
+    def getTelemetry(self):
+        """Returns a LookbackMultipleTelemetry with the work done by
+        the workers during the last call to getDatetimes().  The queue
+        wait of each batch is the time from the submit until a worker
+        leased it.
+        """
+
+        return self.telemetry
+
+##############################################################################
+
+def runWorker(address, authKey, **kwargs):
+    """Runs a LookbackMultipleJobWorker until the connection to the
+    server is lost.  This is a module-level function so that it can be
+    the target of a multiprocessing.Process.
+    """
+
+    LookbackMultipleJobWorker(address, authKey, **kwargs).run()
+
+
+def testLookbackMultipleJobProtocol():
+    print("Running " + inspect.stack()[0][3] + "()")
+
+    dt = datetime.datetime(1994, 10, 20, 1, 2, 3, 456789, tzinfo=pytz.utc)
+    resultsList = [[dt, dt + datetime.timedelta(days=1)], [], [dt]]
+
+    data = LookbackMultipleJobProtocol.encodeResults(resultsList)
+
+    print("  Actual   : {} ({} bytes)".\
+          format(LookbackMultipleJobProtocol.decodeResults(data), len(data)))
+    print("  Expected : {}".format(resultsList))
+
+
+def testLookbackMultipleJobServer():
+    print("Running " + inspect.stack()[0][3] + "()")
+
+    import multiprocessing
+    from lookbackmultiple_parallel import \
+         getDatetimesOfLongitudeDeltaDegreesForReferences
+
+    authKey = b"password"
+    methodName = "getDatetimesOfLongitudeDeltaDegreesInFuture"
+    maxErrorTd = datetime.timedelta(minutes=60)
+
+    argsTupleList = []
+    for i in range(40):
+        referenceDt = datetime.datetime(1994, 10, 20, tzinfo=pytz.utc) + \
+            datetime.timedelta(days=(i * 3))
+        argsTupleList.append(("Moon", "geocentric", "tropical", referenceDt,
+                              360.0 * 3, maxErrorTd, -74.0064, 40.7142, 0))
+        argsTupleList.append(("Moon", "geocentric", "tropical", referenceDt,
+                              360.0 * 2, maxErrorTd, -74.0064, 40.7142, 0))
+        argsTupleList.append(("Mars", "geocentric", "tropical", referenceDt,
+                              90.0, maxErrorTd, -74.0064, 40.7142, 0))
+
+    expectedResultsList = \
+        getDatetimesOfLongitudeDeltaDegreesForReferences(methodName,
+                                                         argsTupleList)
+
+    server = LookbackMultipleJobServer(("localhost", 0), authKey,
+                                       leaseTimeoutSeconds=2.0)
+    server.start()
+
+    print("  Testing re-queueing of batches leased by a lost worker.")
+
+    # A worker that takes batches and dies.
+    lostWorkerConn = Client(server.address, authkey=authKey)
+
+    client = LookbackMultipleJobClient(server.address, authKey)
+    clientThread = threading.Thread(\
+        target=lambda: setattr(client, "testResultsList",
+                               client.getDatetimes(methodName, argsTupleList,
+                                                   batchSize=10)))
+    clientThread.start()
+
+    lostWorkerConn.send(("lease", "lost", 2, 5.0))
+    print("  Batches leased by the lost worker: {}".\
+          format(len(lostWorkerConn.recv()[2])))
+    lostWorkerConn.close()
+
+    # A worker that takes batches and hangs.
+    hungWorkerConn = Client(server.address, authkey=authKey)
+    hungWorkerConn.send(("lease", "hung", 2, 5.0))
+    print("  Batches leased by the hung worker: {}".\
+          format(len(hungWorkerConn.recv()[2])))
+
+    workerProcesses = []
+    for i in range(2):
+        workerProcess = multiprocessing.Process(\
+            target=runWorker,
+            args=(server.address, authKey),
+            kwargs={"heartbeatIntervalSeconds" : 0.5},
+            daemon=True)
+        workerProcess.start()
+        workerProcesses.append(workerProcess)
+
+    clientThread.join()
+
+    # The results of smaller batches may differ within maxErrorTd.
+    numMismatches = 0
+    for (actualDts, expectedDts) in zip(client.testResultsList,
+                                        expectedResultsList):
+        if len(actualDts) != len(expectedDts):
+            numMismatches += 1
+        else:
+            for (actualDt, expectedDt) in zip(actualDts, expectedDts):
+                if abs(actualDt - expectedDt) > maxErrorTd:
+                    numMismatches += 1
+                    break
+
+    print("  Actual   : {} results, {} mismatches".\
+          format(len(client.testResultsList), numMismatches))
+    print("  Expected : {} results, 0 mismatches".\
+          format(len(expectedResultsList)))
+
+    telemetry = client.getTelemetry()
+    print("  Actual   : {} references calculated by the workers".\
+          format(telemetry.counters["references"]))
+    print("  Expected : {} references calculated by the workers".\
+          format(len(argsTupleList)))
+
+    print("  Testing a job with a batch that fails on every worker.")
+    numMaxAttempts = server.maxNumAttemptsPerBatch
+    resultsList = client.getDatetimes("noSuchMethod", argsTupleList[:3])
+    print("  Actual   : {} results".format(len(resultsList)))
+    print("  Expected : 0 results (after {} attempts)".format(numMaxAttempts))
+
+    hungWorkerConn.close()
+    client.close()
+    server.shutdown()
+    for workerProcess in workerProcesses:
+        workerProcess.terminate()
+        workerProcess.join()
+
+##############################################################################
+
+# For debugging the module during development.
+if __name__=="__main__":
+    # For logging and for exiting.
+    import logging.config
+    import sys
+
+    # Initialize logging.
+    LOG_CONFIG_FILE = os.path.join(sys.path[0], "../conf/logging.conf")
+    logging.config.fileConfig(LOG_CONFIG_FILE)
+
+    # For calculating the expected results in this process.
+    from ephemeris import Ephemeris
+
+    # Initialize the Ephemeris (required).
+    Ephemeris.initialize()
+
+    # Set a default location (required).  New York City.
+    Ephemeris.setGeographicPosition(-74.0064, 40.7142)
+
+    # Various tests to run:
+    testLookbackMultipleJobProtocol()
+    testLookbackMultipleJobServer()
+
+    # Quit.
+    print("Exiting.")
+    sys.exit()
+
+##############################################################################
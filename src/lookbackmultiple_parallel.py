@@ -4,6 +4,251 @@
 from multiprocessing import Pool
 
 import os
+
+# For creating the pool only once.
+import threading
+
+# For logging.
+import logging
+
+# For timing the work of the processes.
+import time
+
+# For the approximate timestamps of reaching the desired delta degrees.
+import datetime
+
+# For adding up the work done by the processes.
+from lookbackmultiple_telemetry import LookbackMultipleTelemetry
+
+
+# Location, as a tuple (longitude, latitude, elevation), that the
+# Ephemeris of this process was initialized for by
+# _initializeWorkerEphemeris(), or None if it wasn't yet.
+_workerEphemerisLocation = None
+
+
+def _initializeWorker(swissEphemerisDataDir):
+    """Initializer of the processes of the LookbackMultipleParallel
+    pool.  The Ephemeris itself is initialized on the first task,
+    once the location is known.
+
+    Arguments:
+    swissEphemerisDataDir - str holding the value of
+                            Ephemeris.SWISS_EPHEMERIS_DATA_DIR in the
+                            process that created the pool.
+    """
+
+    from ephemeris import Ephemeris
+
+    Ephemeris.SWISS_EPHEMERIS_DATA_DIR = swissEphemerisDataDir
+
+    
+def _initializeWorkerEphemeris(locationLongitudeDegrees, 
+                               locationLatitudeDegrees,
+                               locationElevationMeters):
+    """Initializes the Ephemeris of a worker process for the given
+    location.  The Ephemeris is only fully initialized the first time.
+    After that, only the geographic position is updated, and only if
+    the location changed.  This must only be called in processes that
+    do nothing but LookbackMultiple calculations.
+    """
+
+    global _workerEphemerisLocation
+    
+    from lookbackmultiple_calc import LookbackMultipleUtils
+    from ephemeris import Ephemeris
+
+    location = (locationLongitudeDegrees, 
+                locationLatitudeDegrees,
+                locationElevationMeters)
+
+    if _workerEphemerisLocation == None:
+        LookbackMultipleUtils.initializeEphemeris(*location)
+    elif _workerEphemerisLocation != location:
+        Ephemeris.setGeographicPosition(*location)
+
+    _workerEphemerisLocation = location
+    
+
+def groupArgsTuples(argsTupleList):
+    """Groups the given LookbackMultiple argument tuples by all the
+    fields except the reference timestamp and the desired delta
+    degrees.  All the tuples of a group are calculated in a shared
+    sweep through time, so LookbackMultiples of the same planet that
+    differ only in their multiple don't each need their own.
+
+    Returns:
+    dict mapping a tuple of (planetName, centricityType,
+    longitudeType, maxErrorTd, locationLongitudeDegrees,
+    locationLatitudeDegrees, locationElevationMeters) to the list of
+    indexes of the tuples in 'argsTupleList' with these fields.
+    """
+
+    groups = {}
+    for i in range(len(argsTupleList)):
+        argsTuple = argsTupleList[i]
+        key = argsTuple[0:3] + argsTuple[5:]
+        groups.setdefault(key, []).append(i)
+
+    return groups
+
+
+def sortIndexesByTarget(argsTupleList, indexes):
+    """Sorts the given indexes of tuples of a group returned by
+    groupArgsTuples(), in place, by the approximate timestamp the
+    planet reaches the desired delta degrees from the reference
+    timestamp.  Consecutive tuples then end near each other, even
+    when their deltas differ, so that slicing the sorted group gives
+    batches that share most of their sweep through time.
+    """
+
+    if len(indexes) == 0:
+        return
+    
+    argsTuple = argsTupleList[indexes[0]]
+    meanMotion = LookbackMultipleParallel.\
+        getMeanMotionDegreesPerDay(argsTuple[0], argsTuple[1])
+
+    indexes.sort(key=lambda i: \
+                 argsTupleList[i][3] + \
+                 datetime.timedelta(days=argsTupleList[i][4] / meanMotion))
+
+
+def _getDatetimesForReferences(methodName, key, referenceDts,
+                               desiredDeltaDegreesList):
+    """Runs the LookbackMultipleUtils method with the name
+    'methodName' + 'ForReferencesAndDeltas' for the pairs of reference
+    timestamps in 'referenceDts' and deltas in
+    'desiredDeltaDegreesList', with the other arguments in 'key', as
+    returned by groupArgsTuples().  The Ephemeris must already be
+    initialized for the location.
+    """
+
+    from lookbackmultiple_calc import LookbackMultipleUtils
+
+    method = getattr(LookbackMultipleUtils,
+                     methodName + "ForReferencesAndDeltas")
+
+    planetName = key[0]
+    centricityType = key[1]
+    longitudeType = key[2]
+    maxErrorTd = key[3]
+    
+    return method(planetName,
+                  centricityType,
+                  longitudeType,
+                  referenceDts,
+                  desiredDeltaDegreesList,
+                  maxErrorTd)
+
+
+def getDatetimesForBatch(batch):
+    """Method that is run by the processes of the
+    LookbackMultipleParallel pool.  It calculates a batch of
+    LookbackMultiples that share all the arguments except the
+    reference timestamp and the desired delta degrees.
+
+    Arguments:
+    batch - tuple of (methodName, key, referenceDts,
+            desiredDeltaDegreesList).  See _getDatetimesForReferences().
+
+    Returns:
+    List of list of datetime.datetime objects, one list for each
+    timestamp in 'referenceDts'.
+    """
+
+    (methodName, key, referenceDts, desiredDeltaDegreesList) = batch
+
+    _initializeWorkerEphemeris(key[4], key[5], key[6])
+
+    return _getDatetimesForReferences(methodName, key, referenceDts,
+                                      desiredDeltaDegreesList)
+
+
+def _getDatetimesForIndexedBatch(indexedBatch):
+    """Method that is run by the processes of the
+    LookbackMultipleParallel pool, for batches submitted out of order.
+
+    Arguments:
+    indexedBatch - tuple of (batchIndex, batch, submitTime), where
+                   'batch' is as for getDatetimesForBatch(), and
+                   'submitTime' is the time.time() it was submitted.
+
+    Returns:
+    Tuple of (batchIndex, processId, telemetry, resultsList), where
+    'resultsList' is as returned by getDatetimesForBatch(), and
+    'telemetry' is a LookbackMultipleTelemetry with the work done
+    calculating it.
+    """
+
+    (batchIndex, batch, submitTime) = indexedBatch
+
+    startTime = time.time()
+    baseCounters = LookbackMultipleTelemetry.getProcessCounters()
+    
+    resultsList = getDatetimesForBatch(batch)
+
+    telemetry = _createBatchTelemetry(submitTime, startTime, baseCounters)
+
+    return (batchIndex, os.getpid(), telemetry, resultsList)
+
+
+def _getDatetimesForBatches(batches, batchIndexes, numResults, submitTime):
+    """Method that is run by the processes of the
+    LookbackMultipleParallel pool.  It calculates several batches, as
+    for getDatetimesForBatch(), and puts the results back in the
+    order of the original tuples.
+
+    Arguments:
+    batches - list of batches, as for getDatetimesForBatch().
+    batchIndexes - list of lists of int.  These are the indexes of
+                   the original tuples of each batch.
+    numResults - int holding the number of original tuples.
+    submitTime - float holding the time.time() the batches were
+                 submitted.
+
+    Returns:
+    Tuple of (resultsList, telemetry), where 'resultsList' is a list
+    of list of datetime.datetime objects, with each list within the
+    list corresponding to the respective original tuple, and
+    'telemetry' is a LookbackMultipleTelemetry with the work done
+    calculating them.
+    """
+
+    startTime = time.time()
+    baseCounters = LookbackMultipleTelemetry.getProcessCounters()
+    
+    rv = [None] * numResults
+
+    for batch, indexes in zip(batches, batchIndexes):
+        for i, dts in zip(indexes, getDatetimesForBatch(batch)):
+            rv[i] = dts
+
+    telemetry = _createBatchTelemetry(submitTime, startTime, baseCounters)
+
+    return (rv, telemetry)
+
+
+def _createBatchTelemetry(submitTime, startTime, baseCounters):
+    """Returns a LookbackMultipleTelemetry with the work done by this
+    process since 'startTime', for a batch submitted at 'submitTime'.
+
+    Arguments:
+    submitTime - float holding the time.time() the batch was submitted.
+    startTime - float holding the time.time() the calculations started.
+    baseCounters - dict of the work counters of this process when
+                   the calculations started.
+    """
+
+    busySeconds = time.time() - startTime
+    counters = LookbackMultipleTelemetry.subtractCounters(\
+        LookbackMultipleTelemetry.getProcessCounters(), baseCounters)
+    
+    telemetry = LookbackMultipleTelemetry()
+    telemetry.addBatch(busySeconds, max(0.0, startTime - submitTime),
+                       counters)
+
+    return telemetry
     
 
 def getDatetimesOfLongitudeDeltaDegreesInFuture(argsTuple):
@@ -32,9 +277,9 @@ def getDatetimesOfLongitudeDeltaDegreesInFuture(argsTuple):
     locationLatitudeDegrees = argsTuple[7]
     locationElevationMeters = argsTuple[8]
 
-    LookbackMultipleUtils.initializeEphemeris(locationLongitudeDegrees, 
-                                              locationLatitudeDegrees,
-                                              locationElevationMeters)
+    _initializeWorkerEphemeris(locationLongitudeDegrees, 
+                               locationLatitudeDegrees,
+                               locationElevationMeters)
     
     return LookbackMultipleUtils.getDatetimesOfLongitudeDeltaDegreesInFuture(\
         planetName, 
@@ -70,9 +315,9 @@ def getDatetimesOfLongitudeDeltaDegreesInPast(argsTuple):
     locationLatitudeDegrees = argsTuple[7]
     locationElevationMeters = argsTuple[8]
 
-    LookbackMultipleUtils.initializeEphemeris(locationLongitudeDegrees, 
-                                              locationLatitudeDegrees,
-                                              locationElevationMeters)
+    _initializeWorkerEphemeris(locationLongitudeDegrees, 
+                               locationLatitudeDegrees,
+                               locationElevationMeters)
     
     return LookbackMultipleUtils.getDatetimesOfLongitudeDeltaDegreesInPast(\
         planetName, 
@@ -83,11 +328,450 @@ def getDatetimesOfLongitudeDeltaDegreesInPast(argsTuple):
         maxErrorTd)
     
 
+def getDatetimesOfLongitudeDeltaDegreesForReferences(methodName,
+                                                     argsTupleList):
+    """Method that runs a list of LookbackMultiple calculations in the
+    calling process.  The tuples that differ only by the reference
+    timestamp and the desired delta degrees are calculated together,
+    in a single sweep through time, by the LookbackMultipleUtils
+    method with the name 'methodName' + 'ForReferencesAndDeltas'.
+    Module dependencies are imported within the method below.
+
+    Arguments:
+    methodName   - str holding one of the following:
+                   getDatetimesOfLongitudeDeltaDegreesInFuture
+                   getDatetimesOfLongitudeDeltaDegreesInPast
+    argsTupleList - List of tuple objects.  Each tuple has the same
+                    fields as for
+                    LookbackMultipleParallel.getDatetimesOfLongitudeDeltaDegreesInFutureParallel().
+
+    Returns:
+    List of list of datetime.datetime objects.
+    Each list within the list corresponds to the
+    respective tuple within argsTupleList.
+    """
+
+    from lookbackmultiple_calc import LookbackMultipleUtils
+
+    # Return value.
+    rv = [None] * len(argsTupleList)
+
+    for key, indexes in groupArgsTuples(argsTupleList).items():
+
+        referenceDts = [argsTupleList[i][3] for i in indexes]
+        desiredDeltaDegreesList = [argsTupleList[i][4] for i in indexes]
+        
+        # Initialize ephemeris.
+        LookbackMultipleUtils.initializeEphemeris(key[4], key[5], key[6])
+        
+        # Do LookbackMultiple calculations.
+        resultsList = _getDatetimesForReferences(methodName, key,
+                                                 referenceDts,
+                                                 desiredDeltaDegreesList)
+
+        for i, dts in zip(indexes, resultsList):
+            rv[i] = dts
+    
+    return rv
+
+
 class LookbackMultipleParallel:
     
     poolSize = os.cpu_count()
+
+    # Pool of processes.  This is created on first use by getPool().
+    pool = None
+
+    # Lock for creating the pool.
+    poolLock = threading.Lock()
+
+    # Logger object for this class.
+    log = logging.getLogger("lookbackmultiple_parallel.LookbackMultipleParallel")
+
+    # Approximate mean motion of the planets, in degrees per day, for
+    # estimating the work of calculations.  Averaged and combination
+    # planets are derived from their components.  House cusps and
+    # ascmc planets are all under "Houses".
+    meanMotionDegreesPerDay = \
+        {'Sun'            : 0.9856,
+         'Moon'           : 13.1764,
+         'Mercury'        : 0.9856,
+         'Venus'          : 0.9856,
+         'Earth'          : 0.9856,
+         'Mars'           : 0.5240,
+         'Jupiter'        : 0.0831,
+         'Saturn'         : 0.0335,
+         'Uranus'         : 0.0117,
+         'Neptune'        : 0.0060,
+         'Pluto'          : 0.0040,
+         'MeanNorthNode'  : 0.0530,
+         'TrueNorthNode'  : 0.0530,
+         'MeanSouthNode'  : 0.0530,
+         'TrueSouthNode'  : 0.0530,
+         'Chiron'         : 0.0195,
+         'Houses'         : 360.9856}
+
+    # Mean motions that are different when heliocentric.
+    heliocentricMeanMotionDegreesPerDay = \
+        {'Mercury'        : 4.0923,
+         'Venus'          : 1.6021}
+
+    # Mean motion used for planets not known above.
+    defaultMeanMotionDegreesPerDay = 0.01
+
+    # Degrees of longitude covered by one step of a sweep, on average.
+    degreesPerStep = 60.0
+
+    # Work, in steps, to solve for one crossing.
+    workPerCrossing = 4.0
+
+    # Number of crossings per reference timestamp estimated for
+    # planets that can go retrograde.
+    retrogradeCrossingsPerReference = 3.0
+
+    # Number of batches targeted for each process.  More batches
+    # balance the load better, but each batch sweeps the desired delta
+    # again.
+    numBatchesPerProcess = 4
+
+    # Utilization of the processes, as returned by
+    # getWorkerUtilization().
+    workerUtilization = {}
+
+    # Work done by the processes, as returned by getTelemetry().
+    telemetry = LookbackMultipleTelemetry()
     
-    pool = Pool(poolSize)
+    @staticmethod
+    def getPool():
+        """Returns the multiprocessing.Pool used for the calculations,
+        creating it if it wasn't yet.
+        """
+
+        with LookbackMultipleParallel.poolLock:
+            if LookbackMultipleParallel.pool == None:
+                from ephemeris import Ephemeris
+                
+                LookbackMultipleParallel.pool = \
+                    Pool(LookbackMultipleParallel.poolSize,
+                         initializer=_initializeWorker,
+                         initargs=(Ephemeris.SWISS_EPHEMERIS_DATA_DIR,))
+                
+            return LookbackMultipleParallel.pool
+
+    @staticmethod
+    def getMeanMotionDegreesPerDay(planetName, centricityType):
+        """Returns the approximate mean motion, in degrees per day, of
+        the given planet.  This is only used to estimate how much work
+        calculations for the planet take.
+
+        Arguments:
+        planetName - str holding the name of the planet.
+        centricityType - str value holding either "geocentric",
+                         "topocentric", or "heliocentric".
+        """
+
+        from ephemeris import Ephemeris
+        
+        if Ephemeris.isHouseCuspPlanetName(planetName) or \
+               Ephemeris.isAscmcPlanetName(planetName):
+            return LookbackMultipleParallel.meanMotionDegreesPerDay["Houses"]
+
+        if centricityType == "heliocentric" and \
+               planetName in \
+               LookbackMultipleParallel.heliocentricMeanMotionDegreesPerDay:
+            return LookbackMultipleParallel.\
+                heliocentricMeanMotionDegreesPerDay[planetName]
+
+        if planetName in LookbackMultipleParallel.meanMotionDegreesPerDay:
+            return LookbackMultipleParallel.meanMotionDegreesPerDay[planetName]
+
+        # Averaged planets move at the average of their components,
+        # and combination planets at the difference of theirs.
+        if planetName in Ephemeris.AveragedPlanetComponents:
+            componentNames = Ephemeris.AveragedPlanetComponents[planetName]
+            total = 0.0
+            for componentName in componentNames:
+                total += LookbackMultipleParallel.\
+                    getMeanMotionDegreesPerDay(componentName, centricityType)
+            return total / len(componentNames)
+
+        if planetName in Ephemeris.CombinationPlanetComponents:
+            (name1, name2) = Ephemeris.CombinationPlanetComponents[planetName]
+            motion1 = LookbackMultipleParallel.\
+                getMeanMotionDegreesPerDay(name1, centricityType)
+            motion2 = LookbackMultipleParallel.\
+                getMeanMotionDegreesPerDay(name2, centricityType)
+            return max(abs(motion1 - motion2),
+                       LookbackMultipleParallel.defaultMeanMotionDegreesPerDay)
+
+        return LookbackMultipleParallel.defaultMeanMotionDegreesPerDay
+
+    @staticmethod
+    def estimateWork(key, numReferences, spanDays):
+        """Returns an estimate of the work to calculate a batch, in
+        units of sweep steps.  A batch is swept through the longitude
+        from its first reference timestamp to the last timestamp the
+        planet reaches the desired delta degrees from one of them, and
+        each result is then solved for.
+
+        Arguments:
+        key - tuple of the arguments other than the reference
+              timestamp and the desired delta degrees, as returned by
+              groupArgsTuples().
+        numReferences - int holding the number of reference
+                        timestamps in the batch.
+        spanDays - float holding the number of days swept through.
+        """
+
+        from ephemeris import Ephemeris
+        
+        planetName = key[0]
+        centricityType = key[1]
+        
+        meanMotion = LookbackMultipleParallel.\
+            getMeanMotionDegreesPerDay(planetName, centricityType)
+
+        degreesSwept = meanMotion * spanDays
+
+        numCrossingsPerReference = 1.0
+        if not Ephemeris.isDirectOnlyPlanetName(centricityType, planetName):
+            numCrossingsPerReference = \
+                LookbackMultipleParallel.retrogradeCrossingsPerReference
+
+        return degreesSwept / LookbackMultipleParallel.degreesPerStep + \
+            numReferences * numCrossingsPerReference * \
+            LookbackMultipleParallel.workPerCrossing
+
+    @staticmethod
+    def __createBatches(methodName, listOfTuples):
+        """Splits the calculations for 'listOfTuples' into batches of
+        about the same estimated work.
+
+        The tuples that share all the arguments except the reference
+        timestamp and the desired delta degrees are split into batches
+        holding those arguments once, along with lists of reference
+        timestamps and deltas.  The tuples of a batch are consecutive
+        in the order of sortIndexesByTarget(), so LookbackMultiples
+        that differ only in their multiple share their batches.  The
+        work targeted for each batch is the total estimated work
+        divided by numBatchesPerProcess batches for each process, but
+        never less than twice the work of sweeping the largest desired
+        delta alone, since every batch sweeps about that again.
+
+        Returns:
+        Tuple of (batches, batchIndexes, batchWorks), sorted by
+        descending estimated work.  'batches' is a list of tuples
+        (methodName, key, referenceDts, desiredDeltaDegreesList),
+        'batchIndexes' has the list of indexes within 'listOfTuples'
+        for each batch, and 'batchWorks' has the estimated work of
+        each batch.
+        """
+
+        if len(listOfTuples) == 0:
+            return ([], [], [])
+        
+        groups = groupArgsTuples(listOfTuples)
+
+        # Days swept through for each tuple, as a tuple (lowDays,
+        # highDays) of the reference timestamp and the approximate
+        # timestamp of reaching the desired delta degrees, in days
+        # since the earliest reference timestamp.
+        firstDt = min([argsTuple[3] for argsTuple in listOfTuples])
+        sweptDays = [None] * len(listOfTuples)
+
+        # Largest number of days to sweep through for one tuple, for
+        # each group.
+        maxSweptDays = {}
+        
+        totalWork = 0.0
+        for key, indexes in groups.items():
+            meanMotion = LookbackMultipleParallel.\
+                getMeanMotionDegreesPerDay(key[0], key[1])
+
+            maxSweptDays[key] = 0.0
+            for i in indexes:
+                referenceDays = \
+                    (listOfTuples[i][3] - firstDt).total_seconds() / 86400.0
+                targetDays = referenceDays + listOfTuples[i][4] / meanMotion
+                sweptDays[i] = (min(referenceDays, targetDays),
+                                max(referenceDays, targetDays))
+                maxSweptDays[key] = max(maxSweptDays[key],
+                                        abs(targetDays - referenceDays))
+            
+            # Tuples that end near each other go in the same batch,
+            # so that each batch sweeps through a short time range.
+            sortIndexesByTarget(listOfTuples, indexes)
+
+            lowDays = min([sweptDays[i][0] for i in indexes])
+            highDays = max([sweptDays[i][1] for i in indexes])
+            totalWork += LookbackMultipleParallel.\
+                estimateWork(key, len(indexes), highDays - lowDays)
+
+        numBatchesTargeted = \
+            LookbackMultipleParallel.poolSize * \
+            LookbackMultipleParallel.numBatchesPerProcess
+        
+        batchList = []
+        
+        for key, indexes in groups.items():
+            targetWork = max(totalWork / numBatchesTargeted,
+                             2.0 * LookbackMultipleParallel.\
+                             estimateWork(key, 0, maxSweptDays[key]))
+
+            start = 0
+            while start < len(indexes):
+                # Grow the batch until it reaches the targeted work.
+                (lowDays, highDays) = sweptDays[indexes[start]]
+                end = start + 1
+                while end < len(indexes):
+                    (low, high) = sweptDays[indexes[end]]
+                    work = LookbackMultipleParallel.\
+                        estimateWork(key, end + 1 - start,
+                                     max(highDays, high) - min(lowDays, low))
+                    if work > targetWork:
+                        break
+                    lowDays = min(lowDays, low)
+                    highDays = max(highDays, high)
+                    end += 1
+
+                work = LookbackMultipleParallel.\
+                    estimateWork(key, end - start, highDays - lowDays)
+                referenceDts = [listOfTuples[i][3] for i in indexes[start:end]]
+                desiredDeltaDegreesList = \
+                    [listOfTuples[i][4] for i in indexes[start:end]]
+                batchList.append((work,
+                                  (methodName, key, referenceDts,
+                                   desiredDeltaDegreesList),
+                                  indexes[start:end]))
+                start = end
+
+        # The largest batches go first, so that the small ones fill in
+        # the gaps at the end.
+        batchList.sort(key=lambda x: x[0], reverse=True)
+
+        batches = [x[1] for x in batchList]
+        batchIndexes = [x[2] for x in batchList]
+        batchWorks = [x[0] for x in batchList]
+        
+        return (batches, batchIndexes, batchWorks)
+        
+    @staticmethod
+    def __mapBatches(methodName, listOfTuples):
+        """Runs the calculations for 'listOfTuples' in the pool, in
+        batches created by __createBatches().
+
+        The batches are submitted with imap_unordered() one at a time,
+        so a process that finishes its batch takes the next one from
+        the queue shared by all processes.  This is what balances the
+        load when the estimates are off.  The utilization of each
+        process is logged and kept for getWorkerUtilization(), and the
+        work done by all of them is logged and kept for
+        getTelemetry().
+
+        Returns:
+        List of list of datetime.datetime objects, with each list
+        within the list corresponding to the respective tuple within
+        listOfTuples.
+        """
+
+        # Return value.
+        rv = [None] * len(listOfTuples)
+
+        (batches, batchIndexes, batchWorks) = \
+            LookbackMultipleParallel.__createBatches(methodName, listOfTuples)
+
+        # Busy time and number of batches, for each process.
+        busySecondsByProcess = {}
+        numBatchesByProcess = {}
+
+        # Work done by all the processes.
+        telemetry = LookbackMultipleTelemetry()
+        
+        startTime = time.time()
+
+        indexedBatches = \
+            [(batchIndex, batch, startTime) \
+             for batchIndex, batch in enumerate(batches)]
+        
+        for (batchIndex, processId, batchTelemetry, resultsList) in \
+                LookbackMultipleParallel.getPool().imap_unordered(\
+                    _getDatetimesForIndexedBatch, 
+                    indexedBatches,
+                    chunksize=1):
+
+            for i, dts in zip(batchIndexes[batchIndex], resultsList):
+                rv[i] = dts
+
+            telemetry.add(batchTelemetry)
+            busySeconds = batchTelemetry.busySeconds
+            
+            busySecondsByProcess[processId] = \
+                busySecondsByProcess.get(processId, 0.0) + busySeconds
+            numBatchesByProcess[processId] = \
+                numBatchesByProcess.get(processId, 0) + 1
+                
+        elapsedSeconds = time.time() - startTime
+
+        # Utilization of each process that calculated batches.  The
+        # processes that got no batches are only counted below.
+        utilization = {}
+        for processId in busySecondsByProcess.keys():
+            fraction = 0.0
+            if elapsedSeconds > 0.0:
+                fraction = busySecondsByProcess[processId] / elapsedSeconds
+            utilization[processId] = \
+                (numBatchesByProcess[processId],
+                 busySecondsByProcess[processId],
+                 fraction)
+        LookbackMultipleParallel.workerUtilization = utilization
+        LookbackMultipleParallel.telemetry = telemetry
+
+        log = LookbackMultipleParallel.log
+        if log.isEnabledFor(logging.INFO) == True:
+            log.info("Calculated {} tuples in {} batches ".\
+                     format(len(listOfTuples), len(batches)) + \
+                     "in {:.3f} sec.".format(elapsedSeconds))
+            log.info("  Work: " + telemetry.toString())
+            
+            for processId in sorted(utilization.keys()):
+                (numBatches, busySeconds, fraction) = utilization[processId]
+                log.info("  Process {}: {} batches, busy {:.3f} sec ({:.0%})".\
+                         format(processId, numBatches, busySeconds, fraction))
+                
+            numIdleProcesses = \
+                LookbackMultipleParallel.poolSize - len(utilization)
+            if numIdleProcesses > 0:
+                log.info("  {} processes got no batches.".\
+                         format(numIdleProcesses))
+                
+        return rv
+
+    @staticmethod
+    def getWorkerUtilization():
+        """Returns the utilization of the processes of the pool during
+        the last call to getDatetimesOfLongitudeDeltaDegreesInFutureParallel()
+        or getDatetimesOfLongitudeDeltaDegreesInPastParallel().
+
+        Returns:
+        dict mapping the process id of each process that calculated
+        batches to a tuple of (numBatches, busySeconds, fraction),
+        where 'fraction' is the busy time over the elapsed time of the
+        call.  Processes that got no batches are not included.
+        """
+
+        return dict(LookbackMultipleParallel.workerUtilization)
+
+    @staticmethod
+    def getTelemetry():
+        """Returns a LookbackMultipleTelemetry with the work done by
+        the processes of the pool during the last call to
+        getDatetimesOfLongitudeDeltaDegreesInFutureParallel() or
+        getDatetimesOfLongitudeDeltaDegreesInPastParallel().  The
+        queue wait of each batch is counted from the start of that
+        call.
+        """
+
+        return LookbackMultipleParallel.telemetry
     
     @staticmethod
     def getDatetimesOfLongitudeDeltaDegreesInFutureParallel(listOfTuples):
@@ -136,8 +820,8 @@ class LookbackMultipleParallel:
         """
 
         listOfResults = \
-            LookbackMultipleParallel.pool.map(
-                getDatetimesOfLongitudeDeltaDegreesInFuture, listOfTuples)
+            LookbackMultipleParallel.__mapBatches(\
+                "getDatetimesOfLongitudeDeltaDegreesInFuture", listOfTuples)
             
         return listOfResults
 
@@ -188,14 +872,60 @@ class LookbackMultipleParallel:
         """
         
         listOfResults = \
-            LookbackMultipleParallel.pool.map(\
-                getDatetimesOfLongitudeDeltaDegreesInPast, listOfTuples)
+            LookbackMultipleParallel.__mapBatches(\
+                "getDatetimesOfLongitudeDeltaDegreesInPast", listOfTuples)
             
         return listOfResults
 
+    @staticmethod
+    def getDatetimesOfLongitudeDeltaDegreesForReferencesAsync(methodName,
+                                                             listOfTuples):
+        """Submits a list of LookbackMultiple calculations to be run
+        by one of the processes of the pool, without waiting for them.
+        The tuples are sent in batches, as for __mapBatches().
+        
+        Arguments:
+        methodName   - str holding one of the following:
+                       getDatetimesOfLongitudeDeltaDegreesInFuture
+                       getDatetimesOfLongitudeDeltaDegreesInPast
+        listOfTuples - List of tuple objects.  Each tuple has the same
+                       fields as for
+                       getDatetimesOfLongitudeDeltaDegreesInFutureParallel().
+
+        Returns:
+        multiprocessing.pool.AsyncResult object.  When ready, its
+        get() method returns a tuple of (resultsList, telemetry).
+        'resultsList' is the list of list of datetime.datetime
+        objects, with each list within the list corresponding to the
+        respective tuple within listOfTuples.  'telemetry' is a
+        LookbackMultipleTelemetry with the work done calculating them,
+        with the queue wait counted from the time of this call.
+        """
+
+        # Batches of the tuples, as for __mapBatches(), but all
+        # calculated by the same process.
+        batches = []
+        batchIndexes = []
+        for key, indexes in groupArgsTuples(listOfTuples).items():
+            referenceDts = [listOfTuples[i][3] for i in indexes]
+            desiredDeltaDegreesList = [listOfTuples[i][4] for i in indexes]
+            batches.append((methodName, key, referenceDts,
+                            desiredDeltaDegreesList))
+            batchIndexes.append(indexes)
+
+        asyncResult = \
+            LookbackMultipleParallel.getPool().apply_async(\
+                _getDatetimesForBatches, (batches, batchIndexes,
+                                          len(listOfTuples), time.time()))
+
+        return asyncResult
+    
     @staticmethod
     def shutdown():
-        LookbackMultipleParallel.pool.close()
+        with LookbackMultipleParallel.poolLock:
+            if LookbackMultipleParallel.pool != None:
+                LookbackMultipleParallel.pool.close()
+                LookbackMultipleParallel.pool = None
             
             
 ##############################################################################
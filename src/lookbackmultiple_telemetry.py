@@ -0,0 +1,224 @@
+# For logging.
+import logging
+
+# For directory access.
+import inspect
+
+##############################################################################
+
+class LookbackMultipleTelemetry:
+    """Class that adds up the work done calculating LookbackMultiples,
+    so that it can be told why a redraw took as long as it did.
+
+    The work counters are obtained from the process doing the
+    calculations with getProcessCounters(), before and after the
+    calculations.  Their difference (see subtractCounters()) is then
+    added here, together with the time spent calculating and the time
+    spent waiting in a queue for a process.  Counters obtained in
+    other processes (local pool or remote workers) are plain dicts, so
+    they can be sent back along with the results.
+
+    The counters are:
+      references           - Reference timestamps calculated.
+      results              - Timestamps found.
+      longitudeEvaluations - Planet longitudes calculated by the
+                             Ephemeris (see EventSolver).
+      crossingIterations   - Iterations refining the timestamps of
+                             crossings (see EventSolver).
+      segments             - Segments of the sweeps through time.
+
+    Example:
+
+    telemetry = LookbackMultipleTelemetry()
+    baseCounters = LookbackMultipleTelemetry.getProcessCounters()
+    ...
+    telemetry.addBatch(busySeconds, 0.0,
+        LookbackMultipleTelemetry.subtractCounters(\\
+            LookbackMultipleTelemetry.getProcessCounters(), baseCounters))
+    log.info(telemetry.toString())
+    """
+
+    # Names of the work counters.
+    counterNames = ["references",
+                    "results",
+                    "longitudeEvaluations",
+                    "crossingIterations",
+                    "segments"]
+
+    # Logger object for this class.
+    log = logging.getLogger("lookbackmultiple_telemetry.LookbackMultipleTelemetry")
+
+    def __init__(self):
+        """Initializes all the totals to zero."""
+
+        # Dictionary mapping the name of each work counter to its total.
+        self.counters = dict.fromkeys(LookbackMultipleTelemetry.counterNames, 0)
+
+        # Number of batches calculated.
+        self.numBatches = 0
+
+        # Seconds spent calculating, added up over all the processes.
+        self.busySeconds = 0.0
+
+        # Seconds the batches waited for a process, added up, and the
+        # longest wait of a batch.
+        self.queueSeconds = 0.0
+        self.maxQueueSeconds = 0.0
+
+        # Lookups of results in the LookbackMultipleCache.
+        self.numCacheHits = 0
+        self.numCacheMisses = 0
+
+    @staticmethod
+    def getProcessCounters():
+        """Returns a dict with the work counters of the calling
+        process, since it started.
+        """
+
+        # Imported here so that this module can be used without the
+        # Ephemeris.
+        from lookbackmultiple_calc import LookbackMultipleUtils
+
+        return LookbackMultipleUtils.getCounters()
+
+    @staticmethod
+    def subtractCounters(counters, baseCounters):
+        """Returns a dict with the difference of the given work
+        counters.
+        """
+
+        return {name : counters.get(name, 0) - baseCounters.get(name, 0) \
+                for name in LookbackMultipleTelemetry.counterNames}
+
+    def addCounters(self, counters):
+        """Adds the given dict of work counters to the totals."""
+
+        for name in LookbackMultipleTelemetry.counterNames:
+            self.counters[name] += counters.get(name, 0)
+
+    def addBatch(self, busySeconds, queueSeconds, counters):
+        """Adds a batch of calculations to the totals.
+
+        Arguments:
+        busySeconds - float holding the seconds spent calculating.
+        queueSeconds - float holding the seconds the batch waited for
+                       a process to calculate it.
+        counters - dict of the work counters of the batch.
+        """
+
+        self.numBatches += 1
+        self.busySeconds += busySeconds
+        self.queueSeconds += queueSeconds
+        self.maxQueueSeconds = max(self.maxQueueSeconds, queueSeconds)
+        self.addCounters(counters)
+
+    def addCacheLookups(self, numHits, numMisses):
+        """Adds lookups of results in the LookbackMultipleCache."""
+
+        self.numCacheHits += numHits
+        self.numCacheMisses += numMisses
+
+    def add(self, other):
+        """Adds the totals of another LookbackMultipleTelemetry."""
+
+        self.numBatches += other.numBatches
+        self.busySeconds += other.busySeconds
+        self.queueSeconds += other.queueSeconds
+        self.maxQueueSeconds = max(self.maxQueueSeconds, other.maxQueueSeconds)
+        self.numCacheHits += other.numCacheHits
+        self.numCacheMisses += other.numCacheMisses
+        self.addCounters(other.counters)
+
+    def getCacheHitRate(self):
+        """Returns the fraction of the lookups in the
+        LookbackMultipleCache that were found, or None if there were
+        no lookups.
+        """
+
+        numLookups = self.numCacheHits + self.numCacheMisses
+        if numLookups == 0:
+            return None
+
+        return self.numCacheHits / numLookups
+
+    def toString(self):
+        """Returns the string representation of the totals."""
+
+        rv = "{} references, {} results, ".\
+             format(self.counters["references"], self.counters["results"]) + \
+             "{} longitude evaluations, {} crossing iterations, ".\
+             format(self.counters["longitudeEvaluations"],
+                    self.counters["crossingIterations"]) + \
+             "{} segments, ".format(self.counters["segments"]) + \
+             "{} batches busy {:.3f} sec, ".\
+             format(self.numBatches, self.busySeconds)
+
+        if self.numBatches > 0:
+            rv += "queue wait {:.3f} sec avg, {:.3f} sec max, ".\
+                  format(self.queueSeconds / self.numBatches,
+                         self.maxQueueSeconds)
+
+        cacheHitRate = self.getCacheHitRate()
+        if cacheHitRate == None:
+            rv += "no cache lookups"
+        else:
+            rv += "cache hits {} of {} ({:.0%})".\
+                  format(self.numCacheHits,
+                         self.numCacheHits + self.numCacheMisses,
+                         cacheHitRate)
+
+        return rv
+
+    def __str__(self):
+        """Returns the string representation of the totals."""
+
+        return self.toString()
+
+##############################################################################
+
+def testLookbackMultipleTelemetry():
+    print("Running " + inspect.stack()[0][3] + "()")
+
+    telemetry = LookbackMultipleTelemetry()
+    telemetry.addBatch(2.0, 0.5, {"references" : 10, "results" : 12,
+                                  "longitudeEvaluations" : 300,
+                                  "crossingIterations" : 40,
+                                  "segments" : 20})
+    telemetry.addBatch(1.0, 1.5, {"references" : 5, "results" : 5})
+    telemetry.addCacheLookups(15, 5)
+
+    print("  Actual   : {}".format(telemetry))
+    print("  Expected : 15 references, 17 results, " + \
+          "300 longitude evaluations, 40 crossing iterations, " + \
+          "20 segments, 2 batches busy 3.000 sec, " + \
+          "queue wait 1.000 sec avg, 1.500 sec max, " + \
+          "cache hits 15 of 20 (75%)")
+
+    counters = LookbackMultipleTelemetry.subtractCounters(\
+        {"references" : 7, "results" : 9}, {"references" : 2})
+
+    print("  Actual   : {}".format(counters))
+    print("  Expected : {'references': 5, 'results': 9, " + \
+          "'longitudeEvaluations': 0, 'crossingIterations': 0, 'segments': 0}")
+
+##############################################################################
+
+# For debugging the module during development.
+if __name__=="__main__":
+    # For logging and for exiting.
+    import logging.config
+    import os
+    import sys
+
+    # Initialize logging.
+    LOG_CONFIG_FILE = os.path.join(sys.path[0], "../conf/logging.conf")
+    logging.config.fileConfig(LOG_CONFIG_FILE)
+
+    # Various tests to run:
+    testLookbackMultipleTelemetry()
+
+    # Quit.
+    print("Exiting.")
+    sys.exit()
+
+##############################################################################
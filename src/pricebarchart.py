@@ -30,8 +30,6 @@ import datetime
 import pytz
 
 # For multiprocessing features with LookbackMultiple calculations.
-from multiprocessing.managers import BaseManager
-from multiprocessing import JoinableQueue
 from multiprocessing.context import AuthenticationError
 
 # For PyQt UI classes.
@@ -55,7 +53,20 @@ from ephemeris import Ephemeris
 # For getting datetimes forward and backward in time, 
 # to support LookbackMultiple.
 from lookbackmultiple_parallel import LookbackMultipleParallel
-from lookbackmultiple_calc import LookbackMultipleUtils
+from lookbackmultiple_parallel import \
+     getDatetimesOfLongitudeDeltaDegreesForReferences
+from lookbackmultiple_parallel import groupArgsTuples
+from lookbackmultiple_parallel import sortIndexesByTarget
+from lookbackmultiple_distributed import LookbackMultipleJobClient
+
+# For keeping the results of LookbackMultiple calculations.
+from lookbackmultiple_cache import LookbackMultipleCache
+
+# For looking up PriceBars without going through all the QGraphicsItems.
+from pricebarindex import PriceBarIndex
+
+# For adding up the work done by LookbackMultiple calculations.
+from lookbackmultiple_telemetry import LookbackMultipleTelemetry
 
 # For generic utility helper methods.
 from util import Util
@@ -150,7 +161,16 @@ class PriceBarGraphicsItem(QGraphicsItem):
     red otherwise.
     """
     
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, templateItem=None):
+        """Initializes the item.
+
+        Arguments:
+        parent - parent QGraphicsItem.
+        templateItem - PriceBarGraphicsItem to copy the settings and the
+                       pen from (see copySettingsFrom()), instead of
+                       reading them from the QSettings object.  This is
+                       for creating many items at once.
+        """
 
         # Logger
         self.log = logging.getLogger("pricebarchart.PriceBarGraphicsItem")
@@ -189,9 +209,28 @@ class PriceBarGraphicsItem(QGraphicsItem):
         self.lowerPriceBarColor = \
             SettingsKeys.lowerPriceBarColorSettingsDefValue
 
-        # Read the QSettings preferences for the various parameters of
-        # this price bar.
-        self.loadSettingsFromAppPreferences()
+        if templateItem == None:
+            # Read the QSettings preferences for the various parameters
+            # of this price bar.
+            self.loadSettingsFromAppPreferences()
+        else:
+            self.copySettingsFrom(templateItem)
+
+    def copySettingsFrom(self, item):
+        """Copies the parameters/settings of this PriceBarGraphicsItem
+        from the given PriceBarGraphicsItem, as loaded by
+        loadSettingsFromPriceBarChartSettings() and
+        loadSettingsFromAppPreferences().  The pen is copied too; Qt
+        shares the data of copied pens until one of them is changed.
+        """
+
+        self.prepareGeometryChange()
+        self.penWidth = item.penWidth
+        self.leftExtensionWidth = item.leftExtensionWidth
+        self.rightExtensionWidth = item.rightExtensionWidth
+        self.higherPriceBarColor = item.higherPriceBarColor
+        self.lowerPriceBarColor = item.lowerPriceBarColor
+        self.pen = QPen(item.pen)
 
 
     def loadSettingsFromPriceBarChartSettings(self, priceBarChartSettings):
@@ -245,8 +284,9 @@ class PriceBarGraphicsItem(QGraphicsItem):
         This has an effect on the color of the pricebar.
         """
 
-        self.log.debug("Entered setPriceBar().  priceBar={}".\
-                       format(priceBar.toString()))
+        if self.log.isEnabledFor(logging.DEBUG) == True:
+            self.log.debug("Entered setPriceBar().  priceBar={}".\
+                           format(priceBar.toString()))
 
         self.priceBar = priceBar
 
@@ -661,6 +701,9 @@ class PriceBarGraphicsItem(QGraphicsItem):
 
             # Flag that a redraw of this QGraphicsItem is required.
             self.prepareGeometryChange()
+
+            # Keep the index of PriceBars up to date.
+            self.scene().updatePriceBarGraphicsItemInIndex(self)
             
             # Emit that the PriceBarChart has changed so that the
             # dirty flag can be set.
@@ -710,6 +753,685 @@ class PriceBarGraphicsItem(QGraphicsItem):
         self.scene().openAstrolog(self.scenePos().x())
         
 
+class PriceBarEnvelopeGraphicsItem(QGraphicsItem):
+    """QGraphicsItem that draws the PriceBars of a PriceBarIndex as OHLC
+    envelopes, for when the chart is zoomed out too far for the
+    individual PriceBarGraphicsItems to be seen.
+
+    The PriceBars in the exposed area are merged into columns of
+    columnWidthPixels pixels (see PriceBarIndex.getOHLCEnvelopes()).
+    Each column is drawn like a PriceBar, with a stem from the high to
+    the low and open and close ticks on the left and right side.  All
+    the columns are drawn as two QPainterPaths, one for each PriceBar
+    color, instead of one QGraphicsItem for each PriceBar.
+
+    The PriceBarChartGraphicsScene shows this item and hides the
+    PriceBarGraphicsItems when the number of PriceBars per pixel passes
+    a threshold (see PriceBarChartGraphicsScene.
+    setPriceBarEnvelopesEnabled()).
+    """
+
+    # Width of the columns that PriceBars are merged into, in pixels.
+    columnWidthPixels = 2.0
+    
+    def __init__(self, priceBarIndex, parent=None):
+        """Initializes the item.
+
+        Arguments:
+        priceBarIndex - PriceBarIndex holding the PriceBars to draw.
+        parent - parent QGraphicsItem.
+        """
+
+        super().__init__(parent)
+
+        # Logger
+        self.log = \
+            logging.getLogger("pricebarchart.PriceBarEnvelopeGraphicsItem")
+
+        # PriceBarIndex holding the PriceBars to draw.
+        self.priceBarIndex = priceBarIndex
+
+        # Bounding rectangle of all the PriceBars, in scene coordinates.
+        self.rect = QRectF()
+
+        # Color setting for a PriceBar that has a higher close than open.
+        self.higherPriceBarColor = \
+            SettingsKeys.higherPriceBarColorSettingsDefValue
+
+        # Color setting for a PriceBar that has a lower close than open.
+        self.lowerPriceBarColor = \
+            SettingsKeys.lowerPriceBarColorSettingsDefValue
+
+        # The item is only drawn, not interacted with.  The exposed
+        # rectangle is needed to only merge the visible PriceBars.
+        self.setAcceptedMouseButtons(Qt.NoButton)
+        self.setFlags(QGraphicsItem.GraphicsItemFlags(\
+            QGraphicsItem.ItemUsesExtendedStyleOption))
+
+        # Read the QSettings preferences for the PriceBar colors.
+        self.loadSettingsFromAppPreferences()
+
+    def loadSettingsFromAppPreferences(self):
+        """Reads some of the parameters/settings of this
+        GraphicsItem from the QSettings object. 
+        """
+
+        settings = QSettings()
+
+        # higherPriceBarColor
+        key = SettingsKeys.higherPriceBarColorSettingsKey
+        defaultValue = \
+            SettingsKeys.higherPriceBarColorSettingsDefValue
+        self.higherPriceBarColor = \
+            settings.value(key, defaultValue, type=QColor)
+
+        # lowerPriceBarColor
+        key = SettingsKeys.lowerPriceBarColorSettingsKey
+        defaultValue = \
+            SettingsKeys.lowerPriceBarColorSettingsDefValue
+        self.lowerPriceBarColor = \
+            settings.value(key, defaultValue, type=QColor)
+
+    def recalculateBoundingRect(self):
+        """Recalculates the bounding rectangle from the PriceBars in the
+        PriceBarIndex.  This is called when PriceBars are added to or
+        cleared from the index.
+        """
+
+        self.prepareGeometryChange()
+
+        xs = self.priceBarIndex.xs
+        ys = self.priceBarIndex.sortedHighLowYs
+
+        if len(xs) == 0:
+            self.rect = QRectF()
+        else:
+            # Pad by a day on each side for the open and close ticks.
+            self.rect = QRectF(QPointF(xs[0] - 1.0, ys[0]),
+                               QPointF(xs[-1] + 1.0, ys[-1]))
+
+    def boundingRect(self):
+        """Returns the bounding rectangle for this graphicsitem."""
+
+        return self.rect
+
+    def paint(self, painter, option, widget):
+        """Paints the OHLC envelopes of the PriceBars in the exposed
+        rectangle.
+        """
+
+        pixelsPerSceneX = abs(painter.worldTransform().m11())
+        if pixelsPerSceneX == 0.0:
+            return
+
+        columnWidth = \
+            PriceBarEnvelopeGraphicsItem.columnWidthPixels / pixelsPerSceneX
+        halfColumnWidth = columnWidth * 0.5
+
+        exposedRect = option.exposedRect
+        envelopes = self.priceBarIndex.getOHLCEnvelopes(\
+            exposedRect.left() - columnWidth,
+            exposedRect.right() + columnWidth,
+            columnWidth)
+
+        higherPath = QPainterPath()
+        lowerPath = QPainterPath()
+
+        for (x, openY, highY, lowY, closeY) in envelopes:
+
+            # Scene Y is the negative of the price.
+            if closeY <= openY:
+                path = higherPath
+            else:
+                path = lowerPath
+
+            # Stem, left extension (open) and right extension (close).
+            path.moveTo(x, highY)
+            path.lineTo(x, lowY)
+            path.moveTo(x - halfColumnWidth, openY)
+            path.lineTo(x, openY)
+            path.moveTo(x, closeY)
+            path.lineTo(x + halfColumnWidth, closeY)
+
+        # Cosmetic pens, one pixel wide at any zoom.
+        painter.setBrush(Qt.NoBrush)
+        painter.setPen(QPen(self.higherPriceBarColor, 0.0))
+        painter.drawPath(higherPath)
+        painter.setPen(QPen(self.lowerPriceBarColor, 0.0))
+        painter.drawPath(lowerPath)
+
+
+class PriceBarSeriesGraphicsItem(QGraphicsItem):
+    """QGraphicsItem that draws the PriceBars of a PriceBarIndex that
+    don't have a PriceBarGraphicsItem, instead of one
+    PriceBarGraphicsItem for each PriceBar.  The PriceBars are drawn
+    like the PriceBarGraphicsItems, as bars with open and close ticks
+    on the left and right side.  PriceBars of the index that have a
+    PriceBarGraphicsItem are left to it, both for drawing and for
+    hit-testing.
+
+    The scene coordinates of the PriceBars are read from the arrays of
+    the PriceBarIndex, so that loading a PriceBar doesn't create any
+    Qt objects.  Only the PriceBars in the exposed area are drawn, as
+    two QPainterPaths, one for each PriceBar color.
+
+    Hit-testing (contains() and collidesWithPath()) is true only over
+    the PriceBars, so that the item doesn't hide the empty area under
+    it from the mouse.  PriceBars are selected individually: the item
+    keeps the positions of the selected PriceBars in the index, and
+    emits the priceBarSelectionChanged signal of the
+    PriceBarChartGraphicsScene when they change.  The item itself is
+    never selected in the QGraphicsScene.
+
+    The item is at position (0, 0), so item coordinates are scene
+    coordinates.
+    """
+    
+    def __init__(self, priceBarIndex, parent=None):
+        """Initializes the item.
+
+        Arguments:
+        priceBarIndex - PriceBarIndex holding the PriceBars to draw.
+        parent - parent QGraphicsItem.
+        """
+
+        super().__init__(parent)
+
+        # Logger
+        self.log = \
+            logging.getLogger("pricebarchart.PriceBarSeriesGraphicsItem")
+
+        # PriceBarIndex holding the PriceBars to draw.
+        self.priceBarIndex = priceBarIndex
+
+        # Pen width for PriceBars.
+        self.penWidth = \
+            PriceBarChartSettings.defaultPriceBarGraphicsItemPenWidth
+
+        # Width of the left extension drawn that represents the open price.
+        self.leftExtensionWidth = \
+            PriceBarChartSettings.\
+                defaultPriceBarGraphicsItemLeftExtensionWidth 
+
+        # Width of the right extension drawn that represents the close price.
+        self.rightExtensionWidth = \
+            PriceBarChartSettings.\
+                defaultPriceBarGraphicsItemRightExtensionWidth 
+
+        # Color setting for a PriceBar that has a higher close than open.
+        self.higherPriceBarColor = \
+            SettingsKeys.higherPriceBarColorSettingsDefValue
+
+        # Color setting for a PriceBar that has a lower close than open.
+        self.lowerPriceBarColor = \
+            SettingsKeys.lowerPriceBarColorSettingsDefValue
+
+        # Bounding rectangle of all the PriceBars, in scene coordinates.
+        self.rect = QRectF()
+
+        # Flag for whether PriceBars can be selected with the mouse.
+        self.priceBarSelectionEnabled = False
+
+        # Positions in the PriceBarIndex of the selected PriceBars.
+        self.selectedIndexes = set()
+
+        # Position in the PriceBarIndex of the PriceBar that the last
+        # context menu was created for.
+        self.contextMenuIndex = None
+
+        # The exposed rectangle is needed to only draw the visible
+        # PriceBars.
+        self.setFlags(QGraphicsItem.GraphicsItemFlags(\
+            QGraphicsItem.ItemUsesExtendedStyleOption))
+
+        # Read the QSettings preferences for the PriceBar colors.
+        self.loadSettingsFromAppPreferences()
+
+    def loadSettingsFromPriceBarChartSettings(self, priceBarChartSettings):
+        """Reads some of the parameters/settings of this
+        PriceBarSeriesGraphicsItem from the given PriceBarChartSettings
+        object.
+        """
+
+        # priceBarGraphicsItemPenWidth (float).
+        self.penWidth = priceBarChartSettings.priceBarGraphicsItemPenWidth
+
+        # priceBarGraphicsItemLeftExtensionWidth (float).
+        self.leftExtensionWidth = \
+            priceBarChartSettings.priceBarGraphicsItemLeftExtensionWidth
+
+        # priceBarGraphicsItemRightExtensionWidth (float).
+        self.rightExtensionWidth = \
+            priceBarChartSettings.priceBarGraphicsItemRightExtensionWidth
+
+        # The bounding rectangle depends on the widths.
+        self.recalculateBoundingRect()
+
+    def loadSettingsFromAppPreferences(self):
+        """Reads some of the parameters/settings of this
+        GraphicsItem from the QSettings object. 
+        """
+
+        settings = QSettings()
+
+        # higherPriceBarColor
+        key = SettingsKeys.higherPriceBarColorSettingsKey
+        defaultValue = \
+            SettingsKeys.higherPriceBarColorSettingsDefValue
+        self.higherPriceBarColor = \
+            settings.value(key, defaultValue, type=QColor)
+
+        # lowerPriceBarColor
+        key = SettingsKeys.lowerPriceBarColorSettingsKey
+        defaultValue = \
+            SettingsKeys.lowerPriceBarColorSettingsDefValue
+        self.lowerPriceBarColor = \
+            settings.value(key, defaultValue, type=QColor)
+
+    def recalculateBoundingRect(self):
+        """Recalculates the bounding rectangle from the PriceBars in the
+        PriceBarIndex.  This is called when PriceBars are added to,
+        replaced in or cleared from the index.
+        """
+
+        self.prepareGeometryChange()
+
+        xs = self.priceBarIndex.xs
+        ys = self.priceBarIndex.sortedHighLowYs
+
+        if len(xs) == 0:
+            self.rect = QRectF()
+        else:
+            halfPenWidth = self.penWidth * 0.5
+            self.rect = \
+                QRectF(QPointF(xs[0] - self.leftExtensionWidth - halfPenWidth,
+                               ys[0] - halfPenWidth),
+                       QPointF(xs[-1] + self.rightExtensionWidth + halfPenWidth,
+                               ys[-1] + halfPenWidth))
+
+    def boundingRect(self):
+        """Returns the bounding rectangle for this graphicsitem."""
+
+        return self.rect
+
+    def getPriceBarIndexAt(self, pointF):
+        """Returns the position in the PriceBarIndex of the PriceBar
+        drawn at the given point, or None if there isn't one.
+
+        Arguments:
+        pointF - QPointF in item (and scene) coordinates.
+        """
+
+        return self.priceBarIndex.getIndexAt(pointF.x(), pointF.y(),
+                                             self.leftExtensionWidth,
+                                             self.rightExtensionWidth,
+                                             self.penWidth * 0.5,
+                                             skipItemsFlag=True)
+
+    def contains(self, pointF):
+        """Returns True if a PriceBar is drawn at the given point."""
+
+        return self.getPriceBarIndexAt(pointF) != None
+
+    def collidesWithPath(self, path, mode=Qt.IntersectsItemShape):
+        """Returns True if a PriceBar is drawn within the bounding
+        rectangle of the given QPainterPath.  The mode is ignored.
+        """
+
+        rect = path.boundingRect()
+        index = self.priceBarIndex
+
+        (startIndex, endIndex) = \
+            index.getIndexRangeInXRange(\
+                rect.left() - self.rightExtensionWidth,
+                rect.right() + self.leftExtensionWidth)
+
+        for i in range(startIndex, endIndex):
+            if index.items[i] == None and \
+               index.highYs[i] <= rect.bottom() and \
+               index.lowYs[i] >= rect.top():
+                return True
+
+        return False
+
+    def paint(self, painter, option, widget):
+        """Paints the PriceBars in the exposed rectangle."""
+
+        index = self.priceBarIndex
+        items = index.items
+        xs = index.xs
+        openYs = index.openYs
+        highYs = index.highYs
+        lowYs = index.lowYs
+        closeYs = index.closeYs
+
+        exposedRect = option.exposedRect
+        (startIndex, endIndex) = \
+            index.getIndexRangeInXRange(\
+                exposedRect.left() - self.rightExtensionWidth - self.penWidth,
+                exposedRect.right() + self.leftExtensionWidth + self.penWidth)
+
+        higherPath = QPainterPath()
+        lowerPath = QPainterPath()
+
+        for i in range(startIndex, endIndex):
+            # These are drawn by their PriceBarGraphicsItems.
+            if items[i] != None:
+                continue
+
+            x = xs[i]
+
+            # Scene Y is the negative of the price.
+            if closeYs[i] <= openYs[i]:
+                path = higherPath
+            else:
+                path = lowerPath
+
+            # Stem, left extension (open) and right extension (close).
+            path.moveTo(x, highYs[i])
+            path.lineTo(x, lowYs[i])
+            path.moveTo(x, openYs[i])
+            path.lineTo(x - self.leftExtensionWidth, openYs[i])
+            path.moveTo(x, closeYs[i])
+            path.lineTo(x + self.rightExtensionWidth, closeYs[i])
+
+        painter.setBrush(Qt.NoBrush)
+        painter.setPen(QPen(self.higherPriceBarColor, self.penWidth))
+        painter.drawPath(higherPath)
+        painter.setPen(QPen(self.lowerPriceBarColor, self.penWidth))
+        painter.drawPath(lowerPath)
+
+        # Draw the bounding rect of the selected PriceBars.
+        if len(self.selectedIndexes) > 0:
+            fgcolor = option.palette.windowText().color()
+            
+            # Ensure good contrast against fgcolor.
+            r = 255
+            g = 255
+            b = 255
+            if fgcolor.red() > 127:
+                r = 0
+            if fgcolor.green() > 127:
+                g = 0
+            if fgcolor.blue() > 127:
+                b = 0
+            
+            bgcolor = QColor(r, g, b)
+
+            halfPenWidth = self.penWidth * 0.5
+
+            for i in sorted(self.selectedIndexes):
+                if i < startIndex or i >= endIndex:
+                    continue
+
+                boundingRect = \
+                    QRectF(QPointF(xs[i] - self.leftExtensionWidth - \
+                                   halfPenWidth,
+                                   highYs[i] - halfPenWidth),
+                           QPointF(xs[i] + self.rightExtensionWidth + \
+                                   halfPenWidth,
+                                   lowYs[i] + halfPenWidth))
+
+                painter.setPen(QPen(bgcolor, 0.0, Qt.SolidLine))
+                painter.drawRect(boundingRect)
+
+                painter.setPen(QPen(option.palette.windowText(), 0,
+                                    Qt.DashLine))
+                painter.drawRect(boundingRect)
+
+    def setPriceBarSelectionEnabled(self, flag):
+        """Sets whether PriceBars can be selected with the mouse.
+        This is set per the tool mode of the PriceBarChartGraphicsView,
+        like the flags of the PriceBarGraphicsItems.
+        """
+
+        self.priceBarSelectionEnabled = flag
+
+    def getSelectedPriceBars(self):
+        """Returns the list of the selected PriceBars, sorted by
+        timestamp.
+        """
+
+        return [self.priceBarIndex.getPriceBar(i) \
+                for i in sorted(self.selectedIndexes)]
+
+    def setPriceBarSelected(self, index, flag):
+        """Selects or unselects the PriceBar at the given position in
+        the PriceBarIndex.
+        """
+
+        if flag == True:
+            if index in self.selectedIndexes:
+                return
+            self.selectedIndexes.add(index)
+        else:
+            if index not in self.selectedIndexes:
+                return
+            self.selectedIndexes.remove(index)
+
+        self.update()
+        self._emitPriceBarSelectionChanged()
+
+    def clearPriceBarSelection(self):
+        """Unselects all the PriceBars."""
+
+        if len(self.selectedIndexes) == 0:
+            return
+
+        self.selectedIndexes = set()
+
+        self.update()
+        self._emitPriceBarSelectionChanged()
+
+    def _emitPriceBarSelectionChanged(self):
+        """Emits the priceBarSelectionChanged signal of the scene."""
+
+        scene = self.scene()
+        if scene != None:
+            scene.priceBarSelectionChanged.emit()
+
+    def mousePressEvent(self, event):
+        """Selects the PriceBar under the mouse, if PriceBars can be
+        selected.  As with selectable QGraphicsItems, the other
+        selected items are unselected unless the Control key is held,
+        in which case the selection of the PriceBar is toggled.
+        """
+
+        index = None
+        if self.priceBarSelectionEnabled == True and \
+           event.button() == Qt.LeftButton:
+            index = self.getPriceBarIndexAt(event.pos())
+
+        if index == None:
+            event.ignore()
+            return
+
+        if event.modifiers() & Qt.ControlModifier:
+            self.setPriceBarSelected(index, index not in self.selectedIndexes)
+        else:
+            scene = self.scene()
+            if scene != None:
+                scene.clearSelection()
+            self.selectedIndexes = set([index])
+            self.update()
+            self._emitPriceBarSelectionChanged()
+
+    def appendActionsToContextMenu(self, menu, index, readOnlyMode=False):
+        """Modifies the given QMenu object to update the title and add
+        actions relevant to the PriceBar at the given position in the
+        PriceBarIndex.  The actions are the same as those of a
+        PriceBarGraphicsItem.
+
+        Arguments:
+        menu - QMenu object to modify.
+        index - int position in the PriceBarIndex of the PriceBar.
+        readOnlyMode - bool value that indicates the actions are to be
+                       readonly actions.
+        """
+
+        self.contextMenuIndex = index
+
+        # Set the menu title.
+        priceBar = self.priceBarIndex.getPriceBar(index)
+        timestampStr = Ephemeris.datetimeToDayStr(priceBar.timestamp)
+        menu.setTitle("PriceBar_" + timestampStr)
+        
+        # These are the QActions that are in the menu.
+        parent = menu
+        selectAction = QAction("&Select", parent)
+        unselectAction = QAction("&Unselect", parent)
+        removeAction = QAction("&Remove", parent)
+        infoAction = QAction("&Info", parent)
+        editAction = QAction("&Edit", parent)
+        setAstro1Action = QAction("Set timestamp on Astro Chart &1", parent)
+        setAstro2Action = QAction("Set timestamp on Astro Chart &2", parent)
+        setAstro3Action = QAction("Set timestamp on Astro Chart &3", parent)
+        openJHoraAction = QAction("Open JHor&a with timestamp", parent)
+        openAstrologAction = QAction("Open As&trolog with timestamp", parent)
+        
+        selectAction.triggered.\
+            connect(self._handleSelectAction)
+        unselectAction.triggered.\
+            connect(self._handleUnselectAction)
+        infoAction.triggered.\
+            connect(self._handleInfoAction)
+        editAction.triggered.\
+            connect(self._handleEditAction)
+        setAstro1Action.triggered.\
+            connect(self._handleSetAstro1Action)
+        setAstro2Action.triggered.\
+            connect(self._handleSetAstro2Action)
+        setAstro3Action.triggered.\
+            connect(self._handleSetAstro3Action)
+        openJHoraAction.triggered.\
+            connect(self._handleOpenJHoraAction)
+        openAstrologAction.triggered.\
+            connect(self._handleOpenAstrologAction)
+                    
+        # Enable or disable actions.
+        selectAction.setEnabled(True)
+        unselectAction.setEnabled(True)
+        removeAction.setEnabled(False)
+        infoAction.setEnabled(True)
+        editAction.setEnabled(not readOnlyMode)
+        setAstro1Action.setEnabled(True)
+        setAstro2Action.setEnabled(True)
+        setAstro3Action.setEnabled(True)
+        openJHoraAction.setEnabled(True)
+        openAstrologAction.setEnabled(True)
+
+        # Add the QActions to the menu.
+        menu.addAction(selectAction)
+        menu.addAction(unselectAction)
+        menu.addSeparator()
+        menu.addAction(removeAction)
+        menu.addSeparator()
+        menu.addAction(infoAction)
+        menu.addAction(editAction)
+        menu.addSeparator()
+        menu.addAction(setAstro1Action)
+        menu.addAction(setAstro2Action)
+        menu.addAction(setAstro3Action)
+        menu.addAction(openJHoraAction)
+        menu.addAction(openAstrologAction)
+        
+        return menu
+
+    def _handleSelectAction(self):
+        """Causes the PriceBar of the context menu to become selected."""
+
+        self.setPriceBarSelected(self.contextMenuIndex, True)
+
+    def _handleUnselectAction(self):
+        """Causes the PriceBar of the context menu to become unselected."""
+
+        self.setPriceBarSelected(self.contextMenuIndex, False)
+
+    def _handleInfoAction(self):
+        """Causes a dialog to be executed to show information about
+        the PriceBar of the context menu.
+        """
+
+        pb = self.priceBarIndex.getPriceBar(self.contextMenuIndex)
+        
+        dialog = PriceBarEditDialog(priceBar=pb, readOnly=True)
+
+        # Run the dialog.  We don't care about what is returned
+        # because the dialog is read-only.
+        rv = dialog.exec_()
+        
+    def _handleEditAction(self):
+        """Causes a dialog to be executed to edit information about
+        the PriceBar of the context menu.
+        """
+
+        pb = self.priceBarIndex.getPriceBar(self.contextMenuIndex)
+        
+        dialog = PriceBarEditDialog(priceBar=pb, readOnly=False)
+
+        rv = dialog.exec_()
+        
+        if rv == QDialog.Accepted:
+            # The positions of the PriceBars may change, so the
+            # selection is cleared.
+            self.clearPriceBarSelection()
+
+            # Replace the PriceBar in the index with the new values.
+            self.scene().replacePriceBarInIndex(self.contextMenuIndex,
+                                                dialog.getPriceBar())
+            
+            # Emit that the PriceBarChart has changed so that the
+            # dirty flag can be set.
+            self.scene().priceBarChartChanged.emit()
+        else:
+            # The user canceled so don't change anything.
+            pass
+        
+    def _handleSetAstro1Action(self):
+        """Causes the astro chart 1 to be set with the timestamp
+        of the PriceBar of the context menu.
+        """
+
+        # The scene X position represents the time.
+        self.scene().setAstroChart1(\
+            self.priceBarIndex.xs[self.contextMenuIndex])
+        
+    def _handleSetAstro2Action(self):
+        """Causes the astro chart 2 to be set with the timestamp
+        of the PriceBar of the context menu.
+        """
+
+        # The scene X position represents the time.
+        self.scene().setAstroChart2(\
+            self.priceBarIndex.xs[self.contextMenuIndex])
+        
+    def _handleSetAstro3Action(self):
+        """Causes the astro chart 3 to be set with the timestamp
+        of the PriceBar of the context menu.
+        """
+
+        # The scene X position represents the time.
+        self.scene().setAstroChart3(\
+            self.priceBarIndex.xs[self.contextMenuIndex])
+
+    def _handleOpenJHoraAction(self):
+        """Causes the timestamp of the PriceBar of the context menu to
+        be opened in JHora.
+        """
+
+        # The scene X position represents the time.
+        self.scene().openJHora(self.priceBarIndex.xs[self.contextMenuIndex])
+        
+    def _handleOpenAstrologAction(self):
+        """Causes the timestamp of the PriceBar of the context menu to
+        be opened in Astrolog.
+        """
+
+        # The scene X position represents the time.
+        self.scene().openAstrolog(\
+            self.priceBarIndex.xs[self.contextMenuIndex])
+
+
 class LookbackMultiplePriceBarGraphicsItem(QGraphicsItem):
     """QGraphicsItem that visualizes a LookbackMultiplePriceBar object.
 
@@ -2188,6 +2910,7 @@ class BarCountGraphicsItem(PriceBarChartArtifactGraphicsItem):
                            "required.")
             
             # Swap the points.
+            self.prepareGeometryChange()
             temp = self.startPointF
             self.startPointF = self.endPointF
             self.endPointF = temp
@@ -2225,9 +2948,6 @@ class BarCountGraphicsItem(PriceBarChartArtifactGraphicsItem):
         if scene == None:
             self.barCount = 0
         else:
-            # Get all the QGraphicsItems.
-            graphicsItems = scene.items()
-
             # Reset the bar count.
             self.barCount = 0
 
@@ -2235,21 +2955,12 @@ class BarCountGraphicsItem(PriceBarChartArtifactGraphicsItem):
             if self.startPointF.x() == self.endPointF.x():
                 self.barCount = 0
             else:
-                # Go through the PriceBarGraphicsItems and count the ones in
-                # between self.startPointF and self.endPointF.
-                for item in graphicsItems:
-                    if isinstance(item, PriceBarGraphicsItem):
-
-                        x = item.getPriceBarHighScenePoint().x()
-
-                        # Here we check for the bar being in between
-                        # the self.startPointF and the self.endPointF.
-                        # This handles the case when the start and end
-                        # points are reversed also.
-                        if (self.startPointF.x() < x <= self.endPointF.x()) or \
-                           (self.endPointF.x() < x <= self.startPointF.x()):
-                            
-                            self.barCount += 1
+                # Count the PriceBars in between self.startPointF and
+                # self.endPointF.  This handles the case when the
+                # start and end points are reversed also.
+                self.barCount = \
+                    scene.getNumPriceBarsInXRange(self.startPointF.x(),
+                                                  self.endPointF.x())
                             
 
         # Update the text of the self.barCountText.
@@ -3615,6 +4326,7 @@ class TimeMeasurementGraphicsItem(PriceBarChartArtifactGraphicsItem):
                            "required.")
             
             # Swap the points.
+            self.prepareGeometryChange()
             temp = self.startPointF
             self.startPointF = self.endPointF
             self.endPointF = temp
@@ -3723,24 +4435,12 @@ class TimeMeasurementGraphicsItem(PriceBarChartArtifactGraphicsItem):
         self.numSqrdSama = 0.0
         
         if scene != None:
-            # Get all the QGraphicsItems.
-            graphicsItems = scene.items()
-
-            # Go through the PriceBarGraphicsItems and count the bars in
-            # between self.startPointF and self.endPointF.
-            for item in graphicsItems:
-                if isinstance(item, PriceBarGraphicsItem):
-
-                    x = item.getPriceBarHighScenePoint().x()
-
-                    # Here we check for the bar being in between
-                    # the self.startPointF and the self.endPointF.
-                    # This handles the case when the start and end
-                    # points are reversed also.
-                    if (self.startPointF.x() < x <= self.endPointF.x()) or \
-                       (self.endPointF.x() < x <= self.startPointF.x()):
-
-                        self.numPriceBars += 1
+            # Count the bars in between self.startPointF and
+            # self.endPointF.  This handles the case when the start
+            # and end points are reversed also.
+            self.numPriceBars += \
+                scene.getNumPriceBarsInXRange(self.startPointF.x(),
+                                              self.endPointF.x())
         
             # Calculate the number of (calendar) days.
             startTimestamp = \
@@ -4761,6 +5461,7 @@ class VerticalTickGraphicsItem(QGraphicsItem):
         penWidth - float value for the pen width.
         """
         
+        self.prepareGeometryChange()
         self.penWidth = penWidth
         self.pen.setWidthF(self.penWidth)
     
@@ -4771,6 +5472,7 @@ class VerticalTickGraphicsItem(QGraphicsItem):
         barHeight - float value for the bar height.
         """
 
+        self.prepareGeometryChange()
         self.barHeight = barHeight
 
     def getBarHeight(self):
@@ -4833,6 +5535,7 @@ class HorizontalTickGraphicsItem(QGraphicsItem):
         penWidth - float value for the pen width.
         """
         
+        self.prepareGeometryChange()
         self.penWidth = penWidth
         self.pen.setWidthF(self.penWidth)
     
@@ -4843,6 +5546,7 @@ class HorizontalTickGraphicsItem(QGraphicsItem):
         barWidth - float value for the bar width.
         """
 
+        self.prepareGeometryChange()
         self.barWidth = barWidth
 
     def getBarWidth(self):
@@ -5059,6 +5763,7 @@ class TimeModalScaleGraphicsItem(PriceBarChartArtifactGraphicsItem):
             priceBarChartSettings.timeModalScaleGraphicsItemTextColor
         
         # TimeModalScaleGraphicsItem bar height (float).
+        self.prepareGeometryChange()
         self.timeModalScaleGraphicsItemBarHeight = \
             priceBarChartSettings.timeModalScaleGraphicsItemBarHeight
 
@@ -5592,6 +6297,7 @@ class TimeModalScaleGraphicsItem(PriceBarChartArtifactGraphicsItem):
             setColor(self.artifact.getTextColor())
         self.timeModalScaleTextBrush.\
             setColor(self.artifact.getTextColor())
+        self.prepareGeometryChange()
         self.timeModalScaleGraphicsItemBarHeight = self.artifact.getBarHeight()
         self.timeModalScaleGraphicsItemFontSize = self.artifact.getFontSize()
 
@@ -6491,6 +7197,7 @@ class PriceModalScaleGraphicsItem(PriceBarChartArtifactGraphicsItem):
             priceBarChartSettings.priceModalScaleGraphicsItemTextColor
         
         # PriceModalScaleGraphicsItem bar width (float).
+        self.prepareGeometryChange()
         self.priceModalScaleGraphicsItemBarWidth = \
             priceBarChartSettings.priceModalScaleGraphicsItemBarWidth
 
@@ -6989,6 +7696,7 @@ class PriceModalScaleGraphicsItem(PriceBarChartArtifactGraphicsItem):
             setColor(self.artifact.getTextColor())
         self.priceModalScaleTextBrush.\
             setColor(self.artifact.getTextColor())
+        self.prepareGeometryChange()
         self.priceModalScaleGraphicsItemBarWidth = self.artifact.getBarWidth()
         self.priceModalScaleGraphicsItemFontSize = self.artifact.getFontSize()
         
@@ -8724,6 +9432,7 @@ class PlanetLongitudeMovementMeasurementGraphicsItem(PriceBarChartArtifactGraphi
                            "required.")
             
             # Swap the points.
+            self.prepareGeometryChange()
             temp = self.startPointF
             self.startPointF = self.endPointF
             self.endPointF = temp
@@ -9976,6 +10685,7 @@ class PlanetLongitudeMovementMeasurementGraphicsItem(PriceBarChartArtifactGraphi
         self.planetLongitudeMovementMeasurementGraphicsItemTextColor = self.artifact.getTextColor()
         self.planetLongitudeMovementMeasurementPen.setColor(self.artifact.getColor())
         
+        self.prepareGeometryChange()
         self.planetLongitudeMovementMeasurementGraphicsItemBarHeight = \
             self.artifact.getBarHeight()
         self.planetLongitudeMovementMeasurementGraphicsItemTextRotationAngle = \
@@ -12308,6 +13018,7 @@ class PriceMeasurementGraphicsItem(PriceBarChartArtifactGraphicsItem):
                            "required.")
             
             # Swap the points.
+            self.prepareGeometryChange()
             temp = self.startPointF
             self.startPointF = self.endPointF
             self.endPointF = temp
@@ -13596,6 +14307,7 @@ class TimeRetracementGraphicsItem(PriceBarChartArtifactGraphicsItem):
         self.timeRetracementGraphicsItemTextColor = self.artifact.getTextColor()
         self.timeRetracementPen.setColor(self.artifact.getColor())
         
+        self.prepareGeometryChange()
         self.showFullLinesFlag = self.artifact.getShowFullLinesFlag()
         self.showTimeTextFlag = self.artifact.getShowTimeTextFlag()
         self.showPercentTextFlag = self.artifact.getShowPercentTextFlag()
@@ -14877,6 +15589,7 @@ class PriceRetracementGraphicsItem(PriceBarChartArtifactGraphicsItem):
             self.artifact.getTextColor()
         self.priceRetracementPen.setColor(self.artifact.getColor())
         
+        self.prepareGeometryChange()
         self.showFullLinesFlag = self.artifact.getShowFullLinesFlag()
         self.showPriceTextFlag = self.artifact.getShowPriceTextFlag()
         self.showPercentTextFlag = self.artifact.getShowPercentTextFlag()
@@ -17949,6 +18662,7 @@ class LineSegmentGraphicsItem(PriceBarChartArtifactGraphicsItem):
         # because the self version moves both the start and end
         # points.  We want to keep the end point the same.
         super().setPos(newStartPointF)
+        self.prepareGeometryChange()
         self.startPointF = newStartPointF
         
         # Update the artifact.
@@ -17987,6 +18701,7 @@ class LineSegmentGraphicsItem(PriceBarChartArtifactGraphicsItem):
         # because the self version moves both the start and end
         # points.  We want to keep the end point the same.
         super().setPos(newStartPointF)
+        self.prepareGeometryChange()
         self.startPointF = newStartPointF
         
         # Update the artifact.
@@ -18939,6 +19654,7 @@ class VerticalLineSegmentGraphicsItem(PriceBarChartArtifactGraphicsItem):
         # because the self version moves both the start and end
         # points.  We want to keep the end point the same.
         super().setPos(newStartPointF)
+        self.prepareGeometryChange()
         self.startPointF = newStartPointF
         
         # Update the artifact.
@@ -18977,6 +19693,7 @@ class VerticalLineSegmentGraphicsItem(PriceBarChartArtifactGraphicsItem):
         # because the self version moves both the start and end
         # points.  We want to keep the end point the same.
         super().setPos(newStartPointF)
+        self.prepareGeometryChange()
         self.startPointF = newStartPointF
         
         # Update the artifact.
@@ -19929,6 +20646,7 @@ class HorizontalLineSegmentGraphicsItem(PriceBarChartArtifactGraphicsItem):
         # because the self version moves both the start and end
         # points.  We want to keep the end point the same.
         super().setPos(newStartPointF)
+        self.prepareGeometryChange()
         self.startPointF = newStartPointF
         
         # Update the artifact.
@@ -19967,6 +20685,7 @@ class HorizontalLineSegmentGraphicsItem(PriceBarChartArtifactGraphicsItem):
         # because the self version moves both the start and end
         # points.  We want to keep the end point the same.
         super().setPos(newStartPointF)
+        self.prepareGeometryChange()
         self.startPointF = newStartPointF
         
         # Update the artifact.
@@ -20188,6 +20907,7 @@ class OctaveFanGraphicsItem(PriceBarChartArtifactGraphicsItem):
 
         self.log.debug("Entered setConvertObj()")
         
+        self.prepareGeometryChange()
         self.convertObj = convertObj
         
         self.log.debug("Exiting setConvertObj()")
@@ -20207,6 +20927,7 @@ class OctaveFanGraphicsItem(PriceBarChartArtifactGraphicsItem):
                           octaveFanGraphicsItemMusicalRatios)
         
         # Bar height.
+        self.prepareGeometryChange()
         self.octaveFanBarHeight = \
             priceBarChartSettings.\
             defaultOctaveFanGraphicsItemBarHeight
@@ -20938,6 +21659,7 @@ class OctaveFanGraphicsItem(PriceBarChartArtifactGraphicsItem):
         self.log.debug("Entering setArtifact()")
 
         if isinstance(artifact, PriceBarChartOctaveFanArtifact):
+            self.prepareGeometryChange()
             self.artifact = artifact
         else:
             raise TypeError("Expected artifact type: " + \
@@ -22216,6 +22938,7 @@ class FibFanGraphicsItem(PriceBarChartArtifactGraphicsItem):
 
         self.log.debug("Entered setConvertObj()")
         
+        self.prepareGeometryChange()
         self.convertObj = convertObj
         
         self.log.debug("Exiting setConvertObj()")
@@ -22230,6 +22953,7 @@ class FibFanGraphicsItem(PriceBarChartArtifactGraphicsItem):
         ########
         
         # Height of the vertical bar drawn.
+        self.prepareGeometryChange()
         self.fibFanBarHeight = \
             priceBarChartSettings.\
             fibFanGraphicsItemBarHeight 
@@ -22971,6 +23695,7 @@ class FibFanGraphicsItem(PriceBarChartArtifactGraphicsItem):
         self.log.debug("Entering setArtifact()")
 
         if isinstance(artifact, PriceBarChartFibFanArtifact):
+            self.prepareGeometryChange()
             self.artifact = artifact
         else:
             raise TypeError("Expected artifact type: " + \
@@ -24092,6 +24817,7 @@ class GannFanGraphicsItem(PriceBarChartArtifactGraphicsItem):
 
         self.log.debug("Entered setConvertObj()")
         
+        self.prepareGeometryChange()
         self.convertObj = convertObj
         
         self.log.debug("Exiting setConvertObj()")
@@ -24106,6 +24832,7 @@ class GannFanGraphicsItem(PriceBarChartArtifactGraphicsItem):
         ########
         
         # Height of the vertical bar drawn.
+        self.prepareGeometryChange()
         self.gannFanBarHeight = \
             priceBarChartSettings.\
             gannFanGraphicsItemBarHeight 
@@ -24845,6 +25572,7 @@ class GannFanGraphicsItem(PriceBarChartArtifactGraphicsItem):
         self.log.debug("Entering setArtifact()")
 
         if isinstance(artifact, PriceBarChartGannFanArtifact):
+            self.prepareGeometryChange()
             self.artifact = artifact
         else:
             raise TypeError("Expected artifact type: " + \
@@ -26480,6 +27208,7 @@ class VimsottariDasaGraphicsItem(PriceBarChartArtifactGraphicsItem):
                        format(artifact.getEndPointF()))
                        
         if isinstance(artifact, PriceBarChartVimsottariDasaArtifact):
+            self.prepareGeometryChange()
             self.artifact = artifact
         else:
             raise TypeError("Expected artifact type: " + \
@@ -27880,6 +28609,7 @@ class AshtottariDasaGraphicsItem(PriceBarChartArtifactGraphicsItem):
         self.log.debug("Entering setArtifact()")
 
         if isinstance(artifact, PriceBarChartAshtottariDasaArtifact):
+            self.prepareGeometryChange()
             self.artifact = artifact
         else:
             raise TypeError("Expected artifact type: " + \
@@ -29258,6 +29988,7 @@ class YoginiDasaGraphicsItem(PriceBarChartArtifactGraphicsItem):
         self.log.debug("Entering setArtifact()")
 
         if isinstance(artifact, PriceBarChartYoginiDasaArtifact):
+            self.prepareGeometryChange()
             self.artifact = artifact
         else:
             raise TypeError("Expected artifact type: " + \
@@ -30635,6 +31366,7 @@ class DwisaptatiSamaDasaGraphicsItem(PriceBarChartArtifactGraphicsItem):
         self.log.debug("Entering setArtifact()")
 
         if isinstance(artifact, PriceBarChartDwisaptatiSamaDasaArtifact):
+            self.prepareGeometryChange()
             self.artifact = artifact
         else:
             raise TypeError("Expected artifact type: " + \
@@ -32012,6 +32744,7 @@ class ShattrimsaSamaDasaGraphicsItem(PriceBarChartArtifactGraphicsItem):
         self.log.debug("Entering setArtifact()")
 
         if isinstance(artifact, PriceBarChartShattrimsaSamaDasaArtifact):
+            self.prepareGeometryChange()
             self.artifact = artifact
         else:
             raise TypeError("Expected artifact type: " + \
@@ -33389,6 +34122,7 @@ class DwadasottariDasaGraphicsItem(PriceBarChartArtifactGraphicsItem):
         self.log.debug("Entering setArtifact()")
 
         if isinstance(artifact, PriceBarChartDwadasottariDasaArtifact):
+            self.prepareGeometryChange()
             self.artifact = artifact
         else:
             raise TypeError("Expected artifact type: " + \
@@ -34766,6 +35500,7 @@ class ChaturaseetiSamaDasaGraphicsItem(PriceBarChartArtifactGraphicsItem):
         self.log.debug("Entering setArtifact()")
 
         if isinstance(artifact, PriceBarChartChaturaseetiSamaDasaArtifact):
+            self.prepareGeometryChange()
             self.artifact = artifact
         else:
             raise TypeError("Expected artifact type: " + \
@@ -36143,6 +36878,7 @@ class SataabdikaDasaGraphicsItem(PriceBarChartArtifactGraphicsItem):
         self.log.debug("Entering setArtifact()")
 
         if isinstance(artifact, PriceBarChartSataabdikaDasaArtifact):
+            self.prepareGeometryChange()
             self.artifact = artifact
         else:
             raise TypeError("Expected artifact type: " + \
@@ -37522,6 +38258,7 @@ class ShodasottariDasaGraphicsItem(PriceBarChartArtifactGraphicsItem):
         self.log.debug("Entering setArtifact()")
 
         if isinstance(artifact, PriceBarChartShodasottariDasaArtifact):
+            self.prepareGeometryChange()
             self.artifact = artifact
         else:
             raise TypeError("Expected artifact type: " + \
@@ -38902,6 +39639,7 @@ class PanchottariDasaGraphicsItem(PriceBarChartArtifactGraphicsItem):
         self.log.debug("Entering setArtifact()")
 
         if isinstance(artifact, PriceBarChartPanchottariDasaArtifact):
+            self.prepareGeometryChange()
             self.artifact = artifact
         else:
             raise TypeError("Expected artifact type: " + \
@@ -40279,6 +41017,7 @@ class ShashtihayaniDasaGraphicsItem(PriceBarChartArtifactGraphicsItem):
         self.log.debug("Entering setArtifact()")
 
         if isinstance(artifact, PriceBarChartShashtihayaniDasaArtifact):
+            self.prepareGeometryChange()
             self.artifact = artifact
         else:
             raise TypeError("Expected artifact type: " + \
@@ -41427,6 +42166,48 @@ class PriceBarChartWidget(QWidget):
         # correct timezone.
         self.timezone = pytz.utc
 
+        # Cache of the results of LookbackMultiple calculations.  This
+        # is held in memory until a file is set for it with
+        # setLookbackMultipleCacheFilename().
+        self.lookbackMultipleCache = LookbackMultipleCache()
+
+        # List of dict objects, one for each LookbackMultiple that has
+        # LookbackMultiplePriceBarGraphicsItems currently drawn.  These
+        # let drawLookbackMultiplePriceBars() calculate only for the
+        # historic PriceBars that a pan or zoom newly exposes.
+        self.lookbackMultipleDrawStates = []
+
+        # Single-shot timer that redraws the LookbackMultiplePriceBars
+        # once the user stops panning or zooming for a moment.
+        self.lookbackMultipleRedrawTimer = QTimer(self)
+        self.lookbackMultipleRedrawTimer.setSingleShot(True)
+        self.lookbackMultipleRedrawTimer.setInterval(250)
+
+        # Visible area of the QGraphicsScene, as a QRectF, at the time
+        # of the last call to drawLookbackMultiplePriceBars().
+        self.lookbackMultipleDrawSceneRectF = None
+
+        # Dictionary holding the state of the LookbackMultiple
+        # calculations running in the background, or None if there
+        # aren't any.  See _startLookbackMultipleJob().
+        self.lookbackMultipleJob = None
+
+        # Work done by the LookbackMultiple calculations of the last
+        # call to drawLookbackMultiplePriceBars(), including those made
+        # in the background.  It is logged at INFO level when the
+        # calculations are done.  See _logLookbackMultipleTelemetry().
+        self.lookbackMultipleTelemetry = LookbackMultipleTelemetry()
+
+        # time.time() of the last call to drawLookbackMultiplePriceBars(),
+        # and the hit counts of the LookbackMultipleCache at that time.
+        self.lookbackMultipleDrawStartTime = time.time()
+        self.lookbackMultipleDrawCacheHitCounts = (0, 0)
+
+        # Timer for checking on the LookbackMultiple calculations
+        # running in the background.
+        self.lookbackMultipleJobTimer = QTimer(self)
+        self.lookbackMultipleJobTimer.setInterval(50)
+
         # These are the label widgets at the top of the PriceBarChartWidget.
         self.descriptionLabel = QLabel("")
         self.firstPriceBarTimestampLabel = QLabel("")
@@ -41484,6 +42265,15 @@ class PriceBarChartWidget(QWidget):
         self.cursorJdTimestampLabel.setFont(smallMonospacedFont)
         self.cursorPriceLabel.setFont(smallMonospacedFont)
         
+        # Progress of the LookbackMultiple calculations running in the
+        # background.  These are only shown while there are some.
+        self.lookbackMultipleProgressBar = QProgressBar()
+        self.lookbackMultipleProgressBar.\
+            setFormat("Calculating LookbackMultiples: %v/%m PriceBars")
+        self.lookbackMultipleCancelButton = QPushButton("Cancel")
+        self.lookbackMultipleProgressBar.setVisible(False)
+        self.lookbackMultipleCancelButton.setVisible(False)
+        
         # Create the QGraphicsView and QGraphicsScene for the display portion.
         self.graphicsScene = PriceBarChartGraphicsScene()
         self.graphicsView = PriceBarChartGraphicsView()
@@ -41523,8 +42313,15 @@ class PriceBarChartWidget(QWidget):
         topLabelsLayout.addLayout(col4, 0, 4)
         topLabelsLayout.addLayout(col5, 0, 5)
         
+        lookbackMultipleProgressLayout = QHBoxLayout()
+        lookbackMultipleProgressLayout.\
+            addWidget(self.lookbackMultipleProgressBar)
+        lookbackMultipleProgressLayout.\
+            addWidget(self.lookbackMultipleCancelButton)
+        
         layout = QVBoxLayout()
         layout.addLayout(topLabelsLayout)
+        layout.addLayout(lookbackMultipleProgressLayout)
         layout.addWidget(self.graphicsView)
         self.setLayout(layout)
 
@@ -41541,6 +42338,28 @@ class PriceBarChartWidget(QWidget):
             connect(self.priceBarChartChanged)
         self.graphicsScene.selectionChanged.\
             connect(self._handleSelectionChanged)
+        self.graphicsScene.priceBarSelectionChanged.\
+            connect(self._handleSelectionChanged)
+
+        # Panning and zooming change the scroll bars of the view.
+        self.graphicsView.horizontalScrollBar().valueChanged.\
+            connect(self._scheduleLookbackMultipleRedraw)
+        self.graphicsView.horizontalScrollBar().rangeChanged.\
+            connect(self._scheduleLookbackMultipleRedraw)
+        self.graphicsView.verticalScrollBar().valueChanged.\
+            connect(self._scheduleLookbackMultipleRedraw)
+        self.graphicsView.verticalScrollBar().rangeChanged.\
+            connect(self._scheduleLookbackMultipleRedraw)
+
+        # Zooming changes the range of the horizontal scroll bar.
+        self.graphicsView.horizontalScrollBar().rangeChanged.\
+            connect(self._updatePriceBarLevelOfDetail)
+        self.lookbackMultipleRedrawTimer.timeout.\
+            connect(self._handleLookbackMultipleRedrawTimerTimeout)
+        self.lookbackMultipleJobTimer.timeout.\
+            connect(self._handleLookbackMultipleJobTimerTimeout)
+        self.lookbackMultipleCancelButton.clicked.\
+            connect(self.cancelLookbackMultipleCalculations)
 
         # Bubble up the signal emission to update the time of the astro charts.
         self.graphicsScene.astroChart1Update.\
@@ -41584,6 +42403,29 @@ class PriceBarChartWidget(QWidget):
         # does the conversions.  Pass the timezone info to that object.
         self.graphicsScene.setTimezone(self.timezone)
 
+    def setLookbackMultipleCacheFilename(self, filename):
+        """Sets the file that the results of LookbackMultiple
+        calculations are kept in, so that they are still available
+        the next time the document is opened.  The results already
+        held in the current cache are copied into the new one.
+
+        Arguments:
+
+        filename - str holding the path of the LookbackMultipleCache
+                   file.
+        """
+
+        self.log.debug("Entered setLookbackMultipleCacheFilename()")
+
+        if self.lookbackMultipleCache.filename != filename:
+            newCache = LookbackMultipleCache(filename)
+            newCache.copyEntriesFrom(self.lookbackMultipleCache)
+
+            self.lookbackMultipleCache.close()
+            self.lookbackMultipleCache = newCache
+        
+        self.log.debug("Exiting setLookbackMultipleCacheFilename()")
+        
     def setDescriptionText(self, text):
         """Sets the text of the QLabel self.descriptionLabel."""
 
@@ -41719,36 +42561,96 @@ class PriceBarChartWidget(QWidget):
 
 
     def loadPriceBars(self, priceBars):
-        """Loads the given PriceBars list into this widget as
-        PriceBarGraphicsItems.
+        """Loads the given PriceBars list into this widget, either into
+        the PriceBarSeriesGraphicsItem of the scene or as
+        PriceBarGraphicsItems, depending on the application
+        preferences.
+
+        The PriceBars are loaded in bulk: the scene X positions are all
+        converted at once, the PriceBarGraphicsItems copy their
+        settings, pen and flags from a single template item, and the
+        scene is neither indexed nor emitting signals while they are
+        added.  The index of PriceBars, the level of detail and the
+        labels are then updated once at the end.
         """
         
         self.log.debug("Entered loadPriceBars({} pricebars)".\
                        format(len(priceBars)))
 
-        for priceBar in priceBars:
+        settings = QSettings()
+        priceSeriesItemEnabled = \
+            settings.value(\
+            SettingsKeys.priceBarChartPriceSeriesItemEnabledSettingsKey,
+            SettingsKeys.priceBarChartPriceSeriesItemEnabledSettingsDefValue,
+            type=bool)
+
+        # PriceBarGraphicsItems created, for the index of PriceBars.
+        items = []
 
-            # Create the QGraphicsItem
-            item = PriceBarGraphicsItem()
-            item.loadSettingsFromPriceBarChartSettings(\
+        if priceSeriesItemEnabled == True:
+            # The PriceBars are all drawn by the
+            # PriceBarSeriesGraphicsItem of the scene.
+            seriesItem = self.graphicsScene.priceBarSeriesGraphicsItem
+            seriesItem.loadSettingsFromPriceBarChartSettings(\
                 self.priceBarChartSettings)
-            item.setPriceBar(priceBar)
+            self.graphicsView.setGraphicsItemFlagsPerCurrToolMode(seriesItem)
 
-            # Add the item.
-            self.graphicsScene.addItem(item)
+            self.graphicsScene.addPriceBarsToIndex(priceBars)
 
-            # Make sure the proper flags are set for the mode we're in.
-            self.graphicsView.setGraphicsItemFlagsPerCurrToolMode(item)
+            # Don't create any PriceBarGraphicsItems.
+            priceBarsForItems = []
+        else:
+            priceBarsForItems = priceBars
+
+        if len(priceBarsForItems) > 0:
+            # X locations based on the timestamps, converted at once.
+            xs = self.graphicsScene.datetimesToSceneXPositions(\
+                [priceBar.timestamp for priceBar in priceBarsForItems])
+
+            # The settings, the pen and the flags for the mode we're in
+            # are the same for all the items.  They are set on a
+            # template item and copied from it, rather than being
+            # loaded again for each item.
+            templateItem = PriceBarGraphicsItem()
+            templateItem.loadSettingsFromPriceBarChartSettings(\
+                self.priceBarChartSettings)
+            self.graphicsView.setGraphicsItemFlagsPerCurrToolMode(templateItem)
+            flags = templateItem.flags()
 
-            # X location based on the timestamp.
-            x = self.graphicsScene.datetimeToSceneXPos(priceBar.timestamp)
+            # Add the items without indexing them one at a time, and
+            # without the scene emitting signals for each one.
+            self.graphicsScene.beginBulkEdit()
+            oldSignalsBlocked = self.graphicsScene.blockSignals(True)
 
-            # Y location based on the mid price (average of high and low).
-            y = self.graphicsScene.priceToSceneYPos(priceBar.midPrice())
+            for i in range(len(priceBarsForItems)):
+                priceBar = priceBarsForItems[i]
 
-            # Set the position, in parent coordinates.
-            item.setPos(QPointF(x, y))
+                # Create the QGraphicsItem
+                item = PriceBarGraphicsItem(templateItem=templateItem)
+                item.setPriceBar(priceBar)
+                item.setFlags(flags)
+
+                # Y location based on the mid price (average of high
+                # and low).
+                y = self.graphicsScene.priceToSceneYPos(priceBar.midPrice())
+
+                # Set the position, in parent coordinates.
+                item.setPos(QPointF(xs[i], y))
+
+                # Add the item.
+                self.graphicsScene.addItem(item)
+
+                items.append(item)
 
+            self.graphicsScene.blockSignals(oldSignalsBlocked)
+            self.graphicsScene.endBulkEdit()
+
+        if len(items) > 0:
+            self.graphicsScene.addPriceBarGraphicsItemsToIndex(items)
+
+        # The number of PriceBars per pixel may have changed.
+        self._updatePriceBarLevelOfDetail()
+        
         # Set the labels for the timestamps of the first and 
         # last pricebars.
         if len(priceBars) > 0:
@@ -41763,31 +42665,36 @@ class PriceBarChartWidget(QWidget):
             self.updateFirstPriceBarTimestampLabel(None)
             self.updateLastPriceBarTimestampLabel(None)
             self.updateNumPriceBarsLabel(len(priceBars))
-
-            self.graphicsScene.clearCachedPriceBars()
             
         self.log.debug("Leaving loadPriceBars({} pricebars)".\
                        format(len(priceBars)))
 
+    def _updatePriceBarLevelOfDetail(self, *args):
+        """Draws the PriceBars as OHLC envelopes or as
+        PriceBarGraphicsItems, depending on how far the QGraphicsView
+        is zoomed out.  This is called when the zoom may have changed.
+        """
+
+        self.graphicsScene.updatePriceBarLevelOfDetail(\
+            abs(self.graphicsView.transform().m11()))
+
     def clearAllPriceBars(self):
         """Clears all the PriceBar QGraphicsItems from the 
         QGraphicsScene."""
 
-        # Get all the QGraphicsItems.
-        graphicsItems = self.graphicsScene.items()
-
         # Only remove the PriceBarGraphicsItem items.
-        for item in graphicsItems:
-            if isinstance(item, PriceBarGraphicsItem):
-                if item.scene() != None:
-                    self.graphicsScene.removeItem(item)
+        self.graphicsScene.beginBulkEdit()
+        for item in self.graphicsScene.getPriceBarGraphicsItems():
+            if item.scene() != None:
+                self.graphicsScene.removeItem(item)
+        self.graphicsScene.endBulkEdit()
 
         # Update the labels describing the pricebarchart.
         self.updateFirstPriceBarTimestampLabel(None)
         self.updateLastPriceBarTimestampLabel(None)
         self.updateNumPriceBarsLabel(0)
         self.updateSelectedPriceBarLabels(None)
-        self.graphicsScene.clearCachedPriceBars()
+        self.graphicsScene.clearPriceBarIndex()
 
     def loadPriceBarChartArtifacts(self, priceBarChartArtifacts):
         """Loads the given list of PriceBarChartArtifact objects
@@ -41808,6 +42715,9 @@ class PriceBarChartWidget(QWidget):
 
         # Flag to determine if an item was created and added.
         addedItemFlag = False
+
+        # Add the items without indexing them one at a time.
+        self.graphicsScene.beginBulkEdit()
         
         for artifact in priceBarChartArtifacts:
 
@@ -42414,6 +43324,8 @@ class PriceBarChartWidget(QWidget):
         
                 addedItemFlag = True
 
+        self.graphicsScene.endBulkEdit()
+
         if addedItemFlag == True:
             # Emit that the PriceBarChart has changed.
             self.graphicsScene.priceBarChartChanged.emit()
@@ -42459,6 +43371,7 @@ class PriceBarChartWidget(QWidget):
         # Go through all the QGraphicsItems and remove the artifact items.
         graphicsItems = self.graphicsScene.items()
 
+        self.graphicsScene.beginBulkEdit()
         for item in graphicsItems:
             if isinstance(item, PriceBarChartArtifactGraphicsItem):
                 self.log.debug("Removing QGraphicsItem for artifact " + \
@@ -42467,6 +43380,7 @@ class PriceBarChartWidget(QWidget):
                     self.graphicsScene.removeItem(item)
                 
                 removedItemFlag = True
+        self.graphicsScene.endBulkEdit()
 
         if removedItemFlag == True:
             # Emit that the PriceBarChart has changed.
@@ -42480,6 +43394,31 @@ class PriceBarChartWidget(QWidget):
         These are only drawn for the currently visible area of the 
         QGraphicsScene.
 
+        Drawing is incremental.  Items previously drawn for historic
+        PriceBars that are still within the historic time range of the
+        view are kept (and rescaled if the price range changed), items
+        for historic PriceBars that fell out of range are removed, and
+        LookbackMultiple calculations are only made for the historic
+        PriceBars that were newly exposed.  Items of LookbackMultiples
+        that are no longer enabled, or that were modified, are removed.
+
+        The calculations into the future for the newly exposed historic
+        PriceBars are made in the background (except for the remote
+        parallel calculation model), in chunks, and the items of each
+        chunk are drawn as soon as its results arrive.  Calling this
+        method again supersedes the calculations still in progress.
+
+        The calculations of all the enabled LookbackMultiples are made
+        together, so LookbackMultiples that differ only in their
+        multiple (same planet, centricity and zodiac) share their
+        sweeps through time.  The cost of a redraw then grows with the
+        number of distinct planets rather than with the number of
+        LookbackMultiples.
+
+        The work done by the calculations (see
+        LookbackMultipleTelemetry) is logged at INFO level once they
+        are all done, in total and for each LookbackMultiple.
+
         Note: This drawing does not cause a priceBarChartChanged signal
         to be emitted.  That is because LookbackMultiplePriceBars are
         transient and are not persisted.  They get redrawn frequently, 
@@ -42489,10 +43428,44 @@ class PriceBarChartWidget(QWidget):
         
         self.log.debug("Entered drawLookbackMultiplePriceBars()")
 
+        # Calculations for a previous view are superseded by this one.
+        self.cancelLookbackMultipleCalculations()
+
+        # Start adding up the work done for this draw.
+        self.lookbackMultipleTelemetry = LookbackMultipleTelemetry()
+        self.lookbackMultipleDrawStartTime = time.time()
+        self.lookbackMultipleDrawCacheHitCounts = \
+            self.lookbackMultipleCache.getHitCounts()
+        
         # Maximum error for calculation of LookbackMultiple results.
         maxErrorTd = datetime.timedelta(minutes=60)
         
+        # Number of historic PriceBars of each LookbackMultiple in each
+        # chunk of calculations made in the background.  Smaller chunks
+        # show up sooner, but each chunk is a separate sweep through
+        # time.
+        chunkSize = 50
         
+        # Obtain the QSettings value for the LookbackMultiple
+        # calculation model/architecture to use.  Remote parallel
+        # calculations are not run in the background because they
+        # block on the remote server's queues anyway.
+        settings = QSettings()
+        key = SettingsKeys.lookbackMultipleCalcModelKey
+        calcModel = settings.value(key, \
+            SettingsKeys.lookbackMultipleCalcModelDefValue,
+            type=str)
+
+        backgroundCalcFlag = False
+        maxNumChunksInFlight = 1
+        if calcModel == str(LookbackMultipleCalcModel.local_serial):
+            backgroundCalcFlag = True
+            maxNumChunksInFlight = 1
+        elif calcModel == str(LookbackMultipleCalcModel.local_parallel):
+            backgroundCalcFlag = True
+            maxNumChunksInFlight = LookbackMultipleParallel.poolSize
+
+
         # Set the birth location in the Ephemeris.
         #
         # This is required before making Ephemeris calculations for
@@ -42509,6 +43482,7 @@ class PriceBarChartWidget(QWidget):
                              self.graphicsView.viewport().height());
         visibleSceneRectF = \
             self.graphicsView.mapToScene(viewportRect).boundingRect()
+        self.lookbackMultipleDrawSceneRectF = visibleSceneRectF
 
         if self.log.isEnabledFor(logging.DEBUG) == True:
             self.log.debug("visibleSceneRect is: x={}, y={}, w={}, h={}".\
@@ -42537,6 +43511,17 @@ class PriceBarChartWidget(QWidget):
             self.log.debug("highestViewPrice == {}".format(highestViewPrice))
             self.log.debug("lowestViewPrice  == {}".format(lowestViewPrice))
 
+        # Location the LookbackMultiple calculations are made for.
+        # Items computed for a different location must be recomputed.
+        birthLocation = (birthInfo.longitudeDegrees,
+                         birthInfo.latitudeDegrees,
+                         birthInfo.elevation)
+        
+        # Enabled LookbackMultiples, as tuples (lookbackMultiple,
+        # planetName, centricityType, longitudeType,
+        # desiredDeltaDegrees).
+        lookbackMultipleParamsList = []
+        
         for lookbackMultiple in lookbackMultiples:
 
             # Don't process disabled LookbackMultiples.
@@ -42573,12 +43558,22 @@ class PriceBarChartWidget(QWidget):
                     lookbackMultiple.getBaseUnit() * \
                     360
             
-            # Look backwards in time to get the start and end datetimes for
-            # obtaining the time range of historic PriceBars.
-            self.log.debug("Looking backwards in time ...")
+            lookbackMultipleParamsList.append((lookbackMultiple,
+                                               planetName,
+                                               centricityType,
+                                               longitudeType,
+                                               desiredDeltaDegrees))
+            
+        # Look backwards in time to get the start and end datetimes for
+        # obtaining the time range of historic PriceBars.  This is done
+        # for all the LookbackMultiples at once, so that those that
+        # differ only in their multiple share their calculations.
+        self.log.debug("Looking backwards in time ...")
+        
+        argsTupleList = []
+        for (lookbackMultiple, planetName, centricityType, longitudeType,
+             desiredDeltaDegrees) in lookbackMultipleParamsList:
             
-            argsTupleList = []
-
             startLookbackArgs = (\
                     planetName, 
                     centricityType, 
@@ -42605,19 +43600,73 @@ class PriceBarChartWidget(QWidget):
 
             argsTupleList.append(endLookbackArgs)
 
+        lookbackResultsList = []
+        if len(argsTupleList) > 0:
             # Compute results.
-            resultsList = \
+            lookbackResultsList = \
                 self._getLookbackMultipleDatetimesOfLongitudeDeltaDegreesInPast(\
                     argsTupleList)
             
-            if len(resultsList) == 0:
+            if len(lookbackResultsList) == 0:
                 # No results were returned.  This means an error happened
                 # during calculation that was already logged.  Return without
                 # drawing any LookbackMultiplePriceBars.
+                self.clearAllLookbackMultiplePriceBars()
                 return
+            
+        # Draw states left over from the previous call.  Each enabled
+        # LookbackMultiple below claims its matching draw state, if any.
+        # Whatever is left unclaimed at the end belongs to
+        # LookbackMultiples that were disabled or edited, and those
+        # items get removed.
+        staleDrawStates = self.lookbackMultipleDrawStates
+        self.lookbackMultipleDrawStates = []
+
+        # Calculations into the future still to be made for the newly
+        # exposed historic PriceBars of all the LookbackMultiples, as
+        # tuples (drawState, lookbackMultiple, pb, argsTuple).  These
+        # are made together after this loop, so that LookbackMultiples
+        # that differ only in their multiple share their calculations.
+        futureWork = []
+        
+        for j in range(len(lookbackMultipleParamsList)):
+            (lookbackMultiple, planetName, centricityType, longitudeType,
+             desiredDeltaDegrees) = lookbackMultipleParamsList[j]
+            
+            # Claim the draw state for this LookbackMultiple.
+            drawState = None
+            for i in range(len(staleDrawStates)):
+                if staleDrawStates[i]["lookbackMultiple"] == \
+                       lookbackMultiple and \
+                   staleDrawStates[i]["birthLocation"] == birthLocation:
+                    
+                    drawState = staleDrawStates.pop(i)
+                    break
+
+            if drawState == None:
+                drawState = {
+                    "lookbackMultiple" : copy.deepcopy(lookbackMultiple),
+                    "birthLocation" : birthLocation,
+                    "scaling" : None,
+                    "items" : {},
+                    }
+
+            # Historic PriceBars calculated for this LookbackMultiple
+            # during this draw, and the seconds of calculation
+            # attributed to them.  See
+            # _attributeLookbackMultipleBusySeconds().
+            drawState["numPriceBarsCalculated"] = 0
+            drawState["busySeconds"] = 0.0
                 
-            startLookbackDts = resultsList[0]
-            endLookbackDts = resultsList[1]
+            self.lookbackMultipleDrawStates.append(drawState)
+
+            # Dictionary mapping a historic PriceBar timestamp to the
+            # list of LookbackMultiplePriceBarGraphicsItems already
+            # drawn for it.
+            itemsDict = drawState["items"]
+            
+            startLookbackDts = lookbackResultsList[2 * j]
+            endLookbackDts = lookbackResultsList[2 * j + 1]
             
             if self.log.isEnabledFor(logging.DEBUG) == True:
                 self.log.debug("len(startLookbackDts) == {}".\
@@ -42652,26 +43701,17 @@ class PriceBarChartWidget(QWidget):
                     format(Ephemeris.datetimeToDayStr(endPriceBarSearchDt)))
 
             # Get the PriceBars in time between startPriceBarSearchDt and
-            # endPriceBarSearchDt.  Store these in list 'pbs'.
-            pbs = []
-
-            graphicsItems = self.graphicsScene.items()
-            for item in graphicsItems:
-                if isinstance(item, PriceBarGraphicsItem):
-                    pb = item.getPriceBar()
-                    dt = pb.timestamp
-                    if startPriceBarSearchDt <= dt <= endPriceBarSearchDt:
-                        # Found a PriceBar within our historic time range.
-                        pbs.append(pb)
-
-                        if self.log.isEnabledFor(logging.DEBUG) == True:
-                            debugStr = "Found a pricebar within " + \
-                                "our historic time range: {}".\
-                                format(Ephemeris.datetimeToDayStr(dt))
-                            self.log.debug(debugStr)
-
-            # Sort the PriceBars by ascending timestamp (earlier to later).
-            pbs.sort(key=lambda x: x.timestamp)
+            # endPriceBarSearchDt, sorted by ascending timestamp
+            # (earlier to later).  Store these in list 'pbs'.
+            pbs = self.graphicsScene.getPriceBarsInTimestampRange(\
+                startPriceBarSearchDt, endPriceBarSearchDt)
+
+            if self.log.isEnabledFor(logging.DEBUG) == True:
+                for pb in pbs:
+                    debugStr = "Found a pricebar within " + \
+                        "our historic time range: {}".\
+                        format(Ephemeris.datetimeToDayStr(pb.timestamp))
+                    self.log.debug(debugStr)
             
             # Working variables that will be used later for scaling the
             # LookbackMultiplePriceBars to fit within the visible portion of
@@ -42696,11 +43736,49 @@ class PriceBarChartWidget(QWidget):
                 self.log.debug("lowestPriceBarPrice == {}".\
                                format(lowestPriceBarPrice))
             
+            # Remove the items of historic PriceBars that are no longer
+            # in the historic time range of the current view.
+            pbTimestamps = set([pb.timestamp for pb in pbs])
+            for timestamp in list(itemsDict.keys()):
+                if timestamp not in pbTimestamps:
+                    self._removeLookbackMultiplePriceBarGraphicsItems(\
+                        itemsDict.pop(timestamp))
+            
+            # The prices of the LookbackMultiplePriceBars depend on the
+            # visible price range and the price range of the historic
+            # PriceBars.  If either changed, rescale the items we are
+            # keeping.  This doesn't require any new calculations.
+            scaling = (highestViewPrice,
+                       lowestViewPrice,
+                       highestPriceBarPrice,
+                       lowestPriceBarPrice)
+            
+            if drawState["scaling"] != scaling:
+                for pb in pbs:
+                    for item in itemsDict.get(pb.timestamp, []):
+                        lmpb = item.getLookbackMultiplePriceBar()
+                        self._setLookbackMultiplePriceBarPrices(lmpb, pb,
+                                                                *scaling)
+                        item.setLookbackMultiplePriceBar(lmpb)
+
+                        x = self.graphicsScene.\
+                            datetimeToSceneXPos(lmpb.timestamp)
+                        y = self.graphicsScene.\
+                            priceToSceneYPos(lmpb.midPrice())
+                        item.setPos(QPointF(x, y))
+                        
+                drawState["scaling"] = scaling
+                
+            # Only the historic PriceBars newly exposed by this view
+            # need LookbackMultiple calculations.
+            pbs = [pb for pb in pbs if pb.timestamp not in itemsDict]
+            
+            if len(pbs) == 0:
+                self.log.debug("No newly exposed historic PriceBars.")
+                continue
+            
             # Calculate LookbackMultiple datetimes for each PriceBar's
             # timestamp.
-
-            # Assemble arguments for each method invocation to get datetimes.
-            argsTupleList = []
             for pb in pbs:
                 referenceDt = pb.timestamp
                 
@@ -42715,7 +43793,7 @@ class PriceBarChartWidget(QWidget):
                     birthInfo.latitudeDegrees,
                     birthInfo.elevation)
 
-                argsTupleList.append(args)
+                futureWork.append((drawState, lookbackMultiple, pb, args))
             
             if self.log.isEnabledFor(logging.INFO) == True:
                 infoMsg = \
@@ -42727,71 +43805,116 @@ class PriceBarChartWidget(QWidget):
                            Ephemeris.datetimeToDayStr(endPriceBarSearchDt))
                 self.log.info(infoMsg)
             
+        # Remove the items of LookbackMultiples that are no longer
+        # enabled, or that were edited since the previous draw.
+        for drawState in staleDrawStates:
+            for items in drawState["items"].values():
+                self._removeLookbackMultiplePriceBarGraphicsItems(items)
+
+        argsTupleList = [work[3] for work in futureWork]
+        
+        if len(futureWork) == 0:
+            pass
+        elif backgroundCalcFlag == False:
+            busySeconds = self.lookbackMultipleTelemetry.busySeconds
+            
             # Compute results.
             resultsList = \
                 self._getLookbackMultipleDatetimesOfLongitudeDeltaDegreesInFuture(\
                     argsTupleList)
     
             if len(resultsList) == 0:
-                # No results were returned.  This means an error happened
-                # during calculation that was already logged.  Return without
-                # drawing any LookbackMultiplePriceBars.
+                # No results were returned.  This means an error
+                # happened during calculation that was already logged.
+                # Return without drawing any LookbackMultiplePriceBars.
+                self.clearAllLookbackMultiplePriceBars()
                 return
-                
-            # Create the LookbackMultiplePriceBars for these historic
-            # PriceBars and store them in a list.
-            lmpbs = []
-            for i in range(len(pbs)):
-                
-                # Current PriceBar and it's LookbackMultiple datetimes 
-                # in the future.
-                pb = pbs[i]
-                resultDts = resultsList[i]
-                
-                # Create the LookbackMultiplePriceBar for each timestamp.
-                # The prices used in the LookbackMultiplePriceBars are 
-                # the underlying PriceBar's values scaled.
-                for dt in resultDts:
-                    lmpb = LookbackMultiplePriceBar(lookbackMultiple, pb)
-                    lmpb.timestamp = dt
-                    lmpb.open = \
-                        self._scaleLookbackMultiplePriceBarPrice(\
-                            highestViewPrice,
-                            lowestViewPrice,
-                            highestPriceBarPrice,
-                            lowestPriceBarPrice,
-                            priceBarPriceToScale=pb.open)
-                    lmpb.high = \
-                        self._scaleLookbackMultiplePriceBarPrice(\
-                            highestViewPrice,
-                            lowestViewPrice,
-                            highestPriceBarPrice,
-                            lowestPriceBarPrice,
-                            priceBarPriceToScale=pb.high)
-                    lmpb.low = \
-                        self._scaleLookbackMultiplePriceBarPrice(\
-                            highestViewPrice,
-                            lowestViewPrice,
-                            highestPriceBarPrice,
-                            lowestPriceBarPrice,
-                            priceBarPriceToScale=pb.low)
-                    lmpb.close = \
-                        self._scaleLookbackMultiplePriceBarPrice(\
-                            highestViewPrice,
-                            lowestViewPrice,
-                            highestPriceBarPrice,
-                            lowestPriceBarPrice,
-                            priceBarPriceToScale=pb.close)
-                    lmpb.oi = pb.oi
-                    lmpb.vol = pb.vol
-                    lmpb.tags = copy.deepcopy(pb.tags)
-
-                    # Append to our list of LookbackMultiplePriceBars.
-                    lmpbs.append(lmpb)
-
-            # Create and draw the LookbackMultiplePriceBarGraphicsItems for
-            # each of the LookbackMultiplePriceBars.
-            for lmpb in lmpbs:
+
+            self._attributeLookbackMultipleBusySeconds(\
+                [work[0] for work in futureWork],
+                self.lookbackMultipleTelemetry.busySeconds - busySeconds)
+            
+            for i in range(len(futureWork)):
+                (drawState, lookbackMultiple, pb, args) = futureWork[i]
+                self._createLookbackMultiplePriceBarGraphicsItems(\
+                    drawState, lookbackMultiple, [pb], [resultsList[i]])
+        else:
+            # Results calculated before are drawn right away.  The rest
+            # are calculated in the background.
+            cachedResultsList = \
+                self.lookbackMultipleCache.getResults(\
+                    "getDatetimesOfLongitudeDeltaDegreesInFuture",
+                    argsTupleList)
+            
+            uncachedWork = []
+            for i in range(len(futureWork)):
+                if cachedResultsList[i] == None:
+                    uncachedWork.append(futureWork[i])
+                else:
+                    (drawState, lookbackMultiple, pb, args) = futureWork[i]
+                    self._createLookbackMultiplePriceBarGraphicsItems(\
+                        drawState, lookbackMultiple, [pb],
+                        [cachedResultsList[i]])
+
+            jobChunks = self._createLookbackMultipleJobChunks(uncachedWork,
+                                                              chunkSize)
+            if len(jobChunks) > 0:
+                self._startLookbackMultipleJob(jobChunks, maxNumChunksInFlight)
+
+        # The work of calculations made in the background is logged
+        # when they are done.
+        if self.lookbackMultipleJob == None:
+            self._logLookbackMultipleTelemetry()
+        
+        self.log.debug("Exiting drawLookbackMultiplePriceBars()")
+
+
+    def _createLookbackMultiplePriceBarGraphicsItems(self,
+                                                     drawState,
+                                                     lookbackMultiple,
+                                                     pbs,
+                                                     resultsList):
+        """Creates and draws the LookbackMultiplePriceBarGraphicsItems
+        for the given historic PriceBars, and records them in the
+        given draw state.
+
+        Arguments:
+        drawState - dict from self.lookbackMultipleDrawStates that the
+                    items belong to.
+        lookbackMultiple - LookbackMultiple the items are drawn for.
+        pbs - list of historic PriceBar objects.
+        resultsList - List of list of datetime.datetime objects.  Each
+                      list within the list holds the LookbackMultiple
+                      datetimes in the future for the respective
+                      PriceBar in 'pbs'.
+        """
+
+        itemsDict = drawState["items"]
+        scaling = drawState["scaling"]
+        
+        # Create the LookbackMultiplePriceBars for these historic
+        # PriceBars, and draw a LookbackMultiplePriceBarGraphicsItem
+        # for each of them.
+        for i in range(len(pbs)):
+            
+            # Current PriceBar and it's LookbackMultiple datetimes 
+            # in the future.
+            pb = pbs[i]
+            resultDts = resultsList[i]
+            
+            items = itemsDict.setdefault(pb.timestamp, [])
+            
+            # Create the LookbackMultiplePriceBar for each timestamp.
+            # The prices used in the LookbackMultiplePriceBars are 
+            # the underlying PriceBar's values scaled.
+            for dt in resultDts:
+                lmpb = LookbackMultiplePriceBar(lookbackMultiple, pb)
+                lmpb.timestamp = dt
+                self._setLookbackMultiplePriceBarPrices(lmpb, pb, *scaling)
+                lmpb.oi = pb.oi
+                lmpb.vol = pb.vol
+                lmpb.tags = copy.deepcopy(pb.tags)
+
                 # Create the QGraphicsItem.
                 item = LookbackMultiplePriceBarGraphicsItem()
                 item.loadSettingsFromPriceBarChartSettings(\
@@ -42812,11 +43935,316 @@ class PriceBarChartWidget(QWidget):
     
                 # Set the position, in parent coordinates.
                 item.setPos(QPointF(x, y))
+
+                items.append(item)
+
+    def _createLookbackMultipleJobChunks(self, work, chunkSize):
+        """Splits the given LookbackMultiple calculations into the
+        future into chunks for _startLookbackMultipleJob().
+
+        Calculations of LookbackMultiples that differ only in their
+        multiple (same planet, centricity and zodiac) go in the same
+        chunks, ordered by about when they reach their LookbackMultiple
+        datetimes.  Each chunk is then calculated in one sweep through
+        time shared by all those LookbackMultiples, and holds up to
+        'chunkSize' historic PriceBars of each of them.
+
+        Arguments:
+        work - list of tuples (drawState, lookbackMultiple, pb,
+               argsTuple).  See
+               _createLookbackMultiplePriceBarGraphicsItems() and 
+               _getLookbackMultipleDatetimesOfLongitudeDeltaDegreesInFuture()
+               for what these are.
+        chunkSize - int holding the number of historic PriceBars of
+                    each LookbackMultiple in a chunk.
+
+        Returns:
+        list of tuples (chunkWork, argsTupleList), where 'chunkWork' is
+        a list of tuples (drawState, lookbackMultiple, pb), and
+        'argsTupleList' has the respective argsTuples.
+        """
+
+        # Return value.
+        chunks = []
         
+        argsTupleList = [w[3] for w in work]
         
-        self.log.debug("Exiting drawLookbackMultiplePriceBars()")
+        for key, indexes in groupArgsTuples(argsTupleList).items():
+            sortIndexesByTarget(argsTupleList, indexes)
+
+            numLookbackMultiples = len(set([id(work[i][0]) for i in indexes]))
+            groupChunkSize = chunkSize * numLookbackMultiples
+            
+            for start in range(0, len(indexes), groupChunkSize):
+                chunkIndexes = indexes[start:start + groupChunkSize]
+                chunks.append(([work[i][0:3] for i in chunkIndexes],
+                               [argsTupleList[i] for i in chunkIndexes]))
+
+        return chunks
+        
+    def _startLookbackMultipleJob(self, chunks, maxNumChunksInFlight):
+        """Starts running the given chunks of LookbackMultiple
+        calculations into the future in the background, via the pool
+        of LookbackMultipleParallel.  The results of each chunk are
+        drawn as they arrive, in
+        _handleLookbackMultipleJobTimerTimeout().
+
+        Arguments:
+        chunks - list of tuples of (chunkWork, argsTupleList), as
+                 returned by _createLookbackMultipleJobChunks().
+        maxNumChunksInFlight - int holding the maximum number of chunks
+                               submitted to the pool at any one time.
+        """
+
+        self.log.debug("Entered _startLookbackMultipleJob()")
 
+        numPriceBarsTotal = 0
+        for chunk in chunks:
+            numPriceBarsTotal += len(chunk[0])
+
+        self.log.info("Calculating LookbackMultiples in the background " + \
+                      "for {} historic PriceBars in {} chunks ...".\
+                      format(numPriceBarsTotal, len(chunks)))
+        
+        self.lookbackMultipleJob = {
+            "chunks" : chunks,
+            "nextChunkIndex" : 0,
+            "chunksInFlight" : [],
+            "maxNumChunksInFlight" : maxNumChunksInFlight,
+            "numPriceBarsDone" : 0,
+            "numPriceBarsTotal" : numPriceBarsTotal,
+            "startTime" : time.time(),
+            }
+
+        self._submitLookbackMultipleJobChunks()
+        
+        self.lookbackMultipleProgressBar.setRange(0, numPriceBarsTotal)
+        self.lookbackMultipleProgressBar.setValue(0)
+        self.lookbackMultipleProgressBar.setVisible(True)
+        self.lookbackMultipleCancelButton.setVisible(True)
+        
+        self.lookbackMultipleJobTimer.start()
+        
+        self.log.debug("Exiting _startLookbackMultipleJob()")
+
+    def _submitLookbackMultipleJobChunks(self):
+        """Submits chunks of the current LookbackMultiple job to the
+        pool, until the maximum number of chunks in flight is reached
+        or there are no more chunks.
+        """
 
+        job = self.lookbackMultipleJob
+        
+        while len(job["chunksInFlight"]) < job["maxNumChunksInFlight"] and \
+              job["nextChunkIndex"] < len(job["chunks"]):
+
+            chunk = job["chunks"][job["nextChunkIndex"]]
+            job["nextChunkIndex"] += 1
+
+            asyncResult = \
+                LookbackMultipleParallel.\
+                getDatetimesOfLongitudeDeltaDegreesForReferencesAsync(\
+                    "getDatetimesOfLongitudeDeltaDegreesInFuture",
+                    chunk[1])
+            
+            job["chunksInFlight"].append((chunk, asyncResult))
+            
+    def _handleLookbackMultipleJobTimerTimeout(self):
+        """Draws the results of the chunks of the current
+        LookbackMultiple job that completed, submits more chunks, and
+        updates the progress shown.
+        """
+
+        job = self.lookbackMultipleJob
+        if job == None:
+            self.lookbackMultipleJobTimer.stop()
+            return
+
+        chunksInFlight = []
+        
+        for (chunk, asyncResult) in job["chunksInFlight"]:
+            if asyncResult.ready() == False:
+                chunksInFlight.append((chunk, asyncResult))
+                continue
+
+            (chunkWork, argsTupleList) = chunk
+            
+            try:
+                (resultsList, telemetry) = asyncResult.get()
+            except Exception as e:
+                self.log.error("Caught exception while calculating " + \
+                               "LookbackMultiples in the background.  " + \
+                               "Aborting calculations.  e == {}".format(e))
+                self.cancelLookbackMultipleCalculations()
+                return
+
+            self.lookbackMultipleCache.putResults(\
+                "getDatetimesOfLongitudeDeltaDegreesInFuture",
+                argsTupleList,
+                resultsList)
+            
+            self.lookbackMultipleTelemetry.add(telemetry)
+            self._attributeLookbackMultipleBusySeconds(\
+                [work[0] for work in chunkWork], telemetry.busySeconds)
+            
+            for i in range(len(chunkWork)):
+                (drawState, lookbackMultiple, pb) = chunkWork[i]
+                self._createLookbackMultiplePriceBarGraphicsItems(\
+                    drawState, lookbackMultiple, [pb], [resultsList[i]])
+
+            job["numPriceBarsDone"] += len(chunkWork)
+
+        job["chunksInFlight"] = chunksInFlight
+        self._submitLookbackMultipleJobChunks()
+
+        self.lookbackMultipleProgressBar.setValue(job["numPriceBarsDone"])
+        
+        if len(job["chunksInFlight"]) == 0:
+            self.log.info("Calculating LookbackMultiples in the " + \
+                          "background took: {} sec".\
+                          format(time.time() - job["startTime"]))
+            self.cancelLookbackMultipleCalculations()
+            self._logLookbackMultipleTelemetry()
+        
+    def _attributeLookbackMultipleBusySeconds(self, drawStates, busySeconds):
+        """Adds the time spent calculating historic PriceBars to the
+        draw states of their LookbackMultiples.  Since LookbackMultiples
+        that differ only in their multiple share their calculations,
+        the time is split evenly over the historic PriceBars.
+
+        Arguments:
+        drawStates - list with the draw state of the LookbackMultiple
+                     of each historic PriceBar calculated.
+        busySeconds - float holding the seconds spent calculating them.
+        """
+
+        if len(drawStates) == 0:
+            return
+
+        busySecondsPerPriceBar = busySeconds / len(drawStates)
+        
+        for drawState in drawStates:
+            drawState["numPriceBarsCalculated"] += 1
+            drawState["busySeconds"] += busySecondsPerPriceBar
+            
+    def _logLookbackMultipleTelemetry(self):
+        """Logs at INFO level the work done by the LookbackMultiple
+        calculations since the last call to
+        drawLookbackMultiplePriceBars(), in total and for each
+        LookbackMultiple.
+        """
+
+        if self.log.isEnabledFor(logging.INFO) == False:
+            return
+
+        # Lookups in the LookbackMultipleCache made for this draw.
+        (numHits, numMisses) = self.lookbackMultipleCache.getHitCounts()
+        (baseNumHits, baseNumMisses) = self.lookbackMultipleDrawCacheHitCounts
+        
+        telemetry = self.lookbackMultipleTelemetry
+        telemetry.numCacheHits = numHits - baseNumHits
+        telemetry.numCacheMisses = numMisses - baseNumMisses
+        
+        self.log.info("Drawing LookbackMultiples took {:.3f} sec: {}".\
+                      format(time.time() - self.lookbackMultipleDrawStartTime,
+                             telemetry.toString()))
+
+        for drawState in self.lookbackMultipleDrawStates:
+            self.log.info("  LookbackMultiple '{}': ".\
+                          format(drawState["lookbackMultiple"].getName()) + \
+                          "{} historic PriceBars calculated in {:.3f} sec".\
+                          format(drawState["numPriceBarsCalculated"],
+                                 drawState["busySeconds"]))
+            
+    def cancelLookbackMultipleCalculations(self):
+        """Stops the LookbackMultiple calculations running in the
+        background, if there are any.  Chunks already submitted to the
+        pool run to completion, but their results are discarded.  The
+        items already drawn are kept.
+        """
+
+        if self.lookbackMultipleJob != None:
+            job = self.lookbackMultipleJob
+            if job["numPriceBarsDone"] < job["numPriceBarsTotal"]:
+                self.log.info("Cancelling LookbackMultiple calculations " + \
+                              "with {} of {} historic PriceBars done.".\
+                              format(job["numPriceBarsDone"],
+                                     job["numPriceBarsTotal"]))
+            self.lookbackMultipleJob = None
+            
+        self.lookbackMultipleJobTimer.stop()
+        self.lookbackMultipleProgressBar.setVisible(False)
+        self.lookbackMultipleCancelButton.setVisible(False)
+        
+    def _scheduleLookbackMultipleRedraw(self, *args):
+        """Restarts the timer for redrawing the
+        LookbackMultiplePriceBars for the new view.  This only happens
+        if there are LookbackMultiplePriceBars currently drawn, so that
+        the user still decides when they are first drawn (and after
+        they were cleared).
+        """
+
+        if len(self.lookbackMultipleDrawStates) > 0:
+            self.lookbackMultipleRedrawTimer.start()
+            
+    def _handleLookbackMultipleRedrawTimerTimeout(self):
+        """Redraws the currently drawn LookbackMultiples for the
+        current view.  Since drawing is incremental, only the historic
+        PriceBars newly exposed by the pan or zoom are calculated.
+        """
+
+        self.log.debug("Entered _handleLookbackMultipleRedrawTimerTimeout()")
+
+        # The scroll bars also change when items are added to the
+        # QGraphicsScene.  Only redraw if the view actually moved.
+        viewportRect = QRect(0, 0, 
+                             self.graphicsView.viewport().width(), 
+                             self.graphicsView.viewport().height());
+        visibleSceneRectF = \
+            self.graphicsView.mapToScene(viewportRect).boundingRect()
+        if visibleSceneRectF == self.lookbackMultipleDrawSceneRectF:
+            self.log.debug("Exiting _handleLookbackMultipleRedrawTimerTimeout()")
+            return
+        
+        lookbackMultiples = \
+            [drawState["lookbackMultiple"] \
+             for drawState in self.lookbackMultipleDrawStates]
+
+        self.drawLookbackMultiplePriceBars(lookbackMultiples)
+        
+        self.log.debug("Exiting _handleLookbackMultipleRedrawTimerTimeout()")
+        
+    def _setLookbackMultiplePriceBarPrices(self,
+                                           lookbackMultiplePriceBar,
+                                           priceBar,
+                                           highestViewPrice,
+                                           lowestViewPrice,
+                                           highestPriceBarPrice,
+                                           lowestPriceBarPrice):
+        """Sets the open, high, low and close of the given
+        LookbackMultiplePriceBar to the prices of the given historic
+        PriceBar, scaled via _scaleLookbackMultiplePriceBarPrice().
+        """
+
+        for attrName in ["open", "high", "low", "close"]:
+            scaledPrice = \
+                self._scaleLookbackMultiplePriceBarPrice(\
+                    highestViewPrice,
+                    lowestViewPrice,
+                    highestPriceBarPrice,
+                    lowestPriceBarPrice,
+                    priceBarPriceToScale=getattr(priceBar, attrName))
+            setattr(lookbackMultiplePriceBar, attrName, scaledPrice)
+
+    def _removeLookbackMultiplePriceBarGraphicsItems(self, items):
+        """Removes the given LookbackMultiplePriceBarGraphicsItems from
+        the QGraphicsScene.
+        """
+
+        for item in items:
+            if item.scene() != None:
+                self.graphicsScene.removeItem(item)
+        
     def _getLookbackMultipleDatetimesOfLongitudeDeltaDegreesInFuture(self, argsTupleList):
         """Makes LookbackMultiple calculations into the future by
         one of the following methods, depending on what is
@@ -42869,15 +44297,163 @@ class PriceBarChartWidget(QWidget):
         where the planet is at the elapsed number of
         degrees away from the longitude at 'referenceDt'.
         """
-        
-        self.log.debug("Entered _getLookbackMultipleDatetimesOfLongitudeDeltaDegreesInFuture()")
+        
+        self.log.debug("Entered _getLookbackMultipleDatetimesOfLongitudeDeltaDegreesInFuture()")
+
+        # Return value.
+        rv = []
+
+        methodName = "getDatetimesOfLongitudeDeltaDegreesInFuture"
+
+        # Set the start time for timing how long the computations take.
+        startTime = time.time()
+
+        # Results calculated before are taken from the cache, and only
+        # the rest are calculated.
+        cachedResultsList = \
+            self.lookbackMultipleCache.getResults(methodName, argsTupleList)
+        argsTupleList = \
+            [argsTupleList[i] for i in range(len(argsTupleList)) \
+             if cachedResultsList[i] == None]
+        
+        # Obtain the QSettings value for the LookbackMultiple
+        # calculation model/architecture to use.
+        settings = QSettings()
+        key = SettingsKeys.lookbackMultipleCalcModelKey
+        value = settings.value(key, \
+            SettingsKeys.lookbackMultipleCalcModelDefValue,
+            type=str)
+
+        if len(argsTupleList) == 0:
+            self.log.debug(\
+                "All LookbackMultiple results were found in the cache.")
+            
+        elif value == str(LookbackMultipleCalcModel.local_serial):
+            self.log.debug(\
+                "Doing LookbackMultiple calculations local serial.")
+            
+            # Run calculations serially, locally.
+            rv = self._runLookbackMultipleCalculationsLocalSerial(\
+                methodName, argsTupleList)
+                
+        elif value == str(LookbackMultipleCalcModel.local_parallel):
+            self.log.debug(\
+                "Doing LookbackMultiple calculations local parallel.")
+
+            # Run calculations in parallel, locally.
+            rv = \
+               LookbackMultipleParallel.\
+               getDatetimesOfLongitudeDeltaDegreesInFutureParallel(\
+                   argsTupleList)
+            self.lookbackMultipleTelemetry.add(\
+                LookbackMultipleParallel.getTelemetry())
+            
+        elif value == str(LookbackMultipleCalcModel.remote_parallel):
+            self.log.debug(\
+                "Doing LookbackMultiple calculations remote parallel.")
+
+            # Run calculations in parallel, remotely.
+            rv = self._runLookbackMultipleCalculationsRemoteParallel(\
+                methodName, argsTupleList)
+
+        else:
+            errorMsg = "QSettings had an unknown or unsupported " + \
+                       "LookbackMultiple calculation model/architecture.  " + \
+                       "The calculation was aborted."
+            self.log.error(errMsg)
+            QMessageBox.warning(self, "LookbackMultiple",
+                                errorMsg,
+                                QMessageBox.Ok,
+                                QMessageBox.NoButton);
+
+        # Set the end time for timing how long the computations take.
+        endTime = time.time()
+
+        self.log.info("Calculations for {} took: {} sec".\
+                      format(value, endTime - startTime))
+
+        # An empty return value for calculations that were needed
+        # means an error happened, that was already logged.
+        if len(rv) == len(argsTupleList):
+            self.lookbackMultipleCache.putResults(methodName,
+                                                  argsTupleList, rv)
+            rv = self._mergeLookbackMultipleResults(cachedResultsList, rv)
+
+        self.log.debug("Exiting _getLookbackMultipleDatetimesOfLongitudeDeltaDegreesInFuture()")
+        return rv
+
+
+    def _getLookbackMultipleDatetimesOfLongitudeDeltaDegreesInPast(self, argsTupleList):
+        """Makes LookbackMultiple calculations into the past by
+        one of the following methods, depending on what is
+        configured in QSettings (set via AppPreferencesEditDialog).
+
+        The possible calculation model/methods are:
+          - Local serial calculations.
+          - Local parallel calculations (multiple processes).
+          - Remote parallel calculations (multiple processes, distributed).
+            
+        Arguments:
+        argsTupleList - List of tuple objects.  
+                        Each tuple has the following within it:
+            
+            planetName - str holding the name of the planet to do the
+                         calculations for.
+            centricityType - str value holding either "geocentric",
+                             "topocentric", or "heliocentric".
+            longitudeType - str value holding either "tropical" or "sidereal".
+            referenceDt - datetime.datetime object for the reference time.
+                          The planet longitude at this moment is taken as
+                          the zero-point.  Increments or decrements in time 
+                          are started from this moment in time.
+            desiredDeltaDegrees - float value for the number of 
+                            longitude degrees elapsed from the 
+                            longitude at 'referenceDt'.
+            maxErrorTd - datetime.timedelta object holding the maximum
+                         time difference between the exact planetary
+                         combination timestamp, and the one calculated.
+                         This would define the accuracy of the
+                         calculations.  
+            locationLongitudeDegrees - float value holding the
+                          location longitude in degrees.  
+                          West longitudes are negative,
+                          East longitudes are positive.
+                          Value should be in the range of -180 to 180.
+            locationLatitudeDegrees - float value holding the
+                          location latitude in degrees.
+                          North latitudes are positive, 
+                          South latitudes are negative.  
+                          Value should be in the range of -90 to 90.
+            locationElevationMeters - float value holding the
+                          altitude in meters.
+            
+        Returns:
+        List of list of datetime.datetime objects.
+        Each list within the list corresponds to the
+        respective tuple within argsTupleList
+        The datetime.datetime objects are the timestamps
+        where the planet is at the elapsed number of
+        degrees away from the longitude at 'referenceDt'.
+        """
+
+        self.log.debug("Entered _getLookbackMultipleDatetimesOfLongitudeDeltaDegreesInPast()")
 
         # Return value.
         rv = []
 
+        methodName = "getDatetimesOfLongitudeDeltaDegreesInPast"
+
         # Set the start time for timing how long the computations take.
         startTime = time.time()
- 
+
+        # Results calculated before are taken from the cache, and only
+        # the rest are calculated.
+        cachedResultsList = \
+            self.lookbackMultipleCache.getResults(methodName, argsTupleList)
+        argsTupleList = \
+            [argsTupleList[i] for i in range(len(argsTupleList)) \
+             if cachedResultsList[i] == None]
+        
         # Obtain the QSettings value for the LookbackMultiple
         # calculation model/architecture to use.
         settings = QSettings()
@@ -42885,42 +44461,18 @@ class PriceBarChartWidget(QWidget):
         value = settings.value(key, \
             SettingsKeys.lookbackMultipleCalcModelDefValue,
             type=str)
-
-        if value == str(LookbackMultipleCalcModel.local_serial):
+        
+        if len(argsTupleList) == 0:
+            self.log.debug(\
+                "All LookbackMultiple results were found in the cache.")
+            
+        elif value == str(LookbackMultipleCalcModel.local_serial):
             self.log.debug(\
                 "Doing LookbackMultiple calculations local serial.")
             
-            for argsTuple in argsTupleList:
-                
-                # Extract variable values from the tuple.
-                planetName = argsTuple[0]
-                centricityType = argsTuple[1]
-                longitudeType = argsTuple[2]
-                referenceDt = argsTuple[3]
-                desiredDeltaDegrees = argsTuple[4]
-                maxErrorTd = argsTuple[5]
-                locationLongitudeDegrees = argsTuple[6]
-                locationLatitudeDegrees = argsTuple[7]
-                locationElevationMeters = argsTuple[8]
-
-                # Initialize ephemeris.
-                LookbackMultipleUtils.initializeEphemeris(\
-                    locationLongitudeDegrees, 
-                    locationLatitudeDegrees,
-                    locationElevationMeters)
-                
-                # Do LookbackMultiple calculations.
-                dts = \
-                    LookbackMultipleUtils.\
-                    getDatetimesOfLongitudeDeltaDegreesInFuture(\
-                        planetName,
-                        centricityType,
-                        longitudeType,
-                        referenceDt,
-                        desiredDeltaDegrees,
-                        maxErrorTd)
-
-                rv.append(dts)
+            # Run calculations serially, locally.
+            rv = self._runLookbackMultipleCalculationsLocalSerial(\
+                methodName, argsTupleList)
                 
         elif value == str(LookbackMultipleCalcModel.local_parallel):
             self.log.debug(\
@@ -42929,16 +44481,16 @@ class PriceBarChartWidget(QWidget):
             # Run calculations in parallel, locally.
             rv = \
                LookbackMultipleParallel.\
-               getDatetimesOfLongitudeDeltaDegreesInFutureParallel(\
+               getDatetimesOfLongitudeDeltaDegreesInPastParallel(\
                    argsTupleList)
+            self.lookbackMultipleTelemetry.add(\
+                LookbackMultipleParallel.getTelemetry())
             
         elif value == str(LookbackMultipleCalcModel.remote_parallel):
             self.log.debug(\
                 "Doing LookbackMultiple calculations remote parallel.")
 
             # Run calculations in parallel, remotely.
-            methodName = "getDatetimesOfLongitudeDeltaDegreesInFuture"
-
             rv = self._runLookbackMultipleCalculationsRemoteParallel(\
                 methodName, argsTupleList)
 
@@ -42952,161 +44504,94 @@ class PriceBarChartWidget(QWidget):
                                 QMessageBox.Ok,
                                 QMessageBox.NoButton);
 
+
         # Set the end time for timing how long the computations take.
         endTime = time.time()
 
         self.log.info("Calculations for {} took: {} sec".\
                       format(value, endTime - startTime))
 
-        self.log.debug("Exiting _getLookbackMultipleDatetimesOfLongitudeDeltaDegreesInFuture()")
-        return rv
+        # An empty return value for calculations that were needed
+        # means an error happened, that was already logged.
+        if len(rv) == len(argsTupleList):
+            self.lookbackMultipleCache.putResults(methodName,
+                                                  argsTupleList, rv)
+            rv = self._mergeLookbackMultipleResults(cachedResultsList, rv)
 
+        self.log.debug("Exiting _getLookbackMultipleDatetimesOfLongitudeDeltaDegreesInPast()")
+        return rv
 
-    def _getLookbackMultipleDatetimesOfLongitudeDeltaDegreesInPast(self, argsTupleList):
-        """Makes LookbackMultiple calculations into the past by
-        one of the following methods, depending on what is
-        configured in QSettings (set via AppPreferencesEditDialog).
+    def _mergeLookbackMultipleResults(self, cachedResultsList, resultsList):
+        """Returns the list of results for all the argument tuples of a
+        LookbackMultiple calculation, given the results found in the
+        cache and the results calculated for the rest.
 
-        The possible calculation model/methods are:
-          - Local serial calculations.
-          - Local parallel calculations (multiple processes).
-          - Remote parallel calculations (multiple processes, distributed).
-            
         Arguments:
-        argsTupleList - List of tuple objects.  
-                        Each tuple has the following within it:
-            
-            planetName - str holding the name of the planet to do the
-                         calculations for.
-            centricityType - str value holding either "geocentric",
-                             "topocentric", or "heliocentric".
-            longitudeType - str value holding either "tropical" or "sidereal".
-            referenceDt - datetime.datetime object for the reference time.
-                          The planet longitude at this moment is taken as
-                          the zero-point.  Increments or decrements in time 
-                          are started from this moment in time.
-            desiredDeltaDegrees - float value for the number of 
-                            longitude degrees elapsed from the 
-                            longitude at 'referenceDt'.
-            maxErrorTd - datetime.timedelta object holding the maximum
-                         time difference between the exact planetary
-                         combination timestamp, and the one calculated.
-                         This would define the accuracy of the
-                         calculations.  
-            locationLongitudeDegrees - float value holding the
-                          location longitude in degrees.  
-                          West longitudes are negative,
-                          East longitudes are positive.
-                          Value should be in the range of -180 to 180.
-            locationLatitudeDegrees - float value holding the
-                          location latitude in degrees.
-                          North latitudes are positive, 
-                          South latitudes are negative.  
-                          Value should be in the range of -90 to 90.
-            locationElevationMeters - float value holding the
-                          altitude in meters.
-            
+        cachedResultsList - List as returned by
+                            LookbackMultipleCache.getResults().  The
+                            entries are None for the results that were
+                            not found in the cache.
+        resultsList - List of list of datetime.datetime objects, with
+                      the results calculated for the None entries of
+                      'cachedResultsList', in the same order.
+
         Returns:
         List of list of datetime.datetime objects.
-        Each list within the list corresponds to the
-        respective tuple within argsTupleList
-        The datetime.datetime objects are the timestamps
-        where the planet is at the elapsed number of
-        degrees away from the longitude at 'referenceDt'.
         """
 
-        self.log.debug("Entered _getLookbackMultipleDatetimesOfLongitudeDeltaDegreesInPast()")
-
-        # Return value.
         rv = []
 
-        # Set the start time for timing how long the computations take.
-        startTime = time.time()
- 
-        # Obtain the QSettings value for the LookbackMultiple
-        # calculation model/architecture to use.
-        settings = QSettings()
-        key = SettingsKeys.lookbackMultipleCalcModelKey
-        value = settings.value(key, \
-            SettingsKeys.lookbackMultipleCalcModelDefValue,
-            type=str)
-        
-        if value == str(LookbackMultipleCalcModel.local_serial):
-            self.log.debug(\
-                "Doing LookbackMultiple calculations local serial.")
-            
-            for argsTuple in argsTupleList:
-                
-                # Extract variable values from the tuple.
-                planetName = argsTuple[0]
-                centricityType = argsTuple[1]
-                longitudeType = argsTuple[2]
-                referenceDt = argsTuple[3]
-                desiredDeltaDegrees = argsTuple[4]
-                maxErrorTd = argsTuple[5]
-                locationLongitudeDegrees = argsTuple[6]
-                locationLatitudeDegrees = argsTuple[7]
-                locationElevationMeters = argsTuple[8]
-
-                # Initialize ephemeris.
-                LookbackMultipleUtils.initializeEphemeris(\
-                    locationLongitudeDegrees, 
-                    locationLatitudeDegrees,
-                    locationElevationMeters)
-                
-                # Do LookbackMultiple calculations.
-                dts = \
-                    LookbackMultipleUtils.\
-                    getDatetimesOfLongitudeDeltaDegreesInPast(\
-                        planetName,
-                        centricityType,
-                        longitudeType,
-                        referenceDt,
-                        desiredDeltaDegrees,
-                        maxErrorTd)
-
-                rv.append(dts)
-                
-        elif value == str(LookbackMultipleCalcModel.local_parallel):
-            self.log.debug(\
-                "Doing LookbackMultiple calculations local parallel.")
-
-            # Run calculations in parallel, locally.
-            rv = \
-               LookbackMultipleParallel.\
-               getDatetimesOfLongitudeDeltaDegreesInPastParallel(\
-                   argsTupleList)
-            
-        elif value == str(LookbackMultipleCalcModel.remote_parallel):
-            self.log.debug(\
-                "Doing LookbackMultiple calculations remote parallel.")
-
-            # Run calculations in parallel, remotely.
-            methodName = "getDatetimesOfLongitudeDeltaDegreesInPast"
+        j = 0
+        for cachedResults in cachedResultsList:
+            if cachedResults == None:
+                rv.append(resultsList[j])
+                j += 1
+            else:
+                rv.append(cachedResults)
 
-            rv = self._runLookbackMultipleCalculationsRemoteParallel(\
-                methodName, argsTupleList)
+        return rv
 
-        else:
-            errorMsg = "QSettings had an unknown or unsupported " + \
-                       "LookbackMultiple calculation model/architecture.  " + \
-                       "The calculation was aborted."
-            self.log.error(errMsg)
-            QMessageBox.warning(self, "LookbackMultiple",
-                                errorMsg,
-                                QMessageBox.Ok,
-                                QMessageBox.NoButton);
+    def _runLookbackMultipleCalculationsLocalSerial(self, 
+                                                    methodName, 
+                                                    argsTupleList):
+        """Runs the LookbackMultiple calculations in this process.
+        The tuples that differ only by the reference timestamp are
+        calculated together, in a single sweep through time, by the
+        LookbackMultipleUtils method with the name 'methodName' +
+        'ForReferences'.  The work done is added to
+        self.lookbackMultipleTelemetry.
+        
+        Arguments:
+        methodName   - str holding one of the following:
+                       getDatetimesOfLongitudeDeltaDegreesInFuture
+                       getDatetimesOfLongitudeDeltaDegreesInPast
+        argsTupleList - List of tuple objects.  Each tuple has the
+                        same fields as for
+                        _runLookbackMultipleCalculationsRemoteParallel().
 
+        Returns:
+        List of list of datetime.datetime objects.
+        Each list within the list corresponds to the
+        respective tuple within argsTupleList.
+        """
 
-        # Set the end time for timing how long the computations take.
-        endTime = time.time()
+        self.log.debug("Entered _runLookbackMultipleCalculationsLocalSerial()")
 
-        self.log.info("Calculations for {} took: {} sec".\
-                      format(value, endTime - startTime))
+        startTime = time.time()
+        baseCounters = LookbackMultipleTelemetry.getProcessCounters()
+        
+        rv = getDatetimesOfLongitudeDeltaDegreesForReferences(methodName,
+                                                              argsTupleList)
 
-        self.log.debug("Exiting _getLookbackMultipleDatetimesOfLongitudeDeltaDegreesInPast()")
+        self.lookbackMultipleTelemetry.addBatch(\
+            time.time() - startTime,
+            0.0,
+            LookbackMultipleTelemetry.subtractCounters(\
+                LookbackMultipleTelemetry.getProcessCounters(), baseCounters))
+        
+        self.log.debug("Exiting _runLookbackMultipleCalculationsLocalSerial()")
         return rv
-
+        
     def _runLookbackMultipleCalculationsRemoteParallel(self, 
                                                        methodName, 
                                                        argsTupleList):
@@ -43192,22 +44677,12 @@ class PriceBarChartWidget(QWidget):
             type=str)
         serverAuthKey = value.encode("utf-8")
            
-        class QueueManager(BaseManager):
-            pass
-            
-        QueueManager.register("getTaskQueue", 
-                              callable=lambda: taskQueue)
-        QueueManager.register("getResultQueue", 
-                              callable=lambda: resultQueue)
-    
-        manager = QueueManager(address=(serverAddress, serverPort), 
-                               authkey=serverAuthKey)
-
-        self.log.debug("LookbackMultiple client tasker connecting " + \
+        self.log.debug("LookbackMultiple client connecting " + \
                        "to server {} port {} ...".\
                        format(serverAddress, serverPort))
         try:
-            manager.connect()
+            client = LookbackMultipleJobClient((serverAddress, serverPort),
+                                               serverAuthKey)
         except ConnectionRefusedError as e:
             endl = os.linesep
             errorStr = "Caught ConnectionRefusedError while " + \
@@ -43240,141 +44715,31 @@ class PriceBarChartWidget(QWidget):
             rv = []
             return rv
                            
-        self.log.debug("LookbackMultiple client tasker connected.")
-        
-        taskQueue = manager.getTaskQueue()
-        resultQueue = manager.getResultQueue()
-
-        # The remote parallel distributed method takes a list of tuples with
-        # different arguments/parameters.  This list holds the reformatted
-        # parameters.
-        newArgsTupleList = []
-
-        for i in range(len(argsTupleList)):
-            argsTuple = argsTupleList[i]
-                            
-            # Extract variable values from the tuple.
-            planetName = argsTuple[0]
-            centricityType = argsTuple[1]
-            longitudeType = argsTuple[2]
-            referenceDt = argsTuple[3]
-            desiredDeltaDegrees = argsTuple[4]
-            maxErrorTd = argsTuple[5]
-            locationLongitudeDegrees = argsTuple[6]
-            locationLatitudeDegrees = argsTuple[7]
-            locationElevationMeters = argsTuple[8]
-            
-            # Variables not in the original tuple.
-            methodToRun = methodName
-            taskId = i
-
-            # Assemble a new tuple for sending to the remote server.
-            newArgsTuple = (\
-                methodToRun,
-                taskId,
-                planetName, 
-                centricityType, 
-                longitudeType, 
-                referenceDt, 
-                desiredDeltaDegrees, 
-                maxErrorTd, 
-                locationLongitudeDegrees, 
-                locationLatitudeDegrees, 
-                locationElevationMeters)
-            
-            newArgsTupleList.append(newArgsTuple)
-            
-        # Submit tasks.
-        self.log.info("Submitting {} tasks ...".format(len(newArgsTupleList)))
-        for argsTuple in newArgsTupleList:
-            taskQueue.put(argsTuple)
-        self.log.info("Submitting {} tasks completed.".\
-                  format(len(newArgsTupleList)))
-            
-        # Block, waiting for all the tasks to complete.
-        self.log.info("Waiting for all tasks to complete ...")
-
-        taskQueue.join()
-
-        self.log.info("Tasks completed.  Now analyzing results ...")
-        
-        # Initialize the results list that will be returned.  
-        #
-        # The results extracted out of the resultQueue is not guaranteed to be
-        # in the same order as the corresponding tasks submitted to the
-        # taskQueue.  This is the results after we have put them in the correct
-        # order.
-        resultsList = [None] * len(newArgsTupleList)
+        self.log.debug("LookbackMultiple client connected.")
 
-        resultCount = 0
-        while resultCount < len(newArgsTupleList):
-
-            # Get a result.
-            (argsTuple, resultDts) = resultQueue.get()
-             
-            argIndex = 0
-            methodToRun = argsTuple[argIndex]
-            argIndex += 1
-            taskId = argsTuple[argIndex]
-            argIndex += 1
-            planetName = argsTuple[argIndex]
-            argIndex += 1
-            centricityType = argsTuple[argIndex]
-            argIndex += 1
-            longitudeType = argsTuple[argIndex]
-            argIndex += 1
-            referenceDt = argsTuple[argIndex]
-            argIndex += 1
-            desiredDeltaDegrees = argsTuple[argIndex]
-            argIndex += 1
-            maxErrorTd = argsTuple[argIndex]
-            argIndex += 1
-            locationLongitudeDegrees = argsTuple[argIndex]
-            argIndex += 1
-            locationLatitudeDegrees = argsTuple[argIndex]
-            argIndex += 1
-            locationElevationMeters = argsTuple[argIndex]
-            argIndex += 1
-            
-
-            # Place the resultDts in the correct place.
-            resultsList[taskId] = resultDts
-
-            # Debug output.
-            if self.log.isEnabledFor(logging.DEBUG) == True:
-                endl = os.linesep
-                argsTupleStr = \
-                    "methodToRun == {}".format(methodToRun) + endl + \
-                    "taskId == {}".format(taskId) + endl + \
-                    "planetName == {}".format(planetName) + endl + \
-                    "centricityType == {}".format(centricityType) + endl + \
-                    "longitudeType == {}".format(longitudeType) + endl + \
-                    "referenceDt == {}".format(referenceDt) + endl + \
-                    "desiredDeltaDegrees == {}".\
-                    format(desiredDeltaDegrees) + endl + \
-                    "maxErrorTd == {}".format(maxErrorTd) + endl + \
-                    "locationLongitudeDegrees == {}".\
-                    format(locationLongitudeDegrees) + endl + \
-                    "locationLatitudeDegrees == {}".\
-                    format(locationLatitudeDegrees) + endl + \
-                    "locationElevationMeters == {}".\
-                    format(locationElevationMeters)
-    
-                self.log.debug("Obtained result: " + \
-                          "argsTuple == {}, ".format(argsTuple) + 
-                          "len(resultDts) == {}".format(len(resultDts)))
-                for i in range(len(resultDts)):
-                    dt = resultDts[i]
-                    self.log.debug("  resultDts[{}] == {}".format(i, dt))
-
-            # Notify that the consumption of this result is complete.
-            resultQueue.task_done()
+        # Submit the tasks in batches, and block, waiting for all the
+        # results.  Batches leased by workers that are lost are
+        # re-queued by the server for other workers.
+        self.log.info("Submitting {} tasks ...".format(len(argsTupleList)))
+        
+        try:
+            resultsList = client.getDatetimes(methodName, argsTupleList)
+            self.lookbackMultipleTelemetry.add(client.getTelemetry())
+        except (EOFError, OSError) as e:
+            errorStr = "Lost the connection to " + \
+                "LookbackMultiple server {} port {}.  ".\
+                format(serverAddress, serverPort) + \
+                "Aborting calculations.  e == {}".format(e)
+            self.log.error(errorStr)
+            QMessageBox.warning(self, 
+                                "Connection Error",
+                                errorStr,
+                                QMessageBox.Ok,
+                                QMessageBox.NoButton);
+            resultsList = []
+        finally:
+            client.close()
 
-            resultCount += 1
-            if self.log.isEnabledFor(logging.DEBUG) == True:
-                self.log.debug("We have consumed {} total results now.".\
-                          format(resultCount))
-    
         self.log.info("Done consuming all tasks submitted.") 
         return resultsList
 
@@ -43389,10 +44754,13 @@ class PriceBarChartWidget(QWidget):
         """
 
         self.log.debug("Entered clearAllLookbackMultiplePriceBars()")
+
+        self.cancelLookbackMultipleCalculations()
         
         # Go through all the QGraphicsItems and remove the artifact items.
         graphicsItems = self.graphicsScene.items()
 
+        self.graphicsScene.beginBulkEdit()
         for item in graphicsItems:
             if isinstance(item, LookbackMultiplePriceBarGraphicsItem):
 
@@ -43404,7 +44772,11 @@ class PriceBarChartWidget(QWidget):
                                
                 if item.scene() != None:
                     self.graphicsScene.removeItem(item)
+        self.graphicsScene.endBulkEdit()
                 
+        # Nothing is drawn anymore, so the next draw starts from scratch.
+        self.lookbackMultipleDrawStates = []
+        
         self.log.debug("Exiting clearAllLookbackMultiplePriceBars()")
 
     def applyPriceBarChartSettings(self, priceBarChartSettings):
@@ -43499,11 +44871,17 @@ class PriceBarChartWidget(QWidget):
 
         # Apply the transform.
         self.graphicsView.setTransform(newTransform)
+        self._updatePriceBarLevelOfDetail()
 
         # Apply the settings on all the existing relevant QGraphicsItems.
         graphicsItems = self.graphicsScene.items()
         for item in graphicsItems:
-            if isinstance(item, PriceBarGraphicsItem):
+            if isinstance(item, PriceBarSeriesGraphicsItem):
+                self.log.debug("Applying settings to " + \
+                               "PriceBarSeriesGraphicsItem.")
+                item.loadSettingsFromPriceBarChartSettings(\
+                    self.priceBarChartSettings)
+            elif isinstance(item, PriceBarGraphicsItem):
                 self.log.debug("Applying settings to PriceBarGraphicsItem.")
                 item.loadSettingsFromPriceBarChartSettings(\
                     self.priceBarChartSettings)
@@ -44102,33 +45480,26 @@ class PriceBarChartWidget(QWidget):
         """Handles when the QGraphicsScene has it's selection of
         QGraphicsItems changed.
 
-        This function obtains the selected items, and if there is only
-        one PriceBarGraphicsItem selected, then it displays the
+        This function obtains the selected PriceBars (of the
+        PriceBarGraphicsItems or of the PriceBarSeriesGraphicsItem), and
+        if there is only one PriceBar selected, then it displays the
         information about that pricebar in the labels at the top of
         the widget.
         """
 
-        selectedItems = self.graphicsScene.selectedItems()
-
-        numPriceBarGraphicsItemsSelected = 0
-        lastPriceBarGraphicsItem = None
-        
-        for item in selectedItems:
-            if isinstance(item, PriceBarGraphicsItem):
-                numPriceBarGraphicsItemsSelected += 1
-                lastPriceBarGraphicsItem = item
+        selectedPriceBars = self.graphicsScene.getSelectedPriceBars()
 
-        self.log.debug("Number of PriceBarGraphicsItems selected is: {}".\
-                       format(numPriceBarGraphicsItemsSelected))
+        self.log.debug("Number of PriceBars selected is: {}".\
+                       format(len(selectedPriceBars)))
 
         # Only update the labels with price/time information if there
-        # was only one PriceBarGraphicsItem selected.  This is done to
+        # was only one PriceBar selected.  This is done to
         # avoid confusion in the event that a second
-        # PriceBarGraphicsItem is selected and the user didn't notice
+        # PriceBar is selected and the user didn't notice
         # that it was (to prevent the wrong information from being
         # interpreted).
-        if numPriceBarGraphicsItemsSelected == 1:
-            priceBar = lastPriceBarGraphicsItem.getPriceBar()
+        if len(selectedPriceBars) == 1:
+            priceBar = selectedPriceBars[0]
             self.updateSelectedPriceBarLabels(priceBar)
         else:
             self.updateSelectedPriceBarLabels(None)
@@ -44259,6 +45630,16 @@ class PriceBarChartGraphicsScene(QGraphicsScene):
     # in Astrolog.
     astrologLaunch = QtCore.pyqtSignal(datetime.datetime)
 
+    # Signal emitted when the selection of PriceBars in the
+    # PriceBarSeriesGraphicsItem changes.
+    priceBarSelectionChanged = QtCore.pyqtSignal()
+
+    # Number of PriceBars per pixel of the view, at or above which the
+    # PriceBars are drawn as OHLC envelopes by a
+    # PriceBarEnvelopeGraphicsItem instead of by the
+    # PriceBarGraphicsItems.
+    priceBarEnvelopesPriceBarsPerPixel = 1.0
+
 
     def __init__(self, parent=None):
         """Pass-through to the QGraphicsScene constructor."""
@@ -44294,18 +45675,52 @@ class PriceBarChartGraphicsScene(QGraphicsScene):
         # datetime.datetime.
         self.timezone = pytz.utc
 
-        # Set the indexing method to be QGraphicsScene.NoIndex.
-        # We need to do this to prevent segmentation faults in Qt's
-        # use of a BspTreeIndex.
+        # Flag for whether the QGraphicsItems are indexed in a BSP tree
+        # (QGraphicsScene.BspTreeIndex), so that painting a part of the
+        # scene and finding the items under the mouse don't go through
+        # all the items.  The scene used to always be
+        # QGraphicsScene.NoIndex, to prevent segmentation faults in
+        # Qt's use of a BspTreeIndex when items changed geometry
+        # without calling prepareGeometryChange().  The items now call
+        # it before every change to what their boundingRect() depends
+        # on, but the indexing can still be turned off in the
+        # application preferences if the segmentation faults come back.
+        self.itemIndexingEnabled = \
+            SettingsKeys.priceBarChartItemIndexingEnabledSettingsDefValue
+
+        # Number of bulk edits in progress (see beginBulkEdit()).  While
+        # it is greater than zero, the scene is QGraphicsScene.NoIndex,
+        # so that many items can be added or removed without updating
+        # the BSP tree for each one.  The BSP tree is then rebuilt once
+        # at the end of the outermost bulk edit.
+        self.bulkEditDepth = 0
+
+        # Start out with QGraphicsScene.NoIndex, and switch to the
+        # BSP tree if enabled in the application preferences.
         self.setItemIndexMethod(QGraphicsScene.NoIndex)
+        self.loadSettingsFromAppPreferences()
 
-        # Holds references to the highest, lowest, earliest and latest
-        # PriceBars.  This is so we don't re-compute it every time we
-        # need it.  The values are set when PriceBars are loaded or cleared.
-        self.highestPriceBar = None
-        self.lowestPriceBar = None
-        self.earliestPriceBar = None
-        self.latestPriceBar = None
+        # Index of the PriceBars of the PriceBarGraphicsItems, sorted
+        # by timestamp.  This is so that lookups of PriceBars don't go
+        # through all the QGraphicsItems.  It is updated when PriceBars
+        # are loaded or cleared.
+        self.priceBarIndex = PriceBarIndex()
+
+        # QGraphicsItem drawing the PriceBars of the index as OHLC
+        # envelopes when zoomed out, and the flag for whether it is
+        # shown instead of the PriceBarGraphicsItems.
+        self.priceBarEnvelopeGraphicsItem = \
+            PriceBarEnvelopeGraphicsItem(self.priceBarIndex)
+        self.priceBarEnvelopeGraphicsItem.setVisible(False)
+        self.addItem(self.priceBarEnvelopeGraphicsItem)
+        self.priceBarEnvelopesEnabled = False
+
+        # QGraphicsItem drawing the PriceBars of the index that were
+        # added without a PriceBarGraphicsItem (see
+        # addPriceBarsToIndex()).
+        self.priceBarSeriesGraphicsItem = \
+            PriceBarSeriesGraphicsItem(self.priceBarIndex)
+        self.addItem(self.priceBarSeriesGraphicsItem)
         
         # Adding or removing an artifact graphics item counts as
         # something changed.
@@ -44314,6 +45729,102 @@ class PriceBarChartGraphicsScene(QGraphicsScene):
         self.priceBarChartArtifactGraphicsItemRemoved.\
             connect(self.priceBarChartChanged)
 
+    def loadSettingsFromAppPreferences(self):
+        """Reads some of the parameters/settings of this
+        QGraphicsScene from the QSettings object. 
+        """
+
+        settings = QSettings()
+
+        # itemIndexingEnabled
+        key = SettingsKeys.priceBarChartItemIndexingEnabledSettingsKey
+        defaultValue = \
+            SettingsKeys.priceBarChartItemIndexingEnabledSettingsDefValue
+        self.setItemIndexingEnabled(\
+            settings.value(key, defaultValue, type=bool))
+
+    def setItemIndexingEnabled(self, flag):
+        """Sets whether the QGraphicsItems of the scene are indexed in
+        a BSP tree.  If a bulk edit is in progress, the BSP tree is
+        built when it ends.
+
+        Arguments:
+        flag - bool value for whether the indexing is enabled.
+        """
+
+        self.itemIndexingEnabled = flag
+        self._applyItemIndexMethod()
+
+    def isItemIndexingEnabled(self):
+        """Returns whether the QGraphicsItems of the scene are indexed
+        in a BSP tree, outside of bulk edits.
+        """
+
+        return self.itemIndexingEnabled
+
+    def beginBulkEdit(self):
+        """Starts a bulk edit of the scene, where many QGraphicsItems
+        are about to be added or removed.  The scene is switched to
+        QGraphicsScene.NoIndex until the matching call to
+        endBulkEdit().  Bulk edits can be nested.
+        """
+
+        self.bulkEditDepth += 1
+        self._applyItemIndexMethod()
+
+    def endBulkEdit(self):
+        """Ends a bulk edit of the scene started with beginBulkEdit().
+        When the outermost bulk edit ends, the BSP tree of the
+        QGraphicsItems is rebuilt, if indexing is enabled.
+        """
+
+        if self.bulkEditDepth == 0:
+            self.log.warning("endBulkEdit() called without a matching " + \
+                             "call to beginBulkEdit().")
+            return
+
+        self.bulkEditDepth -= 1
+        self._applyItemIndexMethod()
+
+    def _applyItemIndexMethod(self):
+        """Sets the item index method of the scene from the
+        itemIndexingEnabled flag and the bulk edits in progress.
+        Changing the method to QGraphicsScene.BspTreeIndex builds the
+        BSP tree from all the QGraphicsItems of the scene at once, so
+        it is only set when it differs from the current method.
+        """
+
+        if self.itemIndexingEnabled == True and self.bulkEditDepth == 0:
+            indexMethod = QGraphicsScene.BspTreeIndex
+        else:
+            indexMethod = QGraphicsScene.NoIndex
+
+        if self.itemIndexMethod() != indexMethod:
+            if self.log.isEnabledFor(logging.DEBUG) == True:
+                self.log.debug("Setting the item index method to {} ".\
+                               format(indexMethod) + \
+                               "for {} items.".format(len(self.items())))
+            self.setItemIndexMethod(indexMethod)
+
+    def mousePressEvent(self, qgraphicsscenemouseevent):
+        """Overwrites the QGraphicsScene.mousePressEvent() function.
+        Unselects the PriceBars of the PriceBarSeriesGraphicsItem when
+        the mouse is pressed elsewhere, like the QGraphicsScene does
+        for the selected QGraphicsItems.
+        """
+
+        event = qgraphicsscenemouseevent
+        seriesItem = self.priceBarSeriesGraphicsItem
+
+        if event.button() == Qt.LeftButton and \
+           not (event.modifiers() & Qt.ControlModifier) and \
+           seriesItem.priceBarSelectionEnabled == True and \
+           seriesItem.getPriceBarIndexAt(event.scenePos()) == None:
+
+            seriesItem.clearPriceBarSelection()
+
+        super().mousePressEvent(event)
+
     def setScaling(self, scaling):
         """Sets the PriceBarChartScaling scaling object used for this
         trading entity.  This scaling object is used for various
@@ -44775,6 +46286,25 @@ class PriceBarChartGraphicsScene(QGraphicsScene):
             
         return sceneXPos
 
+    def datetimesToSceneXPositions(self, dts):
+        """Returns the X positions in scene coordinates for many
+        datetime.datetime objects, as datetimeToSceneXPos() does for
+        one.  The Julian Days of all of them are converted at once (see
+        Ephemeris.datetimesToJulianDays()).
+
+        Arguments:
+
+        dts - list of datetime.datetime objects.
+
+        Returns:
+
+        list of float values for the X positions, in the same order.
+        """
+
+        jds = Ephemeris.datetimesToJulianDays(dts)
+
+        return [self.julianDayToSceneXPos(jd) for jd in jds]
+
     def priceToSceneYPos(self, price):
         """Returns the conversion from price to what we have chosen the Y
         coordinate values to be.
@@ -45057,136 +46587,266 @@ class PriceBarChartGraphicsScene(QGraphicsScene):
         
         return QPointF(sceneX, sceneY)
 
-    def clearCachedPriceBars(self):
-        """Clears what we pre-determined was the highest, lowest,
-        earliest and latest PriceBars.  These will be recalculated the
-        next time the user wants the reference to the specific PriceBar.
+    def addPriceBarGraphicsItemsToIndex(self, items):
+        """Adds the given PriceBarGraphicsItems, already added to this
+        QGraphicsScene and positioned, to the index of PriceBars.
+
+        Arguments:
+        items - list of PriceBarGraphicsItem objects.
         """
-        
-        self.highestPriceBar = None
-        self.lowestPriceBar = None
-        self.earliestPriceBar = None
-        self.latestPriceBar = None
-        
-    def getEarliestPriceBar(self):
-        """Goes through all the PriceBars, looking at the one that has
-        the earliest timestamp.  This pricebar is returned.
-        
-        Returns:
-        PriceBar - PriceBar object that has the earliest timestamp.
+
+        entries = [self._getPriceBarIndexEntry(item.getPriceBar(), item,
+                                               item.pos().x()) \
+                   for item in items]
+
+        self.priceBarIndex.addPriceBars(entries)
+        self._priceBarIndexChanged()
+
+        # The new items are hidden if the envelopes are drawn instead.
+        if self.priceBarEnvelopesEnabled == True:
+            for item in items:
+                item.setVisible(False)
+
+    def addPriceBarsToIndex(self, priceBars):
+        """Adds the given PriceBars to the index of PriceBars, without
+        PriceBarGraphicsItems.  They are drawn by the
+        PriceBarSeriesGraphicsItem of this QGraphicsScene instead.
+
+        Arguments:
+        priceBars - list of PriceBar objects.
         """
 
-        # Use pre-determined value if available.
-        if self.earliestPriceBar != None:
-            return self.earliestPriceBar
-        
-        earliestPriceBar = None
-        
-        graphicsItems = self.items()
+        xs = self.datetimesToSceneXPositions(\
+            [priceBar.timestamp for priceBar in priceBars])
 
-        for item in graphicsItems:
-            if isinstance(item, PriceBarGraphicsItem):
-                pb = item.getPriceBar()
+        entries = [self._getPriceBarIndexEntry(priceBars[i], None, xs[i]) \
+                   for i in range(len(priceBars))]
 
-                if earliestPriceBar == None:
-                    earliestPriceBar = pb
-                elif pb.timestamp < earliestPriceBar.timestamp:
-                    earliestPriceBar = pb
+        self.priceBarIndex.addPriceBars(entries)
+        self._priceBarIndexChanged()
 
-        # Cache for later usage.
-        self.earliestPriceBar = earliestPriceBar
-                    
-        return earliestPriceBar
+    def replacePriceBarInIndex(self, index, priceBar):
+        """Replaces the PriceBar at the given position in the index of
+        PriceBars with the given PriceBar, keeping its
+        PriceBarGraphicsItem, if any.  This is called when a PriceBar
+        was edited.
 
-    def getLatestPriceBar(self):
-        """Goes through all the PriceBars, looking at the one that has
-        the latest timestamp.  This pricebar is returned.
-        
-        Returns:
-        PriceBar - PriceBar object that has the latest timestamp.
+        Arguments:
+        index - int position of the PriceBar in the index.
+        priceBar - PriceBar object with the new values.
         """
 
-        # Use pre-determined value if available.
-        if self.latestPriceBar != None:
-            return self.latestPriceBar
-        
-        latestPriceBar = None
-        
-        graphicsItems = self.items()
+        item = self.priceBarIndex.getItem(index)
 
-        for item in graphicsItems:
+        self.priceBarIndex.replacePriceBar(\
+            index, self._getPriceBarIndexEntry(priceBar, item))
+        self._priceBarIndexChanged()
+
+    def updatePriceBarGraphicsItemInIndex(self, item):
+        """Updates the index of PriceBars after the PriceBar of the
+        given PriceBarGraphicsItem was edited.
+
+        Arguments:
+        item - PriceBarGraphicsItem that is in the index.
+        """
+
+        index = self.priceBarIndex.getIndexOfItem(item)
+
+        if index == None:
+            self.log.error("PriceBarGraphicsItem is not in the index " + \
+                           "of PriceBars.")
+            return
+
+        self.replacePriceBarInIndex(index, item.getPriceBar())
+
+    def _getPriceBarIndexEntry(self, priceBar, item, x=None):
+        """Returns the entry of the given PriceBar for the index of
+        PriceBars, as for PriceBarIndex.addPriceBars().  If the scene X
+        position 'x' of the PriceBar is not given, it is converted from
+        its timestamp.
+        """
+
+        if x == None:
+            x = self.datetimeToSceneXPos(priceBar.timestamp)
+
+        return (priceBar,
+                item,
+                x,
+                self.priceToSceneYPos(priceBar.open),
+                self.priceToSceneYPos(priceBar.high),
+                self.priceToSceneYPos(priceBar.low),
+                self.priceToSceneYPos(priceBar.close))
+
+    def _priceBarIndexChanged(self):
+        """Updates the QGraphicsItems that draw from the index of
+        PriceBars, after PriceBars were added, replaced or cleared.
+        """
+
+        # The positions of the selected PriceBars are no longer valid.
+        self.priceBarSeriesGraphicsItem.clearPriceBarSelection()
+
+        self.priceBarSeriesGraphicsItem.recalculateBoundingRect()
+        self.priceBarSeriesGraphicsItem.update()
+        self.priceBarEnvelopeGraphicsItem.recalculateBoundingRect()
+        self.priceBarEnvelopeGraphicsItem.update()
+
+    def getSelectedPriceBars(self):
+        """Returns the list of the PriceBars selected in the
+        PriceBarSeriesGraphicsItem and of the selected
+        PriceBarGraphicsItems.
+        """
+
+        priceBars = self.priceBarSeriesGraphicsItem.getSelectedPriceBars()
+
+        for item in self.selectedItems():
             if isinstance(item, PriceBarGraphicsItem):
-                pb = item.getPriceBar()
+                priceBars.append(item.getPriceBar())
 
-                if latestPriceBar == None:
-                    latestPriceBar = pb
-                elif pb.timestamp > latestPriceBar.timestamp:
-                    latestPriceBar = pb
+        return priceBars
 
-        # Cache for later usage.
-        self.latestPriceBar = latestPriceBar
-        
-        return latestPriceBar
+    def clearPriceBarIndex(self):
+        """Removes all the PriceBars from the index of PriceBars.  This
+        is called when the PriceBarGraphicsItems are removed.
+        """
 
-    def getHighestPriceBar(self):
-        """Goes through all the PriceBars, looking at the one that has
-        the highest high price.  This pricebar is returned.
-        
-        Returns:
-        PriceBar - PriceBar object for the highest pricebar in price.
+        self.priceBarIndex.clear()
+        self._priceBarIndexChanged()
+
+    def getPriceBarsPerPixel(self, pixelsPerSceneX):
+        """Returns the average number of PriceBars per pixel of a view
+        with the given scaling, or None if there are less than two
+        PriceBars.
+
+        Arguments:
+        pixelsPerSceneX - float value for the number of pixels of the
+                          view per scene X unit.
         """
 
-        # Use pre-determined value if available.
-        if self.highestPriceBar != None:
-            return self.highestPriceBar
-        
-        highestPriceBar = None
+        averageXSpacing = self.priceBarIndex.getAverageXSpacing()
+        if averageXSpacing == None or averageXSpacing <= 0.0 or \
+           pixelsPerSceneX <= 0.0:
+            return None
+
+        return 1.0 / (pixelsPerSceneX * averageXSpacing)
+
+    def updatePriceBarLevelOfDetail(self, pixelsPerSceneX):
+        """Draws the PriceBars as OHLC envelopes or as
+        PriceBarGraphicsItems, depending on the number of PriceBars per
+        pixel of a view with the given scaling.  See
+        priceBarEnvelopesPriceBarsPerPixel.
+
+        Arguments:
+        pixelsPerSceneX - float value for the number of pixels of the
+                          view per scene X unit.
+        """
+
+        priceBarsPerPixel = self.getPriceBarsPerPixel(pixelsPerSceneX)
+
+        flag = priceBarsPerPixel != None and \
+               priceBarsPerPixel >= \
+               PriceBarChartGraphicsScene.priceBarEnvelopesPriceBarsPerPixel
+
+        self.setPriceBarEnvelopesEnabled(flag)
+
+    def setPriceBarEnvelopesEnabled(self, flag):
+        """Sets whether the PriceBars are drawn as OHLC envelopes by the
+        PriceBarEnvelopeGraphicsItem, with the PriceBarGraphicsItems
+        hidden, or by the PriceBarGraphicsItems.
+
+        Arguments:
+        flag - bool value for whether the envelopes are drawn.
+        """
+
+        if self.priceBarEnvelopesEnabled == flag:
+            return
+
+        self.log.debug("Setting PriceBar envelopes enabled to {}.".\
+                       format(flag))
+
+        self.priceBarEnvelopesEnabled = flag
+
+        self.priceBarEnvelopeGraphicsItem.setVisible(flag)
+        self.priceBarSeriesGraphicsItem.setVisible(not flag)
+        for item in self.getPriceBarGraphicsItems():
+            item.setVisible(not flag)
+
+    def isPriceBarEnvelopesEnabled(self):
+        """Returns whether the PriceBars are drawn as OHLC envelopes."""
+
+        return self.priceBarEnvelopesEnabled
+
+    def getNumPriceBars(self):
+        """Returns the number of PriceBars in the index of PriceBars."""
+
+        return self.priceBarIndex.getNumPriceBars()
+
+    def getPriceBarGraphicsItems(self):
+        """Returns the list of PriceBarGraphicsItems in the index of
+        PriceBars, sorted by the timestamp of their PriceBars.
+        PriceBars drawn by the PriceBarSeriesGraphicsItem don't have
+        one.
+        """
+
+        priceBarIndex = self.priceBarIndex
         
-        graphicsItems = self.items()
+        return [priceBarIndex.getItem(i) \
+                for i in range(priceBarIndex.getNumPriceBars()) \
+                if priceBarIndex.getItem(i) != None]
 
-        for item in graphicsItems:
-            if isinstance(item, PriceBarGraphicsItem):
-                pb = item.getPriceBar()
+    def getPriceBarsInTimestampRange(self, startDt, endDt):
+        """Returns the list of PriceBars with a timestamp between
+        'startDt' and 'endDt', inclusive, sorted by timestamp.
+        """
 
-                if highestPriceBar == None:
-                    highestPriceBar = pb
-                elif pb.hasHigherHighThan(highestPriceBar):
-                    highestPriceBar = pb
-                    
-        # Cache for later usage.
-        self.highestPriceBar = highestPriceBar
+        return self.priceBarIndex.getPriceBarsInTimestampRange(startDt, endDt)
 
-        return highestPriceBar
+    def getNumPriceBarsInXRange(self, x1, x2):
+        """Returns the number of PriceBars with a scene X position in
+        between 'x1' and 'x2'.  A PriceBar at the smaller of the two
+        is not counted, and a PriceBar at the larger of the two is.
+        """
 
-    def getLowestPriceBar(self):
-        """Goes through all the PriceBars, looking at the one that has
-        the lowest low price.  This pricebar is returned.
+        return self.priceBarIndex.getNumPriceBarsInXRange(x1, x2)
+        
+    def getEarliestPriceBar(self):
+        """Returns the PriceBar that has the earliest timestamp.
         
         Returns:
-        PriceBar - PriceBar object for the lowest pricebar in price.
+        PriceBar - PriceBar object that has the earliest timestamp.
+                   If there are no PriceBars, None is returned.
         """
 
-        # Use pre-determined value if available.
-        if self.lowestPriceBar != None:
-            return self.lowestPriceBar
+        return self.priceBarIndex.getEarliestPriceBar()
+
+    def getLatestPriceBar(self):
+        """Returns the PriceBar that has the latest timestamp.
         
-        lowestPriceBar = None
+        Returns:
+        PriceBar - PriceBar object that has the latest timestamp.
+                   If there are no PriceBars, None is returned.
+        """
+
+        return self.priceBarIndex.getLatestPriceBar()
+
+    def getHighestPriceBar(self):
+        """Returns the PriceBar that has the highest high price.
         
-        graphicsItems = self.items()
+        Returns:
+        PriceBar - PriceBar object for the highest pricebar in price.
+                   If there are no PriceBars, None is returned.
+        """
 
-        for item in graphicsItems:
-            if isinstance(item, PriceBarGraphicsItem):
-                pb = item.getPriceBar()
+        return self.priceBarIndex.getHighestPriceBar()
 
-                if lowestPriceBar == None:
-                    lowestPriceBar = pb
-                elif pb.hasLowerLowThan(lowestPriceBar):
-                    lowestPriceBar = pb
+    def getLowestPriceBar(self):
+        """Returns the PriceBar that has the lowest low price.
         
-        # Cache for later usage.
-        self.lowestPriceBar = lowestPriceBar
+        Returns:
+        PriceBar - PriceBar object for the lowest pricebar in price.
+                   If there are no PriceBars, None is returned.
+        """
 
-        return lowestPriceBar
+        return self.priceBarIndex.getLowestPriceBar()
 
     def getEarliestLookbackMultiplePriceBar(self):
         """Goes through all the LookbackMultiplePriceBars, 
@@ -45289,10 +46949,11 @@ class PriceBarChartGraphicsScene(QGraphicsScene):
         return lowestLookbackMultiplePriceBar
 
     def getClosestPriceBarOHLCPoint(self, pointF):
-        """Goes through all the PriceBars, looking at the QPointF of
-        the open, high, low, and close of each bar (in price and
-        time), and tests it to locate the point out of all the bars
-        that is the closest to 'pointF'.
+        """Looks at the QPointF of the open, high, low, and close of
+        the PriceBars (in price and time), to locate the point out of
+        all the bars that is the closest to 'pointF'.  Only the
+        PriceBars near 'pointF' in X are looked at (see
+        PriceBarIndex.getClosestOHLCPoint()).
 
         WARNING: This may not do what you expect to do!  The reason is
         because our current scaling for time (x coordinate) is 1 unit
@@ -45307,123 +46968,34 @@ class PriceBarChartGraphicsScene(QGraphicsScene):
         Returns:
         QPointF - Point that is a scene pos of a open, high, low,
                   or close of a PriceBar, where it is the closest
-                  to the given 'pointF'.
+                  to the given 'pointF'.  If there are no PriceBars,
+                  None is returned.
         """
 
         self.log.debug("Entered getClosestPriceBarOHLCPoint()")
         
+        self.log.debug("PointF is: ({}, {})".format(pointF.x(), pointF.y()))
+
         # QPointF for the closest point.
         closestPoint = None
-
-        # Smallest length of line from pointF to desired point.
-        smallestLength = None
         
-        # PriceBarGraphicsItem that is the closest.
-        closestPriceBarGraphicsItem = None
-        
-        # Allocate lines ahead of time so we don't have
-        # to create and destroy a whole bunch of them in the loop.
-        lineToOpen = QLineF()
-        lineToHigh = QLineF()
-        lineToLow = QLineF()
-        lineToClose = QLineF()
-
-        graphicsItems = self.items()
-
-        self.log.debug("PointF is: ({}, {})".format(pointF.x(), pointF.y()))
-                       
-        for item in graphicsItems:
-            if isinstance(item, PriceBarGraphicsItem):
-                # Get the points of the open, high, low, and close of
-                # this PriceBarGraphicsItem.
-                openPointF = item.getPriceBarOpenScenePoint()
-                highPointF = item.getPriceBarHighScenePoint()
-                lowPointF = item.getPriceBarLowScenePoint()
-                closePointF = item.getPriceBarCloseScenePoint()
-
-                #self.log.debug("openPointF is: ({}, {})".
-                #               format(openPointF.x(), openPointF.y()))
-                #self.log.debug("highPointF is: ({}, {})".
-                #               format(highPointF.x(), highPointF.y()))
-                #self.log.debug("lowPointF is: ({}, {})".
-                #               format(lowPointF.x(), lowPointF.y()))
-                #self.log.debug("closePointF is: ({}, {})".
-                #               format(closePointF.x(), closePointF.y()))
-
-                # Create lines so we can get the lengths between the points.
-                lineToOpen.setPoints(pointF, openPointF)
-                lineToHigh.setPoints(pointF, highPointF)
-                lineToLow.setPoints(pointF, lowPointF)
-                lineToClose.setPoints(pointF, closePointF)
-
-                lineToOpenLength = lineToOpen.length()
-                lineToHighLength = lineToHigh.length()
-                lineToLowLength = lineToLow.length()
-                lineToCloseLength = lineToClose.length()
-                
-                #self.log.debug("lineToOpenLength is: {}".\
-                #               format(lineToOpenLength))
-                #self.log.debug("lineToHighLength is: {}".\
-                #               format(lineToHighLength))
-                #self.log.debug("lineToLowLength is: {}".\
-                #               format(lineToLowLength))
-                #self.log.debug("lineToCloseLength is: {}".\
-                #               format(lineToCloseLength))
-
-                # Set the initial smallestLength as the first point if
-                # it is not set already.
-                if smallestLength == None:
-                    closestPoint = openPointF
-                    smallestLength = lineToOpen.length()
-                    closestPriceBarGraphicsItem = item
-
-                # Test the open, high, low, and close points to see if
-                # they are now the closest to pointF.
-                if lineToOpenLength < smallestLength:
-                    closestPoint = openPointF
-                    smallestLength = lineToOpenLength
-                    closestPriceBarGraphicsItem = item
-                    #self.log.debug("New closest point is now: " +
-                    #               "({}, {})".format(closestPoint.x(),
-                    #                                 closestPoint.y()))
-
-                if lineToHighLength < smallestLength:
-                    closestPoint = highPointF
-                    smallestLength = lineToHighLength
-                    closestPriceBarGraphicsItem = item
-                    #self.log.debug("New closest point is now: " +
-                    #               "({}, {})".format(closestPoint.x(),
-                    #                                 closestPoint.y()))
-
-                if lineToLowLength < smallestLength:
-                    closestPoint = lowPointF
-                    smallestLength = lineToLowLength
-                    closestPriceBarGraphicsItem = item
-                    #self.log.debug("New closest point is now: " +
-                    #               "({}, {})".format(closestPoint.x(),
-                    #                                 closestPoint.y()))
-
-                if lineToCloseLength < smallestLength:
-                    closestPoint = closePointF
-                    smallestLength = lineToCloseLength
-                    closestPriceBarGraphicsItem = item
-                    #self.log.debug("New closest point is now: " +
-                    #               "({}, {})".format(closestPoint.x(),
-                    #                                 closestPoint.y()))
-                    
-        self.log.debug("Closest point is: ({}, {})".format(closestPoint.x(),
-                                                           closestPoint.y()))
+        point = self.priceBarIndex.getClosestOHLCPoint(pointF.x(), pointF.y())
+        if point != None:
+            closestPoint = QPointF(point[0], point[1])
+            
+            self.log.debug("Closest point is: ({}, {})".\
+                           format(closestPoint.x(), closestPoint.y()))
 
         self.log.debug("Exiting getClosestPriceBarOHLCPoint()")
         
         return closestPoint
 
     def getClosestPriceBarOHLCViewPoint(self, pointF):
-        """Goes through all the PriceBars, looking at the QPointF of
-        the open, high, low, and close of each pricebar (in price and
-        time), and tests it to locate the point out of all the bars
-        that is the closest to 'pointF' in the GraphicsView.  This
-        utilizes the graphics view scaling to see what is closest.  
+        """Looks at the QPointF of the open, high, low, and close of
+        the PriceBars (in price and time), to locate the point out of
+        all the bars that is the closest to 'pointF' in the
+        GraphicsView.  This utilizes the graphics view scaling to see
+        what is closest.
 
         Arguments:
         pointF - QPointF object that is a point in scene
@@ -45434,7 +47006,8 @@ class PriceBarChartGraphicsScene(QGraphicsScene):
         Returns:
         QPointF - Point in scene coordinates of the closest pricebar's
         open, high, low, or close (in price and time), when computed
-        using scaled view coordinates.
+        using scaled view coordinates.  If there are no PriceBars,
+        None is returned.
         """
         
         self.log.debug("Entered getClosestPriceBarOHLCViewPoint()")
@@ -45442,160 +47015,22 @@ class PriceBarChartGraphicsScene(QGraphicsScene):
         # QPointF for the closest point.
         closestPoint = None
 
-        # Smallest length of line from pointF to desired point.
-        smallestLength = None
-        
-        # PriceBarGraphicsItem that is the closest.
-        closestPriceBarGraphicsItem = None
-
         # Scaling object to use.
         scaling = self.scaling
         
         self.log.debug("PointF is: ({}, {})".format(pointF.x(), pointF.y()))
 
-        viewScaledPointF = QPointF(pointF.x() * scaling.getViewScalingX(),
-                                   pointF.y() * scaling.getViewScalingY())
-        
-        self.log.debug("View-scaled PointF is: ({}, {})".\
-                       format(viewScaledPointF.x(), viewScaledPointF.y()))
-
-        # Allocate the points and lines ahead of time so we don't have
-        # to create and destroy a whole bunch of them in the loop.
-        viewScaledOpenPointF = QPointF()
-        viewScaledHighPointF = QPointF()
-        viewScaledLowPointF = QPointF()
-        viewScaledClosePointF = QPointF()
-        lineToOpen = QLineF()
-        lineToHigh = QLineF()
-        lineToLow = QLineF()
-        lineToClose = QLineF()
-
-        graphicsItems = self.items()
-
-        for item in graphicsItems:
-            if isinstance(item, PriceBarGraphicsItem):
-                # Get the points of the open, high, low, and close of
-                # this PriceBarGraphicsItem.
-                openPointF = item.getPriceBarOpenScenePoint()
-                highPointF = item.getPriceBarHighScenePoint()
-                lowPointF = item.getPriceBarLowScenePoint()
-                closePointF = item.getPriceBarCloseScenePoint()
-
-                #self.log.debug("openPointF is: ({}, {})".
-                #               format(openPointF.x(), openPointF.y()))
-                #self.log.debug("highPointF is: ({}, {})".
-                #               format(highPointF.x(), highPointF.y()))
-                #self.log.debug("lowPointF is: ({}, {})".
-                #               format(lowPointF.x(), lowPointF.y()))
-                #self.log.debug("closePointF is: ({}, {})".
-                #               format(closePointF.x(), closePointF.y()))
-
-                viewScaledOpenPointF.\
-                    setX(openPointF.x() * scaling.getViewScalingX())
-                viewScaledOpenPointF.\
-                    setY(openPointF.y() * scaling.getViewScalingY())
-                
-                viewScaledHighPointF.\
-                    setX(highPointF.x() * scaling.getViewScalingX())
-                viewScaledHighPointF.\
-                    setY(highPointF.y() * scaling.getViewScalingY())
-                
-                viewScaledLowPointF.\
-                    setX(lowPointF.x() * scaling.getViewScalingX())
-                viewScaledLowPointF.\
-                    setY(lowPointF.y() * scaling.getViewScalingY())
-                
-                viewScaledClosePointF.\
-                    setX(closePointF.x() * scaling.getViewScalingX())
-                viewScaledClosePointF.\
-                    setY(closePointF.y() * scaling.getViewScalingY())
-
-                #self.log.debug("viewScaledOpenPointF is: ({}, {})".
-                #               format(viewScaledOpenPointF.x(),
-                #                      viewScaledOpenPointF.y()))
-                #self.log.debug("viewScaledHighPointF is: ({}, {})".
-                #               format(viewScaledHighPointF.x(),
-                #                      viewScaledHighPointF.y()))
-                #self.log.debug("viewScaledLowPointF is: ({}, {})".
-                #               format(viewScaledLowPointF.x(),
-                #                      viewScaledLowPointF.y()))
-                #self.log.debug("viewScaledClosePointF is: ({}, {})".
-                #               format(viewScaledClosePointF.x(),
-                #                      viewScaledClosePointF.y()))
-
-                # Create lines so we can get the lengths between the points.
-                lineToOpen.setPoints(viewScaledPointF, viewScaledOpenPointF)
-                lineToHigh.setPoints(viewScaledPointF, viewScaledHighPointF)
-                lineToLow.setPoints(viewScaledPointF, viewScaledLowPointF)
-                lineToClose.setPoints(viewScaledPointF, viewScaledClosePointF)
-
-                lineToOpenLength = lineToOpen.length()
-                lineToHighLength = lineToHigh.length()
-                lineToLowLength = lineToLow.length()
-                lineToCloseLength = lineToClose.length()
-                
-                #self.log.debug("lineToOpenLength is: {}".\
-                #               format(lineToOpenLength))
-                #self.log.debug("lineToHighLength is: {}".\
-                #               format(lineToHighLength))
-                #self.log.debug("lineToLowLength is: {}".\
-                #               format(lineToLowLength))
-                #self.log.debug("lineToCloseLength is: {}".\
-                #               format(lineToCloseLength))
-
-                # Set the initial smallestLength as the first point if
-                # it is not set already.
-                if smallestLength == None:
-                    # Here we are keeping the scene coordinate, not the
-                    # view-scaled one.
-                    closestPoint = openPointF
-                    smallestLength = lineToOpen.length()
-                    closestPriceBarGraphicsItem = item
-
-                # Test the open, high, low, and close points to see if
-                # they are now the closest to pointF.
-                if lineToOpenLength < smallestLength:
-                    # Here we are keeping the scene coordinate, not the
-                    # view-scaled one.
-                    closestPoint = openPointF
-                    smallestLength = lineToOpenLength
-                    closestPriceBarGraphicsItem = item
-                    #self.log.debug("New closest point is now: ({}, {})".\
-                    #               format(closestPoint.x(),
-                    #                      closestPoint.y()))
-
-                if lineToHighLength < smallestLength:
-                    # Here we are keeping the scene coordinate, not the
-                    # view-scaled one.
-                    closestPoint = highPointF
-                    smallestLength = lineToHighLength
-                    closestPriceBarGraphicsItem = item
-                    #self.log.debug("New closest point is now: ({}, {})".\
-                    #               format(closestPoint.x(),
-                    #                      closestPoint.y()))
-
-                if lineToLowLength < smallestLength:
-                    # Here we are keeping the scene coordinate, not the
-                    # view-scaled one.
-                    closestPoint = lowPointF
-                    smallestLength = lineToLowLength
-                    closestPriceBarGraphicsItem = item
-                    #self.log.debug("New closest point is now: ({}, {})".\
-                    #               format(closestPoint.x(),
-                    #                      closestPoint.y()))
-
-                if lineToCloseLength < smallestLength:
-                    # Here we are keeping the scene coordinate, not the
-                    # view-scaled one.
-                    closestPoint = closePointF
-                    smallestLength = lineToCloseLength
-                    closestPriceBarGraphicsItem = item
-                    #self.log.debug("New closest point is now: ({}, {})".\
-                    #               format(closestPoint.x(),
-                    #                      closestPoint.y()))
-                    
-        self.log.debug("Closest point is: ({}, {})".\
-                       format(closestPoint.x(), closestPoint.y()))
+        # The distances are measured in view-scaled coordinates, but
+        # the point kept is the scene coordinate, not the view-scaled
+        # one.
+        point = self.priceBarIndex.getClosestOHLCPoint(\
+            pointF.x(), pointF.y(),
+            scaling.getViewScalingX(), scaling.getViewScalingY())
+        if point != None:
+            closestPoint = QPointF(point[0], point[1])
+            
+            self.log.debug("Closest point is: ({}, {})".\
+                           format(closestPoint.x(), closestPoint.y()))
 
         self.log.debug("Exiting getClosestPriceBarOHLCViewPoint()")
         
@@ -45614,38 +47049,17 @@ class PriceBarChartGraphicsScene(QGraphicsScene):
         returns the X given in the input pointF.
         """
 
-        # Get all the QGraphicsItems.
-        graphicsItems = self.items()
-
-        closestPriceBarX = None
-        currClosestDistance = None
-
-        # Go through the PriceBarGraphicsItems and find the closest one in
-        # X coordinates.
-        for item in graphicsItems:
-            if isinstance(item, PriceBarGraphicsItem):
-
-                x = item.getPriceBarHighScenePoint().x()
-                distance = abs(pointF.x() - x)
-
-                if closestPriceBarX == None:
-                    closestPriceBarX = x
-                    currClosestDistance = distance
-                elif (currClosestDistance != None) and \
-                        (distance < currClosestDistance):
-
-                    closestPriceBarX = x
-                    currClosestDistance = distance
-                    
+        closestPriceBarX = self.priceBarIndex.getClosestX(pointF.x())
+        
         if closestPriceBarX == None:
             closestPriceBarX = pointF.x()
 
         return closestPriceBarX
 
     def getClosestPriceBarOHLCY(self, pointF):
-        """Gets the Y position value of the closest open, high, low,
-        or close price on all the PriceBars (on the Y axis) to the
-        given QPointF position.
+        """Gets the Y position value of the closest high or low price
+        on all the PriceBars (on the Y axis) to the given QPointF
+        position.
 
         Arguments:
         pointF - QPointF to do the lookup on.
@@ -45655,43 +47069,8 @@ class PriceBarChartGraphicsScene(QGraphicsScene):
         returns the Y given in the input pointF.
         """
 
-        # Get all the QGraphicsItems.
-        graphicsItems = self.items()
-
-        closestPriceBarY = None
-        currClosestDistance = None
-
-        # Go through the PriceBarGraphicsItems and find the closest one in
-        # Y coordinates.
-        for item in graphicsItems:
-            if isinstance(item, PriceBarGraphicsItem):
-
-                # High price's Y.
-                y = item.getPriceBarHighScenePoint().y()
-                distance = abs(pointF.y() - y)
-                
-                if closestPriceBarY == None:
-                    closestPriceBarY = y
-                    currClosestDistance = distance
-                elif (currClosestDistance != None) and \
-                        (distance < currClosestDistance):
-
-                    closestPriceBarY = y
-                    currClosestDistance = distance
-
-                # Low price's Y.
-                y = item.getPriceBarLowScenePoint().y()
-                distance = abs(pointF.y() - y)
-
-                if closestPriceBarY == None:
-                    closestPriceBarY = y
-                    currClosestDistance = distance
-                elif (currClosestDistance != None) and \
-                        (distance < currClosestDistance):
-
-                    closestPriceBarY = y
-                    currClosestDistance = distance
-                    
+        closestPriceBarY = self.priceBarIndex.getClosestHighLowY(pointF.y())
+        
         if closestPriceBarY == None:
             closestPriceBarY = pointF.y()
 
@@ -46777,6 +48156,14 @@ class PriceBarChartGraphicsView(QGraphicsView):
         #               "{}.".
         #               format(isinstance(item,
         #                                 PriceBarChartArtifactGraphicsItem)))
+
+        if isinstance(item, PriceBarSeriesGraphicsItem):
+            # Like the PriceBarGraphicsItems, the PriceBars are only
+            # selectable in the ReadOnlyPointerTool mode.
+            item.setPriceBarSelectionEnabled(\
+                self.toolMode == \
+                PriceBarChartGraphicsView.ToolMode['ReadOnlyPointerTool'])
+            return
                        
         if self.toolMode == \
                PriceBarChartGraphicsView.ToolMode['ReadOnlyPointerTool']:
@@ -48187,6 +49574,26 @@ class PriceBarChartGraphicsView(QGraphicsView):
                 item.appendActionsToContextMenu(submenu,
                                                 readOnlyMode=readOnlyFlag)
 
+            elif isinstance(item, PriceBarSeriesGraphicsItem):
+                # Only if a PriceBar is drawn at the click position.
+                index = item.getPriceBarIndexAt(clickPosF)
+                if index == None:
+                    continue
+
+                debugLogStr += \
+                    "PriceBarSeriesGraphicsItem with PriceBar: " + \
+                    item.priceBarIndex.getPriceBar(index).toString() + ". "
+                
+                numContextSubMenuItems += 1
+
+                # Add the menu for this item.  We create the menu this
+                # way so that 'submenu' is owned by 'menu'.
+                submenu = menu.addMenu("")
+                
+                # Append actions and update the submenu title.
+                item.appendActionsToContextMenu(submenu, index,
+                                                readOnlyMode=readOnlyFlag)
+
             elif isinstance(item, LookbackMultiplePriceBarGraphicsItem):
                 debugLogStr += \
                     "LookbackMultiplePriceBarGraphicsItem with " + \
@@ -0,0 +1,650 @@
+# For logging.
+import logging
+
+# For bisect.bisect_left() and bisect.bisect_right().
+import bisect
+
+# For math.floor() and math.log2().
+import math
+
+# For compact arrays of float values.
+import array
+
+# For timestamps and timezone information.
+import datetime
+import pytz
+
+# For directory access.
+import inspect
+
+##############################################################################
+
+class PriceBarIndex:
+    """Class that holds the PriceBars of a PriceBarChartGraphicsScene,
+    sorted by timestamp, together with the scene coordinates of their
+    open, high, low and close points and their PriceBarGraphicsItems.
+    This is so that the PriceBars can be looked up without going
+    through all the QGraphicsItems of the scene (artifacts included).
+
+    The scene X and Y coordinates are held in float arrays, one for
+    each field, in the order of the timestamps.  The scene X
+    coordinate increases with the timestamp, so lookups by X or by
+    timestamp are binary searches.  The earliest, latest, highest and
+    lowest PriceBars are determined when PriceBars are added, and the
+    Y coordinates of all the highs and lows are also held sorted, for
+    snapping to the closest one.
+
+    For drawing the chart zoomed out, the PriceBars can be returned
+    merged into OHLC envelopes of columns of a given width (see
+    getOHLCEnvelopes()).  The envelopes are merged from pre-aggregated
+    levels, where each level merges pairs of consecutive entries of the
+    level below it, so that the work done is proportional to the
+    number of columns rather than to the number of PriceBars.  The
+    levels are built the first time they are needed after PriceBars
+    are added.
+
+    The index doesn't use Qt, so points are passed in and returned as
+    (x, y) float values.
+
+    Example:
+
+    index = PriceBarIndex()
+    index.addPriceBars([(priceBar, item, x, openY, highY, lowY, closeY)])
+    (x, y) = index.getClosestOHLCPoint(pointF.x(), pointF.y())
+    """
+
+    # Logger object for this class.
+    log = logging.getLogger("pricebarindex.PriceBarIndex")
+
+    def __init__(self):
+        """Initializes an empty index."""
+
+        self.clear()
+
+    def clear(self):
+        """Removes all the PriceBars from the index."""
+
+        # PriceBar objects and their PriceBarGraphicsItems, sorted by
+        # timestamp.
+        self.priceBars = []
+        self.items = []
+
+        # Timestamps of the PriceBars, as datetime.datetime objects.
+        self.timestamps = []
+
+        # Scene coordinates of the PriceBars.
+        self.xs = array.array("d")
+        self.openYs = array.array("d")
+        self.highYs = array.array("d")
+        self.lowYs = array.array("d")
+        self.closeYs = array.array("d")
+
+        # Scene Y coordinates of the highs and lows of all the
+        # PriceBars, sorted.
+        self.sortedHighLowYs = array.array("d")
+
+        self.highestPriceBar = None
+        self.lowestPriceBar = None
+
+        # Pre-aggregated levels of OHLC envelopes.  Level 'k' merges
+        # groups of 2**k consecutive PriceBars.  Each level is a tuple
+        # of float arrays (startXs, endXs, openYs, highYs, lowYs,
+        # closeYs).
+        self.aggregationLevels = []
+
+    def addPriceBars(self, entries):
+        """Adds PriceBars to the index.
+
+        Arguments:
+        entries - list of tuples (priceBar, item, x, openY, highY,
+                  lowY, closeY), where 'priceBar' is a PriceBar,
+                  'item' is the PriceBarGraphicsItem of it, and the
+                  rest are the float scene coordinates of the open,
+                  high, low and close points of the item.
+        """
+
+        if len(entries) == 0:
+            return
+
+        entries = sorted(entries, key=lambda entry: entry[0].timestamp)
+
+        if len(self.priceBars) > 0 and \
+           entries[0][0].timestamp < self.timestamps[-1]:
+
+            # The new PriceBars are not all later than the ones
+            # already in the index, so sort all of them again.
+            entries = sorted(self.__getEntries() + entries,
+                             key=lambda entry: entry[0].timestamp)
+            self.clear()
+
+        for (priceBar, item, x, openY, highY, lowY, closeY) in entries:
+            self.priceBars.append(priceBar)
+            self.items.append(item)
+            self.timestamps.append(priceBar.timestamp)
+            self.xs.append(x)
+            self.openYs.append(openY)
+            self.highYs.append(highY)
+            self.lowYs.append(lowY)
+            self.closeYs.append(closeY)
+
+            if self.highestPriceBar == None or \
+               priceBar.hasHigherHighThan(self.highestPriceBar):
+                self.highestPriceBar = priceBar
+            if self.lowestPriceBar == None or \
+               priceBar.hasLowerLowThan(self.lowestPriceBar):
+                self.lowestPriceBar = priceBar
+
+        self.sortedHighLowYs = \
+            array.array("d", sorted(self.highYs + self.lowYs))
+
+        # The pre-aggregated levels are rebuilt when next needed.
+        self.aggregationLevels = []
+
+        if PriceBarIndex.log.isEnabledFor(logging.DEBUG) == True:
+            PriceBarIndex.log.debug("Added {} PriceBars, for {} in total.".\
+                                    format(len(entries), len(self.priceBars)))
+
+    def replacePriceBar(self, index, entry):
+        """Replaces the PriceBar at the given position in timestamp
+        order, for when the PriceBar was edited.  The positions of the
+        PriceBars change if the timestamp of the PriceBar changed.
+
+        Arguments:
+        index - int position of the PriceBar to replace.
+        entry - tuple (priceBar, item, x, openY, highY, lowY, closeY),
+                as for addPriceBars().
+        """
+
+        entries = self.__getEntries()
+        entries[index] = entry
+
+        # The highest and lowest PriceBars may have changed, so add
+        # all of them again.
+        self.clear()
+        self.addPriceBars(entries)
+
+    def getNumPriceBars(self):
+        """Returns the number of PriceBars in the index."""
+
+        return len(self.priceBars)
+
+    def getIndexOfItem(self, item):
+        """Returns the position in timestamp order of the PriceBar of
+        the given PriceBarGraphicsItem, or None if it is not in the
+        index.
+        """
+
+        for i in range(len(self.items)):
+            if self.items[i] is item:
+                return i
+
+        return None
+
+    def getPriceBar(self, index):
+        """Returns the PriceBar at the given position in timestamp
+        order.
+        """
+
+        return self.priceBars[index]
+
+    def getItem(self, index):
+        """Returns the PriceBarGraphicsItem of the PriceBar at the given
+        position in timestamp order.
+        """
+
+        return self.items[index]
+
+    def getEarliestPriceBar(self):
+        """Returns the PriceBar with the earliest timestamp, or None if
+        there are no PriceBars.
+        """
+
+        if len(self.priceBars) == 0:
+            return None
+
+        return self.priceBars[0]
+
+    def getLatestPriceBar(self):
+        """Returns the PriceBar with the latest timestamp, or None if
+        there are no PriceBars.
+        """
+
+        if len(self.priceBars) == 0:
+            return None
+
+        return self.priceBars[-1]
+
+    def getHighestPriceBar(self):
+        """Returns the PriceBar with the highest high price, or None if
+        there are no PriceBars.
+        """
+
+        return self.highestPriceBar
+
+    def getLowestPriceBar(self):
+        """Returns the PriceBar with the lowest low price, or None if
+        there are no PriceBars.
+        """
+
+        return self.lowestPriceBar
+
+    def getPriceBarsInTimestampRange(self, startDt, endDt):
+        """Returns the list of PriceBars with a timestamp between
+        'startDt' and 'endDt', inclusive, sorted by timestamp.
+        """
+
+        startIndex = bisect.bisect_left(self.timestamps, startDt)
+        endIndex = bisect.bisect_right(self.timestamps, endDt)
+
+        return self.priceBars[startIndex:endIndex]
+
+    def getIndexRangeInXRange(self, x1, x2):
+        """Returns the positions in timestamp order of the PriceBars
+        with a scene X coordinate in between 'x1' and 'x2', inclusive.
+
+        Returns:
+        Tuple (startIndex, endIndex) of int values, such that the
+        PriceBars are at positions startIndex to endIndex - 1.
+        """
+
+        lowX = min(x1, x2)
+        highX = max(x1, x2)
+
+        return (bisect.bisect_left(self.xs, lowX),
+                bisect.bisect_right(self.xs, highX))
+
+    def getIndexAt(self, x, y, leftWidth, rightWidth, pad=0.0,
+                   skipItemsFlag=False):
+        """Returns the position in timestamp order of the PriceBar
+        drawn at the point ('x', 'y'), or None if there isn't one.  A
+        PriceBar is drawn from 'leftWidth' on the left of its X
+        coordinate to 'rightWidth' on the right of it, and from its
+        high to its low, with 'pad' added on every side.  If more than
+        one PriceBar is drawn there, the one closest on the X axis is
+        returned.  If 'skipItemsFlag' is True, the PriceBars that have
+        a PriceBarGraphicsItem are skipped.
+        """
+
+        (startIndex, endIndex) = \
+            self.getIndexRangeInXRange(x - rightWidth - pad,
+                                       x + leftWidth + pad)
+
+        closestIndex = None
+        smallestDistance = None
+
+        for i in range(startIndex, endIndex):
+            if skipItemsFlag == True and self.items[i] != None:
+                continue
+
+            if self.highYs[i] - pad <= y <= self.lowYs[i] + pad:
+                distance = abs(self.xs[i] - x)
+                if smallestDistance == None or distance < smallestDistance:
+                    closestIndex = i
+                    smallestDistance = distance
+
+        return closestIndex
+
+    def getNumPriceBarsInXRange(self, x1, x2):
+        """Returns the number of PriceBars with a scene X coordinate
+        in between 'x1' and 'x2'.  A PriceBar at the smaller of the
+        two is not counted, and a PriceBar at the larger of the two is.
+        """
+
+        lowX = min(x1, x2)
+        highX = max(x1, x2)
+
+        return bisect.bisect_right(self.xs, highX) - \
+               bisect.bisect_right(self.xs, lowX)
+
+    def getAverageXSpacing(self):
+        """Returns the average distance between the scene X
+        coordinates of consecutive PriceBars, or None if there are less
+        than two PriceBars.
+        """
+
+        if len(self.xs) < 2:
+            return None
+
+        return (self.xs[-1] - self.xs[0]) / (len(self.xs) - 1)
+
+    def getOHLCEnvelopes(self, x1, x2, columnWidth):
+        """Returns the PriceBars with a scene X coordinate in between
+        'x1' and 'x2', merged into OHLC envelopes of columns of scene
+        width 'columnWidth'.  The columns start at scene X coordinate
+        0.0, so that they stay at the same place when the view is
+        panned.  The envelope of a column has the open of its first
+        PriceBar, the highest high, the lowest low and the close of its
+        last PriceBar.
+
+        PriceBars are merged from a pre-aggregated level with groups of
+        at most a quarter of the PriceBars of a column, by the column
+        of the first PriceBar of each group.  A PriceBar can thus land
+        in the column before its own, by up to a quarter of a column.
+
+        Returns:
+        List of tuples (x, openY, highY, lowY, closeY) of float values
+        for the scene coordinates of the envelopes, sorted by X, where
+        'x' is the center of the column.
+        """
+
+        averageXSpacing = self.getAverageXSpacing()
+        if averageXSpacing == None or averageXSpacing <= 0.0 or \
+           columnWidth <= 0.0:
+            return []
+
+        lowX = min(x1, x2)
+        highX = max(x1, x2)
+
+        # Pick the level with the largest groups that are at most a
+        # quarter of a column.
+        priceBarsPerColumn = columnWidth / averageXSpacing
+        levelNum = 0
+        if priceBarsPerColumn >= 8.0:
+            levelNum = int(math.log2(priceBarsPerColumn / 4.0))
+
+        (startXs, endXs, openYs, highYs, lowYs, closeYs) = \
+            self.__getAggregationLevel(levelNum)
+
+        startIndex = bisect.bisect_left(endXs, lowX)
+        endIndex = bisect.bisect_right(startXs, highX)
+
+        envelopes = []
+
+        currColumn = None
+        openY = highY = lowY = closeY = 0.0
+
+        for i in range(startIndex, endIndex):
+            column = math.floor(startXs[i] / columnWidth)
+
+            if column != currColumn:
+                if currColumn != None:
+                    envelopes.append(((currColumn + 0.5) * columnWidth,
+                                      openY, highY, lowY, closeY))
+                currColumn = column
+                openY = openYs[i]
+                highY = highYs[i]
+                lowY = lowYs[i]
+            else:
+                # Scene Y is the negative of the price.
+                highY = min(highY, highYs[i])
+                lowY = max(lowY, lowYs[i])
+
+            closeY = closeYs[i]
+
+        if currColumn != None:
+            envelopes.append(((currColumn + 0.5) * columnWidth,
+                              openY, highY, lowY, closeY))
+
+        return envelopes
+
+    def getClosestX(self, x):
+        """Returns the scene X coordinate of the PriceBar closest to
+        'x' on the X axis, or None if there are no PriceBars.
+        """
+
+        if len(self.xs) == 0:
+            return None
+
+        i = bisect.bisect_left(self.xs, x)
+
+        if i == 0:
+            return self.xs[0]
+        elif i == len(self.xs):
+            return self.xs[-1]
+        elif x - self.xs[i - 1] <= self.xs[i] - x:
+            return self.xs[i - 1]
+        else:
+            return self.xs[i]
+
+    def getClosestHighLowY(self, y):
+        """Returns the scene Y coordinate of the high or low of a
+        PriceBar that is closest to 'y' on the Y axis, or None if there
+        are no PriceBars.
+        """
+
+        ys = self.sortedHighLowYs
+
+        if len(ys) == 0:
+            return None
+
+        i = bisect.bisect_left(ys, y)
+
+        if i == 0:
+            return ys[0]
+        elif i == len(ys):
+            return ys[-1]
+        elif y - ys[i - 1] <= ys[i] - y:
+            return ys[i - 1]
+        else:
+            return ys[i]
+
+    def getClosestOHLCPoint(self, x, y, scaleX=1.0, scaleY=1.0):
+        """Returns the open, high, low or close point of a PriceBar
+        that is closest to the point ('x', 'y').  The distances are
+        measured after multiplying the X and Y differences by 'scaleX'
+        and 'scaleY', so that the closest point can be found as it
+        appears in a scaled view.
+
+        The search starts at the PriceBars nearest to 'x' and goes
+        outwards on both sides, until the X difference alone is larger
+        than the distance to the closest point found.
+
+        Returns:
+        Tuple (x, y) of float values for the scene coordinates of the
+        closest point, or None if there are no PriceBars.
+        """
+
+        numPriceBars = len(self.xs)
+        if numPriceBars == 0:
+            return None
+
+        scaleX = abs(scaleX)
+        scaleY = abs(scaleY)
+
+        closestPoint = None
+        smallestLengthSquared = None
+
+        # Next PriceBars to look at on the left and the right of 'x'.
+        right = bisect.bisect_left(self.xs, x)
+        left = right - 1
+
+        while left >= 0 or right < numPriceBars:
+
+            # Look at the side with the smaller X difference first.
+            leftFlag = right >= numPriceBars or \
+                (left >= 0 and x - self.xs[left] <= self.xs[right] - x)
+            if leftFlag == True:
+                i = left
+                left -= 1
+            else:
+                i = right
+                right += 1
+
+            dx = (self.xs[i] - x) * scaleX
+            dxSquared = dx * dx
+
+            if smallestLengthSquared != None and \
+               dxSquared >= smallestLengthSquared:
+
+                # The PriceBars further out on this side are even
+                # further away in X.  Stop looking on this side.
+                if leftFlag == True:
+                    left = -1
+                else:
+                    right = numPriceBars
+                continue
+
+            for pointY in (self.openYs[i], self.highYs[i],
+                           self.lowYs[i], self.closeYs[i]):
+                dy = (pointY - y) * scaleY
+                lengthSquared = dxSquared + dy * dy
+
+                if smallestLengthSquared == None or \
+                   lengthSquared < smallestLengthSquared:
+                    closestPoint = (self.xs[i], pointY)
+                    smallestLengthSquared = lengthSquared
+
+        return closestPoint
+
+    def __getAggregationLevel(self, levelNum):
+        """Returns the pre-aggregated level 'levelNum' of OHLC
+        envelopes, building the levels up to it if they weren't built
+        yet.  If there are less levels than that, the highest level is
+        returned.
+
+        Returns:
+        Tuple (startXs, endXs, openYs, highYs, lowYs, closeYs) of float
+        arrays.
+        """
+
+        levels = self.aggregationLevels
+
+        if len(levels) == 0:
+            # Level 0 is the PriceBars themselves.
+            levels.append((self.xs, self.xs, self.openYs, self.highYs,
+                           self.lowYs, self.closeYs))
+
+        while len(levels) <= levelNum and len(levels[-1][0]) > 1:
+            (prevStartXs, prevEndXs, prevOpenYs,
+             prevHighYs, prevLowYs, prevCloseYs) = levels[-1]
+            numPrev = len(prevStartXs)
+
+            startXs = array.array("d")
+            endXs = array.array("d")
+            openYs = array.array("d")
+            highYs = array.array("d")
+            lowYs = array.array("d")
+            closeYs = array.array("d")
+
+            # Merge pairs of consecutive entries.  The last entry is
+            # kept as is if there is an odd number of them.
+            for i in range(0, numPrev, 2):
+                j = min(i + 1, numPrev - 1)
+
+                startXs.append(prevStartXs[i])
+                endXs.append(prevEndXs[j])
+                openYs.append(prevOpenYs[i])
+                highYs.append(min(prevHighYs[i], prevHighYs[j]))
+                lowYs.append(max(prevLowYs[i], prevLowYs[j]))
+                closeYs.append(prevCloseYs[j])
+
+            levels.append((startXs, endXs, openYs, highYs, lowYs, closeYs))
+
+            if PriceBarIndex.log.isEnabledFor(logging.DEBUG) == True:
+                PriceBarIndex.log.debug("Built aggregation level {} ".\
+                                        format(len(levels) - 1) + \
+                                        "with {} entries.".\
+                                        format(len(startXs)))
+
+        return levels[min(levelNum, len(levels) - 1)]
+
+    def __getEntries(self):
+        """Returns the list of the entries in the index, as for
+        addPriceBars().
+        """
+
+        return list(zip(self.priceBars, self.items, self.xs,
+                        self.openYs, self.highYs, self.lowYs, self.closeYs))
+
+##############################################################################
+
+def testPriceBarIndex():
+    print("Running " + inspect.stack()[0][3] + "()")
+
+    from data_objects import PriceBar
+
+    index = PriceBarIndex()
+
+    startDt = datetime.datetime(2012, 1, 2, tzinfo=pytz.utc)
+
+    # PriceBars one day apart, added out of order, with the scene X
+    # coordinate as the day number and the scene Y as the negative
+    # price.
+    entries = []
+    for day in [3, 0, 4, 1, 2]:
+        timestamp = startDt + datetime.timedelta(days=day)
+        high = 100.0 + (day % 3) * 10
+        low = high - 5.0
+        priceBar = PriceBar(timestamp, open=low + 1.0, high=high,
+                            low=low, close=high - 1.0)
+        entries.append((priceBar, None, float(day),
+                        -priceBar.open, -priceBar.high,
+                        -priceBar.low, -priceBar.close))
+    index.addPriceBars(entries[:3])
+    index.addPriceBars(entries[3:])
+
+    print("  Actual   : {} PriceBars, X of {}".\
+          format(index.getNumPriceBars(), list(index.xs)))
+    print("  Expected : 5 PriceBars, X of [0.0, 1.0, 2.0, 3.0, 4.0]")
+
+    print("  Actual   : earliest {}, latest {}, highest {}, lowest {}".\
+          format(index.getEarliestPriceBar().timestamp.day,
+                 index.getLatestPriceBar().timestamp.day,
+                 index.getHighestPriceBar().high,
+                 index.getLowestPriceBar().low))
+    print("  Expected : earliest 2, latest 6, highest 120.0, lowest 95.0")
+
+    priceBars = index.getPriceBarsInTimestampRange(\
+        startDt + datetime.timedelta(days=1),
+        startDt + datetime.timedelta(days=3))
+
+    print("  Actual   : {} PriceBars in range, {} bars between X 3 and 1".\
+          format(len(priceBars), index.getNumPriceBarsInXRange(3.0, 1.0)))
+    print("  Expected : 3 PriceBars in range, 2 bars between X 3 and 1")
+
+    print("  Actual   : closest X {}, closest Y {}, closest point {}".\
+          format(index.getClosestX(2.4),
+                 index.getClosestHighLowY(-112.0),
+                 index.getClosestOHLCPoint(3.9, -104.0)))
+    print("  Expected : closest X 2.0, closest Y -110.0, " + \
+          "closest point (4.0, -105.0)")
+
+    # 4 PriceBars per column of width 4.0: days 0 to 3, then day 4.
+    print("  Actual   : envelopes {}".\
+          format(index.getOHLCEnvelopes(-1.0, 10.0, 4.0)))
+    print("  Expected : envelopes [(2.0, -96.0, -120.0, -95.0, -99.0), " + \
+          "(6.0, -106.0, -110.0, -105.0, -109.0)]")
+
+    print("  Actual   : bar at (2.1, -117.0) is {}, ".\
+          format(index.getIndexAt(2.1, -117.0, 0.5, 0.5)) + \
+          "bar at (2.1, -125.0) is {}".\
+          format(index.getIndexAt(2.1, -125.0, 0.5, 0.5)))
+    print("  Expected : bar at (2.1, -117.0) is 2, " + \
+          "bar at (2.1, -125.0) is None")
+
+    # Give the PriceBar at X 2.0 its own item, which is skipped.
+    entry = (index.getPriceBar(2), "item", index.xs[2], index.openYs[2],
+             index.highYs[2], index.lowYs[2], index.closeYs[2])
+    index.replacePriceBar(2, entry)
+    print("  Actual   : bar without an item at (2.1, -117.0) is {}".\
+          format(index.getIndexAt(2.1, -117.0, 0.5, 0.5,
+                                  skipItemsFlag=True)))
+    print("  Expected : bar without an item at (2.1, -117.0) is None")
+
+    index.clear()
+
+    print("  Actual   : {} PriceBars, closest point {}".\
+          format(index.getNumPriceBars(), index.getClosestOHLCPoint(0, 0)))
+    print("  Expected : 0 PriceBars, closest point None")
+
+##############################################################################
+
+# For debugging the module during development.
+if __name__=="__main__":
+    # For logging and for exiting.
+    import logging.config
+    import os
+    import sys
+
+    # Initialize logging.
+    LOG_CONFIG_FILE = os.path.join(sys.path[0], "../conf/logging.conf")
+    logging.config.fileConfig(LOG_CONFIG_FILE)
+
+    # Various tests to run:
+    testPriceBarIndex()
+
+    # Quit.
+    print("Exiting.")
+    sys.exit()
+
+##############################################################################
@@ -85,6 +85,25 @@ class SettingsKeys():
     # QSettings default value for the BarCountGraphicsItem text color (QColor object).
     barCountGraphicsItemTextColorSettingsDefValue = QColor(Qt.black)
 
+    # QSettings key for whether the QGraphicsItems of the PriceBarChart
+    # are indexed in a BSP tree by the QGraphicsScene (bool).
+    priceBarChartItemIndexingEnabledSettingsKey = \
+        "ui/pricebarchart/itemIndexingEnabled"
+
+    # QSettings default value for whether the QGraphicsItems of the
+    # PriceBarChart are indexed in a BSP tree by the QGraphicsScene (bool).
+    priceBarChartItemIndexingEnabledSettingsDefValue = True
+
+    # QSettings key for whether the PriceBars of the PriceBarChart are
+    # drawn by a single PriceBarSeriesGraphicsItem instead of one
+    # PriceBarGraphicsItem for each PriceBar (bool).
+    priceBarChartPriceSeriesItemEnabledSettingsKey = \
+        "ui/pricebarchart/priceSeriesItemEnabled"
+
+    # QSettings default value for whether the PriceBars of the
+    # PriceBarChart are drawn by a single PriceBarSeriesGraphicsItem (bool).
+    priceBarChartPriceSeriesItemEnabledSettingsDefValue = True
+
     # QSettings key for the ModalScaleGraphicsItem color (QColor object).
     modalScaleGraphicsItemColorSettingsKey = \
         "ui/pricebarchart/modalScaleGraphicsItemColor"
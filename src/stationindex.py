@@ -0,0 +1,479 @@
+# For logging.
+import logging
+
+# For bisect.bisect_left() and bisect.bisect_right().
+import bisect
+
+# For saving and loading the index.
+import pickle
+
+# For the lock that guards the index.
+import threading
+
+# For timestamps and timezone information.
+import datetime
+import pytz
+
+# For directory access.
+import inspect
+
+# For the Swiss Ephemeris version of the data saved.
+import swisseph as swe
+
+# Import the Ephemeris classes.
+from ephemeris import Ephemeris
+
+# For stepping through the longitude of a planet.
+from eventsolver import EventSolver
+
+##############################################################################
+
+class StationIndex:
+    """Class that holds the timestamps of the stations of planets,
+    i.e. the moments when the longitude speed changes sign and the
+    planet turns retrograde or direct.
+
+    Stations are stored per (planetName, centricityType,
+    longitudeType), for the geocentric and heliocentric centricity
+    types only, as a sorted list of Julian Days for a contiguous
+    covered range of time.  Lookups for stations between two
+    timestamps are done with a binary search.  If a lookup falls
+    outside of the covered range, the stations for the missing range
+    are calculated and added first, so an index can be used without
+    any setup.  The stations are found with the EventSolver, to within
+    'maxErrorTd'.
+
+    Installed with EventSolver.setStationIndex(), the index is also
+    used by EventSolver.iterateLongitudeSegments() to know where the
+    longitude is monotonic, so it can take larger steps.
+
+    Example:
+
+    index = StationIndex()
+    stations = index.getStations("Mercury", "geocentric", "tropical",
+                                 startDt, endDt)
+    index.save("/tmp/stations.index")
+    ...
+    index = StationIndex.load("/tmp/stations.index")
+    EventSolver.setStationIndex(index)
+    """
+
+    # Version of the file format written by save().
+    # This should be incremented whenever the layout of the pickled
+    # data changes.
+    FILE_FORMAT_VERSION = 1
+
+    # Logger object for this class.
+    log = logging.getLogger("stationindex.StationIndex")
+
+    def __init__(self,
+                 maxErrorTd=datetime.timedelta(seconds=1),
+                 chunkDays=3652.5):
+        """Initializes an empty index.
+
+        Parameters:
+        maxErrorTd - datetime.timedelta object holding the maximum
+                     time difference between the exact timestamp of
+                     a station, and the one stored.
+        chunkDays  - float value for the smallest number of days that
+                     the covered range is extended by when a lookup
+                     falls outside of it.
+        """
+
+        self.maxErrorTd = maxErrorTd
+        self.chunkDays = chunkDays
+
+        # Dictionary mapping (planetName, centricityType, longitudeType)
+        # to a list:
+        # [coveredStartJd, coveredEndJd, stationJds, stationTypes]
+        #
+        # stationJds is a sorted list of the Julian Days of the
+        # stations within the covered range, and stationTypes is the
+        # list of str values "direct" or "retrograde" for what the
+        # planet turns at each station.
+        self.tables = {}
+
+        # Lock that guards 'tables'.
+        self.lock = threading.RLock()
+
+    def isEmpty(self):
+        """Returns True if the index holds no stations or covered ranges."""
+
+        return len(self.tables) == 0
+
+    def contains(self, planetName, centricityType, longitudeType,
+                 startDt, endDt):
+        """Returns True if the range from 'startDt' to 'endDt' is
+        covered for the given planet, i.e. stations in that range can
+        be looked up without calculating anything.
+        """
+
+        key = (planetName, centricityType.lower(), longitudeType.lower())
+
+        startJd = Ephemeris.datetimeToJulianDay(startDt)
+        endJd = Ephemeris.datetimeToJulianDay(endDt)
+
+        with self.lock:
+            table = self.tables.get(key)
+            if table == None:
+                return False
+
+            return table[0] <= startJd and endJd <= table[1]
+
+    def addRange(self, planetName, centricityType, longitudeType,
+                 startDt, endDt):
+        """Calculates the stations of the given planet between
+        'startDt' and 'endDt', and adds them to the index.  The covered
+        range is kept contiguous, so if the range given does not touch
+        the covered range, the stations in between are calculated too.
+
+        Arguments:
+        planetName     - str holding the name of the planet.
+        centricityType - str value holding either "geocentric"
+                         or "heliocentric".
+        longitudeType  - str value holding either "tropical" or "sidereal".
+        startDt        - datetime.datetime object for the start of the range.
+        endDt          - datetime.datetime object for the end of the range.
+
+        Returns:
+        True if the stations were added, False if the stations of
+        this planet cannot be calculated.
+        """
+
+        key = (planetName, centricityType.lower(), longitudeType.lower())
+
+        startJd = Ephemeris.datetimeToJulianDay(startDt)
+        endJd = Ephemeris.datetimeToJulianDay(endDt)
+
+        return self.__addRange(key, startJd, endJd)
+
+    def getStations(self, planetName, centricityType, longitudeType,
+                    startDt, endDt):
+        """Returns the stations of the given planet between 'startDt'
+        and 'endDt', inclusive.  Stations are calculated first for any
+        part of the range not yet covered by the index.
+
+        Arguments:
+        planetName     - str holding the name of the planet.
+        centricityType - str value holding either "geocentric"
+                         or "heliocentric".
+        longitudeType  - str value holding either "tropical" or "sidereal".
+        startDt        - datetime.datetime object for the start of the range.
+        endDt          - datetime.datetime object for the end of the range.
+
+        Returns:
+        List of tuples (dt, stationType), ordered by timestamp, where
+        dt is a datetime.datetime in UTC, and stationType is the str
+        "direct" or "retrograde" for what the planet turns at that
+        moment.  In the event of an error, the reference None is
+        returned.
+        """
+
+        stations = self.getStationJulianDays(planetName, centricityType,
+                                             longitudeType, startDt, endDt)
+        if stations == None:
+            return None
+
+        rv = []
+        for (jd, stationType) in stations:
+            rv.append((Ephemeris.julianDayToDatetime(jd), stationType))
+
+        return rv
+
+    def getStationJulianDays(self, planetName, centricityType, longitudeType,
+                             startDt, endDt):
+        """Same as getStations(), except the timestamps are returned
+        as float Julian Days, which is cheaper when many lookups are
+        done.
+
+        Returns:
+        List of tuples (jd, stationType), or None on error.
+        """
+
+        key = (planetName, centricityType.lower(), longitudeType.lower())
+
+        startJd = Ephemeris.datetimeToJulianDay(startDt)
+        endJd = Ephemeris.datetimeToJulianDay(endDt)
+
+        if endJd < startJd:
+            self.log.error("Invalid input: 'endDt' must be after 'startDt'")
+            return None
+
+        with self.lock:
+            table = self.tables.get(key)
+
+            if table == None or startJd < table[0] or table[1] < endJd:
+                # Extend the covered range by whole chunks, so lookups
+                # in a sequence of nearby ranges calculate stations
+                # only once in a while.
+                if table == None:
+                    paddingDays = \
+                        max(0.0, self.chunkDays - (endJd - startJd)) / 2.0
+                    (addStartJd, addEndJd) = \
+                        (startJd - paddingDays, endJd + paddingDays)
+                else:
+                    addStartJd = startJd
+                    if startJd < table[0]:
+                        addStartJd = min(startJd, table[0] - self.chunkDays)
+                    addEndJd = endJd
+                    if table[1] < endJd:
+                        addEndJd = max(endJd, table[1] + self.chunkDays)
+
+                if not self.__addRange(key, addStartJd, addEndJd):
+                    return None
+
+                table = self.tables[key]
+
+            (coveredStartJd, coveredEndJd, stationJds, stationTypes) = table
+
+            i = bisect.bisect_left(stationJds, startJd)
+            j = bisect.bisect_right(stationJds, endJd)
+
+            return list(zip(stationJds[i:j], stationTypes[i:j]))
+
+    def save(self, filename):
+        """Writes this index to the given file.
+
+        Returns:
+        True if the write succeeded, False otherwise.
+        """
+
+        with self.lock:
+            data = {"version"    : StationIndex.FILE_FORMAT_VERSION,
+                    "sweVersion" : swe.version,
+                    "maxErrorTd" : self.maxErrorTd,
+                    "chunkDays"  : self.chunkDays,
+                    "tables"     : self.tables}
+
+            try:
+                with open(filename, "wb") as f:
+                    pickle.dump(data, f, pickle.HIGHEST_PROTOCOL)
+            except (IOError, OSError, pickle.PicklingError) as e:
+                self.log.error("Failed to write the station index " + \
+                               "to file '{}': {}".format(filename, e))
+                return False
+
+        return True
+
+    @staticmethod
+    def load(filename):
+        """Reads an index previously written with save().
+
+        Returns:
+        StationIndex object, or None if the file could not be read or
+        was written in an incompatible format.
+        """
+
+        log = StationIndex.log
+
+        try:
+            with open(filename, "rb") as f:
+                data = pickle.load(f)
+        except (IOError, OSError, EOFError, pickle.UnpicklingError) as e:
+            log.error("Failed to read the station index " + \
+                      "from file '{}': {}".format(filename, e))
+            return None
+
+        if not isinstance(data, dict) or \
+           data.get("version") != StationIndex.FILE_FORMAT_VERSION:
+
+            log.error("Station index file '{}' ".format(filename) + \
+                      "has an unsupported format version.")
+            return None
+
+        if data["sweVersion"] != swe.version:
+            log.warning("Station index file '{}' ".format(filename) + \
+                        "was created with Swiss Ephemeris version {}, ".\
+                        format(data["sweVersion"]) + \
+                        "but version {} is in use.".format(swe.version))
+
+        index = StationIndex(data["maxErrorTd"], data["chunkDays"])
+        index.tables = data["tables"]
+
+        return index
+
+    def __addRange(self, key, startJd, endJd):
+        """Calculates the stations for the given key between 'startJd'
+        and 'endJd', and merges them into the table for that key.
+
+        Returns:
+        True if the stations were added, False otherwise.
+        """
+
+        (planetName, centricityType, longitudeType) = key
+
+        if not EventSolver.isLongitudeSpeedAvailable(planetName):
+            self.log.error("Stations of planet '{}' ".format(planetName) + \
+                           "cannot be calculated, because its " + \
+                           "longitude speed is not available.")
+            return False
+
+        # Topocentric stations depend on the geographic position,
+        # which is not part of the key.
+        if centricityType != "geocentric" and \
+           centricityType != "heliocentric":
+
+            self.log.error("Invalid input: Centricity type is invalid " + \
+                           "for a station index.  " + \
+                           "Value given was: {}".format(centricityType))
+            return False
+
+        if longitudeType != "tropical" and \
+           longitudeType != "sidereal":
+
+            self.log.error("Invalid input: Longitude type is invalid.  " + \
+                           "Value given was: {}".format(longitudeType))
+            return False
+
+        with self.lock:
+            table = self.tables.get(key)
+
+            if table == None:
+                (stationJds, stationTypes) = \
+                    self.__calculateStations(key, startJd, endJd)
+                self.tables[key] = \
+                    [startJd, endJd, stationJds, stationTypes]
+                return True
+
+            (coveredStartJd, coveredEndJd, stationJds, stationTypes) = table
+
+            # Stations found within this many days of one at the
+            # border of the covered range are the same station.
+            toleranceDays = 2 * self.maxErrorTd.total_seconds() / 86400.0
+
+            if startJd < coveredStartJd:
+                (newJds, newTypes) = \
+                    self.__calculateStations(key, startJd, coveredStartJd)
+
+                if len(newJds) > 0 and len(stationJds) > 0 and \
+                   stationJds[0] - newJds[-1] < toleranceDays:
+                    del newJds[-1]
+                    del newTypes[-1]
+
+                stationJds = newJds + stationJds
+                stationTypes = newTypes + stationTypes
+                coveredStartJd = startJd
+
+            if coveredEndJd < endJd:
+                (newJds, newTypes) = \
+                    self.__calculateStations(key, coveredEndJd, endJd)
+
+                if len(newJds) > 0 and len(stationJds) > 0 and \
+                   newJds[0] - stationJds[-1] < toleranceDays:
+                    del newJds[0]
+                    del newTypes[0]
+
+                stationJds = stationJds + newJds
+                stationTypes = stationTypes + newTypes
+                coveredEndJd = endJd
+
+            self.tables[key] = \
+                [coveredStartJd, coveredEndJd, stationJds, stationTypes]
+
+        return True
+
+    def __calculateStations(self, key, startJd, endJd):
+        """Returns a tuple (stationJds, stationTypes) for the stations
+        of the planet for the given key between 'startJd' and 'endJd'.
+        """
+
+        if self.log.isEnabledFor(logging.DEBUG) == True:
+            self.log.debug("Calculating stations for {} ".format(key) + \
+                           "from JD {} to JD {} ...".format(startJd, endJd))
+
+        startDt = Ephemeris.julianDayToDatetime(startJd)
+        endDt = Ephemeris.julianDayToDatetime(endJd)
+
+        longitudeFunction = EventSolver.createLongitudeFunction([key])
+
+        stationJds = []
+        stationTypes = []
+
+        # Segments are split at stations, so a station is the end of
+        # a segment where the speed is zero.
+        for (t1, u1, v1, t2, u2, v2) in \
+                EventSolver.iterateLongitudeSegments(longitudeFunction,
+                                                     startDt, endDt,
+                                                     maxErrorTd=self.maxErrorTd):
+
+            if v2 == 0.0 and v1 != None and v1 != 0.0:
+                stationJds.append(startJd + t2)
+                if v1 < 0.0:
+                    stationTypes.append("direct")
+                else:
+                    stationTypes.append("retrograde")
+
+        return (stationJds, stationTypes)
+
+##############################################################################
+
+def testStationIndex():
+    """Compares the stations looked up in a StationIndex with the ones
+    found by stepping one day at a time through the longitude speed.
+    """
+
+    print("Running " + inspect.stack()[0][3] + "()")
+
+    startDt = datetime.datetime(1990, 1, 1, tzinfo=pytz.utc)
+    endDt = datetime.datetime(2000, 1, 1, tzinfo=pytz.utc)
+
+    index = StationIndex()
+
+    for planetName in ["Mercury", "Venus", "Mars", "Jupiter"]:
+        stations = index.getStations(planetName, "geocentric", "tropical",
+                                     startDt, endDt)
+
+        # Same stations, by checking the sign of the speed every day.
+        numSignChanges = 0
+        prevSpeed = None
+        dt = startDt
+        while dt <= endDt:
+            pi = Ephemeris.getPlanetaryInfo(planetName, dt)
+            speed = pi.geocentric['tropical']['longitude_speed']
+            if prevSpeed != None and (prevSpeed < 0.0) != (speed < 0.0):
+                numSignChanges += 1
+            prevSpeed = speed
+            dt += datetime.timedelta(days=1)
+
+        print("    {}: {} stations ({} with daily steps), first: {}".\
+              format(planetName, len(stations), numSignChanges,
+                     [(Ephemeris.datetimeToStr(dt), stationType) \
+                      for (dt, stationType) in stations[:2]]))
+
+    # Lookups within the covered range need no calculations.
+    print("    Covered: {}".format(\
+        index.contains("Mercury", "geocentric", "tropical",
+                       startDt + datetime.timedelta(days=100),
+                       endDt - datetime.timedelta(days=100))))
+
+##############################################################################
+
+# For debugging the module during development.
+if __name__=="__main__":
+    # For logging and for exiting.
+    import logging.config
+    import os
+    import sys
+
+    # Initialize logging.
+    LOG_CONFIG_FILE = os.path.join(sys.path[0], "../conf/logging.conf")
+    logging.config.fileConfig(LOG_CONFIG_FILE)
+
+    # Initialize the Ephemeris (required).
+    Ephemeris.initialize()
+
+    # New York City:
+    lon = -74.0064
+    lat = 40.7142
+
+    # Set a default location (required).
+    Ephemeris.setGeographicPosition(lon, lat)
+
+    # Various tests to run:
+    testStationIndex()
+
+    # Quit.
+    print("Exiting.")
+    sys.exit()
+
+##############################################################################
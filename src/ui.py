@@ -4345,6 +4345,11 @@ class PriceChartDocument(QMdiSubWindow):
     # File extension.
     fileExtension = ".pcd"
 
+    # File extension appended to the filename of the document, for the
+    # file that holds the cached results of LookbackMultiple
+    # calculations.
+    lookbackMultipleCacheFileExtension = ".lmcache"
+
     # File filter.
     fileFilter = "PriceChartDocument files (*" + fileExtension + ")"
 
@@ -4523,6 +4528,11 @@ class PriceChartDocument(QMdiSubWindow):
 
             self.title = self.filename[loc:]
             self.setWindowTitle(self.title)
+
+            # Keep the cached LookbackMultiple results next to the document.
+            self.widgets.setLookbackMultipleCacheFilename(\
+                self.filename + \
+                PriceChartDocument.lookbackMultipleCacheFileExtension)
         else:
             self.log.debug("Filename didn't change.  No need to update.")
 
@@ -5779,6 +5789,17 @@ class PriceChartDocumentWidget(QWidget):
 
         self.priceBarChartWidget.setTimezone(timezone)
 
+    def setLookbackMultipleCacheFilename(self, filename):
+        """Sets the file that the results of LookbackMultiple
+        calculations are kept in.
+        
+        Arguments:
+
+        filename - str holding the path of the LookbackMultipleCache file.
+        """
+
+        self.priceBarChartWidget.setLookbackMultipleCacheFilename(filename)
+
     def loadPriceBars(self, priceBars):
         """Loads the price bars into the widgets.
         
@@ -5866,14 +5887,17 @@ class PriceChartDocumentWidget(QWidget):
         return self.lookbackMultiplePanelWidget.getLookbackMultiples()
     
     def applyRedrawLookbackMultiples(self):
-        """Causes a removal of all
-        LookbackMultiplePriceBarGraphicsItems, and then a drawing of all
-        new LookbackMultiplePriceBarGraphicsItems.
+        """Causes a redraw of the LookbackMultiplePriceBarGraphicsItems
+        for the currently visible area of the QGraphicsScene.
+
+        The redraw is incremental: items already drawn for historic
+        PriceBars that are still in range are kept, and calculations
+        are only made for the historic PriceBars newly exposed since
+        the previous draw.
         """
         
         self.log.debug("Entered applyRedrawLookbackMultiples()")
 
-        self.clearAllLookbackMultiplePriceBars()
         self.drawLookbackMultiplePriceBars()
 
         self.log.debug("Exiting applyRedrawLookbackMultiples()")